@@ -0,0 +1,95 @@
+"""
+Trägt fehlende Medien-Metadaten (Dauer, Auflösung, fps, Codec, Dateigröße) für bestehende Songs, Edits und belegte Slots nach.
+
+    python -m api.commands.backfill_media_metadata
+"""
+import logging
+import os
+from typing import Callable, ContextManager
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.exceptions.sessions.files import (DirectoryNotFoundError,
+                                           FileNotFoundInSessionError)
+from api.models.database.model import Edit, OccupiedSlot, Song
+from api.services.database.media_metadata import \
+    update_edit as update_edit_media_metadata
+from api.services.database.media_metadata import \
+    update_occupied_slot as update_occupied_slot_media_metadata
+from api.services.database.media_metadata import \
+    update_song as update_song_media_metadata
+from api.services.files.edit import path as get_edit_file_path
+from api.services.files.occupied_slot import \
+    path as get_occupied_slot_file_path
+from api.services.files.song import path as get_song_file_path
+from api.sessions.database import (init_database_session_manager,
+                                   open_database_session)
+from api.sessions.files import (BaseFileSessionManager, get_file_session,
+                                init_file_session_manager)
+from api.utils.media_manipulation.probe_media import probe_media_path
+from logging_config import setup_logging
+
+logger = logging.getLogger("commands.backfill_media_metadata")
+
+def backfill_media_metadata(database_session: Session, file_session: BaseFileSessionManager) -> int:
+    """
+    Liest die Metadaten aller Einträge ohne byte_size aus ihren Dateien und speichert sie.
+    Fehlende oder unlesbare Dateien werden übersprungen und bleiben leer.
+
+    Returns:
+        int: Anzahl der nachgetragenen Einträge.
+    """
+    updated = 0
+
+    for song in database_session.query(Song).filter(Song.byte_size.is_(None)).all():
+        updated += _backfill(f"song {song.song_id}", song.song_id, get_song_file_path, update_song_media_metadata, database_session, file_session)
+
+    for edit in database_session.query(Edit).filter(Edit.byte_size.is_(None)).all():
+        updated += _backfill(f"edit {edit.edit_id}", edit.edit_id, get_edit_file_path, update_edit_media_metadata, database_session, file_session)
+
+    for occupied_slot in database_session.query(OccupiedSlot).filter(OccupiedSlot.byte_size.is_(None)).all():
+        updated += _backfill(f"occupied slot {occupied_slot.occupied_slot_id}", occupied_slot.occupied_slot_id, get_occupied_slot_file_path, update_occupied_slot_media_metadata, database_session, file_session)
+
+    logger.info(f"backfill_media_metadata(): Backfilled {updated} entries")
+    return updated
+
+def _backfill(
+    name: str,
+    entity_id: int,
+    get_file_path: Callable[[int, BaseFileSessionManager], ContextManager[str]],
+    update_media_metadata: Callable,
+    database_session: Session,
+    file_session: BaseFileSessionManager
+) -> int:
+    try:
+        # The path keeps the stored file extension, e.g. songs/1.mp3
+        with get_file_path(entity_id, file_session) as file_path:
+            update_media_metadata(entity_id, probe_media_path(file_path), os.path.getsize(file_path), database_session)
+        # Commit per entry, an interrupted run keeps what it has probed so far
+        database_session.commit()
+        logger.info(f"_backfill(): {name} done")
+        return 1
+    except (FileNotFoundInSessionError, DirectoryNotFoundError, MediaManipulationError) as e:
+        logger.warning(f"_backfill(): Skipping {name}: {e}")
+        return 0
+
+def main() -> None:
+    load_dotenv()
+    setup_logging(env=os.getenv("LOGGER_ENV"))
+    init_database_session_manager()
+    init_file_session_manager()
+
+    database_session_generator = open_database_session()
+    database_session = next(database_session_generator)
+    file_session = next(get_file_session())
+    try:
+        updated = backfill_media_metadata(database_session, file_session)
+    finally:
+        database_session_generator.close()
+    print(f"Backfilled media metadata for {updated} entries")
+
+if __name__ == "__main__":
+    main()
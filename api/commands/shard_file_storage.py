@@ -0,0 +1,61 @@
+"""
+Verschiebt die Dateien des lokalen Dateispeichers aus flachen Verzeichnissen (z.B. edits/12.mp4) in die Unterverzeichnisse
+nach Hash-Präfix (z.B. edits/3f/12.mp4) und baut danach den Index neu auf. Der Server darf dabei nicht laufen.
+
+    python -m api.commands.shard_file_storage
+"""
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from api.sessions.files import (LocalFileSessionManager, get_file_session,
+                                init_file_session_manager, is_shard, shard_of,
+                                storage_of)
+from logging_config import setup_logging
+
+logger = logging.getLogger("commands.shard_file_storage")
+
+def shard_file_storage(file_session: LocalFileSessionManager) -> int:
+    """
+    Verschiebt alle Dateien, die noch nicht in einem Unterverzeichnis nach Hash-Präfix liegen, per rename dorthin.
+    Dateien direkt im Wurzelverzeichnis des Dateispeichers bleiben liegen.
+
+    Returns:
+        int: Anzahl der verschobenen Dateien.
+    """
+    moved = 0
+
+    # os.walk lists the subdirectories before descending, the shards created here are not visited again
+    for dirpath, _, filenames in os.walk(file_session.local_media_repo_folder):
+        dir = os.path.relpath(dirpath, file_session.local_media_repo_folder)
+        parent_dir, dir_name = os.path.split(dir)
+        if dir == "." or (parent_dir and is_shard(dir_name)):
+            continue
+
+        for filename in filenames:
+            shard_path = os.path.join(dirpath, shard_of(os.path.splitext(filename)[0]))
+            os.makedirs(shard_path, exist_ok=True)
+            os.rename(os.path.join(dirpath, filename), os.path.join(shard_path, filename))
+            moved += 1
+        logger.info(f"shard_file_storage(): '{dir}' done")
+
+    file_session.rebuild_index()
+    logger.info(f"shard_file_storage(): Moved {moved} files")
+    return moved
+
+def main() -> None:
+    load_dotenv()
+    setup_logging(env=os.getenv("LOGGER_ENV"))
+    init_file_session_manager()
+
+    file_session = storage_of(next(get_file_session()))
+    if not isinstance(file_session, LocalFileSessionManager):
+        print("Only the local file storage is sharded, nothing to do")
+        return
+
+    moved = shard_file_storage(file_session)
+    print(f"Moved {moved} files into hash-prefix subdirectories")
+
+if __name__ == "__main__":
+    main()
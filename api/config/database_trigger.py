@@ -2,8 +2,8 @@ import asyncio
 import logging
 from sqlalchemy import event
 from api.models.database.model import Edit, OccupiedSlot, User
-from api.websocket.active_connections import notify_table_update
-from sqlalchemy.orm import Session, joinedload
+from api.websocket.active_connections import get_event_loop, notify_table_update
+from sqlalchemy.orm import Session, joinedload, object_session
 
 # Set up logging
 logger = logging.getLogger("config.database_trigger")
@@ -26,9 +26,32 @@ def run_async(func, *args):
         # If we are in a running event loop, create a task
         loop.create_task(func(*args))
     except RuntimeError:
+        # In a worker thread (executor pools, render jobs) the websockets still belong to the main event loop
+        loop = get_event_loop()
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(func(*args), loop)
+            return
         # If no event loop is running, use asyncio.run()
         asyncio.run(func(*args))
 
+# Changes are flushed long before the single commit at the end of the request, clients must only refetch after it
+def notify_after_commit(target, group_id, table_name):
+    session = object_session(target)
+    if session is None:
+        run_async(notify_table_update, group_id, table_name)
+        return
+    # dict keeps the order and sends every table of a group only once per commit
+    session.info.setdefault("table_updates", {})[(group_id, table_name)] = None
+
+@event.listens_for(Session, 'after_commit')
+def after_commit(session):
+    for group_id, table_name in session.info.pop("table_updates", {}):
+        run_async(notify_table_update, group_id, table_name)
+
+@event.listens_for(Session, 'after_rollback')
+def after_rollback(session):
+    session.info.pop("table_updates", None)
+
 # Event listener for Edit table
 @event.listens_for(Edit, 'after_insert')
 @event.listens_for(Edit, 'after_update')
@@ -37,7 +60,7 @@ def after_edit_update(mapper, connection, target):
     group_id = get_group_id_from_object(target)
     logger.info(f"Edit table updated. Group ID: {group_id}")
     if group_id:
-        run_async(notify_table_update, group_id, 'EDIT')
+        notify_after_commit(target, group_id, 'EDIT')
     else:
         logger.warning("Edit table updated, but no group ID found.")
 
@@ -59,7 +82,7 @@ def after_occupied_slot_update(mapper, connection, target):
     logger.info(f"OccupiedSlot table updated. Group ID: {group_id}")
     
     if group_id:
-        run_async(notify_table_update, group_id, 'OCCUPIEDSLOT')
+        notify_after_commit(target, group_id, 'OCCUPIEDSLOT')
     else:
         logger.warning("OccupiedSlot table updated, but no group ID found.")
     
@@ -73,6 +96,6 @@ def after_user_update(mapper, connection, target):
     group_id = get_group_id_from_object(target)
     logger.info(f"User table updated. Group ID: {group_id}")
     if group_id:
-        run_async(notify_table_update, group_id, 'USER')
+        notify_after_commit(target, group_id, 'USER')
     else:
         logger.warning("User table updated, but no group ID found.")
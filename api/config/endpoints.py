@@ -82,6 +82,12 @@ endpoint_config = EndpointConfig({
     '/edit/{edit_id}/slot/{occupied_slot_id}' : {
         "PUT": EndpointInfo(role=RoleEnum.GROUP_MEMBER, has_subroles=True),
         "DELETE": EndpointInfo(role=RoleEnum.GROUP_MEMBER, has_subroles=True),
-    }
+    },
+
+    # job
+    '/job/{job_id}':                    {"GET": EndpointInfo(role=RoleEnum.GROUP_MEMBER, has_subroles=True)},
+
+    # metrics
+    '/metrics/':                        {"GET": EndpointInfo(role=RoleEnum.ADMIN, has_subroles=True)},
 
 })
\ No newline at end of file
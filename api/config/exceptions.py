@@ -10,11 +10,13 @@ from api.exceptions.media_manipulation.media_manipulation import \
 from api.exceptions.sessions.email import (EmailConfigurationError,
                                            EmailConnectionError,
                                            EmailDeliveryError, EmailSendError)
+from api.exceptions.sessions.executor import ExecutorSaturatedError
 from api.exceptions.sessions.files import (DirectoryNotFoundError,
                                            FileDeleteError,
                                            FileExistsInSessionError,
                                            FileNotFoundInSessionError,
                                            FileSessionError, FileUpdateError)
+from api.exceptions.sessions.render import RenderJobNotFoundError
 from api.exceptions.sessions.instagram import (FTPConnectionError,
                                                FTPUploadError,
                                                InstagramUploadError,
@@ -133,6 +135,27 @@ def add_exception_handlers(app: FastAPI):
         )
 
 
+    """ RENDER SESSION """
+
+    @app.exception_handler(RenderJobNotFoundError)
+    async def render_job_not_found_error_handler(request: Request, exc: RenderJobNotFoundError):
+        return JSONResponse(
+            status_code=404,
+            content={"detail": str(exc)}
+        )
+
+
+    """ EXECUTOR SESSION """
+
+    @app.exception_handler(ExecutorSaturatedError)
+    async def executor_saturated_error_handler(request: Request, exc: ExecutorSaturatedError):
+        return JSONResponse(
+            status_code=503,  # Service Unavailable
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"}
+        )
+
+
     """ INSTAGRAM """
 
     @app.exception_handler(InstagramUploadError)
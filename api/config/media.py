@@ -0,0 +1,38 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+media_config = {
+    # "ffmpeg": ein filter_complex-Graph pro Rendering, "moviepy": Frame-für-Frame Compositing in Python
+    "engine": os.getenv("MEDIA_ENGINE", "ffmpeg"),
+    # Die Vorschau eines Slots zeigt nur den Slot und so viele Sekunden davor und danach
+    "preview_context_seconds": float(os.getenv("PREVIEW_CONTEXT_SECONDS", "2")),
+    "profiles": {
+        # Gespeicherte Edits
+        "reel": {
+            "width": 1080,
+            "height": 1920,
+            "fps": 25,
+            "preset": "medium",
+            "crf": 18
+        },
+        # Hochgeladene Clips nach dem Ingest, werden beim Rendern noch einmal encodiert
+        "intermediate": {
+            "width": 1080,
+            "height": 1920,
+            "fps": 25,
+            "preset": "veryfast",
+            "crf": 14
+        },
+        # Vorschau auf dem Handy, es zählt nur die Latenz
+        "preview": {
+            "width": 540,
+            "height": 960,
+            "fps": 25,
+            "preset": "ultrafast",
+            "crf": 28
+        }
+    }
+}
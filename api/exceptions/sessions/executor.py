@@ -0,0 +1,7 @@
+class ExecutorSessionError(Exception):
+    """Allgemeiner Fehler für die Ausführung blockierender Aufrufe."""
+    pass
+
+class ExecutorSaturatedError(ExecutorSessionError):
+    """Wird ausgelöst, wenn die Warteschlange eines Executors voll ist."""
+    pass
@@ -0,0 +1,7 @@
+class RenderSessionError(Exception):
+    """Allgemeiner Fehler für Render-Sitzungen."""
+    pass
+
+class RenderJobNotFoundError(RenderSessionError):
+    """Wird ausgelöst, wenn ein Render-Job nicht gefunden wird."""
+    pass
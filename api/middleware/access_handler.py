@@ -5,13 +5,21 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from api.config.endpoints import EndpointConfig
+from api.exceptions.sessions.executor import ExecutorSaturatedError
 from api.security.role_class import Role, RoleInfos
+from api.sessions.database import (finish_database_session, is_recent_writer,
+                                   reads_from_replica, release_database_session,
+                                   remember_writer, use_primary)
+from api.sessions.executor import run_database, run_io
 from api.utils.jwt import jwt
 from api.utils.routes.extract_role_credentials_from_request import \
     extract_role_credentials_from_request
 
 logger = logging.getLogger("middleware.access_handler")
 
+# Only these requests read from replicas, everything that may write reads its own data from the primary
+READ_METHODS = ("GET", "HEAD")
+
 
 class AccessHandlerMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, endpoint_config: EndpointConfig, get_database_session):
@@ -55,26 +63,68 @@ class AccessHandlerMiddleware(BaseHTTPMiddleware):
             jwt_error = str(e)
             userid = None
 
-        # Use the database session
+        # One session per request, shared with the route through request.state and committed once at the end
         database_session_generator = self.get_database_session()
         database_session = next(database_session_generator)
+        request.state.database_session = database_session
 
-        # Initialize role with the extracted credentials
-        role = Role(role_infos=RoleInfos(admintoken=admintoken, userid=userid, groupid=groupid, editid=editid), database_session=database_session)
-        
-        # Check if the role has access
-        if not role.hasAccess(pathInfo):
-            status_code = 403
-            duration = time.time() - start_time
-            # Log the result information (combined line)
-            logger.info(f"Access Result: Status={status_code}, Duration={duration:.4f}s, Role={role._role.name}, Required Role={pathInfo.role.name}, Path={path}, JWT Error={jwt_error}")
-            return Response(status_code=status_code)
-
-        # Proceed if access is granted
-        response = await call_next(request)
-        
-        # Log the result of the request (combined line)
-        duration = time.time() - start_time
-        logger.info(f"Access Result: Status={response.status_code}, Duration={duration:.4f}s, Role={role._role.name}, Required Role={pathInfo.role.name}, Path={path}, JWT Error={jwt_error}")
+        # Read-your-writes: a user who wrote a moment ago would not find the change on a lagging replica yet
+        if method not in READ_METHODS or pathInfo.read_primary or is_recent_writer(database_session, userid):
+            use_primary(database_session)
 
-        return response
+        committed = False
+        try:
+            # Initialize role with the extracted credentials, looking up the memberships queries the database
+            try:
+                role_infos = RoleInfos(admintoken=admintoken, userid=userid, groupid=groupid, editid=editid)
+                role = await run_database(Role, role_infos=role_infos, database_session=database_session)
+
+                # A membership created moments ago may be missing on the replica, only the primary can deny access
+                if not role.hasAccess(pathInfo) and reads_from_replica(database_session):
+                    use_primary(database_session)
+                    role = await run_database(Role, role_infos=role_infos, database_session=database_session)
+            except ExecutorSaturatedError as e:
+                # Exception handlers of the app do not cover the middleware, answer like them
+                status_code = 503
+                duration = time.time() - start_time
+                logger.warning(f"Access Result: Status={status_code}, Duration={duration:.4f}s, Path={path}, Error={e}")
+                return Response(status_code=status_code, headers={"Retry-After": "1"})
+            
+            # Check if the role has access
+            if not role.hasAccess(pathInfo):
+                status_code = 403
+                duration = time.time() - start_time
+                # Log the result information (combined line)
+                logger.info(f"Access Result: Status={status_code}, Duration={duration:.4f}s, Role={role._role.name}, Required Role={pathInfo.role.name}, Path={path}, JWT Error={jwt_error}")
+                return Response(status_code=status_code)
+
+            # The route checks out a connection again on its first statement, not while the client is still sending the body
+            await run_database(release_database_session, database_session)
+
+            # Proceed if access is granted
+            response = await call_next(request)
+
+            # Error responses (handled exceptions included) leave the transaction to the rollback on close
+            if response.status_code < 400:
+                try:
+                    await run_database(database_session.commit)
+                    committed = True
+                    remember_writer(database_session, userid)
+                except Exception as e:
+                    logger.error(f"Commit failed: Path={path}, Error={e}")
+                    response = Response(status_code=503 if isinstance(e, ExecutorSaturatedError) else 500)
+            
+            # Log the result of the request (combined line)
+            duration = time.time() - start_time
+            logger.info(f"Access Result: Status={response.status_code}, Duration={duration:.4f}s, Role={role._role.name}, Required Role={pathInfo.role.name}, Path={path}, JWT Error={jwt_error}")
+
+            return response
+        finally:
+            # Closes the session, rolls back whatever was not committed and returns the connection to the pool
+            database_session_generator.close()
+
+            # Render jobs of the request are only queued now: they must see its rows and never run on a rolled back state
+            try:
+                await run_io(finish_database_session, database_session, committed)
+            except ExecutorSaturatedError:
+                finish_database_session(database_session, committed)
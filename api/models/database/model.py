@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy import Boolean, DateTime, ForeignKey, String, Time
 from sqlalchemy.orm import (Mapped, declarative_base, mapped_column,
@@ -27,6 +27,13 @@ class Song(Base):
     cover_src: Mapped[str] = mapped_column(String(255), nullable=False)
     audio_src: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    # Beim Upload aus dem Header gelesen, leer bei Songs von vor dem Audio-Ingest (siehe backfill_media_metadata)
+    duration: Mapped[Optional[float]] = mapped_column(nullable=True)
+    sample_rate: Mapped[Optional[int]] = mapped_column(nullable=True)
+    channel_layout: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    codec: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    byte_size: Mapped[Optional[int]] = mapped_column(nullable=True)
+
     slot_list: Mapped[List["Slot"]] = relationship("Slot", back_populates="song", cascade="all, delete-orphan")
     edit_list: Mapped[List["Edit"]] = relationship("Edit", back_populates="song", cascade="all, delete-orphan")
 
@@ -41,6 +48,14 @@ class Edit(Base):
     isLive: Mapped[bool] = mapped_column(Boolean, nullable=False)
     video_src: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    # Beim Ingest bzw. Rendern aus den Headern gelesen, leer bis dahin (siehe backfill_media_metadata)
+    duration: Mapped[Optional[float]] = mapped_column(nullable=True)
+    width: Mapped[Optional[int]] = mapped_column(nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(nullable=True)
+    fps: Mapped[Optional[float]] = mapped_column(nullable=True)
+    codec: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    byte_size: Mapped[Optional[int]] = mapped_column(nullable=True)
+
     song: Mapped["Song"] = relationship("Song", back_populates="edit_list")
     group: Mapped["Group"] = relationship("Group", back_populates="edit_list")
     creator: Mapped["User"] = relationship("User", back_populates="edit_list")
@@ -103,6 +118,14 @@ class OccupiedSlot(Base):
     start_time: Mapped[float] = mapped_column(nullable=False)
     end_time: Mapped[float] = mapped_column(nullable=False)
 
+    # Beim Ingest bzw. Rendern aus den Headern gelesen, leer bis dahin (siehe backfill_media_metadata)
+    duration: Mapped[Optional[float]] = mapped_column(nullable=True)
+    width: Mapped[Optional[int]] = mapped_column(nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(nullable=True)
+    fps: Mapped[Optional[float]] = mapped_column(nullable=True)
+    codec: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    byte_size: Mapped[Optional[int]] = mapped_column(nullable=True)
+
 
     user: Mapped["User"] = relationship("User", back_populates="occupied_slot_list")
     slot: Mapped["Slot"] = relationship("Slot", back_populates="occupied_slots")
@@ -43,7 +43,7 @@ class PostRequest(BaseModel):
     edit_name: str = Field(..., min_length=3, max_length=20)
 
 class PostResponse(Edit):
-    pass
+    job_id: Optional[str]
 
 # GET /{edit_id}
 class GetEditResponse(BaseModel):
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# GET /{job_id}
+class GetJobResponse(BaseModel):
+    job_id: str
+    edit_id: int
+    status: str
+    error: Optional[str]
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from fastapi import File, Form, UploadFile
 from pydantic import BaseModel
@@ -12,6 +13,7 @@ class AddSlotRequest():
 
 class AddSlotResponse(BaseModel):
     message: str
+    job_id: Optional[str]
 
 # DELETE /group/{group_id}/{edit_id}/slot/{slot_id}
 @dataclass
@@ -20,6 +22,7 @@ class DeleteSlotRequest:
 
 class DeleteSlotResponse(BaseModel):
     message: str
+    job_id: Optional[str]
 
 # PUT /group/{group_id}/{edit_id}/slot/{slot_id}
 @dataclass
@@ -30,6 +33,7 @@ class ChangeSlotRequest:
 
 class ChangeSlotResponse(BaseModel):
     message: str
+    job_id: Optional[str]
     
 # PUT /group/{group_id}/{edit_id}/slot/{slot_id}/preview
 @dataclass
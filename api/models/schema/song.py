@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from fastapi import File, Form, UploadFile
 from pydantic import BaseModel
@@ -12,6 +12,9 @@ class Song(BaseModel):
     song_id: int
     cover_src: str
     audio_src: str
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channel_layout: Optional[str] = None
     
 # / POST
 @dataclass
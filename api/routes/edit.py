@@ -1,10 +1,18 @@
 
 
 import logging
+import os
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
 
 from fastapi import APIRouter, Body, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.exceptions.sessions.files import (DirectoryNotFoundError,
+                                          FileExistsInSessionError,
+                                          FileNotFoundInSessionError)
 from api.models.schema.edit import (DeleteEditResponse, GetEditResponse,
                                     GoLiveResponse, PostRequest, PostResponse)
 from api.services.database.edit import \
@@ -14,22 +22,39 @@ from api.services.database.edit import get as get_edit_database
 from api.services.database.edit import remove as remove_edit_database
 from api.services.database.edit import set_is_live as set_is_live_edit_database
 from api.services.database.edit import update as edit_update_database
+from api.services.database.media_metadata import \
+    update_edit as update_edit_media_metadata
 from api.services.database.occupied_slot import \
     get_occupied_slots_for_edit as get_occupied_slots_for_edit_database
 from api.services.database.slot import \
     get_slots_for_edit as get_slots_for_edit_database
 from api.services.database.song import \
     get_breakpoints as get_breakpoints_database
-from api.services.files.demo_slot import get as get_demo_file
-from api.services.files.edit import create as create_edit_file
-from api.services.files.edit import get as get_edit_file
-from api.services.files.song import get as get_song_file
-from api.services.instagram.upload import upload as upload_instagram
-from api.sessions.database import get_database_session
+from api.services.files.audio_bed import path as get_audio_bed_file_path
+from api.services.files.demo_slot import path as get_demo_file_path
+from api.services.files.edit import location as get_edit_file_location
+from api.services.files.edit import path as get_edit_file_path
+from api.services.files.edit import remove as remove_edit_file
+from api.services.files.edit_template import \
+    copy_to_edit as copy_edit_template_file
+from api.services.files.edit_template import \
+    create_from_path as create_edit_template_file_from_path
+from api.services.files.song import path as get_song_file_path
+from api.services.instagram.upload import \
+    upload_from_path as upload_instagram_from_path
+from api.sessions.database import (after_request_commit,
+                                   after_request_rollback,
+                                   get_database_session,
+                                   open_background_session,
+                                   release_database_session)
+from api.sessions.executor import run_database
 from api.sessions.files import BaseFileSessionManager, get_file_session
 from api.sessions.instagram import get_instagram_session
+from api.sessions.render import BaseRenderSessionManager, get_render_session
+from api.utils.database.create_uuid import create_uuid
 from api.utils.jwt import jwt
 from api.utils.media_manipulation.create_edit_video import create_edit_video
+from api.utils.media_manipulation.probe_media import probe_media_path
 from sqlalchemy.exc import NoResultFound
 
 logger = logging.getLogger("routes.edit")
@@ -38,19 +63,21 @@ router = APIRouter(
     prefix="/edit",
 )    
 
-@router.post("/", response_model=PostResponse, tags=["edit"])
+@router.post("/", response_model=PostResponse, status_code=202, tags=["edit"])
 def create_edit(
     request: PostRequest = Body(...),
     database_session: Session = Depends(get_database_session),
     file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session),
     authorization: str = Header(None)
 ):        
     user_id = jwt.read_jwt(authorization.replace("Bearer ", ""))
     groupid = request.groupid
+    song_id = request.song_id
     
     # create db edit
     new_edit = create_edit_database(
-        request.song_id, 
+        song_id, 
         user_id,
         groupid,
         request.edit_name,
@@ -58,37 +85,102 @@ def create_edit(
         video_src="",
         database_session=database_session
     )
+    edit_id = new_edit.edit_id
     
-    # get infos to create edit video
-    demo_video_bytes = get_demo_file(file_session)
-    song_audio_bytes = get_song_file(request.song_id, file_session)
-    breakpoints = get_breakpoints_database(request.song_id, database_session)
-
-    # creating video
-    edit_video_bytes = create_edit_video(
-        demo_video_bytes,
-        "mp4",
-        song_audio_bytes,
-        "mp3",
-        breakpoints,
-        "mp4"
-    )
-
-    # save video, obtain link
-    edit_location = create_edit_file(
-        new_edit.edit_id, 
-        "mp4", 
-        edit_video_bytes, 
-        file_session
-    )
-
-    # Update the edit with the new video link
-    updated_edit = edit_update_database(new_edit.edit_id, video_src=edit_location, database_session=database_session)
+    # Update the edit with the video link, the video itself is rendered in the background
+    edit_location = get_edit_file_location(edit_id, "mp4", file_session)
+    updated_edit = edit_update_database(edit_id, video_src=edit_location, database_session=database_session)
+    
+    # Every new edit of a song starts as the same placeholder video, copy it if it was rendered before
+    try:
+        copy_edit_template_file(song_id, edit_id, file_session)
+        logger.info(f"create_edit(): Copied edit template of song {song_id}")
+        # the edit row disappears with a rollback, its video must not stay behind
+        after_request_rollback(database_session, lambda: remove_edit_file(edit_id, file_session))
+        job_id = None
+        try:
+            with get_edit_file_path(edit_id, file_session=file_session) as edit_video_path:
+                updated_edit = update_edit_media_metadata(edit_id, probe_media_path(edit_video_path), os.path.getsize(edit_video_path), database_session)
+        except MediaManipulationError as e:
+            # the metadata is only a cache, backfill_media_metadata can fill it in later
+            logger.warning(f"create_edit(): Could not probe edit template of song {song_id}: {e}")
+    except (FileNotFoundInSessionError, DirectoryNotFoundError):
+        logger.info(f"create_edit(): No edit template for song {song_id}, rendering")
+        breakpoints = get_breakpoints_database(song_id, database_session)
+
+        # provide the demo clip and the audio as files, once the job starts
+        @contextmanager
+        def prepare():
+            with ExitStack() as input_files:
+                demo_video_path = input_files.enter_context(get_demo_file_path(file_session))
+                try:
+                    audio_path = input_files.enter_context(get_audio_bed_file_path(song_id, file_session))
+                    audio_bed = True
+                except (FileNotFoundInSessionError, DirectoryNotFoundError):
+                    # songs uploaded before the audio ingest have no audio bed
+                    audio_path = input_files.enter_context(get_song_file_path(song_id, file_session))
+                    audio_bed = False
+                yield (Path(demo_video_path), Path(audio_path), breakpoints, audio_bed)
+
+        # move the video into the templates for the next edits of this song and copy it for this edit
+        def finalize(edit_video_path: str):
+            edit_media_info = probe_media_path(edit_video_path)
+            edit_byte_size = os.path.getsize(edit_video_path)
+            try:
+                create_edit_template_file_from_path(song_id, "mp4", edit_video_path, file_session)
+            except FileExistsInSessionError:
+                pass
+            copy_edit_template_file(song_id, edit_id, file_session)
+
+            # the request session is closed by now
+            with open_background_session(database_session) as job_database_session:
+                update_edit_media_metadata(edit_id, edit_media_info, edit_byte_size, job_database_session)
+
+        # the job needs the committed edit row, it is only queued once the request commits
+        job_id = create_uuid()
+        after_request_commit(database_session, lambda: render_session.submit(edit_id, prepare, create_edit_video, finalize, job_id=job_id))
         
-    return updated_edit
+    return {
+        "edit_id": updated_edit.edit_id,
+        "song_id": updated_edit.song_id,
+        "group_id": updated_edit.group_id,
+        "created_by": updated_edit.created_by,
+        "name": updated_edit.name,
+        "isLive": updated_edit.isLive,
+        "video_src": updated_edit.video_src,
+        "job_id": job_id
+    }
         
 @router.get("/{edit_id}", response_model=GetEditResponse, tags=["edit"])
 async def get_edit_details(edit_id: int, database_session: Session = Depends(get_database_session)):
+    # creator und user werden beim Zugriff nachgeladen, deshalb läuft die ganze Antwort im Datenbank-Pool
+    return await run_database(_get_edit_details, edit_id, database_session)
+
+@router.post("/{edit_id}/goLive", response_model=GoLiveResponse, tags=["edit"])
+def go_live(edit_id: int, database_session: Session = Depends(get_database_session), file_session: BaseFileSessionManager = Depends(get_file_session), instagram_session = Depends(get_instagram_session)):
+    
+    # check if all slots are belegt 
+    if not are_all_slots_occupied_edit_database(edit_id, database_session=database_session):
+        raise HTTPException(status_code=422, detail="Edit not upload ready, occupie all slots")
+
+    # keine verbindung halten, solange der upload läuft
+    release_database_session(database_session)
+    
+    # lade das edit video direkt aus der datei hoch, ohne es in den speicher zu lesen
+    with get_edit_file_path(edit_id, file_session=file_session) as edit_video_path:
+        upload_instagram_from_path(edit_video_path, "mp4", "was geht ab instagram", instagram_session)
+    
+    # datenbank live setzen
+    set_is_live_edit_database(edit_id, database_session=database_session)
+    
+    return {"message": "Auf instagram hochgeladen!"}
+       
+@router.delete("/{edit_id}", response_model=DeleteEditResponse, tags=["edit"])
+async def delete_edit(edit_id: int, database_session: Session = Depends(get_database_session)):
+    await run_database(remove_edit_database, edit_id, database_session=database_session)
+    return {"message" : "Deleted Successfully"}
+
+def _get_edit_details(edit_id: int, database_session: Session) -> dict:
     # Abrufen des Edits aus der Datenbank
     edit = get_edit_database(edit_id, database_session=database_session)
     
@@ -160,26 +252,3 @@ async def get_edit_details(edit_id: int, database_session: Session = Depends(get
         "edit": edit_info,
         "slots": slot_response
     }
-
-@router.post("/{edit_id}/goLive", response_model=GoLiveResponse, tags=["edit"])
-def go_live(edit_id: int, database_session: Session = Depends(get_database_session), file_session: BaseFileSessionManager = Depends(get_file_session), instagram_session = Depends(get_instagram_session)):
-    
-    # check if all slots are belegt 
-    if not are_all_slots_occupied_edit_database(edit_id, database_session=database_session):
-        raise HTTPException(status_code=422, detail="Edit not upload ready, occupie all slots")
-    
-    # nehme edit video 
-    edit_file = get_edit_file(edit_id, file_session=file_session)
-
-    # lade es hoch
-    upload_instagram(edit_file, "mp4", "was geht ab instagram", instagram_session)
-    
-    # datenbank live setzen
-    set_is_live_edit_database(edit_id, database_session=database_session)
-    
-    return {"message": "Auf instagram hochgeladen!"}
-       
-@router.delete("/{edit_id}", response_model=DeleteEditResponse, tags=["edit"])
-async def delete_edit(edit_id: int, database_session: Session = Depends(get_database_session)):
-    remove_edit_database(edit_id, database_session=database_session)
-    return {"message" : "Deleted Successfully"}
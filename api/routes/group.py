@@ -17,6 +17,7 @@ from api.services.database.group import remove as remove_group_database
 from api.services.database.user import create as create_user_database
 from api.services.database.user import get as get_user_database
 from api.sessions.database import get_database_session
+from api.sessions.executor import run_database
 from api.utils.jwt.jwt import create_jwt, read_jwt
 
 logger = logging.getLogger("routes.group")
@@ -28,10 +29,11 @@ router = APIRouter(
 @router.post("/", response_model=PostResponse, tags=["group"])
 async def create(request: PostRequest = Body(...), database_session: Session = Depends(get_database_session)): 
     # Erstelle die Gruppe
-    new_group = create_group_database(name=request.groupname, database_session=database_session)
+    new_group = await run_database(create_group_database, name=request.groupname, database_session=database_session)
 
     # Erstelle einen neuen Benutzer mit den übergebenen Daten
-    new_user = create_user_database(
+    new_user = await run_database(
+        create_user_database,
         group_id=new_group.group_id,  # group_id der neu erstellten Gruppe verwenden
         role="creator",
         name=request.username,
@@ -51,25 +53,25 @@ async def create(request: PostRequest = Body(...), database_session: Session = D
 @router.delete("/{group_id}", response_model=DeleteResponse, tags=["group"])
 async def delete(group_id: str, database_session: Session = Depends(get_database_session)):
     # Überprüfen, ob die Gruppe existiert und entfernen
-    remove_group_database(group_id, database_session)
+    await run_database(remove_group_database, group_id, database_session)
 
     return {"message" : "Group successfully deleted"}
 
 @router.get("/{group_id}/name", response_model=GroupNameResponse, tags=["group"])
 async def group_name(group_id: str, database_session: Session = Depends(get_database_session)):
-    group = get_group_database(group_id=group_id, database_session=database_session)
+    group = await run_database(get_group_database, group_id=group_id, database_session=database_session)
 
     return {"name":group.name}
 
 @router.get("/{group_id}", response_model=GetResponse, tags=["group"])
 async def get(group_id: str, authorization: str = Header(None), database_session: Session = Depends(get_database_session)):
     # group infos
-    group = get_group_database(group_id=group_id, database_session=database_session)
-    group_creator = get_group_creator(group_id=group_id, database_session=database_session)
+    group = await run_database(get_group_database, group_id=group_id, database_session=database_session)
+    group_creator = await run_database(get_group_creator, group_id=group_id, database_session=database_session)
     
     # user infos
     user_id = read_jwt(authorization.replace("Bearer ", ""))
-    user = get_user_database(user_id, database_session=database_session)
+    user = await run_database(get_user_database, user_id, database_session=database_session)
 
     return {
         "user": {
@@ -85,7 +87,7 @@ async def get(group_id: str, authorization: str = Header(None), database_session
 
 @router.get("/{group_id}/members", response_model=GetMembersResponse, tags=["group"])
 async def get_group_members(group_id: str, database_session: Session = Depends(get_database_session)):
-    members = list_members_group_database(group_id, database_session=database_session)
+    members = await run_database(list_members_group_database, group_id, database_session=database_session)
     return {        
         "members": [
             {
@@ -99,8 +101,8 @@ async def get_group_members(group_id: str, database_session: Session = Depends(g
 
 @router.get("/{group_id}/edits", response_model=GetEditsResponse, tags=["group"])
 async def get_group_edits(group_id: str, database_session: Session = Depends(get_database_session)):
-    edits = get_edits_by_group_database(group_id, database_session=database_session)
-    
+    edits = await run_database(get_edits_by_group_database, group_id, database_session=database_session)
+    creators = [await run_database(get_user_database, edit.created_by, database_session) for edit in edits]
     
     response_edits = [
         {
@@ -113,8 +115,7 @@ async def get_group_edits(group_id: str, database_session: Session = Depends(get
             "name": edit.name,
             "isLive": edit.isLive
         }
-        for edit in edits
-        for user in [get_user_database(edit.created_by, database_session)]
+        for edit, user in zip(edits, creators)
     ]
     
     return {"edits": response_edits}
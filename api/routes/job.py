@@ -0,0 +1,26 @@
+import logging
+
+from fastapi import APIRouter, Depends
+
+from api.exceptions.sessions.render import RenderJobNotFoundError
+from api.models.schema.job import GetJobResponse
+from api.sessions.render import BaseRenderSessionManager, get_render_session
+
+logger = logging.getLogger("routes.job")
+
+router = APIRouter(
+    prefix="/job",
+)    
+
+@router.get("/{job_id}", response_model=GetJobResponse, tags=["job"])
+async def get_job(job_id: str, editid: int, render_session: BaseRenderSessionManager = Depends(get_render_session)):
+    # the access handler checks the group membership via ?editid=, the job has to belong to that edit
+    job = render_session.get(job_id)
+    if job.edit_id != editid:
+        raise RenderJobNotFoundError(f"Render job '{job_id}' not found")
+    return {
+        "job_id": job.job_id,
+        "edit_id": job.edit_id,
+        "status": job.status,
+        "error": job.error
+    }
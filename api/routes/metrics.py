@@ -0,0 +1,35 @@
+import logging
+
+from fastapi import APIRouter, Depends
+
+from api.sessions.database import get_database_pool_stats
+from api.sessions.executor import ExecutorSessionManager, get_executor_session
+from api.sessions.files import (BaseFileSessionManager,
+                                CachingFileSessionManager,
+                                HotFileSessionManager, get_file_session)
+from api.sessions.render import BaseRenderSessionManager, get_render_session
+
+logger = logging.getLogger("routes.metrics")
+
+router = APIRouter(
+    prefix="/metrics",
+)
+
+@router.get("/", tags=["metrics"])
+async def get_metrics(
+    executor_session: ExecutorSessionManager = Depends(get_executor_session),
+    file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session)
+):
+    # Walk the cache layers around the file storage, e.g. Hot(Caching(Remote))
+    file_caches = {}
+    while isinstance(file_session, (HotFileSessionManager, CachingFileSessionManager)):
+        file_caches["memory" if isinstance(file_session, HotFileSessionManager) else "disk"] = file_session.stats()
+        file_session = file_session.backend
+
+    return {
+        "executors": executor_session.stats(),
+        "database_pool": get_database_pool_stats(),
+        "render_cache": render_session.render_cache.stats() if render_session.render_cache is not None else None,
+        "file_caches": file_caches
+    }
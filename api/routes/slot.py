@@ -1,16 +1,27 @@
 
 
-from io import BytesIO
 import logging
+import os
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, ContextManager, Iterator
 
 from fastapi import APIRouter, Depends, Header, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import NoResultFound
 
+from api.config.media import media_config
 from api.models.schema.slot import (AddSlotRequest, AddSlotResponse,
                                     ChangeSlotRequest, ChangeSlotResponse,
                                     DeleteSlotResponse, PreviewSlotRequest)
+from api.services.database.media_metadata import \
+    get_edit as get_edit_media_metadata
+from api.services.database.media_metadata import \
+    update_edit as update_edit_media_metadata
+from api.services.database.media_metadata import \
+    update_occupied_slot as update_occupied_slot_media_metadata
 from api.services.database.occupied_slot import \
     create as create_occupied_slot_service
 from api.services.database.occupied_slot import \
@@ -23,24 +34,49 @@ from api.services.database.occupied_slot import \
 from api.services.database.occupied_slot import \
     update as update_occupied_slot_database
 from api.services.database.song import get_earliest_slot_start_time
-from api.services.files.demo_slot import get as get_demo_file
+from api.services.files.demo_slot import path as get_demo_file_path
 from api.services.database.slot import \
     get_slot_by_occupied_slot_id as get_slot_by_occupied_slot_id_database
 from api.services.database.slot import get as get_slot_database
-from api.services.files.edit import get as get_edit_file
-from api.services.files.edit import update as update_edit_file
+from api.services.files.edit import path as get_edit_file_path
+from api.services.files.edit import \
+    update_from_path as update_edit_file_from_path
 from api.services.files.occupied_slot import \
-    create as create_occupied_slot_file
+    create_from_upload as create_occupied_slot_file_from_upload
+from api.services.files.occupied_slot import \
+    path as get_occupied_slot_file_path
 from api.services.files.occupied_slot import \
     remove as remove_occupied_slot_file
 from api.services.files.occupied_slot import \
-    update as update_occupied_slot_file
-from api.sessions.database import get_database_session
+    update_from_path as update_occupied_slot_file_from_path
+from api.services.files.upload import copy_from as backup_upload_file
+from api.services.files.upload import \
+    create_from_path as create_upload_file_from_path
+from api.services.files.upload import remove as remove_upload_file
+from api.services.files.normalized_occupied_slot import \
+    path as get_normalized_occupied_slot_file_path
+from api.services.files.normalized_occupied_slot import \
+    remove as remove_normalized_occupied_slot_file
+from api.services.files.normalized_occupied_slot import \
+    save_from_path as save_normalized_occupied_slot_file_from_path
+from api.sessions.database import (after_request_commit,
+                                   after_request_rollback,
+                                   get_database_session,
+                                   open_background_session,
+                                   release_database_session)
+from api.sessions.executor import run_database, run_io, run_media
 from api.sessions.files import BaseFileSessionManager, get_file_session
+from api.sessions.render import BaseRenderSessionManager, get_render_session
+from api.utils.database.create_uuid import create_uuid
 from api.utils.files.file_validation import file_validation
+from api.utils.files.save_upload_file import save_upload_file
+from api.utils.files.temporary_file_path import temporary_file_path
 from api.utils.jwt import jwt
-from api.utils.media_manipulation.swap_slot_in_edit_video import \
-    swap_slot_in_edit
+from api.utils.media_manipulation.normalize_clip import normalize_clip
+from api.utils.media_manipulation.probe_media import probe_media_path
+from api.utils.media_manipulation.run_ffmpeg import FFmpegStream
+from api.utils.media_manipulation.swap_slot_in_edit_video import (
+    stream_swap_slot_in_edit, swap_slot_in_edit)
 from mock.database import data
 
 logger = logging.getLogger("routes.slot")
@@ -51,19 +87,20 @@ router = APIRouter(
     prefix="/edit",
 )    
 
-@router.delete("/{edit_id}/slot/{occupied_slot_id}", response_model=DeleteSlotResponse,  tags=["edit"])
+@router.delete("/{edit_id}/slot/{occupied_slot_id}", response_model=DeleteSlotResponse, status_code=202, tags=["edit"])
 async def delete_slot(
     edit_id: int,
     occupied_slot_id: int,
     authorization: str = Header(None), 
     database_session: Session = Depends(get_database_session), 
-    file_session: BaseFileSessionManager = Depends(get_file_session)
+    file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session)
 ):
     
     # optain information
     user_id = jwt.read_jwt(authorization.replace("Bearer ", ""))
-    occupied_slot = get_occupied_slot_database(occupied_slot_id, database_session=database_session)
-    slot = get_slot_by_occupied_slot_id_database(occupied_slot_id, database_session=database_session)
+    occupied_slot = await run_database(get_occupied_slot_database, occupied_slot_id, database_session=database_session)
+    slot = await run_database(get_slot_by_occupied_slot_id_database, occupied_slot_id, database_session=database_session)
     
 
     # IMPORTANT, you can only delete your own slot
@@ -75,74 +112,77 @@ async def delete_slot(
     if edit_id != occupied_slot.edit_id:
         raise HTTPException(status_code=403, detail=f"Edit has not occupied slot with id {edit_id}")
     
-    # remove assets in db and files
-    remove_occupied_slot_database(occupied_slot.occupied_slot_id, database_session)
-    remove_occupied_slot_file(occupied_slot.occupied_slot_id, file_session)
-    
-    # demo file
-    demo_video_bytes = get_demo_file(file_session)
-    old_edit_file = get_edit_file(edit_id, file_session=file_session)
-    
+    # remove assets in db, the files only once the delete is committed (a rollback keeps the clip)
+    await run_database(remove_occupied_slot_database, occupied_slot.occupied_slot_id, database_session)
+    after_request_commit(database_session, lambda: remove_occupied_slot_file(occupied_slot_id, file_session))
+    after_request_commit(database_session, lambda: remove_normalized_occupied_slot_file(occupied_slot_id, file_session))
     
     #transform slot from song scope to edit scope
-    earliest_start_time = get_earliest_slot_start_time_by_edit(edit_id, database_session)
+    earliest_start_time = await run_database(get_earliest_slot_start_time_by_edit, edit_id, database_session)
     new_start_time = slot.start_time - earliest_start_time
     new_end_time = slot.end_time - earliest_start_time
 
-    # create new edit with demo slot
-    new_edit_file = swap_slot_in_edit(
-        old_edit_file,
+    # create new edit with demo slot in the background
+    job_id = _submit_swap(
+        edit_id,
+        slot.slot_id,
         new_start_time,
         new_end_time,
-        "mp4",
-        
-        demo_video_bytes,
+        lambda: get_demo_file_path(file_session),
         0,
         slot.end_time - slot.start_time,
-        "mp4",
-        
-        "mp4"
+        file_session,
+        render_session,
+        database_session
     )
     
-    # updateing file
-    update_edit_file(edit_id, new_edit_file, file_session=file_session)
-    
-    return {"message": "Successfull delete"}
+    return {"message": "Successfull delete", "job_id": job_id}
 
-@router.post("/{edit_id}/slot/{slot_id}", response_model=AddSlotResponse, tags=["edit"])
+@router.post("/{edit_id}/slot/{slot_id}", response_model=AddSlotResponse, status_code=202, tags=["edit"])
 async def post_slot(
     slot_id: int,
     edit_id: int,
     authorization: str = Header(None), 
     request: AddSlotRequest = Depends(), 
     database_session: Session = Depends(get_database_session), 
-    file_session: BaseFileSessionManager = Depends(get_file_session)
+    file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session)
 ):
     
     # Extract user_id from JWT token
     user_id = jwt.read_jwt(authorization.replace("Bearer ", ""))
     
+    # Validate the new video clip
+    validated_video_file = file_validation(request.video_file, "video")
+    clip_extension = validated_video_file.filename.split(".")[-1]
+
+    # The upload is copied in chunks, probed and stored before the first statement, no connection is held meanwhile.
+    # After the insert it is only moved to its place, so the request still commits once
+    upload_id = create_uuid()
+    with temporary_file_path(clip_extension) as upload_path:
+        clip_byte_size = await run_io(save_upload_file, validated_video_file, upload_path)
+        clip_media_info = await run_media(probe_media_path, upload_path)
+        await run_io(create_upload_file_from_path, upload_id, "mp4", upload_path, file_session)
+    after_request_rollback(database_session, lambda: remove_upload_file(upload_id, file_session))
+
     # Check if the slot is already occupied
     try:
-        if is_slot_occupied_database(slot_id, edit_id, database_session=database_session):
+        if await run_database(is_slot_occupied_database, slot_id, edit_id, database_session=database_session):
 
             raise HTTPException(status_code=403, detail="Slot ist schon belegt")
     except NoResultFound:
         pass
     
     # Get slot details from database
-    slot = get_slot_database(slot_id, database_session=database_session)
+    slot = await run_database(get_slot_database, slot_id, database_session=database_session)
     
     # Check if the slot length is the same
     if abs((slot.end_time - slot.start_time) - (request.end_time - request.start_time)) > 0.01:
         raise HTTPException(status_code=422, detail="Slot länge muss die gleiche sein")
-    
-    # Validate the new video clip
-    validated_video_file = file_validation(request.video_file, "video")
-    validate_video_file_bytes = await validated_video_file.read()
 
     # Create a new database entry for the occupied slot
-    new_occupied_slot = create_occupied_slot_service(
+    new_occupied_slot = await run_database(
+        create_occupied_slot_service,
         user_id,
         slot_id,
         edit_id,
@@ -151,118 +191,131 @@ async def post_slot(
         video_src="",
         database_session=database_session
     )
-    
-    # Save the file to the occupied slot
-    video_location = create_occupied_slot_file(
-        new_occupied_slot.occupied_slot_id, 
-        "mp4", 
-        validate_video_file_bytes, 
-        file_session=file_session
-    )
+    occupied_slot_id = new_occupied_slot.occupied_slot_id
+
+    # Move the clip to the occupied slot, a rename (local) or a copy on the server (S3)
+    video_location = await run_io(create_occupied_slot_file_from_upload, occupied_slot_id, upload_id, file_session)
+    # The occupied slot is gone after a rollback, so is its clip
+    after_request_rollback(database_session, lambda: remove_occupied_slot_file(occupied_slot_id, file_session))
 
     # Update the database with video source
-    update_occupied_slot_database(occupied_slot_id=new_occupied_slot.occupied_slot_id, database_session=database_session, video_src=video_location) 
+    await run_database(update_occupied_slot_database, occupied_slot_id=new_occupied_slot.occupied_slot_id, database_session=database_session, video_src=video_location) 
+
+    # Store the probed metadata of the uploaded clip
+    await run_database(update_occupied_slot_media_metadata, new_occupied_slot.occupied_slot_id, clip_media_info, clip_byte_size, database_session)
 
-    # Retrieve the existing edit file
-    old_edit_file = get_edit_file(edit_id, file_session=file_session)
-    
     #transform slot from song scope to edit scope
-    earliest_start_time = get_earliest_slot_start_time_by_edit(edit_id, database_session)
+    earliest_start_time = await run_database(get_earliest_slot_start_time_by_edit, edit_id, database_session)
     new_start_time = slot.start_time - earliest_start_time
     new_end_time = slot.end_time - earliest_start_time
 
-    # Swap the old clip with the new one in the edit
-    new_edit_file = swap_slot_in_edit(
-        old_edit_file,
+    # Normalize the clip once and swap it into the edit, in the background
+    clip_start_time = new_occupied_slot.start_time
+    clip_end_time = new_occupied_slot.end_time
+    job_id = _submit_swap(
+        edit_id,
+        slot.slot_id,
         new_start_time,
         new_end_time,
-        "mp4",
-        validate_video_file_bytes,
-        new_occupied_slot.start_time,
-        new_occupied_slot.end_time,
-        "mp4",
-        "mp4"
+        lambda: _ingest_clip(occupied_slot_id, clip_start_time, clip_end_time, file_session),
+        0,
+        clip_end_time - clip_start_time,
+        file_session,
+        render_session,
+        database_session
     )
-    logger.debug(f"Slot swapped successfully in the edit file")
-
-    # Save the new edit file
-    update_edit_file(edit_id, new_edit_file, file_session=file_session)
 
-    return {"message": "Successful post"}
+    return {"message": "Successful post", "job_id": job_id}
 
-@router.put("/{edit_id}/slot/{occupied_slot_id}", response_model=ChangeSlotResponse,  tags=["edit"])
+@router.put("/{edit_id}/slot/{occupied_slot_id}", response_model=ChangeSlotResponse, status_code=202, tags=["edit"])
 async def put_slot(
     edit_id: int,
     occupied_slot_id: int,
     authorization: str = Header(None), 
     request: ChangeSlotRequest = Depends(), 
     database_session: Session = Depends(get_database_session), 
-    file_session: BaseFileSessionManager = Depends(get_file_session)
+    file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session)
 ):
     # optain information
     user_id = jwt.read_jwt(authorization.replace("Bearer ", ""))
-    occupied_slot = get_occupied_slot_database(occupied_slot_id, database_session=database_session)
-    
-    # IMPORTANT, you can only change your own slot
-    if user_id != occupied_slot.user_id:
-        raise HTTPException(status_code=403, detail="Slot not yours")
-    
-    # Eigentlich egal, da edit id nur für die authorisierung genutzt wird ob wir group member sind
-    # Es würde bei jeder edit id funktionieren, die NUR in der gruppe ist
-    if edit_id != occupied_slot.edit_id:
-        raise HTTPException(status_code=403, detail=f"Edit has not occupied slot with id {edit_id}")
-    
-    # start und endzeit von slot
-    slot = get_slot_by_occupied_slot_id_database(occupied_slot.occupied_slot_id, database_session=database_session)
-    
-    logger.debug(slot.start_time)
-    logger.debug(slot.end_time)
-    logger.debug(request.start_time)
-    logger.debug(request.end_time)
-    logger.debug((slot.end_time - slot.start_time) - (request.end_time - request.start_time))
-    
-    if abs((slot.end_time - slot.start_time) - (request.end_time - request.start_time)) > 0.01:
-        raise HTTPException(status_code=422, detail="Slot länge muss die gleiche sein")
+
+    with ExitStack() as upload_files:
+        # neuen clip vor dem ersten statement stückweise kopieren und prüfen, solange wird keine verbindung gehalten
+        upload_path = None
+        if request.video_file != None:
+            validated_video_file = file_validation(request.video_file, "video")
+            upload_path = upload_files.enter_context(temporary_file_path(validated_video_file.filename.split(".")[-1]))
+            clip_byte_size = await run_io(save_upload_file, validated_video_file, upload_path)
+            clip_media_info = await run_media(probe_media_path, upload_path)
+
+        occupied_slot = await run_database(get_occupied_slot_database, occupied_slot_id, database_session=database_session)
+        
+        # IMPORTANT, you can only change your own slot
+        if user_id != occupied_slot.user_id:
+            raise HTTPException(status_code=403, detail="Slot not yours")
+        
+        # Eigentlich egal, da edit id nur für die authorisierung genutzt wird ob wir group member sind
+        # Es würde bei jeder edit id funktionieren, die NUR in der gruppe ist
+        if edit_id != occupied_slot.edit_id:
+            raise HTTPException(status_code=403, detail=f"Edit has not occupied slot with id {edit_id}")
+        
+        # start und endzeit von slot
+        slot = await run_database(get_slot_by_occupied_slot_id_database, occupied_slot.occupied_slot_id, database_session=database_session)
+        
+        logger.debug(slot.start_time)
+        logger.debug(slot.end_time)
+        logger.debug(request.start_time)
+        logger.debug(request.end_time)
+        logger.debug((slot.end_time - slot.start_time) - (request.end_time - request.start_time))
+        
+        if abs((slot.end_time - slot.start_time) - (request.end_time - request.start_time)) > 0.01:
+            raise HTTPException(status_code=422, detail="Slot länge muss die gleiche sein")
+
+        # file updaten: bisher nur gelesen, also ohne verbindung und zeilensperren in den dateispeicher schreiben (S3-Upload)
+        if upload_path is not None:
+            await run_database(release_database_session, database_session)
+
+            # der alte clip wird vorher gesichert (auf dem server kopiert) und zurückgeholt, falls der request nicht committet
+            backup_id = create_uuid()
+            await run_io(backup_upload_file, str(occupied_slot_id), "occupied_slots", backup_id, file_session)
+            after_request_commit(database_session, lambda: remove_upload_file(backup_id, file_session))
+            after_request_rollback(database_session, lambda: _restore_occupied_slot_file(occupied_slot_id, backup_id, file_session))
+            await run_io(update_occupied_slot_file_from_path, occupied_slot.occupied_slot_id, upload_path, file_session=file_session)
     
     # update occupied slot
-    new_occupied_slot = update_occupied_slot_database(occupied_slot_id, start_time=request.start_time, end_time=request.end_time, database_session=database_session)
+    new_occupied_slot = await run_database(update_occupied_slot_database, occupied_slot_id, start_time=request.start_time, end_time=request.end_time, database_session=database_session)
     
     # change video also ? 
-    if request.video_file != None:
-        # validate new video clip
-        validated_video_file = file_validation(request.video_file, "video")
-        validate_video_file_bytes = await validated_video_file.read()
-                
-        # edit neu erstellen und abspeicher
-        old_edit_file = get_edit_file(edit_id, file_session=file_session)
+    job_id = None
+    if upload_path is not None:
+        await run_database(update_occupied_slot_media_metadata, occupied_slot.occupied_slot_id, clip_media_info, clip_byte_size, database_session)
         
         #transform slot from song scope to edit scope
-        earliest_start_time = get_earliest_slot_start_time_by_edit(edit_id, database_session)
+        earliest_start_time = await run_database(get_earliest_slot_start_time_by_edit, edit_id, database_session)
         new_start_time = slot.start_time - earliest_start_time
         new_end_time = slot.end_time - earliest_start_time
     
-        new_edit_file = swap_slot_in_edit(
-            old_edit_file,
+        # clip normalisieren, edit neu erstellen und abspeichern, im Hintergrund
+        clip_start_time = new_occupied_slot.start_time
+        clip_end_time = new_occupied_slot.end_time
+        job_id = _submit_swap(
+            edit_id,
+            slot.slot_id,
             new_start_time,
             new_end_time,
-            "mp4",
-            
-            validate_video_file_bytes,
-            new_occupied_slot.start_time,
-            new_occupied_slot.end_time,
-            "mp4",
-            
-            "mp4"
+            lambda: _ingest_clip(occupied_slot_id, clip_start_time, clip_end_time, file_session),
+            0,
+            clip_end_time - clip_start_time,
+            file_session,
+            render_session,
+            database_session
         )
-
-        # neues edit abspeichern
-        update_edit_file(edit_id, new_edit_file, file_session=file_session)
-
-        # file updaten
-        update_occupied_slot_file(occupied_slot.occupied_slot_id, validate_video_file_bytes, file_session=file_session)
+    else:
+        # der normalisierte clip passt nicht mehr zu start und ende
+        await run_io(remove_normalized_occupied_slot_file, occupied_slot_id, file_session)
     
-    
-    return {"message": "Successfull swap"}
+    return {"message": "Successfull swap", "job_id": job_id}
 
 @router.post("/{edit_id}/slot/{slot_id}/preview", tags=["edit"])
 async def put_slot(
@@ -270,16 +323,17 @@ async def put_slot(
     slot_id: int,
     request: PreviewSlotRequest = Depends(), 
     database_session: Session = Depends(get_database_session), 
-    file_session: BaseFileSessionManager = Depends(get_file_session)
+    file_session: BaseFileSessionManager = Depends(get_file_session),
+    render_session: BaseRenderSessionManager = Depends(get_render_session)
 ):
     # slot is free ? 
     try :
-        if is_slot_occupied_database(slot_id, edit_id, database_session=database_session):
+        if await run_database(is_slot_occupied_database, slot_id, edit_id, database_session=database_session):
             raise HTTPException(status_code=403, detail="Slot ist schon belegt")
     except NoResultFound:
         pass
        
-    slot = get_slot_database(slot_id, database_session=database_session)
+    slot = await run_database(get_slot_database, slot_id, database_session=database_session)
     
     logger.debug(slot.start_time)
     logger.debug(slot.end_time)
@@ -292,36 +346,133 @@ async def put_slot(
         
     # validate new video clip
     validated_video_file = file_validation(request.video_file, "video")
-    validate_video_file_bytes = await validated_video_file.read()
     
-    # edit neu erstellen und abspeicher
-    old_edit_file = get_edit_file(edit_id, file_session=file_session)
+    edit_media_info = await run_database(get_edit_media_metadata, edit_id, database_session)
+    edit_duration = edit_media_info.duration if edit_media_info is not None else None
     
     #transform slot from song scope to edit scope
-    earliest_start_time = get_earliest_slot_start_time_by_edit(edit_id, database_session)
+    earliest_start_time = await run_database(get_earliest_slot_start_time_by_edit, edit_id, database_session)
     new_start_time = slot.start_time - earliest_start_time
     new_end_time = slot.end_time - earliest_start_time
-    
-    # schreibe den neuen clip in das vorhandene edit
-    new_edit_file = swap_slot_in_edit(
-        old_edit_file,
-        new_start_time,
-        new_end_time,
-        "mp4",
-        validate_video_file_bytes,
-        request.start_time,
-        request.end_time,
-        "mp4",
-        "mp4"
-    )
-    
-    # Create a BytesIO object to hold the video bytes for streaming
-    new_edit_bytes_io = BytesIO(new_edit_file)
+
+    # die vorschau liest nur, die verbindung wird während ffmpeg nicht gebraucht
+    await run_database(release_database_session, database_session)
 
     # Return the new edit file as a video stream with appropriate headers
     headers = {
         'Content-Disposition': 'attachment; filename="edited_video.mp4"'
     }
 
-    return StreamingResponse(new_edit_bytes_io, media_type="video/mp4", headers=headers)
+    # edit und clip liegen als dateien vor, bis die vorschau ausgeliefert ist
+    preview_files = ExitStack()
+    try:
+        # bei einem entfernten dateispeicher wird das edit dabei heruntergeladen
+        old_edit_path = await run_io(preview_files.enter_context, get_edit_file_path(edit_id, file_session=file_session))
+        clip_path = preview_files.enter_context(temporary_file_path(validated_video_file.filename.split(".")[-1]))
+        await run_io(save_upload_file, validated_video_file, clip_path)
+
+        preview_options = ("preview", media_config["preview_context_seconds"], edit_duration)
+
+        # rendere nur den slot mit etwas kontext davor und danach, in niedriger auflösung
+        if media_config["engine"] == "ffmpeg":
+            # fragmentiertes mp4 wird ausgeliefert, während ffmpeg noch encodiert
+            # (startet nur den ffmpeg-Prozess, die Pipe bleibt in diesem Prozess, daher der Ein-/Ausgabe-Pool)
+            preview_stream = await run_io(
+                stream_swap_slot_in_edit,
+                old_edit_path, new_start_time, new_end_time,
+                clip_path, request.start_time, request.end_time,
+                *preview_options,
+                preview_files.close
+            )
+            return StreamingResponse(_iterate_ffmpeg_stream(preview_stream), media_type="video/mp4", headers=headers)
+
+        # moviepy kann nicht in eine pipe schreiben (wiederholte vorschauen kommen aus dem render cache)
+        preview_path = preview_files.enter_context(temporary_file_path("mp4"))
+        # die Render-Session rendert selbst in ihrem Prozess-Pool, hier wird nur gewartet
+        await run_io(render_session.render, swap_slot_in_edit, (
+            Path(old_edit_path), new_start_time, new_end_time,
+            Path(clip_path), request.start_time, request.end_time,
+            *preview_options
+        ), preview_path)
+        return FileResponse(preview_path, media_type="video/mp4", headers=headers, background=BackgroundTask(preview_files.close))
+
+    except BaseException:
+        await run_io(preview_files.close)
+        raise
+
+
+async def _iterate_ffmpeg_stream(stream: FFmpegStream) -> AsyncIterator[bytes]:
+    """
+    Liest den ffmpeg-Stream im Ein-/Ausgabe-Pool. Bricht der Client ab, wird die Response abgebrochen
+    und ffmpeg im finally beendet, statt die Vorschau ungesehen zu Ende zu rendern.
+    """
+    chunks = iter(stream)
+    try:
+        while (chunk := await run_io(next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        stream.close()
+
+
+@contextmanager
+def _ingest_clip(occupied_slot_id: int, clip_start_time: float, clip_end_time: float, file_session: BaseFileSessionManager) -> Iterator[str]:
+    """Normalisiert den verwendeten Abschnitt des Clips einmal auf das Render-Format, speichert ihn neben dem Original und stellt ihn als Pfad bereit."""
+    with get_occupied_slot_file_path(occupied_slot_id, file_session) as clip_path, temporary_file_path("mp4") as normalized_clip_path:
+        normalize_clip(clip_path, clip_start_time, clip_end_time, normalized_clip_path)
+        save_normalized_occupied_slot_file_from_path(occupied_slot_id, "mp4", normalized_clip_path, file_session=file_session)
+
+    with get_normalized_occupied_slot_file_path(occupied_slot_id, file_session) as normalized_clip_path:
+        yield normalized_clip_path
+
+def _restore_occupied_slot_file(occupied_slot_id: int, backup_id: str, file_session: BaseFileSessionManager) -> None:
+    """Holt den vor dem Ersetzen gesicherten Clip zurück, wenn der Request nicht committet."""
+    remove_occupied_slot_file(occupied_slot_id, file_session)
+    create_occupied_slot_file_from_upload(occupied_slot_id, backup_id, file_session)
+
+def _submit_swap(
+    edit_id: int,
+    slot_id: int,
+    edit_start_time: float,
+    edit_end_time: float,
+    get_clip_path: Callable[[], ContextManager[str]],
+    clip_start_time: float,
+    clip_end_time: float,
+    file_session: BaseFileSessionManager,
+    render_session: BaseRenderSessionManager,
+    database_session: Session
+) -> str:
+    """Reiht das Tauschen eines Slots im Edit nach dem Commit des Requests als Render-Job ein und gibt die Job-ID zurück."""
+
+    # Das Edit wird erst geöffnet, wenn der Job startet, damit vorherige Jobs desselben Edits enthalten sind
+    @contextmanager
+    def prepare():
+        # die session des requests ist dann schon geschlossen
+        with open_background_session(database_session) as job_database_session:
+            edit_media_info = get_edit_media_metadata(edit_id, job_database_session)
+
+        # nur pfade gehen an den worker, Path damit der render cache den inhalt vergleicht
+        with get_edit_file_path(edit_id, file_session=file_session) as old_edit_path, get_clip_path() as clip_path:
+            yield (
+                Path(old_edit_path),
+                edit_start_time,
+                edit_end_time,
+                Path(clip_path),
+                clip_start_time,
+                clip_end_time,
+                "reel",
+                None,
+                edit_media_info.duration if edit_media_info is not None else None
+            )
+
+    def finalize(new_edit_path: str):
+        new_edit_media_info = probe_media_path(new_edit_path)
+        new_edit_byte_size = os.path.getsize(new_edit_path)
+        update_edit_file_from_path(edit_id, new_edit_path, file_session=file_session)
+        with open_background_session(database_session) as job_database_session:
+            update_edit_media_metadata(edit_id, new_edit_media_info, new_edit_byte_size, job_database_session)
+        logger.debug(f"Slot {slot_id} swapped successfully in edit {edit_id}")
 
+    # Ein neuerer Job für denselben Slot macht einen noch wartenden älteren überflüssig
+    job_id = create_uuid()
+    after_request_commit(database_session, lambda: render_session.submit(edit_id, prepare, swap_slot_in_edit, finalize, supersede_key=f"slot:{slot_id}", job_id=job_id))
+    return job_id
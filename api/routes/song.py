@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 
 from api.models.schema.song import (DeleteResponse, GetResponse, ListResponse,
                                     PostRequest, PostResponse)
+from api.services.database.media_metadata import \
+    update_song as update_song_media_metadata
 from api.services.database.song import create as create_song_database
 from api.services.database.song import \
     create_slots_from_breakpoints as create_slots_from_breakpoints_database
@@ -12,14 +14,27 @@ from api.services.database.song import get as get_song_database
 from api.services.database.song import list_all as list_all_songs_database
 from api.services.database.song import remove as remove_song_database
 from api.services.database.song import update as update_song_database
-from api.services.files.cover import create as create_cover_files
+from api.services.files.audio_bed import \
+    create_from_upload as create_audio_bed_files_from_upload
+from api.services.files.cover import \
+    create_from_upload as create_cover_files_from_upload
 from api.services.files.cover import remove as remove_cover_files
-from api.services.files.song import create as create_song_files
+from api.services.files.song import \
+    create_from_upload as create_song_files_from_upload
 from api.services.files.song import remove as remove_song_files
-from api.sessions.database import get_database_session
+from api.services.files.upload import create as create_upload_file
+from api.services.files.upload import \
+    create_from_path as create_upload_file_from_path
+from api.services.files.upload import remove as remove_upload_file
+from api.sessions.database import after_request_rollback, get_database_session
+from api.sessions.executor import run_database, run_io, run_media
 from api.sessions.files import BaseFileSessionManager, get_file_session
+from api.utils.database.create_uuid import create_uuid
 from api.utils.files.file_validation import file_validation
-from api.utils.files.get_audio_duration import get_audio_duration
+from api.utils.files.save_upload_file import save_upload_file
+from api.utils.files.temporary_file_path import temporary_file_path
+from api.utils.media_manipulation.create_audio_bed import create_audio_bed
+from api.utils.media_manipulation.probe_media import probe_media_path
 
 logger = logging.getLogger("routes.song")
 
@@ -42,45 +57,69 @@ async def create_song(
     validated_song_file = file_validation(request.song_file, "audio")
     validated_cover_file = file_validation(request.cover_file, "image")
     
-    # Lese die Song-Datei einmal
-    song_file_bytes = await validated_song_file.read()
+    song_extension = validated_song_file.filename.split(".")[-1]
+    cover_extension = validated_cover_file.filename.split(".")[-1]
 
-    # Berechne die Dauer der Song-Datei
-    song_duration = get_audio_duration(song_file_bytes, "wav")
+    # Der Song wird stückweise in eine temporäre Datei kopiert und von dort in den Dateispeicher verschoben
+    with temporary_file_path(song_extension) as song_upload_path, temporary_file_path("m4a") as audio_bed_path:
+        song_byte_size = await run_io(save_upload_file, validated_song_file, song_upload_path)
 
-    if song_duration < (breakpoints[-1] - breakpoints[0]):
-        raise ValueError("Breakpoints exceed song duration")
-    
-    # transform breakpoints so its starts at 0
+        # Lese Dauer, Abtastrate und Kanäle aus den Headern der Song-Datei
+        audio_info = await run_media(probe_media_path, song_upload_path)
 
-    cover_file_bytes = await validated_cover_file.read()
+        if audio_info.duration < (breakpoints[-1] - breakpoints[0]):
+            raise ValueError("Breakpoints exceed song duration")
 
-    song_extension = validated_song_file.filename.split(".")[-1]
-    cover_extension = validated_cover_file.filename.split(".")[-1]
+        # transform breakpoints so its starts at 0
+
+        cover_file_bytes = await validated_cover_file.read()
+
+        # Ingest: encode the audio bed for the slot range once, edits only mux it.
+        # Runs before the first statement, so no connection is held during the encode
+        await run_media(create_audio_bed, song_upload_path, breakpoints[0], breakpoints[-1], audio_bed_path)
+
+        # Auch das Speichern (bei S3 der Upload) läuft vor dem ersten Statement, nach dem Einfügen werden die Dateien nur noch verschoben.
+        # So committet der Request weiterhin einmal, und eine Zeile zeigt nie auf fehlende Dateien
+        song_upload_id, cover_upload_id, audio_bed_upload_id = create_uuid(), create_uuid(), create_uuid()
+        await run_io(create_upload_file_from_path, song_upload_id, song_extension, song_upload_path, file_session)
+        after_request_rollback(database_session, lambda: remove_upload_file(song_upload_id, file_session))
+        await run_io(create_upload_file, cover_upload_id, cover_extension, cover_file_bytes, file_session)
+        after_request_rollback(database_session, lambda: remove_upload_file(cover_upload_id, file_session))
+        await run_io(create_upload_file_from_path, audio_bed_upload_id, "m4a", audio_bed_path, file_session)
+        after_request_rollback(database_session, lambda: remove_upload_file(audio_bed_upload_id, file_session))
 
     # Create new song in database
-    new_song = create_song_database(
+    new_song = await run_database(
+        create_song_database,
         name=request.name,
         author=request.author,
         cover_src="",
         audio_src="",
         database_session=database_session
     )
+    song_id = new_song.song_id
 
-    # Save media files
-    song_location = create_song_files(new_song.song_id, song_extension, song_file_bytes, file_session)
-    cover_location = create_cover_files(new_song.song_id, cover_extension, cover_file_bytes, file_session)
+    # Move the media files to the song, a rename (local) or a copy on the server (S3)
+    song_location = await run_io(create_song_files_from_upload, song_id, song_upload_id, file_session)
+    after_request_rollback(database_session, lambda: remove_song_files(song_id, file_session))
+    cover_location = await run_io(create_cover_files_from_upload, song_id, cover_upload_id, file_session)
+    after_request_rollback(database_session, lambda: remove_cover_files(song_id, file_session))
+    await run_io(create_audio_bed_files_from_upload, song_id, audio_bed_upload_id, file_session)
 
     # Update song record with media locations
-    updated_song = update_song_database(
+    await run_database(
+        update_song_database,
         song_id=new_song.song_id,
         cover_src=cover_location,
         audio_src=song_location,
         database_session=database_session
     )
 
+    # Store the probed metadata, renders can plan without reading the song
+    updated_song = await run_database(update_song_media_metadata, new_song.song_id, audio_info, song_byte_size, database_session)
+
     # Create slots from breakpoints
-    create_slots_from_breakpoints_database(new_song.song_id, breakpoints, database_session=database_session)
+    await run_database(create_slots_from_breakpoints_database, new_song.song_id, breakpoints, database_session=database_session)
 
     return updated_song
 
@@ -91,23 +130,23 @@ async def delete_song(
     database_session: Session = Depends(get_database_session),
     file_session: BaseFileSessionManager = Depends(get_file_session)
 ):
-    # Remove media files
-    remove_song_files(song_id, file_session)
-    remove_cover_files(song_id, file_session)
+    # Remove media files (including the audio bed)
+    await run_io(remove_song_files, song_id, file_session)
+    await run_io(remove_cover_files, song_id, file_session)
     
     # Remove song entry from the database
-    remove_song_database(song_id, database_session)
+    await run_database(remove_song_database, song_id, database_session)
 
     return {"message": "Song and associated media deleted successfully"}
 
 
 @router.get("/list", response_model=ListResponse)
 async def list_songs(database_session: Session = Depends(get_database_session)):
-    songs = list_all_songs_database(database_session=database_session)
+    songs = await run_database(list_all_songs_database, database_session=database_session)
     return {"songs": songs}
 
 
 @router.get("/{song_id}", response_model=GetResponse)
 async def get_song(song_id: int, database_session: Session = Depends(get_database_session)):
-    song = get_song_database(song_id=song_id, database_session=database_session)
+    song = await run_database(get_song_database, song_id=song_id, database_session=database_session)
     return song
@@ -1,44 +1,49 @@
-
 import os
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import FileResponse
 
+from api.exceptions.sessions.files import (DirectoryNotFoundError,
+                                           FileNotFoundInSessionError)
+from api.sessions.files import (BaseFileSessionManager,
+                                LocalFileSessionManager, get_file_session,
+                                storage_of)
+
 router = APIRouter(
     prefix="/files",
 )    
 
 @router.get("/covers/{filename}", tags=["files"])
-async def serve_covers(filename: str):      
-    file_path = f"outgoing/files/covers/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+async def serve_covers(filename: str, file_session: BaseFileSessionManager = Depends(get_file_session)):
+    return _serve_file("covers", filename, file_session)
 
 @router.get("/demo_slot/{filename}", tags=["files"])
-async def serve_demo_slot(filename: str):   
-    file_path = f"outgoing/files/demo_slot/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+async def serve_demo_slot(filename: str, file_session: BaseFileSessionManager = Depends(get_file_session)):
+    return _serve_file("demo_slot", filename, file_session)
 
 @router.get("/edits/{filename}", tags=["files"])
-async def serve_edits(filename: str):
-    file_path = f"outgoing/files/edits/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+async def serve_edits(filename: str, file_session: BaseFileSessionManager = Depends(get_file_session)):
+    return _serve_file("edits", filename, file_session)
 
 @router.get("/occupied_slots/{filename}", tags=["files"])
-async def serve_occupied_slot(filename: str):
-    file_path = f"outgoing/files/occupied_slots/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+async def serve_occupied_slot(filename: str, file_session: BaseFileSessionManager = Depends(get_file_session)):
+    return _serve_file("occupied_slots", filename, file_session)
 
 @router.get("/songs/{filename}", tags=["files"])
-async def serve_songs(filename: str):
-    file_path = f"outgoing/files/songs/{filename}"
-    if not os.path.exists(file_path):
+async def serve_songs(filename: str, file_session: BaseFileSessionManager = Depends(get_file_session)):
+    return _serve_file("songs", filename, file_session)
+
+def _serve_file(dir: str, filename: str, file_session: BaseFileSessionManager) -> FileResponse:
+    # Only the local storage is served from here, the files may lie in a hash-prefix subdirectory
+    file_session = storage_of(file_session)
+    if not isinstance(file_session, LocalFileSessionManager):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        file_path = file_session.file_path(os.path.splitext(filename)[0], dir)
+    except (FileNotFoundInSessionError, DirectoryNotFoundError):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    if os.path.basename(file_path) != filename or not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
\ No newline at end of file
+    return FileResponse(file_path)
@@ -11,6 +11,7 @@ from api.sessions.email import BaseEmailSessionManager, get_email_session
 from api.sessions.files import BaseFileSessionManager, get_file_session
 from api.sessions.instagram import (BaseInstagramSessionManager,
                                     get_instagram_session)
+from api.utils.files.temporary_file_path import temporary_file_path
 from api.utils.media_manipulation.create_edit_video import create_edit_video
 from api.utils.media_manipulation.swap_slot_in_edit_video import \
     swap_slot_in_edit
@@ -24,44 +25,36 @@ def test1(
     database_session = Depends(get_database_session), 
     file_session: BaseFileSessionManager = Depends(get_file_session)
 ):
-    video_bytes = file_session.get("demo", "demo_slot")
-    song_bytes = file_session.get("1", "songs")
-    
     breapoints = [1,2,3,6]
     
-    endresult = create_edit_video(
-        video_bytes,
-        "mp4", 
-        
-        song_bytes, 
-        "mp3",
+    with file_session.path("demo", "demo_slot") as video_path, file_session.path("1", "songs") as song_path, temporary_file_path("mp4") as output_path:
+        create_edit_video(
+            video_path,
+            song_path,
+            
+            breapoints,
+            output_path=output_path
+        )
         
-        breapoints,   
-        "mp4"
-    )
-    
-    file_session.create(f"{generate_random_characters()}", "mp4", endresult, "testres")
+        file_session.create_from_path(f"{generate_random_characters()}", "mp4", output_path, "testres")
     return 18
 
 @router.get("/2", tags=["testing"])
 def test2(database_session = Depends(get_database_session), file_session: BaseFileSessionManager = Depends(get_file_session)):
     name = "9oB0"
-    input_video_bytes = file_session.get(f"{name}.mp4", "testres")
-    new_video_bytes   = file_session.get("1.mp4", "occupied_slots")
     
-    endresult = swap_slot_in_edit(
-        input_video_bytes,
-        0,
-        1,
-        "mp4",
-        new_video_bytes,
-        0,
-        1,
-        "mp4",
-        "mp4"
-    )
-    
-    file_session.create(f"{name}_out.mp4", "testres", endresult)
+    with file_session.path(name, "testres") as input_video_path, file_session.path("1", "occupied_slots") as new_video_path, temporary_file_path("mp4") as output_path:
+        swap_slot_in_edit(
+            input_video_path,
+            0,
+            1,
+            new_video_path,
+            0,
+            1,
+            output_path=output_path
+        )
+        
+        file_session.create_from_path(f"{name}_out", "mp4", output_path, "testres")
     return 17
 
 @router.get("/3", tags=["testing"])
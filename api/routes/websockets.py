@@ -4,8 +4,10 @@ from urllib.parse import parse_qs
 
 from api.services.database.group import is_group_member
 from api.sessions.database import get_database_session
+from api.sessions.executor import run_database
 from api.utils.jwt.jwt import read_jwt
-from api.websocket.active_connections import active_connections
+from api.websocket.active_connections import (active_connections,
+                                              remember_event_loop)
 
 
 router = APIRouter(prefix="/ws")
@@ -33,12 +35,13 @@ async def websocket_endpoint(
         user_id = read_jwt(authorization.replace("Bearer ", ""))
 
         # Step 2: Verify the user is part of the group
-        if not is_group_member(user_id, group_id, database_session):
+        if not await run_database(is_group_member, user_id, group_id, database_session):
             await websocket.close(code=4001)  # Unauthorized access
             return
 
         # Step 3: Accept WebSocket connection
         await websocket.accept()
+        remember_event_loop()
 
         # Add the WebSocket connection to the group
         if group_id not in active_connections:
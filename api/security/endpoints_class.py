@@ -6,6 +6,8 @@ from api.security.role_enum import RoleEnum
 class EndpointInfo(NamedTuple):
     role: RoleEnum
     has_subroles:bool
+    # GET-Routen, die nicht von einem Replikat mit Verzögerung lesen dürfen
+    read_primary: bool = False
     
     
 class EndpointConfig:
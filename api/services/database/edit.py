@@ -26,8 +26,7 @@ def create(
         video_src=video_src
     )
     database_session.add(new_edit)
-    database_session.commit()
-    database_session.refresh(new_edit)
+    database_session.flush()
     return new_edit
 
 def get(edit_id: int, database_session: Session) -> Edit:
@@ -54,8 +53,7 @@ def update(
     if video_src is not None:
         edit.video_src = video_src
     
-    database_session.commit()
-    database_session.refresh(edit)
+    database_session.flush()
     
     return edit
 
@@ -65,7 +63,7 @@ def remove(edit_id: int, database_session: Session) -> None:
         raise NoResultFound(f"Edit with id {edit_id} not found.")
     
     database_session.delete(edit)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -107,7 +105,7 @@ def set_is_live(edit_id: int, database_session: Session) -> None:
         raise Exception(f"Not all slots are occupied for Edit with id {edit_id}.")
     
     edit.isLive = True
-    database_session.commit()
+    database_session.flush()
 
 def get_edits_by_group(group_id: str, database_session: Session) -> List[Edit]:
     edits = database_session.query(Edit).filter(Edit.group_id == group_id).all()
@@ -12,8 +12,7 @@ def create(name: str, database_session: Session) -> Group:
         name=name
     )
     database_session.add(new_group)
-    database_session.commit()
-    database_session.refresh(new_group)
+    database_session.flush()
     return new_group
 
 def get(group_id: str, database_session: Session) -> Group:
@@ -27,8 +26,7 @@ def update(group_id: str, name: str, database_session: Session) -> Group:
     if not group:
         raise NoResultFound(f"Group with ID {group_id} not found")
     group.name = name
-    database_session.commit()
-    database_session.refresh(group)
+    database_session.flush()
     return group
 
 def remove(group_id: str, database_session: Session) -> None:
@@ -36,7 +34,7 @@ def remove(group_id: str, database_session: Session) -> None:
     if not group:
         raise NoResultFound(f"Group with ID {group_id} not found")
     database_session.delete(group)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
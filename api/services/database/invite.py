@@ -22,8 +22,7 @@ def create(group_id: str, email: str, database_session: Session, expires_in_days
     )
     
     database_session.add(new_invitation)
-    database_session.commit()
-    database_session.refresh(new_invitation)
+    database_session.flush()
     return new_invitation
 
 def get(invitation_id: int, database_session: Session) -> Invitation:
@@ -43,8 +42,7 @@ def update(invitation_id: int, email: str = None, expires_in_days: int = None, d
     if expires_in_days is not None:
         invitation.expires_at = datetime.now() + timedelta(days=expires_in_days)
 
-    database_session.commit()
-    database_session.refresh(invitation)
+    database_session.flush()
     return invitation
 
 def remove(invitation_id: int, database_session: Session) -> None:
@@ -53,7 +51,7 @@ def remove(invitation_id: int, database_session: Session) -> None:
         raise NoResultFound(f"Invitation with ID {invitation_id} not found")
 
     database_session.delete(invitation)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -69,4 +67,4 @@ def remove_all_by_email_and_group_id(email: str, group_id: str, database_session
     for invitation in invitations_to_delete:
         database_session.delete(invitation)
     
-    database_session.commit()
+    database_session.flush()
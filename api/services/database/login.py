@@ -20,8 +20,7 @@ def create(user_id: int, database_session: Session, expires_in_minutes: int = 10
         expires_at=expires_at
     )
     database_session.add(new_login_request)
-    database_session.commit()
-    database_session.refresh(new_login_request)
+    database_session.flush()
     return new_login_request
 
 def get(user_id: int, database_session: Session) -> LoginRequest:
@@ -37,8 +36,7 @@ def update(user_id: int, pin: str, expires_in_minutes: int, database_session: Se
     
     login_request.pin = pin
     login_request.expires_at = datetime.now() + timedelta(minutes=expires_in_minutes)
-    database_session.commit()
-    database_session.refresh(login_request)
+    database_session.flush()
     return login_request
 
 def remove(user_id: int, database_session: Session) -> None:
@@ -47,7 +45,7 @@ def remove(user_id: int, database_session: Session) -> None:
         raise NoResultFound(f"Login request for user ID {user_id} not found")
 
     database_session.delete(login_request)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -57,7 +55,7 @@ def delete_all_from_email(email: str, database_session: Session) -> None:
         raise NoResultFound(f"User with email {email} not found")
     
     database_session.query(LoginRequest).filter(LoginRequest.user_id == user.user_id).delete()
-    database_session.commit()
+    database_session.flush()
 
 def get_login_request_by_groupid_and_email(groupid: str, email: str, database_session: Session) -> LoginRequest:
     login_request = database_session.query(LoginRequest).join(User).filter(
@@ -79,8 +77,7 @@ def create_or_update(user_id: int, database_session: Session, expires_in_minutes
         existing_login_request.pin = pin
         existing_login_request.created_at = created_at
         existing_login_request.expires_at = expires_at
-        database_session.commit()
-        database_session.refresh(existing_login_request)
+        database_session.flush()
         return existing_login_request
     else:
         # Prüfen, ob der Benutzer existiert, bevor ein LoginRequest erstellt wird
@@ -95,6 +92,5 @@ def create_or_update(user_id: int, database_session: Session, expires_in_minutes
             expires_at=expires_at
         )
         database_session.add(new_login_request)
-        database_session.commit()
-        database_session.refresh(new_login_request)
+        database_session.flush()
         return new_login_request
\ No newline at end of file
@@ -0,0 +1,58 @@
+from typing import Optional, Union
+
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from api.models.database.model import Edit, OccupiedSlot, Song
+from api.utils.media_manipulation.probe_media import MediaInfo
+
+# Gespeicherte Eigenschaften der Mediendateien, damit Renderings planen können, ohne die Dateien erneut zu untersuchen
+
+MEDIA_METADATA_FIELDS = ("duration", "sample_rate", "channel_layout", "width", "height", "fps", "codec")
+
+"""CRUD Operationen"""
+
+def update_song(song_id: int, media_info: MediaInfo, byte_size: int, database_session: Session) -> Song:
+    song = database_session.query(Song).filter(Song.song_id == song_id).one_or_none()
+    if not song:
+        raise NoResultFound(f"Song with ID {song_id} not found.")
+    return _update(song, media_info, byte_size, database_session)
+
+def update_edit(edit_id: int, media_info: MediaInfo, byte_size: int, database_session: Session) -> Edit:
+    edit = database_session.query(Edit).filter(Edit.edit_id == edit_id).first()
+    if not edit:
+        raise NoResultFound(f"Edit with id {edit_id} not found.")
+    return _update(edit, media_info, byte_size, database_session)
+
+def update_occupied_slot(occupied_slot_id: int, media_info: MediaInfo, byte_size: int, database_session: Session) -> OccupiedSlot:
+    occupied_slot = database_session.query(OccupiedSlot).filter(OccupiedSlot.occupied_slot_id == occupied_slot_id).one_or_none()
+    if not occupied_slot:
+        raise NoResultFound(f"Occupied slot with ID {occupied_slot_id} not found.")
+    return _update(occupied_slot, media_info, byte_size, database_session)
+
+"""Andere Operationen"""
+
+def get_edit(edit_id: int, database_session: Session) -> Optional[MediaInfo]:
+    """
+    Gibt die gespeicherten Eigenschaften der Edit-Datei zurück.
+    None, solange das Edit noch nicht gerendert bzw. nachgetragen wurde.
+    """
+    edit = database_session.query(Edit).filter(Edit.edit_id == edit_id).first()
+    if not edit:
+        raise NoResultFound(f"Edit with id {edit_id} not found.")
+    return _media_info(edit)
+
+def _media_info(entity: Union[Song, Edit, OccupiedSlot]) -> Optional[MediaInfo]:
+    if entity.duration is None:
+        return None
+    return MediaInfo(**{field: getattr(entity, field) for field in MEDIA_METADATA_FIELDS if hasattr(entity, field)})
+
+def _update(entity: Union[Song, Edit, OccupiedSlot], media_info: MediaInfo, byte_size: int, database_session: Session):
+    # Songs have no video columns, edits and occupied slots no audio columns
+    for field in MEDIA_METADATA_FIELDS:
+        if hasattr(entity, field):
+            setattr(entity, field, getattr(media_info, field))
+    entity.byte_size = byte_size
+
+    database_session.flush()
+    return entity
@@ -17,8 +17,7 @@ def create(user_id: int, slot_id: int, edit_id: int, video_src: str, start_time:
         end_time=end_time
     )
     database_session.add(new_occupied_slot)
-    database_session.commit()
-    database_session.refresh(new_occupied_slot)
+    database_session.flush()
     return new_occupied_slot
 
 def get(occupied_slot_id: int, database_session: Session) -> OccupiedSlot:
@@ -44,8 +43,7 @@ def update(occupied_slot_id: int, database_session: Session, user_id: int = None
         occupied_slot.start_time = start_time
     if end_time is not None:
         occupied_slot.end_time = end_time
-    database_session.commit()
-    database_session.refresh(occupied_slot)
+    database_session.flush()
     return occupied_slot
 
 def remove(occupied_slot_id: int, database_session: Session) -> None:
@@ -53,7 +51,7 @@ def remove(occupied_slot_id: int, database_session: Session) -> None:
     if not occupied_slot:
         raise NoResultFound(f"Occupied slot with ID {occupied_slot_id} not found.")
     database_session.delete(occupied_slot)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
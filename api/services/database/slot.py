@@ -12,8 +12,7 @@ def create(song_id: int, start_time: float, end_time: float, database_session: S
         end_time=end_time
     )
     database_session.add(new_slot)
-    database_session.commit()
-    database_session.refresh(new_slot)
+    database_session.flush()
     return new_slot
 
 def get(slot_id: int, database_session: Session) -> Slot:
@@ -31,8 +30,7 @@ def update(slot_id: int, start_time: float = None, end_time: float = None, datab
         slot.start_time = start_time
     if end_time is not None:
         slot.end_time = end_time
-    database_session.commit()
-    database_session.refresh(slot)
+    database_session.flush()
     return slot
 
 def remove(slot_id: int, database_session: Session) -> None:
@@ -40,7 +38,7 @@ def remove(slot_id: int, database_session: Session) -> None:
     if not slot:
         raise NoResultFound(f"Slot with ID {slot_id} not found.")
     database_session.delete(slot)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -16,8 +16,7 @@ def create(name: str, author: str, cover_src: str, audio_src: str, database_sess
         audio_src=audio_src
     )
     database_session.add(new_song)
-    database_session.commit()
-    database_session.refresh(new_song)
+    database_session.flush()
     return new_song
 
 def get(song_id: int, database_session: Session) -> Song:
@@ -26,7 +25,7 @@ def get(song_id: int, database_session: Session) -> Song:
         raise NoResultFound(f"Song with ID {song_id} not found.")
     return song
 
-def update(song_id: int, name: Optional[str] = None, author: Optional[str] = None, cover_src: Optional[str] = None, audio_src: Optional[str] = None, database_session: Session = None) -> Song:
+def update(song_id: int, name: Optional[str] = None, author: Optional[str] = None, cover_src: Optional[str] = None, audio_src: Optional[str] = None, duration: Optional[float] = None, sample_rate: Optional[int] = None, channel_layout: Optional[str] = None, database_session: Session = None) -> Song:
     song = database_session.query(Song).filter(Song.song_id == song_id).one_or_none()
     if not song:
         raise NoResultFound(f"Song with ID {song_id} not found.")
@@ -38,8 +37,13 @@ def update(song_id: int, name: Optional[str] = None, author: Optional[str] = Non
         song.cover_src = cover_src
     if audio_src is not None:
         song.audio_src = audio_src
-    database_session.commit()
-    database_session.refresh(song)
+    if duration is not None:
+        song.duration = duration
+    if sample_rate is not None:
+        song.sample_rate = sample_rate
+    if channel_layout is not None:
+        song.channel_layout = channel_layout
+    database_session.flush()
     return song
 
 def remove(song_id: int, database_session: Session) -> None:
@@ -47,7 +51,7 @@ def remove(song_id: int, database_session: Session) -> None:
     if not song:
         raise NoResultFound(f"Song with ID {song_id} not found.")
     database_session.delete(song)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -94,9 +98,7 @@ def create_slots_from_breakpoints(song_id: int, breakpoints: List[float], databa
         raise ValueError(f"Failed to create slots for song ID {song_id}. No valid slots could be created.")
     
     database_session.add_all(slots)
-    database_session.commit()
-    for slot in slots:
-        database_session.refresh(slot)
+    database_session.flush()
     return slots
 
 def get_earliest_slot_start_time(song_id: int, database_session: Session) -> float:
@@ -13,8 +13,7 @@ def create(group_id: str, role: str, name: str, email: str, database_session: Se
         email=email
     )
     database_session.add(new_user)
-    database_session.commit()
-    database_session.refresh(new_user)
+    database_session.flush()
     return new_user
 
 def get(user_id: int, database_session: Session) -> User:
@@ -35,8 +34,7 @@ def update(user_id: int, group_id: str = None, role: str = None, name: str = Non
         user.name = name
     if email is not None:
         user.email = email
-    database_session.commit()
-    database_session.refresh(user)
+    database_session.flush()
     return user
 
 def remove(user_id: int, database_session: Session) -> None:
@@ -44,7 +42,7 @@ def remove(user_id: int, database_session: Session) -> None:
     if not user:
         raise NoResultFound(f"User with ID {user_id} not found.")
     database_session.delete(user)
-    database_session.commit()
+    database_session.flush()
 
 """Andere Operationen"""
 
@@ -0,0 +1,33 @@
+from typing import ContextManager
+
+from api.exceptions.sessions.files import DirectoryNotFoundError, FileDeleteError
+from api.sessions.files import BaseFileSessionManager
+
+# Auf die Slots zugeschnittener, fertig encodierter Song (siehe create_audio_bed)
+
+def create(song_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
+    """Speichert das Audio-Bett eines Songs."""
+    return file_session.create(str(song_id), file_extension, file, "audio_beds")
+
+def create_from_path(song_id: int, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Speichert das Audio-Bett unter source_path (wird verschoben)."""
+    return file_session.create_from_path(str(song_id), file_extension, source_path, "audio_beds")
+
+def create_from_upload(song_id: int, upload_id: str, file_session: BaseFileSessionManager) -> str:
+    """Verschiebt ein vorab abgelegtes Audio-Bett (siehe services.files.upload) an seinen Platz."""
+    return file_session.move(upload_id, "uploads", str(song_id), "audio_beds")
+
+def get(song_id: int, file_session: BaseFileSessionManager) -> bytes:
+    """Holt das Audio-Bett basierend auf der song_id."""
+    return file_session.get(str(song_id), "audio_beds")
+
+def path(song_id: int, file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt das Audio-Bett als lokalen Pfad bereit."""
+    return file_session.path(str(song_id), "audio_beds")
+
+def remove(song_id: int, file_session: BaseFileSessionManager) -> None:
+    """Verwirft das Audio-Bett eines Songs, falls vorhanden."""
+    try:
+        file_session.remove(str(song_id), "audio_beds")
+    except (FileDeleteError, DirectoryNotFoundError):
+        pass
@@ -4,6 +4,10 @@ def create(song_id: int, file_extension: str, file: bytes, file_session: BaseFil
     """Erstellt eine neue Datei im angegebenen Verzeichnis."""
     return file_session.create(str(song_id), file_extension, file, "covers")
 
+def create_from_upload(song_id: int, upload_id: str, file_session: BaseFileSessionManager) -> str:
+    """Verschiebt einen vorab abgelegten Upload (siehe services.files.upload) an die Stelle der Datei."""
+    return file_session.move(upload_id, "uploads", str(song_id), "covers")
+
 def get(song_id: int, file_session: BaseFileSessionManager) -> bytes:
     """Holt die Datei basierend auf der song_id (ohne Erweiterung)."""
     return file_session.get(str(song_id), "covers")
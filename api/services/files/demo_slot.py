@@ -1,4 +1,17 @@
+from typing import ContextManager
+
+from api.services.files.edit_template import clear as clear_edit_templates
 from api.sessions.files import BaseFileSessionManager
 
 def get(file_session: BaseFileSessionManager) -> bytes:
-    return file_session.get("demo", "demo_slot")
\ No newline at end of file
+    return file_session.get("demo", "demo_slot")
+
+def path(file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt den Demo-Clip als lokalen Pfad bereit."""
+    return file_session.path("demo", "demo_slot")
+
+def update(file: bytes, file_session: BaseFileSessionManager) -> str:
+    """Ersetzt den Demo-Clip. Alle Edit-Templates enthalten den alten Clip und werden verworfen."""
+    location = file_session.update("demo", file, "demo_slot")
+    clear_edit_templates(file_session)
+    return location
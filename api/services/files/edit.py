@@ -1,3 +1,5 @@
+from typing import ContextManager
+
 from api.sessions.files import BaseFileSessionManager
 
 def create(edit_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
@@ -8,10 +10,22 @@ def get(edit_id: int, file_session: BaseFileSessionManager) -> bytes:
     """Holt die Datei basierend auf der edit_id (ohne Erweiterung)."""
     return file_session.get(str(edit_id), "edits")
 
+def path(edit_id: int, file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt die Datei basierend auf der edit_id als lokalen Pfad bereit."""
+    return file_session.path(str(edit_id), "edits")
+
+def location(edit_id: int, file_extension: str, file_session: BaseFileSessionManager) -> str:
+    """Gibt die Adresse zurück, unter der die Datei nach create() erreichbar ist."""
+    return file_session.location(str(edit_id), file_extension, "edits")
+
 def update(edit_id: int, file: bytes, file_session: BaseFileSessionManager) -> str:
     """Aktualisiert eine vorhandene Datei basierend auf der edit_id (ohne Erweiterung)."""
     return file_session.update(str(edit_id), file, "edits")
 
+def update_from_path(edit_id: int, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Ersetzt die Datei basierend auf der edit_id durch die Datei unter source_path (wird verschoben)."""
+    return file_session.update_from_path(str(edit_id), source_path, "edits")
+
 def remove(edit_id: int, file_session: BaseFileSessionManager) -> None:
     """Löscht eine vorhandene Datei basierend auf der edit_id (ohne Erweiterung)."""
     file_session.remove(str(edit_id), "edits")
@@ -0,0 +1,32 @@
+from api.exceptions.sessions.files import DirectoryNotFoundError, FileDeleteError
+from api.sessions.files import BaseFileSessionManager
+
+# Fertig gerendertes Platzhalter-Edit pro Song (Demo-Clip an jedem Breakpoint, darunter der Song)
+
+def create(song_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
+    """Speichert das Template für einen Song."""
+    return file_session.create(str(song_id), file_extension, file, "edit_templates")
+
+def create_from_path(song_id: int, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Speichert das Template unter source_path (wird verschoben)."""
+    return file_session.create_from_path(str(song_id), file_extension, source_path, "edit_templates")
+
+def copy_to_edit(song_id: int, edit_id: int, file_session: BaseFileSessionManager) -> str:
+    """Legt die Edit-Datei als Kopie des Templates an."""
+    return file_session.copy(str(song_id), "edit_templates", str(edit_id), "edits")
+
+def remove(song_id: int, file_session: BaseFileSessionManager) -> None:
+    """Verwirft das Template eines Songs, falls vorhanden."""
+    try:
+        file_session.remove(str(song_id), "edit_templates")
+    except (FileDeleteError, DirectoryNotFoundError):
+        pass
+
+def clear(file_session: BaseFileSessionManager) -> None:
+    """Verwirft alle Templates, z.B. wenn sich der Demo-Clip ändert."""
+    try:
+        file_names = file_session.list("edit_templates")
+    except DirectoryNotFoundError:
+        return
+    for file_name in file_names:
+        remove(file_name.split(".")[0], file_session)
@@ -0,0 +1,37 @@
+from typing import ContextManager
+
+from api.exceptions.sessions.files import (DirectoryNotFoundError,
+                                           FileDeleteError,
+                                           FileNotFoundInSessionError)
+from api.sessions.files import BaseFileSessionManager
+
+# Auf das Render-Format normalisierte Clips der belegten Slots, neben dem Original (siehe normalize_clip)
+
+def save(occupied_slot_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
+    """Speichert den normalisierten Clip, ein vorhandener wird ersetzt."""
+    try:
+        return file_session.update(str(occupied_slot_id), file, "normalized_occupied_slots")
+    except (FileNotFoundInSessionError, DirectoryNotFoundError):
+        return file_session.create(str(occupied_slot_id), file_extension, file, "normalized_occupied_slots")
+
+def save_from_path(occupied_slot_id: int, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Speichert den normalisierten Clip unter source_path (wird verschoben), ein vorhandener wird ersetzt."""
+    try:
+        return file_session.update_from_path(str(occupied_slot_id), source_path, "normalized_occupied_slots")
+    except (FileNotFoundInSessionError, DirectoryNotFoundError):
+        return file_session.create_from_path(str(occupied_slot_id), file_extension, source_path, "normalized_occupied_slots")
+
+def get(occupied_slot_id: int, file_session: BaseFileSessionManager) -> bytes:
+    """Holt den normalisierten Clip basierend auf der occupied_slot_id."""
+    return file_session.get(str(occupied_slot_id), "normalized_occupied_slots")
+
+def path(occupied_slot_id: int, file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt den normalisierten Clip als lokalen Pfad bereit."""
+    return file_session.path(str(occupied_slot_id), "normalized_occupied_slots")
+
+def remove(occupied_slot_id: int, file_session: BaseFileSessionManager) -> None:
+    """Verwirft den normalisierten Clip, falls vorhanden."""
+    try:
+        file_session.remove(str(occupied_slot_id), "normalized_occupied_slots")
+    except (FileDeleteError, DirectoryNotFoundError):
+        pass
@@ -1,17 +1,35 @@
+from typing import ContextManager
+
 from api.sessions.files import BaseFileSessionManager
 
 def create(occupied_slot_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
     """Erstellt eine neue Datei im angegebenen Verzeichnis."""
     return file_session.create(str(occupied_slot_id), file_extension, file, "occupied_slots")
 
+def create_from_path(occupied_slot_id: int, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Speichert die Datei unter source_path (wird verschoben)."""
+    return file_session.create_from_path(str(occupied_slot_id), file_extension, source_path, "occupied_slots")
+
+def create_from_upload(occupied_slot_id: int, upload_id: str, file_session: BaseFileSessionManager) -> str:
+    """Verschiebt einen vorab abgelegten Upload (siehe services.files.upload) an die Stelle der Datei."""
+    return file_session.move(upload_id, "uploads", str(occupied_slot_id), "occupied_slots")
+
 def get(occupied_slot_id: int, file_session: BaseFileSessionManager) -> bytes:
     """Holt die Datei basierend auf der occupied_slot_id (ohne Erweiterung)."""
     return file_session.get(str(occupied_slot_id), "occupied_slots")
 
+def path(occupied_slot_id: int, file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt die Datei basierend auf der occupied_slot_id als lokalen Pfad bereit."""
+    return file_session.path(str(occupied_slot_id), "occupied_slots")
+
 def update(occupied_slot_id: int, file: bytes, file_session: BaseFileSessionManager) -> str:
     """Aktualisiert eine vorhandene Datei basierend auf der occupied_slot_id (ohne Erweiterung)."""
     return file_session.update(str(occupied_slot_id), file, "occupied_slots")
 
+def update_from_path(occupied_slot_id: int, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Ersetzt die Datei basierend auf der occupied_slot_id durch die Datei unter source_path (wird verschoben)."""
+    return file_session.update_from_path(str(occupied_slot_id), source_path, "occupied_slots")
+
 def remove(occupied_slot_id: int, file_session: BaseFileSessionManager) -> None:
     """Löscht eine vorhandene Datei basierend auf der occupied_slot_id (ohne Erweiterung)."""
     file_session.remove(str(occupied_slot_id), "occupied_slots")
@@ -1,17 +1,38 @@
+from typing import ContextManager
+
+from api.services.files.audio_bed import remove as remove_audio_bed
+from api.services.files.edit_template import remove as remove_edit_template
 from api.sessions.files import BaseFileSessionManager
 
 def create(song_id: int, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
     """Erstellt eine neue Datei im angegebenen Verzeichnis."""
     return file_session.create(str(song_id), file_extension, file, "songs")
 
+def create_from_path(song_id: int, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Speichert die Datei unter source_path (wird verschoben)."""
+    return file_session.create_from_path(str(song_id), file_extension, source_path, "songs")
+
+def create_from_upload(song_id: int, upload_id: str, file_session: BaseFileSessionManager) -> str:
+    """Verschiebt einen vorab abgelegten Upload (siehe services.files.upload) an die Stelle der Datei."""
+    return file_session.move(upload_id, "uploads", str(song_id), "songs")
+
 def get(song_id: int, file_session: BaseFileSessionManager) -> bytes:
     """Holt die Datei basierend auf der song_id (ohne Erweiterung)."""
     return file_session.get(str(song_id), "songs")
 
+def path(song_id: int, file_session: BaseFileSessionManager) -> ContextManager[str]:
+    """Stellt die Datei basierend auf der song_id als lokalen Pfad bereit."""
+    return file_session.path(str(song_id), "songs")
+
 def update(song_id: int, file: bytes, file_session: BaseFileSessionManager) -> str:
-    """Aktualisiert eine vorhandene Datei basierend auf der song_id (ohne Erweiterung)."""
-    return file_session.update(str(song_id), file, "songs")
+    """Aktualisiert eine vorhandene Datei basierend auf der song_id (ohne Erweiterung). Edit-Template und Audio-Bett werden verworfen."""
+    location = file_session.update(str(song_id), file, "songs")
+    remove_edit_template(song_id, file_session)
+    remove_audio_bed(song_id, file_session)
+    return location
 
 def remove(song_id: int, file_session: BaseFileSessionManager) -> None:
-    """Löscht eine vorhandene Datei basierend auf der song_id (ohne Erweiterung)."""
+    """Löscht eine vorhandene Datei basierend auf der song_id (ohne Erweiterung). Edit-Template und Audio-Bett werden verworfen."""
     file_session.remove(str(song_id), "songs")
+    remove_edit_template(song_id, file_session)
+    remove_audio_bed(song_id, file_session)
@@ -0,0 +1,24 @@
+from api.exceptions.sessions.files import DirectoryNotFoundError, FileDeleteError
+from api.sessions.files import BaseFileSessionManager
+
+# Uploads, die vor dem ersten Statement eines Requests im Dateispeicher abgelegt werden (bei S3 der eigentliche Upload).
+# Nach dem Einfügen der Zeile werden sie nur noch an ihren Platz verschoben, siehe create_from_upload der einzelnen Dateien
+
+def create(upload_id: str, file_extension: str, file: bytes, file_session: BaseFileSessionManager) -> str:
+    """Legt einen Upload aus dem Speicher ab."""
+    return file_session.create(upload_id, file_extension, file, "uploads")
+
+def create_from_path(upload_id: str, file_extension: str, source_path: str, file_session: BaseFileSessionManager) -> str:
+    """Legt den Upload unter source_path ab (wird verschoben)."""
+    return file_session.create_from_path(upload_id, file_extension, source_path, "uploads")
+
+def copy_from(file_name: str, dir: str, upload_id: str, file_session: BaseFileSessionManager) -> str:
+    """Sichert eine gespeicherte Datei als Upload, z.B. bevor sie ersetzt wird."""
+    return file_session.copy(file_name, dir, upload_id, "uploads")
+
+def remove(upload_id: str, file_session: BaseFileSessionManager) -> None:
+    """Verwirft einen Upload, falls (noch) vorhanden."""
+    try:
+        file_session.remove(upload_id, "uploads")
+    except (FileDeleteError, DirectoryNotFoundError):
+        pass
@@ -2,4 +2,7 @@ from api.sessions.instagram import BaseInstagramSessionManager
 
 
 def upload(video_bytes: bytes, video_format:str, caption: str, instagram_session: BaseInstagramSessionManager):
-    return instagram_session.upload(video_bytes, video_format, caption)
\ No newline at end of file
+    return instagram_session.upload(video_bytes, video_format, caption)
+
+def upload_from_path(video_path: str, video_format: str, caption: str, instagram_session: BaseInstagramSessionManager):
+    return instagram_session.upload_path(video_path, video_format, caption)
\ No newline at end of file
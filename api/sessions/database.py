@@ -1,18 +1,25 @@
 import logging
 import os
+import random
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from distutils.util import strtobool
-from typing import Any, Generator
+from typing import Any, Callable, Generator, Hashable, List, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, select, event
+from sqlalchemy import Select, create_engine, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
 from sqlalchemy.orm import Session, sessionmaker
+from fastapi.requests import HTTPConnection
 from tabulate import tabulate
 
 from api.models.database import model
 from api.models.database.model import (Base, Edit, Group, Invitation,
                                        LoginRequest, OccupiedSlot, Slot, Song,
                                        User)
+from api.utils.database.pool_monitor import PoolMonitor
+from api.utils.database.recent_writers import RecentWriters
 from mock.database.data import data
 
 """Init Trigger"""
@@ -32,10 +39,56 @@ DATABASE_REMOTE_SQL_USER            = os.getenv("DATABASE_REMOTE_MYSQL_USER")
 DATABASE_REMOTE_SQL_PASSWORD        = os.getenv("DATABASE_REMOTE_MYSQL_PASSWORD")
 DATABASE_REMOTE_SQL_DB              = os.getenv("DATABASE_REMOTE_MYSQL_DB")
 
+# Pool der Remote-Datenbank, höchstens POOL_SIZE + MAX_OVERFLOW Verbindungen gleichzeitig
+DATABASE_POOL_SIZE                  = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW               = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT               = float(os.getenv("DATABASE_POOL_TIMEOUT", "10"))
+# Unter dem wait_timeout von MySQL, sonst bekommt ein Request eine vom Server schon geschlossene Verbindung
+DATABASE_POOL_RECYCLE               = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+DATABASE_POOL_PRE_PING              = bool(strtobool(os.getenv("DATABASE_POOL_PRE_PING", "true")))
+# Das Schema wird nur auf Wunsch angelegt, nicht bei jedem Start
+DATABASE_REMOTE_CREATE_SCHEMA       = bool(strtobool(os.getenv("DATABASE_REMOTE_CREATE_SCHEMA", "false")))
+
+# Lese-Replikate mit denselben Zugangsdaten, kommagetrennt. Leer: alles geht an den Primary
+DATABASE_REMOTE_SQL_REPLICA_HOSTS   = [host.strip() for host in os.getenv("DATABASE_REMOTE_MYSQL_REPLICA_HOSTS", "").split(",") if host.strip()]
+# So lange nach einem Schreibzugriff liest derselbe User vom Primary, sollte über der Replikationsverzögerung liegen
+DATABASE_REPLICA_STICKY_SECONDS     = float(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+
+
+"""Routing Session"""
+class RoutingSession(Session):
+    """
+    Session für Primary und Lese-Replikate: SELECTs gehen an ein Replikat (pro Session immer dasselbe),
+    alles andere an den Primary. Nach dem ersten Schreibzugriff liest die Session nur noch vom Primary (Read-your-writes).
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], recent_writers: RecentWriters, **kwargs):
+        # sessionmaker always passes bind, by default None
+        kwargs["bind"] = kwargs.get("bind") or primary
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self.recent_writers = recent_writers
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            self.info["read_primary"] = True
+
+        # Without a statement (e.g. session.connection()) the caller may want to write
+        if self.info.get("read_primary") or not self.replicas or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return self.primary
+
+        if "replica" not in self.info:
+            self.info["replica"] = random.choice(self.replicas)
+        return self.info["replica"]
+
 
 """Base Database Session Manager"""
 class BaseDatabaseSessionManager(ABC):
     SessionLocal: sessionmaker = None
+    pool_monitor: Optional[PoolMonitor] = None
+    replica_pool_monitors: List[PoolMonitor] = []
 
     @abstractmethod
     def __init__(self):
@@ -176,15 +229,48 @@ class BaseDatabaseSessionManager(ABC):
 class RemoteDatabaseSessionManager(BaseDatabaseSessionManager):
     def __init__(self):
         logger.info(f"__init__(): (remote)")
-        database_url = f"mysql+pymysql://{DATABASE_REMOTE_SQL_USER}:{DATABASE_REMOTE_SQL_PASSWORD}@{DATABASE_REMOTE_SQL_HOST}/{DATABASE_REMOTE_SQL_DB}"
-        engine = create_engine(database_url)
-        Base.metadata.create_all(bind=engine)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.pool_monitor = PoolMonitor()
+        engine = self._create_engine(DATABASE_REMOTE_SQL_HOST, self.pool_monitor)
+        logger.info(f"__init__(): pool size={DATABASE_POOL_SIZE} overflow={DATABASE_MAX_OVERFLOW} recycle={DATABASE_POOL_RECYCLE}s pre_ping={DATABASE_POOL_PRE_PING} (remote)")
+
+        if DATABASE_REMOTE_CREATE_SCHEMA:
+            logger.info(f"__init__(): creating schema (remote)")
+            Base.metadata.create_all(bind=engine)
+
+        if DATABASE_REMOTE_SQL_REPLICA_HOSTS:
+            self.replica_pool_monitors = [PoolMonitor() for _ in DATABASE_REMOTE_SQL_REPLICA_HOSTS]
+            replicas = [self._create_engine(host, pool_monitor) for host, pool_monitor in zip(DATABASE_REMOTE_SQL_REPLICA_HOSTS, self.replica_pool_monitors)]
+            logger.info(f"__init__(): reading from {len(replicas)} replicas (remote)")
+            self.SessionLocal = sessionmaker(
+                class_=RoutingSession,
+                primary=engine,
+                replicas=replicas,
+                recent_writers=RecentWriters(DATABASE_REPLICA_STICKY_SECONDS),
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False
+            )
+        else:
+            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
         logger.info(f"__init__(): verbunden (remote)")
 
         if DATABASE_PRINT:
             self._print()
 
+    def _create_engine(self, host: str, pool_monitor: PoolMonitor) -> Engine:
+        database_url = f"mysql+pymysql://{DATABASE_REMOTE_SQL_USER}:{DATABASE_REMOTE_SQL_PASSWORD}@{host}/{DATABASE_REMOTE_SQL_DB}"
+        engine = create_engine(
+            database_url,
+            poolclass=pool_monitor.pool_class(),
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_MAX_OVERFLOW,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+            pool_recycle=DATABASE_POOL_RECYCLE,
+            pool_pre_ping=DATABASE_POOL_PRE_PING
+        )
+        pool_monitor.listen(engine)
+        return engine
+
     # @contextmanager
     def get_session(self) -> Generator[Session, Any, None]:
         logger.info(f"get_session(): (remote)")
@@ -200,9 +286,11 @@ class LocalDatabaseSessionManager(BaseDatabaseSessionManager):
         logger.info(f"__init__(): (local)")
         os.makedirs("./outgoing/database", exist_ok=True)
         database_url = f"sqlite:///./outgoing/database/local.db"
-        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        self.pool_monitor = PoolMonitor()
+        engine = create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=self.pool_monitor.pool_class())
+        self.pool_monitor.listen(engine)
         Base.metadata.create_all(bind=engine)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
         logger.info(f"__init__(): verbunden (local)")
 
         if DATABASE_LOCAL_FILL:
@@ -238,13 +326,14 @@ class MemoryDatabaseSessionManager(BaseDatabaseSessionManager):
         event.listen(self.engine, "connect", _set_foreign_keys_inline)
 
         Base.metadata.create_all(bind=self.engine)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
         logger.info(f"__init__(): verbunden (memory)")
         self._fill(data)
 
     # @contextmanager
     def get_session(self) -> Generator[Session, Any, None]:
         logger.info(f"get_session(): (memory)")
+        # Anders als Local und Remote (Verbindung erst beim ersten Statement) sofort verbunden, die äußere Transaktion isoliert die Tests
         connection = self.engine.connect()
         transaction = connection.begin()
         session = self.SessionLocal(bind=connection)
@@ -276,18 +365,138 @@ def init_database_session_manager():
     else:
         logger.warning(f"init_database_manager(): already initalized")
 
-def get_database_session():
-    logger.info(f"get_database_session()")
+def get_database_pool_stats() -> Optional[dict]:
+    """Auslastung der Connection-Pools von Primary und Replikaten, None ohne überwachten Pool (Memory) oder vor der Initialisierung."""
+    if _database_session_manager is None or _database_session_manager.pool_monitor is None:
+        return None
+    return {
+        "primary": _database_session_manager.pool_monitor.stats(),
+        "replicas": [pool_monitor.stats() for pool_monitor in _database_session_manager.replica_pool_monitors]
+    }
+
+def use_primary(database_session: Session) -> None:
+    """Alle weiteren Lesezugriffe der Session gehen an den Primary. Ohne Replikate wirkungslos."""
+    database_session.info["read_primary"] = True
+
+def reads_from_replica(database_session: Session) -> bool:
+    return isinstance(database_session, RoutingSession) and bool(database_session.replicas) and not database_session.info.get("read_primary")
+
+def is_recent_writer(database_session: Session, key: Optional[Hashable]) -> bool:
+    """Hat key (z.B. die User-ID) vor Kurzem geschrieben, sodass die Replikate womöglich noch nicht aktuell sind?"""
+    return isinstance(database_session, RoutingSession) and key is not None and key in database_session.recent_writers
+
+def remember_writer(database_session: Session, key: Optional[Hashable]) -> None:
+    """Nach dem Commit: Hat die Session geschrieben, liest key für eine Weile vom Primary."""
+    if isinstance(database_session, RoutingSession) and key is not None and database_session.info.get("wrote"):
+        database_session.recent_writers.add(key)
+
+def after_request_commit(database_session: Session, callback: Callable[[], Any]) -> None:
+    """
+    Führt callback erst nach dem Commit am Ende des Requests aus (z.B. Render-Jobs einreihen), bei einem Rollback nie.
+    Ein Job, der vorher startet, sieht die Zeilen des Requests nicht und darf nicht auf einem verworfenen Zustand arbeiten.
+    """
+    database_session.info.setdefault("after_request_commit", []).append(callback)
+
+def after_request_rollback(database_session: Session, callback: Callable[[], Any]) -> None:
+    """Führt callback aus, wenn der Request nicht committet (z.B. schon gespeicherte Dateien wieder löschen)."""
+    database_session.info.setdefault("after_request_rollback", []).append(callback)
+
+def finish_database_session(database_session: Session, committed: bool) -> None:
+    """Führt nach dem Ende des Requests die zum Ausgang passenden Callbacks aus und verwirft die anderen."""
+    callbacks = database_session.info.pop("after_request_commit", [])
+    rollback_callbacks = database_session.info.pop("after_request_rollback", [])
+    for callback in (callbacks if committed else reversed(rollback_callbacks)):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"finish_database_session(): Fehler: {e}")
+
+def open_database_session() -> Generator[Session, Any, None]:
+    """
+    Öffnet eine Session außerhalb der Dependency Injection (AccessHandlerMiddleware, Kommandos).
+    Mit close() des Generators wird die Session geschlossen und die Verbindung an den Pool zurückgegeben, nicht Committetes wird verworfen.
+    """
+    logger.info(f"open_database_session()")
     
     global _database_session_manager
     if _database_session_manager is None:
-        logger.error("get_database_session(): failed! manager not initilized")
+        logger.error("open_database_session(): failed! manager not initilized")
         return
 
+    gen = _database_session_manager.get_session()
     try:
-        gen = _database_session_manager.get_session() 
         session = next(gen)
         yield session
     except Exception as e:
-        logger.error(f"get_database_session(): Fehler: {e}")
+        logger.error(f"open_database_session(): Fehler: {e}")
         raise e
+    finally:
+        gen.close()
+
+def get_database_session(connection: HTTPConnection) -> Generator[Session, Any, None]:
+    """
+    Session des Requests. Die AccessHandlerMiddleware öffnet sie vor der Rechteprüfung, die Route bekommt dieselbe
+    Session, und die Middleware committet einmal am Ende des Requests. Services schreiben deshalb nur mit flush().
+    Ohne Session der Middleware (WebSockets) ist die Dependency selbst die Arbeitseinheit.
+    """
+    logger.info(f"get_database_session()")
+
+    database_session = getattr(connection.state, "database_session", None)
+    if database_session is not None:
+        yield database_session
+        return
+
+    database_session_generator = open_database_session()
+    committed = False
+    try:
+        database_session = next(database_session_generator)
+        yield database_session
+        database_session.commit()
+        committed = True
+    finally:
+        database_session_generator.close()
+        if database_session is not None:
+            finish_database_session(database_session, committed)
+
+def release_database_session(database_session: Session) -> None:
+    """
+    Gibt die Verbindung des Requests vor langsamer Arbeit (Upload des Bodys, ffmpeg, Instagram) an den Pool zurück.
+    Nur solange der Request nichts geschrieben hat: es endet eine reine Lesetransaktion, der Request committet weiterhin
+    genau einmal am Ende. Erst das nächste Statement holt wieder eine Verbindung, geladene Objekte bleiben lesbar (expire_on_commit=False).
+    Wer danach schreibt, schreibt in die Transaktion, die die AccessHandlerMiddleware committet.
+    """
+    if has_pending_writes(database_session):
+        raise RuntimeError("release_database_session(): the request has already written, it would be committed early")
+    # Read-only, so ending the transaction this way writes nothing. A rollback would also drop the outer transaction of the tests
+    database_session.commit()
+
+def has_pending_writes(database_session: Session) -> bool:
+    """Hat die Session in der laufenden Transaktion geschrieben oder Änderungen, die beim nächsten flush() geschrieben würden?"""
+    return bool(database_session.info.get("pending_writes") or database_session.new or database_session.dirty or database_session.deleted)
+
+@event.listens_for(Session, "after_flush")
+def _remember_flush(session: Session, flush_context) -> None:
+    session.info["pending_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _remember_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["pending_writes"] = True
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_writes(session: Session, transaction) -> None:
+    # Only the outermost transaction ends the writes, not a savepoint
+    if transaction.parent is None:
+        session.info.pop("pending_writes", None)
+
+@contextmanager
+def open_background_session(database_session: Session) -> Generator[Session, Any, None]:
+    """
+    Öffnet eine eigene Session auf derselben Datenbank wie database_session, für Render-Jobs, die nach dem Request laufen.
+    Die Session des Requests ist dann schon geschlossen und darf nicht aus einem anderen Thread verwendet werden.
+    Ist database_session an eine Verbindung mit offener Transaktion gebunden (Tests), läuft die neue Session in dieser Transaktion.
+    Am Ende des with-Blocks wird committet, bei einem Fehler verworfen.
+    """
+    with Session(bind=database_session.get_bind()) as job_database_session:
+        yield job_database_session
+        job_database_session.commit()
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Generator, Optional, TypeVar
+
+from dotenv import load_dotenv
+
+from api.utils.concurrency.bounded_executor import BoundedExecutor
+from api.utils.concurrency.event_loop_monitor import EventLoopMonitor
+
+# Logger für die Session-Verwaltung
+logger = logging.getLogger("sessions.executor")
+
+"""ENV"""
+load_dotenv()
+# Getrennte Pools, damit z.B. viele langsame ffmpeg-Aufrufe keine Datenbankabfragen aushungern
+EXECUTOR_DATABASE_WORKERS = int(os.getenv("EXECUTOR_DATABASE_WORKERS", "16"))
+EXECUTOR_IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "8"))
+# Medienarbeit (ffprobe, moviepy/numpy) läuft in eigenen Prozessen, der Pool begrenzt, wie viele gleichzeitig CPU belegen
+EXECUTOR_MEDIA_WORKERS = int(os.getenv("EXECUTOR_MEDIA_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+EXECUTOR_MAX_QUEUE = int(os.getenv("EXECUTOR_MAX_QUEUE", "256"))
+EVENT_LOOP_MONITOR_INTERVAL = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", "0.05"))
+EVENT_LOOP_WARN_SECONDS = float(os.getenv("EVENT_LOOP_WARN_SECONDS", "0.1"))
+
+T = TypeVar("T")
+
+class ExecutorSessionManager:
+    def __init__(
+        self,
+        database_workers: int = EXECUTOR_DATABASE_WORKERS,
+        io_workers: int = EXECUTOR_IO_WORKERS,
+        media_workers: int = EXECUTOR_MEDIA_WORKERS,
+        max_queue: int = EXECUTOR_MAX_QUEUE
+    ) -> None:
+        """Initialisiert die Pools für blockierende Aufrufe: Datenbank, Ein-/Ausgabe (Dateien, E-Mail) und Medien (ffmpeg, ffprobe, Renderings)."""
+        logger.info(f"__init__(): database={database_workers} io={io_workers} media={media_workers} workers")
+        self.database = BoundedExecutor("database", database_workers, max_queue)
+        self.io = BoundedExecutor("io", io_workers, max_queue)
+        self.media = BoundedExecutor("media", media_workers, max_queue, processes=True)
+        self.event_loop_monitor = EventLoopMonitor(EVENT_LOOP_MONITOR_INTERVAL, EVENT_LOOP_WARN_SECONDS)
+
+    def get_session(self) -> Generator["ExecutorSessionManager", None, None]:
+        logger.info(f"get_session()")
+        try:
+            yield self
+        finally:
+            logger.info(f"get_session(): closed session")
+
+    def stats(self) -> dict:
+        """Auslastung aller Pools und Blockierung der Event-Loop."""
+        return {
+            "database": self.database.stats(),
+            "io": self.io.stats(),
+            "media": self.media.stats(),
+            "event_loop": self.event_loop_monitor.stats()
+        }
+
+    def shutdown(self) -> None:
+        logger.info(f"shutdown()")
+        self.event_loop_monitor.stop()
+        for executor in (self.database, self.io, self.media):
+            executor.shutdown()
+
+
+_executor_session_manager = None
+
+def init_executor_session_manager() -> None:
+    """Erzeugt die Pools, in einer laufenden Event-Loop (lifespan) startet auch die Messung ihrer Blockierung."""
+    global _executor_session_manager
+    logger.info(f"init_executor_session_manager()")
+
+    if _executor_session_manager is None:
+        _executor_session_manager = ExecutorSessionManager()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        _executor_session_manager.event_loop_monitor.start()
+    else:
+        logger.warning(f"init_executor_session_manager(): already initialized")
+
+def shutdown_executor_session_manager() -> None:
+    global _executor_session_manager
+    logger.info(f"shutdown_executor_session_manager()")
+
+    if _executor_session_manager is not None:
+        _executor_session_manager.shutdown()
+    _executor_session_manager = None
+
+def get_executor_session() -> Generator[Optional[ExecutorSessionManager], None, None]:
+    global _executor_session_manager
+    logger.info(f"get_executor_session()")
+
+    if _executor_session_manager is None:
+        logger.error(f"get_executor_session(): failed! manager not initialized")
+        return
+
+    try:
+        gen = _executor_session_manager.get_session()
+        session = next(gen)
+        yield session
+    except Exception as e:
+        logger.error(f"get_executor_session(): Error: {e}")
+        raise e
+
+def _manager() -> ExecutorSessionManager:
+    if _executor_session_manager is None:
+        raise RuntimeError("Executor session manager not initialized")
+    return _executor_session_manager
+
+async def run_database(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Führt einen blockierenden Datenbankaufruf aus einer async-Route im Datenbank-Pool aus."""
+    return await _manager().database.run(func, *args, **kwargs)
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Führt blockierende Ein-/Ausgabe (Dateispeicher, Uploads, E-Mail-Versand) aus einer async-Route im Ein-/Ausgabe-Pool aus."""
+    return await _manager().io.run(func, *args, **kwargs)
+
+async def run_media(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Führt Medienverarbeitung (ffmpeg, ffprobe, Audio-Beds) aus einer async-Route in einem Prozess des Medien-Pools aus.
+    func muss eine Funktion auf Modulebene sein und nur picklebare Argumente (Pfade, Zahlen) bekommen.
+    """
+    return await _manager().media.run(func, *args, **kwargs)
@@ -1,13 +1,31 @@
 import copy
+import errno
+import fcntl
+import hashlib
+import io
+import json
 import logging
 import os
+import shutil
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from distutils.util import strtobool
-from typing import Dict, Generator, List, Optional
+from types import MappingProxyType
+from typing import BinaryIO, Callable, ContextManager, Dict, Generator, Iterable, Iterator, List, Mapping, Optional, Set, TextIO, Tuple
+from urllib.parse import quote
 
 from dotenv import load_dotenv
 
-from api.exceptions.sessions.files import DirectoryNotFoundError, FileDeleteError, FileExistsInSessionError, FileNotFoundInSessionError
+from api.exceptions.sessions.files import DirectoryNotFoundError, FileDeleteError, FileExistsInSessionError, FileNotFoundInSessionError, FileSessionError
+from api.utils.database.create_uuid import create_uuid
+from api.utils.files.fsync_batcher import FsyncBatcher
+from api.utils.files.fsync_path import fsync_path
+from api.utils.files.s3_client import S3Client, S3Object
+from api.utils.files.temporary_file_path import temporary_file_path
 
 # Logger für die Session-Verwaltung
 logger = logging.getLogger("sessions.files")
@@ -18,8 +36,64 @@ FILES_LOCAL = bool(strtobool(os.getenv("FILES_LOCAL")))
 FILES_LOCAL_FILL = bool(strtobool(os.getenv("FILES_LOCAL_FILL")))
 FILES_PRINT = bool(strtobool(os.getenv("FILES_PRINT")))
 
+# Wann lokal geschriebene Dateien per fsync auf die Festplatte kommen: "always" vor der Rückkehr jedes Schreibens,
+# "batch" gebündelt im Hintergrund spätestens nach FILES_LOCAL_FSYNC_INTERVAL Sekunden, "never" nach Ermessen des Betriebssystems
+FILES_LOCAL_FSYNC = os.getenv("FILES_LOCAL_FSYNC", "batch")
+FILES_LOCAL_FSYNC_INTERVAL = float(os.getenv("FILES_LOCAL_FSYNC_INTERVAL", "1.0"))
+FSYNC_MODES = ("always", "batch", "never")
+
+FILES_REMOTE_ENDPOINT = os.getenv("FILES_REMOTE_ENDPOINT")
+FILES_REMOTE_BUCKET = os.getenv("FILES_REMOTE_BUCKET")
+FILES_REMOTE_ACCESS_KEY = os.getenv("FILES_REMOTE_ACCESS_KEY")
+FILES_REMOTE_SECRET_KEY = os.getenv("FILES_REMOTE_SECRET_KEY")
+FILES_REMOTE_REGION = os.getenv("FILES_REMOTE_REGION", "us-east-1")
+FILES_REMOTE_PREFIX = os.getenv("FILES_REMOTE_PREFIX", "")
+FILES_REMOTE_PUBLIC_URL = os.getenv("FILES_REMOTE_PUBLIC_URL")
+FILES_REMOTE_POOL_SIZE = int(os.getenv("FILES_REMOTE_POOL_SIZE", "16"))
+FILES_REMOTE_PART_SIZE = int(os.getenv("FILES_REMOTE_PART_SIZE", str(8 * 1024 * 1024)))
+
+# Lokaler Cache vor dem Fernspeicher für häufig gelesene Verzeichnisse (Demo-Slot, Songs, Edits, ...)
+FILES_CACHE = bool(strtobool(os.getenv("FILES_CACHE", "false")))
+FILES_CACHE_DIR = os.getenv("FILES_CACHE_DIR", "./outgoing/files_cache")
+FILES_CACHE_MAX_BYTES = int(os.getenv("FILES_CACHE_MAX_BYTES", str(5 * 1024 * 1024 * 1024)))
+FILES_CACHE_DIRS = os.getenv("FILES_CACHE_DIRS", "demo_slot,songs,audio_beds,edits,edit_templates,normalized_occupied_slots").split(",")
+
+# Kleine, oft gelesene und selten geänderte Dateien (Demo-Clip, Songs) zusätzlich als Bytes im Arbeitsspeicher.
+# FILES_HOT_WARM_UP listet Dateien als "Verzeichnis/Dateiname", die schon beim Start geladen werden
+FILES_HOT = bool(strtobool(os.getenv("FILES_HOT", "true")))
+FILES_HOT_MAX_BYTES = int(os.getenv("FILES_HOT_MAX_BYTES", str(128 * 1024 * 1024)))
+FILES_HOT_MAX_ENTRIES = int(os.getenv("FILES_HOT_MAX_ENTRIES", "64"))
+FILES_HOT_MAX_FILE_BYTES = int(os.getenv("FILES_HOT_MAX_FILE_BYTES", str(16 * 1024 * 1024)))
+FILES_HOT_DIRS = os.getenv("FILES_HOT_DIRS", "demo_slot,songs,audio_beds").split(",")
+FILES_HOT_WARM_UP = [file for file in os.getenv("FILES_HOT_WARM_UP", "demo_slot/demo").split(",") if file]
+
+# Standardgröße der Stücke für iter_chunks() und Kopien zwischen Dateiobjekten
+CHUNK_SIZE = 1024 * 1024
+
+# ioctl FICLONE (linux/fs.h), teilt die Datenblöcke auf Dateisystemen wie btrfs oder XFS
+FICLONE = 0x40049409
+
+# Lokale Dateien liegen in Unterverzeichnissen nach den ersten Hex-Zeichen des SHA-1 ihres Namens (z.B. edits/3f/12.mp4),
+# damit auch bei sehr vielen Dateien kein einzelnes Verzeichnis groß wird
+SHARD_PREFIX_LENGTH = 2
+
+def shard_of(file_name: str) -> str:
+    """Gibt das Unterverzeichnis zurück, in dem eine Datei mit diesem Namen (ohne Endung) liegt."""
+    return hashlib.sha1(file_name.encode("utf-8")).hexdigest()[:SHARD_PREFIX_LENGTH]
+
+def is_temp_file(file_name: str) -> bool:
+    """Temporäre Dateien, die beim Schreiben neben der Zieldatei entstehen und erst fertig umbenannt werden."""
+    return file_name.startswith(".") and file_name.endswith(".tmp")
+
+def is_shard(dir_name: str) -> bool:
+    """Prüft, ob ein Verzeichnisname ein Unterverzeichnis nach shard_of() ist."""
+    return len(dir_name) == SHARD_PREFIX_LENGTH and all(char in "0123456789abcdef" for char in dir_name)
+
 """Base File Session Manager"""
 class BaseFileSessionManager(ABC):
+    # True, wenn path() die gespeicherte Datei selbst bereitstellt, ohne sie zu kopieren
+    local_paths = False
+
     @abstractmethod
     def __init__(self):
         """Initialisiert den Dateispeicher."""
@@ -63,19 +137,78 @@ class BaseFileSessionManager(ABC):
         self.clear()
 
     @abstractmethod
-    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
-        """Speichert eine Datei."""
+    def open_read(self, file_name: str, dir: str) -> ContextManager[BinaryIO]:
+        """Öffnet eine Datei für die Dauer des with-Blocks als lesbares Dateiobjekt."""
         pass
 
     @abstractmethod
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> ContextManager[BinaryIO]:
+        """
+        Öffnet eine Datei für die Dauer des with-Blocks als schreibbares Dateiobjekt.
+        Mit file_extension wird eine neue Datei angelegt (wie create()), ohne wird die vorhandene Datei ersetzt (wie update()).
+        """
+        pass
+
+    def iter_chunks(self, file_name: str, dir: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Liefert eine Datei stückweise, ohne sie vollständig in den Speicher zu laden."""
+        with self.open_read(file_name, dir) as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    def get_range(self, file_name: str, dir: str, start: int, length: int) -> bytes:
+        """Liest einen Ausschnitt einer Datei ab Byte start, am Dateiende auch weniger als length Bytes."""
+        with self.open_read(file_name, dir) as file:
+            file.seek(start)
+            return file.read(length)
+
+    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
+        """Speichert eine Datei."""
+        with self.open_write(file_name, dir, file_extension) as file:
+            file.write(file_data)
+        return self.location(file_name, file_extension, dir)
+
     def get(self, file_name: str, dir: str) -> bytes:
         """Liest eine Datei."""
+        with self.open_read(file_name, dir) as file:
+            return file.read()
+
+    @abstractmethod
+    def path(self, file_name: str, dir: str) -> ContextManager[str]:
+        """Stellt eine Datei für die Dauer des with-Blocks als lokalen Pfad zum Lesen bereit (z.B. für ffmpeg), ohne sie durch Python zu lesen."""
+        pass
+
+    @abstractmethod
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        """Speichert eine Datei aus einem lokalen Pfad, die Quelldatei wird dabei übernommen (verschoben)."""
+        pass
+
+    @abstractmethod
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        """Ersetzt eine Datei durch die Datei unter einem lokalen Pfad, die Quelldatei wird dabei übernommen (verschoben)."""
         pass
 
     @abstractmethod
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        """Gibt die Adresse zurück, unter der eine Datei erreichbar ist bzw. nach create() sein wird."""
+        pass
+
+    @abstractmethod
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        """Kopiert eine Datei (mit gleicher Endung) innerhalb des Dateispeichers, ohne sie durch Python zu lesen."""
+        pass
+
+    def move(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        """Verschiebt eine Datei (mit gleicher Endung) innerhalb des Dateispeichers, z.B. einen vorab gespeicherten Upload an seinen Platz."""
+        location = self.copy(file_name, dir, target_file_name, target_dir)
+        self.remove(file_name, dir)
+        return location
+
     def update(self, file_name: str, file_data: bytes, dir: str) -> str:
         """Aktualisiert eine Datei."""
-        pass
+        file_extension = self._file_extension(file_name, dir)
+        with self.open_write(file_name, dir) as file:
+            file.write(file_data)
+        return self.location(file_name, file_extension, dir)
 
     @abstractmethod
     def remove(self, file_name: str, dir: str) -> None:
@@ -97,14 +230,42 @@ class BaseFileSessionManager(ABC):
         """Listet alle Dateien im Dateispeicher auf."""
         pass
 
+    def _file_extension(self, file_name: str, dir: str) -> str:
+        """Gibt die Endung einer vorhandenen Datei zurück."""
+        for file in self.list(dir):
+            if file.startswith(f"{file_name}."):
+                return file[len(file_name) + 1:]
+        raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+
 
 """Implementations for Different File Session Managers"""
 class LocalFileSessionManager(BaseFileSessionManager):
-    def __init__(self) -> None:
-        """Initialisiert den lokalen Dateispeicher."""
+    local_paths = True
+
+    def __init__(
+        self,
+        local_media_repo_folder: str = "./outgoing/files",
+        index_path: str = "./outgoing/files_index.jsonl",
+        fsync: str = FILES_LOCAL_FSYNC,
+        fsync_interval: float = FILES_LOCAL_FSYNC_INTERVAL
+    ) -> None:
+        """Initialisiert den lokalen Dateispeicher und lädt den Index der Dateinamen."""
         logger.info(f"__init__(): (local)")
-        self.local_media_repo_folder = f"./outgoing/files"
+        self.local_media_repo_folder = local_media_repo_folder
         os.makedirs(self.local_media_repo_folder, exist_ok=True)
+
+        if fsync not in FSYNC_MODES:
+            raise FileSessionError(f"Unknown fsync mode '{fsync}', expected one of {FSYNC_MODES}")
+        self.fsync = fsync
+        self.fsync_batcher = FsyncBatcher(fsync_interval)
+
+        # Verzeichnis -> Dateiname (ohne Endung) -> Pfad relativ zum Verzeichnis (z.B. "3f/12.mp4"),
+        # damit Zugriffe nicht jedes Mal das ganze Verzeichnis auflisten müssen
+        self.index: Dict[str, Dict[str, str]] = {}
+        self.index_path = index_path
+        self.index_lock = threading.Lock()
+        self.index_journal: Optional[TextIO] = None
+        self._load_index()
         logger.info(f"__init__(): Local file storage initialized at {self.local_media_repo_folder}")
 
         if FILES_LOCAL_FILL:
@@ -122,61 +283,137 @@ class LocalFileSessionManager(BaseFileSessionManager):
         finally:
             logger.info(f"get_session(): closed session (local)")
 
-    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
-        logger.info("create(): (lokal)")
-        """Speichert eine Datei mit Dateinamen und Dateiendung."""
-        complete_file_name = f"{file_name}.{file_extension}"
-        file_path = os.path.join(self.local_media_repo_folder, dir, complete_file_name)
-        
-        if os.path.exists(file_path):
-            raise FileExistsInSessionError(f"File '{complete_file_name}' already exists in '{dir}'")
-        
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
-        
-        logger.info(f"create(): Saved file '{complete_file_name}' in '{dir}'")
-        return f"http://localhost:8000/files/{dir}/{complete_file_name}"
+    def file_path(self, file_name: str, dir: str) -> str:
+        """Gibt den Pfad einer Datei im Dateispeicher anhand des Index zurück."""
+        relative_path = self.index.get(dir, {}).get(file_name)
+        if relative_path is None:
+            if not os.path.isdir(os.path.join(self.local_media_repo_folder, dir)):
+                raise DirectoryNotFoundError(f"Directory '{dir}' does not exist")
+            raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+        return os.path.join(self.local_media_repo_folder, dir, relative_path)
 
-    def get(self, file_name: str, dir: str) -> bytes:
-        logger.info("get(): (lokal)")
-        """Liest eine Datei basierend auf dem Dateinamen (ohne Endung)."""
-        files = self.list(dir)
-        for file in files:
-            if file.startswith(f"{file_name}."):
-                logger.info(f"get(): Retrieved file '{file}' from '{dir}'")
-                file_path = os.path.join(self.local_media_repo_folder, dir, file)
-                with open(file_path, 'rb') as f:
-                    return f.read()
-        
-        raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+    @contextmanager
+    def open_read(self, file_name: str, dir: str) -> Iterator[BinaryIO]:
+        logger.info("open_read(): (lokal)")
+        """Öffnet die Datei im Dateispeicher selbst."""
+        try:
+            f = open(self.file_path(file_name, dir), 'rb')
+        except FileNotFoundError:
+            # Removed behind the session's back, the index must not keep pointing at it
+            self._unindex(file_name, dir)
+            raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+        with f:
+            logger.info(f"open_read(): Opened file '{file_name}' from '{dir}'")
+            yield f
 
-    def update(self, file_name: str, file_data: bytes, dir: str) -> str:
-        logger.info("update(): (lokal)")
-        """Aktualisiert eine Datei basierend auf ihrem Dateinamen (ohne Endung)."""
-        files = self.list(dir)
-        for file in files:
-            if file.startswith(f"{file_name}."):
-                file_path = os.path.join(self.local_media_repo_folder, dir, file)
-                with open(file_path, 'wb') as f:
-                    f.write(file_data)
-                logger.info(f"update(): Updated file '{file}' in '{dir}'")
-                return f"http://localhost:8000/files/{dir}/{file}"
-        
-        raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+    @contextmanager
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> Iterator[BinaryIO]:
+        logger.info("open_write(): (lokal)")
+        """
+        Schreibt in eine temporäre Datei neben der Zieldatei, die erst nach dem with-Block an deren Stelle umbenannt wird.
+        Leser (z.B. die statischen Routen) sehen so immer die alte oder die neue Datei, nie eine halb geschriebene.
+        """
+        if file_extension is None:
+            file_path = self.file_path(file_name, dir)
+        else:
+            relative_path = self._new_file(file_name, file_extension, dir)
+            file_path = os.path.join(self.local_media_repo_folder, dir, relative_path)
+
+        temp_path = self._temp_path(file_path)
+        try:
+            with open(temp_path, 'wb') as f:
+                yield f
+            self._commit(temp_path, file_path)
+        except BaseException:
+            self._remove_temp(temp_path)
+            raise
+
+        if file_extension is None:
+            logger.info(f"open_write(): Updated file '{file_path}'")
+            return
+        self._index(file_name, dir, relative_path)
+        logger.info(f"open_write(): Saved file '{relative_path}' in '{dir}'")
+
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        return f"http://localhost:8000/files/{dir}/{file_name}.{file_extension}"
+
+    @contextmanager
+    def path(self, file_name: str, dir: str) -> Iterator[str]:
+        logger.info("path(): (lokal)")
+        """Gibt den Pfad der Datei im Dateispeicher selbst zurück, es wird nichts kopiert."""
+        file_path = self.file_path(file_name, dir)
+        logger.info(f"path(): Providing file '{file_path}'")
+        yield file_path
+
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        logger.info("create_from_path(): (lokal)")
+        """Verschiebt eine Datei in den Dateispeicher, auf demselben Dateisystem per rename."""
+        relative_path = self._new_file(file_name, file_extension, dir)
+        self._move_in(source_path, os.path.join(self.local_media_repo_folder, dir, relative_path))
+        self._index(file_name, dir, relative_path)
+
+        logger.info(f"create_from_path(): Saved file '{relative_path}' in '{dir}'")
+        return self.location(file_name, file_extension, dir)
+
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        logger.info("copy(): (lokal)")
+        """Kopiert eine Datei per Reflink, falls das Dateisystem es unterstützt, sonst per Kernel-Kopie."""
+        source_path = self.file_path(file_name, dir)
+        file_extension = self._file_extension(file_name, dir)
+        relative_path = self._new_file(target_file_name, file_extension, target_dir)
+        target_path = os.path.join(self.local_media_repo_folder, target_dir, relative_path)
+
+        # No hardlink, so that changes made to one of the files outside of the session never show up in the other
+        temp_path = self._temp_path(target_path)
+        try:
+            try:
+                with open(source_path, 'rb') as source, open(temp_path, 'wb') as target:
+                    fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+                logger.info(f"copy(): Reflinked '{source_path}' to '{target_path}'")
+            except OSError:
+                shutil.copyfile(source_path, temp_path)
+                logger.info(f"copy(): Copied '{source_path}' to '{target_path}'")
+            self._commit(temp_path, target_path)
+        except BaseException:
+            self._remove_temp(temp_path)
+            raise
+
+        self._index(target_file_name, target_dir, relative_path)
+        return self.location(target_file_name, file_extension, target_dir)
+
+    def move(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        logger.info("move(): (lokal)")
+        """Benennt die Datei um, ohne sie zu kopieren."""
+        source_path = self.file_path(file_name, dir)
+        file_extension = self._file_extension(file_name, dir)
+        relative_path = self._new_file(target_file_name, file_extension, target_dir)
+        target_path = os.path.join(self.local_media_repo_folder, target_dir, relative_path)
+
+        self._commit(source_path, target_path)
+        self._unindex(file_name, dir)
+        self._index(target_file_name, target_dir, relative_path)
+        logger.info(f"move(): Moved '{source_path}' to '{target_path}'")
+        return self.location(target_file_name, file_extension, target_dir)
+
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        logger.info("update_from_path(): (lokal)")
+        """Ersetzt eine Datei basierend auf ihrem Dateinamen (ohne Endung), Leser der alten Datei lesen diese zu Ende."""
+        file_path = self.file_path(file_name, dir)
+        self._move_in(source_path, file_path)
+        logger.info(f"update_from_path(): Updated file '{file_path}'")
+        return self.location(file_name, self._file_extension(file_name, dir), dir)
 
     def remove(self, file_name: str, dir: str) -> None:
         logger.info("remove(): (lokal)")
         """Löscht eine Datei basierend auf ihrem Dateinamen (ohne Endung)."""
-        files = self.list(dir)
-        for file in files:
-            if file.startswith(f"{file_name}."):
-                file_path = os.path.join(self.local_media_repo_folder, dir, file)
-                os.remove(file_path)
-                logger.info(f"remove(): Deleted file '{file}' from '{dir}'")
-                return
-        
-        raise FileDeleteError(f"File '{file_name}' not found in '{dir}'")
+        try:
+            file_path = self.file_path(file_name, dir)
+        except FileNotFoundInSessionError:
+            raise FileDeleteError(f"File '{file_name}' not found in '{dir}'")
+
+        self._unindex(file_name, dir)
+        os.remove(file_path)
+        logger.info(f"remove(): Deleted file '{file_path}'")
 
     def clear(self) -> None:
         logger.info(f"clear(): Clearing all files from '{self.local_media_repo_folder}'")
@@ -186,75 +423,353 @@ class LocalFileSessionManager(BaseFileSessionManager):
             for dirname in os.listdir(dirpath):
                 os.rmdir(os.path.join(dirpath, dirname))
 
+        with self.index_lock:
+            self.index = {}
+            self._write_index()
+
     def list(self, dir: str) -> List[str]:
         logger.info("list(): (lokal)")
         dir_path = os.path.join(self.local_media_repo_folder, dir)
         if not os.path.exists(dir_path):
             raise DirectoryNotFoundError(f"Directory '{dir}' does not exist")
         
-        files = os.listdir(dir_path)
-        logger.info(f"list(): Listing files in directory '{dir}': {files}")
+        files = [os.path.basename(relative_path) for relative_path in self.index.get(dir, {}).values()]
+        logger.info(f"list(): Listing {len(files)} files in directory '{dir}'")
         return files
 
     def list_all(self) -> List[str]:
         logger.info("list_all(): (lokal)")
-        all_files = []
+        return [
+            os.path.normpath(os.path.join(dir, os.path.basename(relative_path)))
+            for dir, files in self.index.items()
+            for relative_path in files.values()
+        ]
+
+    def rebuild_index(self) -> None:
+        """Baut den Index aus dem Verzeichnisbaum neu auf, z.B. nachdem Dateien an der Sitzung vorbei verändert wurden."""
+        logger.info("rebuild_index(): (lokal)")
+        index: Dict[str, Dict[str, str]] = {}
         for dirpath, _, filenames in os.walk(self.local_media_repo_folder):
+            dir = os.path.relpath(dirpath, self.local_media_repo_folder)
+            parent_dir, shard = os.path.split(dir)
+            if parent_dir and is_shard(shard):
+                dir = parent_dir
+            else:
+                shard = ""
+
             for filename in filenames:
-                relative_path = os.path.relpath(os.path.join(dirpath, filename), self.local_media_repo_folder)
-                all_files.append(relative_path)
-        return all_files
+                if is_temp_file(filename):
+                    continue
+                index.setdefault(dir, {})[os.path.splitext(filename)[0]] = os.path.join(shard, filename)
+
+        with self.index_lock:
+            self.index = index
+            self._write_index()
+        logger.info(f"rebuild_index(): Indexed {sum(len(files) for files in index.values())} files")
+
+    def shutdown(self) -> None:
+        """Schreibt ausstehende Änderungen auf die Festplatte."""
+        logger.info(f"shutdown(): (local)")
+        self.fsync_batcher.close()
+
+    def _file_extension(self, file_name: str, dir: str) -> str:
+        return os.path.basename(self.file_path(file_name, dir))[len(file_name) + 1:]
+
+    def _temp_path(self, file_path: str) -> str:
+        # Next to the target, so that os.replace() stays on one file system, hidden from rebuild_index()
+        return os.path.join(os.path.dirname(file_path), f".{create_uuid()}.tmp")
+
+    def _remove_temp(self, temp_path: str) -> None:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _commit(self, temp_path: str, file_path: str) -> None:
+        """Ersetzt file_path atomar durch die fertig geschriebene temporäre Datei und sorgt je nach fsync für Dauerhaftigkeit."""
+        if self.fsync == "always":
+            fsync_path(temp_path)
+        os.replace(temp_path, file_path)
+        if self.fsync == "always":
+            fsync_path(os.path.dirname(file_path))
+        elif self.fsync == "batch":
+            self.fsync_batcher.add(file_path)
+
+    def _move_in(self, source_path: str, file_path: str) -> None:
+        """Verschiebt eine Datei atomar an file_path, von einem anderen Dateisystem über eine temporäre Kopie daneben."""
+        try:
+            # rename is atomic, but only within one file system
+            self._commit(source_path, file_path)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        temp_path = self._temp_path(file_path)
+        try:
+            shutil.copyfile(source_path, temp_path)
+            self._commit(temp_path, file_path)
+        except BaseException:
+            self._remove_temp(temp_path)
+            raise
+        os.remove(source_path)
+
+    def _new_file(self, file_name: str, file_extension: str, dir: str) -> str:
+        """Prüft, dass der Name frei ist, legt das Unterverzeichnis an und gibt den Pfad relativ zum Verzeichnis zurück."""
+        if file_name in self.index.get(dir, {}):
+            raise FileExistsInSessionError(f"File '{file_name}.{file_extension}' already exists in '{dir}'")
+
+        relative_path = os.path.join(shard_of(file_name), f"{file_name}.{file_extension}")
+        os.makedirs(os.path.dirname(os.path.join(self.local_media_repo_folder, dir, relative_path)), exist_ok=True)
+        return relative_path
+
+    def _load_index(self) -> None:
+        """Liest das Journal des Index ein und schreibt es kompakt neu, ohne Journal wird der Verzeichnisbaum durchsucht."""
+        if not os.path.exists(self.index_path):
+            logger.info(f"_load_index(): No index at '{self.index_path}', scanning '{self.local_media_repo_folder}'")
+            self.rebuild_index()
+            return
+
+        with open(self.index_path, 'r', encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last line can be torn, by a crash while appending
+                    logger.warning(f"_load_index(): Skipping unreadable index entry")
+                    continue
+                if entry["path"] is None:
+                    self.index.get(entry["dir"], {}).pop(entry["name"], None)
+                else:
+                    self.index.setdefault(entry["dir"], {})[entry["name"]] = entry["path"]
+
+        with self.index_lock:
+            self._write_index()
+        logger.info(f"_load_index(): Loaded {sum(len(files) for files in self.index.values())} files from '{self.index_path}'")
+
+    def _write_index(self) -> None:
+        """Ersetzt das Journal durch einen Schnappschuss des Index und öffnet es zum Anhängen. Nur mit index_lock aufrufen."""
+        if self.index_journal is not None:
+            self.index_journal.close()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        temp_index_path = f"{self.index_path}.tmp"
+        with open(temp_index_path, 'w', encoding="utf-8") as snapshot:
+            for dir, files in self.index.items():
+                for file_name, relative_path in files.items():
+                    snapshot.write(json.dumps({"dir": dir, "name": file_name, "path": relative_path}) + "\n")
+        os.replace(temp_index_path, self.index_path)
+
+        # Line buffered, every change reaches the file before the call returns
+        self.index_journal = open(self.index_path, 'a', encoding="utf-8", buffering=1)
+
+    def _index(self, file_name: str, dir: str, relative_path: str) -> None:
+        with self.index_lock:
+            self.index.setdefault(dir, {})[file_name] = relative_path
+            self.index_journal.write(json.dumps({"dir": dir, "name": file_name, "path": relative_path}) + "\n")
+
+    def _unindex(self, file_name: str, dir: str) -> None:
+        with self.index_lock:
+            if self.index.get(dir, {}).pop(file_name, None) is not None:
+                self.index_journal.write(json.dumps({"dir": dir, "name": file_name, "path": None}) + "\n")
+
+class _OverlayDir(MutableMapping):
+    """Dateien eines Verzeichnisses: Lesen aus der gemeinsamen Basis, Schreiben und Löschen nur in die eigenen Änderungen."""
+
+    def __init__(self, base: Mapping[str, bytes]) -> None:
+        self.base = base
+        self.changes: Dict[str, bytes] = {}
+        self.removed: Set[str] = set()
+
+    def __getitem__(self, file: str) -> bytes:
+        if file in self.changes:
+            return self.changes[file]
+        if file in self.removed:
+            raise KeyError(file)
+        return self.base[file]
+
+    def __setitem__(self, file: str, file_data: bytes) -> None:
+        self.changes[file] = file_data
+        self.removed.discard(file)
+
+    def __delitem__(self, file: str) -> None:
+        if file not in self:
+            raise KeyError(file)
+        self.changes.pop(file, None)
+        if file in self.base:
+            self.removed.add(file)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.changes
+        for file in self.base:
+            if file not in self.changes and file not in self.removed:
+                yield file
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+class _OverlayStorage(MutableMapping):
+    """Verzeichnisse einer Sitzung über der gemeinsamen Basis, die erst beim ersten Zugriff geladen wird."""
+
+    def __init__(self, load_base: Callable[[], Mapping[str, Mapping[str, bytes]]]) -> None:
+        self.load_base = load_base
+        self.dirs: Dict[str, _OverlayDir] = {}
+        self.removed: Set[str] = set()
+        self.cleared = False
+
+    def _base(self) -> Mapping[str, Mapping[str, bytes]]:
+        return {} if self.cleared else self.load_base()
+
+    def __getitem__(self, dir: str) -> _OverlayDir:
+        if dir not in self.dirs:
+            if dir in self.removed or dir not in self._base():
+                raise KeyError(dir)
+            self.dirs[dir] = _OverlayDir(self._base()[dir])
+        return self.dirs[dir]
+
+    def __setitem__(self, dir: str, files: Mapping[str, bytes]) -> None:
+        self.dirs[dir] = _OverlayDir({})
+        self.dirs[dir].update(files)
+        self.removed.discard(dir)
+
+    def __delitem__(self, dir: str) -> None:
+        self[dir]
+        del self.dirs[dir]
+        self.removed.add(dir)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.dirs
+        for dir in self._base():
+            if dir not in self.dirs and dir not in self.removed:
+                yield dir
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def setdefault(self, dir: str, default: Optional[Mapping[str, bytes]] = None) -> _OverlayDir:
+        if dir not in self:
+            self[dir] = default or {}
+        return self[dir]
+
+    def clear(self) -> None:
+        # Hides the base without loading it
+        self.dirs = {}
+        self.removed = set()
+        self.cleared = True
+
+# Unveränderliche Basis je Verzeichnis auf der Platte, wird im Prozess nur einmal gelesen und von allen Sitzungen geteilt
+_memory_file_bases: Dict[str, Mapping[str, Mapping[str, bytes]]] = {}
+_memory_file_bases_lock = threading.Lock()
+
+def _load_memory_file_base(input_dir: str) -> Mapping[str, Mapping[str, bytes]]:
+    """Liest alle Dateien eines Verzeichnisses als Basis für MemoryFileSessionManager ein."""
+    input_dir = os.path.abspath(input_dir)
+    with _memory_file_bases_lock:
+        if input_dir not in _memory_file_bases:
+            logger.info(f"_load_memory_file_base(): Loading '{input_dir}'")
+            base: Dict[str, Dict[str, bytes]] = {}
+            for root, _, files in os.walk(input_dir):
+                relative_path = os.path.relpath(root, input_dir)
+                for file_name in files:
+                    with open(os.path.join(root, file_name), 'rb') as f:
+                        base.setdefault(relative_path, {})[file_name] = f.read()
+            _memory_file_bases[input_dir] = MappingProxyType({dir: MappingProxyType(files) for dir, files in base.items()})
+        return _memory_file_bases[input_dir]
 
 class MemoryFileSessionManager(BaseFileSessionManager):
-    def __init__(self) -> None:
-        """Initialisiert den Dateispeicher im Speicher und füllt ihn mit Daten."""
+    def __init__(self, input_dir: str = "mock/files") -> None:
+        """Initialisiert den Dateispeicher im Speicher, die Daten aus input_dir werden erst beim ersten Zugriff gelesen."""
         logger.info(f"__init__(): (memory)")
-        self.memory_storage: Dict[str, Dict[str, bytes]] = {}
-        self._fill("mock/files")
+        self.input_dir = input_dir
+        self.memory_storage: MutableMapping[str, MutableMapping[str, bytes]] = _OverlayStorage(self._load_base)
+
+    def _load_base(self) -> Mapping[str, Mapping[str, bytes]]:
+        return _load_memory_file_base(self.input_dir)
 
     def get_session(self) -> Generator["BaseFileSessionManager", None, None]:
-        """Erzeugt eine transaktionale Dateisitzung im Speicher."""
+        """Erzeugt eine transaktionale Dateisitzung im Speicher, Änderungen bleiben in der Sitzung (Copy-on-Write)."""
         logger.info(f"get_session(): (memory)")
-        session_memory = copy.deepcopy(self.memory_storage)
+        session = copy.copy(self)
+        session.memory_storage = _OverlayStorage(self._load_base)
         try:
-            self.memory_storage = session_memory  # Nutze die Kopie während der Sitzung
-            yield self
+            yield session
         finally:
             logger.info(f"get_session(): closed session (memory)")
 
-    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
-        """Speichert eine Datei mit Dateinamen und Dateiendung im Speicher."""
-        logger.info("create(): (memory)")
-        complete_file_name = f"{file_name}.{file_extension}"
-        if dir not in self.memory_storage:
-            self.memory_storage[dir] = {}
-        if complete_file_name in self.memory_storage[dir]:
-            raise FileExistsInSessionError(f"File '{complete_file_name}' already exists in memory under '{dir}'")
-        self.memory_storage[dir][complete_file_name] = file_data
-        logger.info(f"create(): Saved file '{complete_file_name}' in memory under '{dir}'")
-        return f"memory://{dir}/{complete_file_name}"
-
-    def get(self, file_name: str, dir: str) -> bytes:
-        """Liest eine Datei basierend auf dem Dateinamen (ohne Endung) aus dem Speicher."""
-        logger.info("get(): (memory)")
+    @contextmanager
+    def open_read(self, file_name: str, dir: str) -> Iterator[BinaryIO]:
+        """Liest direkt aus den gespeicherten bytes, BytesIO teilt sich den Puffer, solange nicht geschrieben wird."""
+        logger.info("open_read(): (memory)")
         if dir not in self.memory_storage:
             raise DirectoryNotFoundError(f"Directory '{dir}' not found in memory")
         for file in self.memory_storage[dir]:
             if file.startswith(f"{file_name}."):
-                logger.info(f"get(): Retrieved file '{file}' from memory under '{dir}'")
-                return self.memory_storage[dir][file]
+                logger.info(f"open_read(): Opened file '{file}' from memory under '{dir}'")
+                with io.BytesIO(self.memory_storage[dir][file]) as f:
+                    yield f
+                return
         raise FileNotFoundInSessionError(f"File '{file_name}' not found in memory under '{dir}'")
 
-    def update(self, file_name: str, file_data: bytes, dir: str) -> str:
-        """Aktualisiert eine Datei basierend auf ihrem Dateinamen (ohne Endung) im Speicher."""
-        logger.info("update(): (memory)")
+    @contextmanager
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> Iterator[BinaryIO]:
+        """Schreibt in einen Puffer, der erst am Ende des with-Blocks (ohne Fehler) in den Speicher übernommen wird."""
+        logger.info("open_write(): (memory)")
+        if file_extension is None:
+            if dir not in self.memory_storage:
+                raise DirectoryNotFoundError(f"Directory '{dir}' not found in memory")
+            complete_file_name = f"{file_name}.{self._file_extension(file_name, dir)}"
+        else:
+            complete_file_name = f"{file_name}.{file_extension}"
+            if complete_file_name in self.memory_storage.get(dir, {}):
+                raise FileExistsInSessionError(f"File '{complete_file_name}' already exists in memory under '{dir}'")
+
+        with io.BytesIO() as f:
+            yield f
+            self.memory_storage.setdefault(dir, {})[complete_file_name] = f.getvalue()
+        logger.info(f"open_write(): Saved file '{complete_file_name}' in memory under '{dir}'")
+
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        return f"memory://{dir}/{file_name}.{file_extension}"
+
+    @contextmanager
+    def path(self, file_name: str, dir: str) -> Iterator[str]:
+        """Schreibt die Datei aus dem Speicher in eine temporäre Datei, die nach dem with-Block gelöscht wird."""
+        logger.info("path(): (memory)")
+        with self.open_read(file_name, dir) as source, temporary_file_path(self._file_extension(file_name, dir)) as temp_file_path:
+            with open(temp_file_path, 'wb') as temp_file:
+                shutil.copyfileobj(source, temp_file, CHUNK_SIZE)
+            yield temp_file_path
+
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        """Liest die Datei in den Speicher und löscht die Quelldatei."""
+        logger.info("create_from_path(): (memory)")
+        with open(source_path, 'rb') as source:
+            location = self.create(file_name, file_extension, source.read(), dir)
+        os.remove(source_path)
+        return location
+
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        """Liest die Datei in den Speicher und löscht die Quelldatei."""
+        logger.info("update_from_path(): (memory)")
+        with open(source_path, 'rb') as source:
+            location = self.update(file_name, source.read(), dir)
+        os.remove(source_path)
+        return location
+
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        """Kopiert eine Datei im Speicher, bytes sind unveränderlich und werden daher nur referenziert."""
+        logger.info("copy(): (memory)")
         if dir not in self.memory_storage:
             raise DirectoryNotFoundError(f"Directory '{dir}' not found in memory")
         for file in self.memory_storage[dir]:
             if file.startswith(f"{file_name}."):
-                self.memory_storage[dir][file] = file_data
-                logger.info(f"update(): Updated file '{file}' in memory under '{dir}'")
-                return f"memory://{dir}/{file}"
+                file_extension = file[len(file_name) + 1:]
+                complete_file_name = f"{target_file_name}.{file_extension}"
+                if complete_file_name in self.memory_storage.get(target_dir, {}):
+                    raise FileExistsInSessionError(f"File '{complete_file_name}' already exists in memory under '{target_dir}'")
+                self.memory_storage.setdefault(target_dir, {})[complete_file_name] = self.memory_storage[dir][file]
+                logger.info(f"copy(): Copied '{file}' from '{dir}' to '{target_dir}' in memory")
+                return self.location(target_file_name, file_extension, target_dir)
         raise FileNotFoundInSessionError(f"File '{file_name}' not found in memory under '{dir}'")
 
     def remove(self, file_name: str, dir: str) -> None:
@@ -288,10 +803,74 @@ class MemoryFileSessionManager(BaseFileSessionManager):
         logger.info("list_all(): (memory)")
         return all_files
 
+class _MultipartWriter(io.BufferedIOBase):
+    """
+    Schreibbares Dateiobjekt für open_write() im Fernspeicher. Bis zu einer Teilgröße wird gepuffert und in einer
+    Anfrage hochgeladen, größere Dateien als mehrteiliger Upload, dessen Teile parallel hochgeladen werden, während weiter geschrieben wird.
+    """
+
+    def __init__(self, client: S3Client, key: str, part_size: int, executor: ThreadPoolExecutor, max_pending_parts: int) -> None:
+        self.client = client
+        self.key = key
+        self.part_size = part_size
+        self.executor = executor
+        self.max_pending_parts = max_pending_parts
+        self.buffer = bytearray()
+        self.upload_id: Optional[str] = None
+        self.parts: List[Future] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def commit(self) -> None:
+        """Schließt den Upload ab, erst danach ist das Objekt sichtbar."""
+        if self.upload_id is None:
+            self.client.put_object(self.key, bytes(self.buffer))
+            return
+
+        if self.buffer:
+            self._upload_part(bytes(self.buffer))
+        self.client.complete_multipart_upload(self.key, self.upload_id, [part.result() for part in self.parts])
+
+    def abort(self) -> None:
+        """Verwirft einen begonnenen mehrteiligen Upload, das Objekt bleibt unverändert."""
+        if self.upload_id is not None:
+            wait(self.parts)
+            self.client.abort_multipart_upload(self.key, self.upload_id)
+
+    def _upload_part(self, data: bytes) -> None:
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(self.key)
+
+        # Bounds the memory held by parts that are still uploading
+        pending_parts = [part for part in self.parts if not part.done()]
+        if len(pending_parts) >= self.max_pending_parts:
+            wait(pending_parts, return_when=FIRST_COMPLETED)
+
+        self.parts.append(self.executor.submit(self.client.upload_part, self.key, self.upload_id, len(self.parts) + 1, data))
+
 class RemoteFileSessionManager(BaseFileSessionManager):
-    def __init__(self) -> None:
-        """Initialisiert den Fernspeicher."""
+    def __init__(self, client: Optional[S3Client] = None, prefix: str = FILES_REMOTE_PREFIX, public_url: Optional[str] = FILES_REMOTE_PUBLIC_URL, part_size: int = FILES_REMOTE_PART_SIZE) -> None:
+        """Initialisiert den Fernspeicher in einem S3-kompatiblen Bucket, Verzeichnisse sind Präfixe der Schlüssel (z.B. edits/12.mp4)."""
         logger.info(f"__init__(): (remote)")
+        if client is None:
+            if not FILES_REMOTE_ENDPOINT or not FILES_REMOTE_BUCKET:
+                raise FileSessionError("FILES_REMOTE_ENDPOINT and FILES_REMOTE_BUCKET must be set for the remote file storage")
+            client = S3Client(FILES_REMOTE_ENDPOINT, FILES_REMOTE_BUCKET, FILES_REMOTE_ACCESS_KEY, FILES_REMOTE_SECRET_KEY, FILES_REMOTE_REGION, FILES_REMOTE_POOL_SIZE)
+
+        self.client = client
+        self.prefix = prefix
+        self.public_url = (public_url or f"{client.endpoint}/{client.bucket}").rstrip("/")
+        self.part_size = part_size
+        # Parallel part uploads and ranged downloads share the connection pool of the client
+        self.transfers = ThreadPoolExecutor(max_workers=client.pool_size, thread_name_prefix="files")
         
         if FILES_PRINT:
             self._print()
@@ -304,31 +883,681 @@ class RemoteFileSessionManager(BaseFileSessionManager):
         finally:
             logger.info(f"get_session(): closed session (remote)")
 
-    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
-        logger.info(f"save(): Saving file '{file_name}' remotely in '{dir}' (not implemented)")
-        return "remote://not-implemented"
+    @contextmanager
+    def open_read(self, file_name: str, dir: str) -> Iterator[BinaryIO]:
+        """Liest die Antwort direkt aus der Verbindung, ohne die Datei vorher vollständig zu laden."""
+        logger.info("open_read(): (remote)")
+        response = self.client.get_object(self._find(file_name, dir).key, stream=True)
+        try:
+            response.raw.decode_content = True
+            yield response.raw
+        finally:
+            response.close()
+
+    @contextmanager
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> Iterator[BinaryIO]:
+        """Lädt während des Schreibens hoch, das Objekt wird erst am Ende des with-Blocks (ohne Fehler) angelegt bzw. ersetzt."""
+        logger.info("open_write(): (remote)")
+        if file_extension is None:
+            key = self._find(file_name, dir).key
+        else:
+            self._ensure_free(file_name, file_extension, dir)
+            key = self._key(f"{file_name}.{file_extension}", dir)
+
+        writer = _MultipartWriter(self.client, key, self.part_size, self.transfers, self.client.pool_size)
+        try:
+            yield writer
+            writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+        logger.info(f"open_write(): Saved '{key}'")
+
+    def get_range(self, file_name: str, dir: str, start: int, length: int) -> bytes:
+        """Lädt nur den Ausschnitt per Range-Anfrage."""
+        logger.info("get_range(): (remote)")
+        if length <= 0:
+            return b""
+        return self.client.get_object(self._find(file_name, dir).key, (start, start + length - 1)).content
+
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        return f"{self.public_url}/{quote(self._key(f'{file_name}.{file_extension}', dir))}"
+
+    @contextmanager
+    def path(self, file_name: str, dir: str) -> Iterator[str]:
+        """Lädt die Datei in eine temporäre Datei, große Dateien in parallelen Range-Anfragen."""
+        logger.info("path(): (remote)")
+        s3_object = self._find(file_name, dir)
+        with temporary_file_path(os.path.basename(s3_object.key)[len(file_name) + 1:]) as temp_file_path:
+            if s3_object.size <= self.part_size:
+                with open(temp_file_path, 'wb') as temp_file, self.open_read(file_name, dir) as source:
+                    shutil.copyfileobj(source, temp_file, CHUNK_SIZE)
+            else:
+                with open(temp_file_path, 'wb') as temp_file:
+                    temp_file.truncate(s3_object.size)
+                downloads = [
+                    self.transfers.submit(self._download_range, s3_object.key, start, min(start + self.part_size, s3_object.size) - 1, temp_file_path)
+                    for start in range(0, s3_object.size, self.part_size)
+                ]
+                for download in downloads:
+                    download.result()
+            logger.info(f"path(): Downloaded '{s3_object.key}' ({s3_object.size} bytes)")
+            yield temp_file_path
+
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        """Lädt die Datei hoch (ab der Teilgröße mehrteilig) und löscht die Quelldatei."""
+        logger.info("create_from_path(): (remote)")
+        with open(source_path, 'rb') as source, self.open_write(file_name, dir, file_extension) as target:
+            shutil.copyfileobj(source, target, self.part_size)
+        os.remove(source_path)
+        return self.location(file_name, file_extension, dir)
+
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        """Ersetzt die Datei durch die Datei unter source_path und löscht die Quelldatei."""
+        logger.info("update_from_path(): (remote)")
+        with open(source_path, 'rb') as source, self.open_write(file_name, dir) as target:
+            shutil.copyfileobj(source, target, self.part_size)
+        os.remove(source_path)
+        return self.location(file_name, self._file_extension(file_name, dir), dir)
+
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        """Kopiert auf dem Server, ohne die Datei herunterzuladen."""
+        logger.info("copy(): (remote)")
+        source_key = self._find(file_name, dir).key
+        file_extension = os.path.basename(source_key)[len(file_name) + 1:]
+        self._ensure_free(target_file_name, file_extension, target_dir)
+        self.client.copy_object(source_key, self._key(f"{target_file_name}.{file_extension}", target_dir))
+        return self.location(target_file_name, file_extension, target_dir)
+
+    def remove(self, file_name: str, dir: str) -> None:
+        logger.info("remove(): (remote)")
+        try:
+            key = self._find(file_name, dir).key
+        except FileNotFoundInSessionError:
+            raise FileDeleteError(f"File '{file_name}' not found in '{dir}'")
+        self.client.delete_object(key)
+        logger.info(f"remove(): Deleted '{key}'")
+
+    def clear(self) -> None:
+        logger.info(f"clear(): Clearing all remote files under '{self.prefix}'")
+        self.client.delete_objects([s3_object.key for s3_object in self.client.list_objects(self.prefix)])
+
+    def list(self, dir: str) -> List[str]:
+        logger.info("list(): (remote)")
+        files = [os.path.basename(s3_object.key) for s3_object in self.client.list_objects(self._key("", dir), delimiter="/")]
+        if not files:
+            raise DirectoryNotFoundError(f"Directory '{dir}' does not exist")
+        logger.info(f"list(): Listing {len(files)} files in directory '{dir}'")
+        return files
+
+    def list_all(self) -> List[str]:
+        logger.info("list_all(): (remote)")
+        return [s3_object.key[len(self.prefix):] for s3_object in self.client.list_objects(self.prefix)]
+
+    def _key(self, complete_file_name: str, dir: str) -> str:
+        return f"{self.prefix}{dir}/{complete_file_name}" if dir else f"{self.prefix}{complete_file_name}"
+
+    def _find(self, file_name: str, dir: str) -> S3Object:
+        """Sucht die Datei per Präfix-Listing ihres Namens, statt das ganze Verzeichnis aufzulisten."""
+        for s3_object in self.client.list_objects(self._key(f"{file_name}.", dir), delimiter="/"):
+            return s3_object
+        raise FileNotFoundInSessionError(f"File '{file_name}' not found in '{dir}'")
+
+    def _ensure_free(self, file_name: str, file_extension: str, dir: str) -> None:
+        try:
+            self._find(file_name, dir)
+        except FileNotFoundInSessionError:
+            return
+        raise FileExistsInSessionError(f"File '{file_name}.{file_extension}' already exists in '{dir}'")
+
+    def _file_extension(self, file_name: str, dir: str) -> str:
+        return os.path.basename(self._find(file_name, dir).key)[len(file_name) + 1:]
+
+    def _download_range(self, key: str, first_byte: int, last_byte: int, file_path: str) -> None:
+        data = self.client.get_object(key, (first_byte, last_byte)).content
+        with open(file_path, 'r+b') as f:
+            f.seek(first_byte)
+            f.write(data)
+
+class _TeeWriter(io.BufferedIOBase):
+    """Schreibt gleichzeitig in mehrere Dateiobjekte."""
+
+    def __init__(self, *targets: BinaryIO) -> None:
+        self.targets = targets
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        for target in self.targets:
+            target.write(data)
+        return len(data)
+
+class CachingFileSessionManager(BaseFileSessionManager):
+    """
+    Hält Dateien eines anderen Dateispeichers (z.B. des Fernspeichers) auf der lokalen Festplatte vor, nur für die Verzeichnisse in dirs.
+    Ist der Cache größer als max_bytes, werden die am längsten nicht benutzten Dateien gelöscht (LRU), außer sie sind gerade in Benutzung.
+    Schreiben geht durch den Cache hindurch in den Dateispeicher (write-through). Der Cache gilt pro Prozess bzw. Knoten,
+    Änderungen anderer Knoten am selben Fernspeicher sieht er erst nach der Verdrängung.
+    """
+    local_paths = True
+
+    def __init__(self, backend: BaseFileSessionManager, cache_dir: str = FILES_CACHE_DIR, max_bytes: int = FILES_CACHE_MAX_BYTES, dirs: Iterable[str] = FILES_CACHE_DIRS) -> None:
+        logger.info(f"__init__(): (caching)")
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dirs = set(dirs)
+
+        self.lock = threading.Lock()
+        # Verhindert, dass mehrere Threads dieselbe Datei gleichzeitig herunterladen
+        self.load_locks = [threading.Lock() for _ in range(64)]
+        # (Verzeichnis, Dateiname ohne Endung) -> (Dateiname mit Endung, Größe), älteste zuerst
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[str, int]]" = OrderedDict()
+        self.pins: Dict[Tuple[str, str], int] = {}
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_entries()
+        logger.info(f"__init__(): File cache at {self.cache_dir} with {self.size}/{self.max_bytes} bytes")
+
+    def get_session(self) -> Generator["BaseFileSessionManager", None, None]:
+        logger.info(f"get_session(): (caching)")
+        try:
+            yield self
+        finally:
+            logger.info(f"get_session(): closed session (caching)")
+
+    @contextmanager
+    def open_read(self, file_name: str, dir: str) -> Iterator[BinaryIO]:
+        if dir not in self.dirs:
+            with self.backend.open_read(file_name, dir) as f:
+                yield f
+            return
+
+        with self._cached_path(file_name, dir) as cached_path, open(cached_path, 'rb') as f:
+            yield f
+
+    @contextmanager
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> Iterator[BinaryIO]:
+        if dir not in self.dirs:
+            with self.backend.open_write(file_name, dir, file_extension) as f:
+                yield f
+            return
+
+        complete_file_name = f"{file_name}.{file_extension or self._file_extension(file_name, dir)}"
+        temp_path = self._temp_path(dir)
+        try:
+            with self.backend.open_write(file_name, dir, file_extension) as target, open(temp_path, 'wb') as cache_file:
+                yield _TeeWriter(target, cache_file)
+        except BaseException:
+            self._remove_temp(temp_path)
+            self._invalidate(file_name, dir)
+            raise
+        self._store(file_name, dir, complete_file_name, temp_path)
+
+    def get_range(self, file_name: str, dir: str, start: int, length: int) -> bytes:
+        # Ranges (e.g. probing headers) do not pull the whole file into the cache
+        if dir not in self.dirs or (dir, file_name) not in self.entries:
+            return self.backend.get_range(file_name, dir, start, length)
+        return super().get_range(file_name, dir, start, length)
+
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        return self.backend.location(file_name, file_extension, dir)
+
+    @contextmanager
+    def path(self, file_name: str, dir: str) -> Iterator[str]:
+        """Gibt den Pfad der Datei im Cache zurück, sie wird bis zum Ende des with-Blocks nicht verdrängt."""
+        if dir not in self.dirs:
+            with self.backend.path(file_name, dir) as file_path:
+                yield file_path
+            return
+
+        with self._cached_path(file_name, dir) as cached_path:
+            yield cached_path
+
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        if dir not in self.dirs:
+            return self.backend.create_from_path(file_name, file_extension, source_path, dir)
+
+        temp_path = self._copy_to_temp(source_path, dir)
+        try:
+            location = self.backend.create_from_path(file_name, file_extension, source_path, dir)
+        except BaseException:
+            self._remove_temp(temp_path)
+            raise
+        self._store(file_name, dir, f"{file_name}.{file_extension}", temp_path)
+        return location
+
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        if dir not in self.dirs:
+            return self.backend.update_from_path(file_name, source_path, dir)
+
+        temp_path = self._copy_to_temp(source_path, dir)
+        try:
+            location = self.backend.update_from_path(file_name, source_path, dir)
+        except BaseException:
+            self._remove_temp(temp_path)
+            self._invalidate(file_name, dir)
+            raise
+        self._store(file_name, dir, f"{file_name}.{self._file_extension(file_name, dir)}", temp_path)
+        return location
+
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        location = self.backend.copy(file_name, dir, target_file_name, target_dir)
+
+        # A cached source makes the copy hot right away, e.g. an edit copied from its template
+        with self.lock:
+            entry = self.entries.get((dir, file_name))
+        if entry is not None and target_dir in self.dirs:
+            temp_path = self._temp_path(target_dir)
+            try:
+                os.link(os.path.join(self.cache_dir, dir, entry[0]), temp_path)
+            except OSError:
+                return location
+            self._store(target_file_name, target_dir, f"{target_file_name}.{entry[0][len(file_name) + 1:]}", temp_path)
+        return location
+
+    def move(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        try:
+            return self.backend.move(file_name, dir, target_file_name, target_dir)
+        finally:
+            self._invalidate(file_name, dir)
+            self._invalidate(target_file_name, target_dir)
+
+    def remove(self, file_name: str, dir: str) -> None:
+        self.backend.remove(file_name, dir)
+        self._invalidate(file_name, dir)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self.lock:
+            for key in list(self.entries):
+                self._drop(key)
+
+    def list(self, dir: str) -> List[str]:
+        return self.backend.list(dir)
+
+    def list_all(self) -> List[str]:
+        return self.backend.list_all()
+
+    def stats(self) -> dict:
+        """Zähler und Füllstand des Caches."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes
+            }
+
+    def _file_extension(self, file_name: str, dir: str) -> str:
+        entry = self.entries.get((dir, file_name))
+        if entry is not None:
+            return entry[0][len(file_name) + 1:]
+        return self.backend._file_extension(file_name, dir)
+
+    @contextmanager
+    def _cached_path(self, file_name: str, dir: str) -> Iterator[str]:
+        """Stellt die Datei im Cache bereit (lädt sie bei Bedarf) und schützt sie während des with-Blocks vor der Verdrängung."""
+        key = (dir, file_name)
+        with self.load_locks[hash(key) % len(self.load_locks)]:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    self.pins[key] = self.pins.get(key, 0) + 1
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if entry is None:
+                temp_path = self._temp_path(dir)
+                try:
+                    with self.backend.open_read(file_name, dir) as source, open(temp_path, 'wb') as cache_file:
+                        shutil.copyfileobj(source, cache_file, CHUNK_SIZE)
+                    complete_file_name = f"{file_name}.{self.backend._file_extension(file_name, dir)}"
+                except BaseException:
+                    self._remove_temp(temp_path)
+                    raise
+                entry = self._store(file_name, dir, complete_file_name, temp_path, pin=True)
+                logger.info(f"_cached_path(): miss '{complete_file_name}' in '{dir}'")
+
+        cached_path = os.path.join(self.cache_dir, dir, entry[0])
+        try:
+            yield cached_path
+        finally:
+            with self.lock:
+                self.pins[key] -= 1
+                if self.pins[key] == 0:
+                    del self.pins[key]
+                    # Files larger than the whole cache are only kept while in use
+                    if entry[1] > self.max_bytes:
+                        self._drop(key)
+                self._evict()
+
+    def _store(self, file_name: str, dir: str, complete_file_name: str, temp_path: str, pin: bool = False) -> Tuple[str, int]:
+        """Übernimmt eine vollständig geschriebene temporäre Datei als Eintrag des Caches."""
+        key = (dir, file_name)
+        entry = (complete_file_name, os.path.getsize(temp_path))
+        with self.lock:
+            if key in self.entries:
+                self._drop(key, count_eviction=False, remove_file=self.entries[key][0] != complete_file_name)
+            os.replace(temp_path, os.path.join(self.cache_dir, dir, complete_file_name))
+            self.entries[key] = entry
+            self.size += entry[1]
+            if pin:
+                self.pins[key] = self.pins.get(key, 0) + 1
+            self._evict()
+        return entry
+
+    def _invalidate(self, file_name: str, dir: str) -> None:
+        with self.lock:
+            if (dir, file_name) in self.entries:
+                self._drop((dir, file_name), count_eviction=False)
+
+    def _evict(self) -> None:
+        """Verdrängt die am längsten nicht benutzten Einträge, bis der Cache wieder passt. Nur mit lock aufrufen."""
+        for key in list(self.entries):
+            if self.size <= self.max_bytes:
+                return
+            if key not in self.pins:
+                self._drop(key)
+
+    def _drop(self, key: Tuple[str, str], count_eviction: bool = True, remove_file: bool = True) -> None:
+        """Entfernt einen Eintrag, offene Leser lesen die gelöschte Datei zu Ende. Nur mit lock aufrufen."""
+        complete_file_name, entry_size = self.entries.pop(key)
+        self.size -= entry_size
+        if count_eviction:
+            self.evictions += 1
+            logger.info(f"_drop(): evicted '{complete_file_name}' from '{key[0]}'")
+        if remove_file:
+            try:
+                os.remove(os.path.join(self.cache_dir, key[0], complete_file_name))
+            except FileNotFoundError:
+                pass
+
+    def _load_entries(self) -> None:
+        """Übernimmt die Dateien eines früheren Laufs, die Reihenfolge ergibt sich aus der letzten Benutzung (mtime)."""
+        cached_files = []
+        for dir in self.dirs:
+            dir_path = os.path.join(self.cache_dir, dir)
+            os.makedirs(dir_path, exist_ok=True)
+            for complete_file_name in os.listdir(dir_path):
+                file_path = os.path.join(dir_path, complete_file_name)
+                if complete_file_name.endswith(".tmp"):
+                    os.remove(file_path)
+                    continue
+                stat = os.stat(file_path)
+                cached_files.append((stat.st_mtime, dir, complete_file_name, stat.st_size))
+
+        for _, dir, complete_file_name, file_size in sorted(cached_files):
+            self.entries[(dir, os.path.splitext(complete_file_name)[0])] = (complete_file_name, file_size)
+            self.size += file_size
+        with self.lock:
+            self._evict()
+
+    def _temp_path(self, dir: str) -> str:
+        # In the cache directory itself, so that os.replace() stays on one file system
+        return os.path.join(self.cache_dir, dir, f"{create_uuid()}.tmp")
+
+    def _remove_temp(self, temp_path: str) -> None:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _copy_to_temp(self, source_path: str, dir: str) -> str:
+        temp_path = self._temp_path(dir)
+        try:
+            os.link(source_path, temp_path)
+        except OSError:
+            shutil.copyfile(source_path, temp_path)
+        return temp_path
+
+class HotFileSessionManager(BaseFileSessionManager):
+    """
+    Hält kleine, häufig gelesene und selten geänderte Dateien (z.B. den Demo-Clip) eines anderen Dateispeichers als Bytes im Arbeitsspeicher,
+    nur für die Verzeichnisse in dirs und Dateien bis max_file_bytes. Begrenzt auf max_bytes und max_entries, verdrängt wird der am längsten
+    nicht benutzte Eintrag (LRU). Schreiben und Löschen über diese Sitzung verwirft den Eintrag, das nächste Lesen lädt ihn neu.
+    """
+
+    def __init__(
+        self,
+        backend: BaseFileSessionManager,
+        max_bytes: int = FILES_HOT_MAX_BYTES,
+        max_entries: int = FILES_HOT_MAX_ENTRIES,
+        max_file_bytes: int = FILES_HOT_MAX_FILE_BYTES,
+        dirs: Iterable[str] = FILES_HOT_DIRS
+    ) -> None:
+        logger.info(f"__init__(): (hot)")
+        self.backend = backend
+        self.local_paths = backend.local_paths
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_file_bytes = max_file_bytes
+        self.dirs = set(dirs)
+
+        self.lock = threading.Lock()
+        # (Verzeichnis, Dateiname ohne Endung) -> (Endung, Inhalt), älteste zuerst
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self.size = 0
+        # Steigt mit jeder Invalidierung, ein Laden, das sich mit einem Schreiben überschneidet, trägt dann nichts ein
+        self.generation = 0
+        # Dateien über max_file_bytes, damit sie nicht bei jedem Lesen erneut angelesen werden
+        self.oversized: Set[Tuple[str, str]] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_session(self) -> Generator["BaseFileSessionManager", None, None]:
+        logger.info(f"get_session(): (hot)")
+        try:
+            yield self
+        finally:
+            logger.info(f"get_session(): closed session (hot)")
+
+    @contextmanager
+    def open_read(self, file_name: str, dir: str) -> Iterator[BinaryIO]:
+        entry = self._hot_entry(file_name, dir)
+        if entry is None:
+            with self.backend.open_read(file_name, dir) as f:
+                yield f
+            return
+        yield io.BytesIO(entry[1])
+
+    @contextmanager
+    def open_write(self, file_name: str, dir: str, file_extension: Optional[str] = None) -> Iterator[BinaryIO]:
+        try:
+            with self.backend.open_write(file_name, dir, file_extension) as f:
+                yield f
+        finally:
+            self._invalidate(file_name, dir)
 
     def get(self, file_name: str, dir: str) -> bytes:
-        logger.info(f"get(): Retrieving file '{file_name}' remotely from '{dir}' (not implemented)")
-        return None
+        entry = self._hot_entry(file_name, dir)
+        if entry is None:
+            return self.backend.get(file_name, dir)
+        return entry[1]
+
+    def get_range(self, file_name: str, dir: str, start: int, length: int) -> bytes:
+        with self.lock:
+            entry = self.entries.get((dir, file_name))
+        if entry is None:
+            return self.backend.get_range(file_name, dir, start, length)
+        return entry[1][start:start + length]
+
+    def location(self, file_name: str, file_extension: str, dir: str) -> str:
+        return self.backend.location(file_name, file_extension, dir)
+
+    @contextmanager
+    def path(self, file_name: str, dir: str) -> Iterator[str]:
+        """Stellt den Pfad des Dateispeichers bereit, wenn der nichts kopiert, sonst eine temporäre Datei aus dem Arbeitsspeicher."""
+        entry = None if self.backend.local_paths else self._hot_entry(file_name, dir)
+        if entry is None:
+            with self.backend.path(file_name, dir) as file_path:
+                yield file_path
+            return
+
+        with temporary_file_path(entry[0]) as temp_file_path:
+            with open(temp_file_path, 'wb') as temp_file:
+                temp_file.write(entry[1])
+            yield temp_file_path
+
+    def create(self, file_name: str, file_extension: str, file_data: bytes, dir: str) -> str:
+        try:
+            return self.backend.create(file_name, file_extension, file_data, dir)
+        finally:
+            self._invalidate(file_name, dir)
+
+    def create_from_path(self, file_name: str, file_extension: str, source_path: str, dir: str) -> str:
+        try:
+            return self.backend.create_from_path(file_name, file_extension, source_path, dir)
+        finally:
+            self._invalidate(file_name, dir)
 
     def update(self, file_name: str, file_data: bytes, dir: str) -> str:
-        logger.info(f"update(): Updating file '{file_name}' remotely in '{dir}' (not implemented)")
-        return "remote://not-implemented"
+        try:
+            return self.backend.update(file_name, file_data, dir)
+        finally:
+            self._invalidate(file_name, dir)
+
+    def update_from_path(self, file_name: str, source_path: str, dir: str) -> str:
+        try:
+            return self.backend.update_from_path(file_name, source_path, dir)
+        finally:
+            self._invalidate(file_name, dir)
+
+    def copy(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        try:
+            return self.backend.copy(file_name, dir, target_file_name, target_dir)
+        finally:
+            self._invalidate(target_file_name, target_dir)
+
+    def move(self, file_name: str, dir: str, target_file_name: str, target_dir: str) -> str:
+        try:
+            return self.backend.move(file_name, dir, target_file_name, target_dir)
+        finally:
+            self._invalidate(file_name, dir)
+            self._invalidate(target_file_name, target_dir)
 
     def remove(self, file_name: str, dir: str) -> None:
-        logger.info(f"delete(): Deleting file '{file_name}' remotely from '{dir}' (not implemented)")
+        try:
+            self.backend.remove(file_name, dir)
+        finally:
+            self._invalidate(file_name, dir)
 
     def clear(self) -> None:
-        logger.info(f"clear(): Clearing all remote files (not implemented)")
+        try:
+            self.backend.clear()
+        finally:
+            with self.lock:
+                self.entries.clear()
+                self.oversized.clear()
+                self.size = 0
+                self.generation += 1
 
     def list(self, dir: str) -> List[str]:
-        logger.info(f"list(): Listing files remotely in '{dir}' (not implemented)")
-        return []
+        return self.backend.list(dir)
 
     def list_all(self) -> List[str]:
-        logger.info(f"list_all(): Listing all remote files (not implemented)")
-        return []
+        return self.backend.list_all()
+
+    def warm_up(self, files: Iterable[str]) -> None:
+        """Lädt Dateien ("Verzeichnis/Dateiname ohne Endung") vorab, fehlende Dateien werden übersprungen."""
+        for file in files:
+            dir, _, file_name = file.partition("/")
+            try:
+                if self._hot_entry(file_name, dir) is None:
+                    logger.warning(f"warm_up(): '{file}' is not kept in memory (dir not hot or file too large)")
+            except (FileNotFoundInSessionError, DirectoryNotFoundError):
+                logger.warning(f"warm_up(): '{file}' not found")
+        logger.info(f"warm_up(): {len(self.entries)} files with {self.size} bytes in memory")
+
+    def stats(self) -> dict:
+        """Zähler und Füllstand des Caches."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes
+            }
+
+    def _file_extension(self, file_name: str, dir: str) -> str:
+        entry = self.entries.get((dir, file_name))
+        if entry is not None:
+            return entry[0]
+        return self.backend._file_extension(file_name, dir)
+
+    def _hot_entry(self, file_name: str, dir: str) -> Optional[Tuple[str, bytes]]:
+        """Gibt Endung und Inhalt aus dem Arbeitsspeicher zurück und lädt sie bei Bedarf. None für Dateien, die nicht vorgehalten werden."""
+        if dir not in self.dirs:
+            return None
+
+        key = (dir, file_name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if key in self.oversized:
+                return None
+            self.misses += 1
+            generation = self.generation
+
+        file_extension = self.backend._file_extension(file_name, dir)
+        with self.backend.open_read(file_name, dir) as f:
+            file_data = f.read(self.max_file_bytes + 1)
+        entry = (file_extension, file_data)
+
+        with self.lock:
+            # Written meanwhile, the caller still gets what was read but the cache stays empty
+            if generation != self.generation:
+                return entry if len(file_data) <= self.max_file_bytes else None
+            if len(file_data) > self.max_file_bytes:
+                self.oversized.add(key)
+                return None
+            if key not in self.entries:
+                self.entries[key] = entry
+                self.size += len(file_data)
+                self._evict()
+        logger.info(f"_hot_entry(): loaded '{file_name}.{file_extension}' from '{dir}' ({len(file_data)} bytes)")
+        return entry
+
+    def _invalidate(self, file_name: str, dir: str) -> None:
+        if dir not in self.dirs:
+            return
+        with self.lock:
+            self.generation += 1
+            self.oversized.discard((dir, file_name))
+            entry = self.entries.pop((dir, file_name), None)
+            if entry is not None:
+                self.size -= len(entry[1])
+
+    def _evict(self) -> None:
+        """Verdrängt die am längsten nicht benutzten Einträge, bis Größe und Anzahl wieder passen. Nur mit lock aufrufen."""
+        while self.entries and (self.size > self.max_bytes or len(self.entries) > self.max_entries):
+            (dir, file_name), (_, file_data) = self.entries.popitem(last=False)
+            self.size -= len(file_data)
+            self.evictions += 1
+            logger.info(f"_evict(): evicted '{file_name}' from '{dir}'")
+
+def storage_of(file_session: BaseFileSessionManager) -> BaseFileSessionManager:
+    """Gibt den eigentlichen Dateispeicher hinter vorgeschalteten Caches zurück."""
+    while isinstance(file_session, (CachingFileSessionManager, HotFileSessionManager)):
+        file_session = file_session.backend
+    return file_session
 
 _file_session_manager = None
 
@@ -338,9 +1567,22 @@ def init_file_session_manager() -> None:
     
     if _file_session_manager is None:
         _file_session_manager = LocalFileSessionManager() if FILES_LOCAL else RemoteFileSessionManager()
+        if FILES_CACHE and not FILES_LOCAL:
+            _file_session_manager = CachingFileSessionManager(_file_session_manager)
+        if FILES_HOT:
+            _file_session_manager = HotFileSessionManager(_file_session_manager)
+            _file_session_manager.warm_up(FILES_HOT_WARM_UP)
     else:
         logger.warning(f"init_file_session_manager(): already initialized")
 
+def shutdown_file_session_manager() -> None:
+    global _file_session_manager
+    logger.info(f"shutdown_file_session_manager()")
+
+    if _file_session_manager is not None and isinstance(storage_of(_file_session_manager), LocalFileSessionManager):
+        storage_of(_file_session_manager).shutdown()
+    _file_session_manager = None
+
 def get_file_session() -> Generator[Optional[BaseFileSessionManager], None, None]:
     global _file_session_manager
     logger.info(f"get_file_session()")
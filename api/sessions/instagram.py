@@ -1,6 +1,7 @@
 import datetime
 import logging
 import os
+import shutil
 import tempfile
 import time
 from abc import ABC, abstractmethod
@@ -11,6 +12,7 @@ from typing import Generator
 import requests
 
 from api.exceptions.sessions.instagram import FTPConnectionError, FTPUploadError, InstagramUploadError, MediaContainerCreationError, VideoPublishError
+from api.utils.database.create_uuid import create_uuid
 
 # Logger für die Session-Verwaltung
 logger = logging.getLogger("sessions.instagram")
@@ -48,6 +50,11 @@ class BaseInstagramSessionManager(ABC):
         """Lädt ein Video zu Instagram hoch."""
         pass
 
+    @abstractmethod
+    def upload_path(self, video_path: str, video_format: str, caption: str) -> bool:
+        """Lädt das Video unter video_path zu Instagram hoch, ohne es in den Speicher zu lesen."""
+        pass
+
 
 """Implementations for Different Instagram Session Managers"""
 class RemoteInstagramSessionManager(BaseInstagramSessionManager):
@@ -66,6 +73,17 @@ class RemoteInstagramSessionManager(BaseInstagramSessionManager):
     def upload(self, video_bytes: bytes, video_format: str, caption: str) -> None:
         """Lädt ein Video über FTP zu Instagram hoch."""
         temp_file_path = None
+        try:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{video_format}') as temp_file:
+                temp_file.write(video_bytes)
+                temp_file_path = temp_file.name
+            self.upload_path(temp_file_path, video_format, caption)
+        finally:
+            if temp_file_path is not None and os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    def upload_path(self, video_path: str, video_format: str, caption: str) -> None:
+        """Lädt das Video unter video_path über FTP zu Instagram hoch, die Datei wird dabei gestreamt."""
         ftp = None
         try:
             # Schritt 1: FTP-Verbindung herstellen
@@ -84,14 +102,10 @@ class RemoteInstagramSessionManager(BaseInstagramSessionManager):
                 ftp.cwd(f"public_html/{INSTAGRAM_REMOTE_FTP_REPO}")
             logger.info(f"upload(): Changed to FTP directory: public_html/{INSTAGRAM_REMOTE_FTP_REPO}")
 
-            # Schritt 3: Temporäre Datei erstellen und auf FTP hochladen
+            # Schritt 3: Datei unter einem eindeutigen Namen auf FTP hochladen
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{video_format}') as temp_file:
-                    temp_file.write(video_bytes)
-                    temp_file_path = temp_file.name
-
-                remote_file_path = f"{os.path.basename(temp_file_path)}"
-                with open(temp_file_path, 'rb') as file:
+                remote_file_path = f"{create_uuid()}.{video_format}"
+                with open(video_path, 'rb') as file:
                     ftp.storbinary(f'STOR {remote_file_path}', file)
                 logger.info(f"upload(): Video successfully uploaded to FTP")
             except Exception as e:
@@ -135,8 +149,6 @@ class RemoteInstagramSessionManager(BaseInstagramSessionManager):
             raise InstagramUploadError(f"An error occurred during the upload process: {e}")
 
         finally:
-            if temp_file_path is not None and os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
             if ftp:
                 try:
                     ftp.quit()
@@ -184,6 +196,24 @@ class LocalInstagramSessionManager(BaseInstagramSessionManager):
         except Exception as e:
             raise InstagramUploadError(f"Failed to save video locally: {e}")
 
+    def upload_path(self, video_path: str, video_format: str, caption: str) -> None:
+        """Kopiert das Video unter video_path lokal."""
+        try:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = os.path.join(self.instagram_repo, f"video_{timestamp}.{video_format}")
+
+            # Kopieren des Videos
+            shutil.copyfile(video_path, filepath)
+
+            # Speichern der Bildunterschrift
+            caption_filepath = os.path.join(self.instagram_repo, f"caption_{timestamp}.txt")
+            with open(caption_filepath, 'w') as caption_file:
+                caption_file.write(caption)
+
+            logger.info(f"upload_path(): Video successfully saved to {filepath} with caption.")
+        except Exception as e:
+            raise InstagramUploadError(f"Failed to save video locally: {e}")
+
 
 class MemoryInstagramSessionManager(BaseInstagramSessionManager):
     def __init__(self):
@@ -212,6 +242,20 @@ class MemoryInstagramSessionManager(BaseInstagramSessionManager):
         except Exception as e:
             raise InstagramUploadError(f"Failed to simulate video upload: {e}")
 
+    def upload_path(self, video_path: str, video_format: str, caption: str) -> None:
+        """Simuliert das Hochladen des Videos unter video_path."""
+        try:
+            if not os.path.isfile(video_path) or os.path.getsize(video_path) == 0 or not caption:
+                raise InstagramUploadError("Video file or caption are missing.")
+
+            if video_format not in ['mp4', 'mov']:
+                raise InstagramUploadError(f"Unsupported video format: {video_format}")
+
+            logger.info(f"upload_path(): Simulated video upload with caption: {caption}")
+
+        except Exception as e:
+            raise InstagramUploadError(f"Failed to simulate video upload: {e}")
+
 
 _instagram_session_manager = None
 
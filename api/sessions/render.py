@@ -0,0 +1,279 @@
+import logging
+import os
+import threading
+import traceback
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (Any, Callable, ContextManager, Deque, Dict, Generator,
+                    Optional, Tuple)
+
+from dotenv import load_dotenv
+
+from api.exceptions.sessions.render import RenderJobNotFoundError
+from api.utils.database.create_uuid import create_uuid
+from api.utils.files.temporary_file_path import temporary_file_path
+from api.utils.media_manipulation.render_cache import (RenderCache,
+                                                       render_cache_key)
+
+# Logger für die Session-Verwaltung
+logger = logging.getLogger("sessions.render")
+
+"""ENV"""
+load_dotenv()
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_JOB_HISTORY = int(os.getenv("RENDER_JOB_HISTORY", "1000"))
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "./outgoing/render_cache")
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+
+"""Job"""
+class RenderJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+@dataclass
+class RenderJob:
+    job_id: str
+    edit_id: int
+    status: str
+
+    # Stellt die Eingaben bereit, wenn der Job startet (z.B. das aktuelle Edit als Pfad), und liefert im with-Block
+    # die Argumente für render. Nach finalize werden z.B. temporäre Eingabedateien wieder gelöscht
+    prepare: Callable[[], ContextManager[Tuple[Any, ...]]]
+
+    # Rechenintensiver Teil, läuft im Worker-Prozess, muss deshalb picklebar (Top-Level-Funktion) sein.
+    # Bekommt nur Pfade und Metadaten und schreibt das Ergebnis nach output_path
+    render: Callable[..., None]
+
+    # Übernimmt das Ergebnis (Pfad einer temporären Datei, darf verschoben werden), läuft wieder im API-Prozess
+    finalize: Callable[[str], None]
+
+    # Jobs mit gleichem Key für dasselbe Edit, die noch warten, werden von neueren Jobs verdrängt
+    supersede_key: Optional[str] = None
+    output_format: str = "mp4"
+    error: Optional[str] = None
+
+"""Base Render Session Manager"""
+class BaseRenderSessionManager(ABC):
+    @abstractmethod
+    def __init__(self):
+        """Initialisiert die Render-Warteschlange."""
+        self.lock = threading.Lock()
+        self.jobs: "OrderedDict[str, RenderJob]" = OrderedDict()
+        self.pending: Dict[int, Deque[RenderJob]] = {}
+        self.active_edits: set = set()
+        self.render_cache: Optional[RenderCache] = None
+
+    @abstractmethod
+    def get_session(self) -> Generator["BaseRenderSessionManager", None, None]:
+        """Erzeugt eine Render-Sitzung."""
+        pass
+
+    @abstractmethod
+    def _dispatch(self, edit_id: int) -> None:
+        """Startet die Abarbeitung der Warteschlange eines Edits."""
+        pass
+
+    @abstractmethod
+    def _render(self, render: Callable[..., None], args: Tuple[Any, ...], output_path: str) -> None:
+        """Führt den rechenintensiven Teil eines Jobs aus."""
+        pass
+
+    def submit(
+        self,
+        edit_id: int,
+        prepare: Callable[[], ContextManager[Tuple[Any, ...]]],
+        render: Callable[..., None],
+        finalize: Callable[[str], None],
+        supersede_key: Optional[str] = None,
+        output_format: str = "mp4",
+        job_id: Optional[str] = None
+    ) -> str:
+        """
+        Reiht einen Render-Job ein. Jobs desselben Edits laufen nacheinander in Einreihungsreihenfolge.
+        job_id vergibt die Route selbst, wenn sie den Job erst nach dem Commit des Requests einreiht.
+        """
+        job = RenderJob(
+            job_id=job_id or create_uuid(),
+            edit_id=edit_id,
+            status=RenderJobStatus.QUEUED,
+            prepare=prepare,
+            render=render,
+            finalize=finalize,
+            supersede_key=supersede_key,
+            output_format=output_format
+        )
+        logger.info(f"submit(): Job {job.job_id} for edit {edit_id} (key={supersede_key})")
+
+        with self.lock:
+            queue = self.pending.setdefault(edit_id, deque())
+
+            # Drop queued jobs that would be overwritten by this one anyway
+            if supersede_key is not None:
+                for queued_job in [queued_job for queued_job in queue if queued_job.supersede_key == supersede_key]:
+                    logger.info(f"submit(): Job {queued_job.job_id} superseded by {job.job_id}")
+                    queued_job.status = RenderJobStatus.SUPERSEDED
+                    queue.remove(queued_job)
+
+            queue.append(job)
+            self._remember(job)
+
+            start_worker = edit_id not in self.active_edits
+            if start_worker:
+                self.active_edits.add(edit_id)
+
+        if start_worker:
+            self._dispatch(edit_id)
+
+        return job.job_id
+
+    def render(self, render: Callable[..., None], args: Tuple[Any, ...], output_path: str) -> None:
+        """
+        Rendert direkt, ohne Warteschlange, nach output_path. Gleiche Eingaben werden aus dem Render-Cache beantwortet.
+        Eingabedateien werden als os.PathLike übergeben, damit der Cache ihren Inhalt statt des Pfads vergleicht.
+        """
+        key = render_cache_key(render, args) if self.render_cache is not None else None
+        if key is not None and self.render_cache.get(key, output_path):
+            return
+
+        # The render functions (and MoviePy) only handle plain string paths
+        self._render(render, tuple(os.fspath(arg) if isinstance(arg, os.PathLike) else arg for arg in args), output_path)
+
+        if key is not None:
+            self.render_cache.put(key, output_path)
+
+    def get(self, job_id: str) -> RenderJob:
+        """Gibt einen Job anhand seiner ID zurück."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise RenderJobNotFoundError(f"Render job '{job_id}' not found")
+        return job
+
+    def _remember(self, job: RenderJob) -> None:
+        """Merkt sich den Job, alte abgeschlossene Jobs werden verworfen."""
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > RENDER_JOB_HISTORY:
+            oldest_id, oldest_job = next(iter(self.jobs.items()))
+            if oldest_job.status in (RenderJobStatus.QUEUED, RenderJobStatus.RUNNING):
+                break
+            del self.jobs[oldest_id]
+
+    def _drain(self, edit_id: int) -> None:
+        """Arbeitet die Warteschlange eines Edits ab, bis sie leer ist."""
+        while True:
+            with self.lock:
+                queue = self.pending.get(edit_id)
+                if not queue:
+                    self.pending.pop(edit_id, None)
+                    self.active_edits.discard(edit_id)
+                    return
+                job = queue.popleft()
+                job.status = RenderJobStatus.RUNNING
+
+            self._run(job)
+
+    def _run(self, job: RenderJob) -> None:
+        logger.info(f"_run(): Job {job.job_id} for edit {job.edit_id} started")
+        try:
+            with job.prepare() as args, temporary_file_path(job.output_format) as output_path:
+                self.render(job.render, args, output_path)
+                job.finalize(output_path)
+            job.status = RenderJobStatus.DONE
+            logger.info(f"_run(): Job {job.job_id} done")
+        except Exception as e:
+            job.status = RenderJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"_run(): Job {job.job_id} failed: {e}\n{traceback.format_exc()}")
+
+
+"""Implementations for Different Render Session Managers"""
+class LocalRenderSessionManager(BaseRenderSessionManager):
+    def __init__(self):
+        """Initialisiert den Worker-Pool für Renderings."""
+        super().__init__()
+        logger.info(f"__init__(): (local) with {RENDER_WORKERS} workers")
+        self.process_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+        # Eine Koordinations-Thread pro gleichzeitig bearbeitetem Edit, begrenzt auf die Anzahl der Worker
+        self.dispatcher = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+        self.render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES)
+
+    def get_session(self) -> Generator["BaseRenderSessionManager", None, None]:
+        logger.info(f"get_session(): (local)")
+        try:
+            yield self
+        finally:
+            logger.info(f"get_session(): closed session (local)")
+
+    def _dispatch(self, edit_id: int) -> None:
+        self.dispatcher.submit(self._drain, edit_id)
+
+    def _render(self, render: Callable[..., None], args: Tuple[Any, ...], output_path: str) -> None:
+        # Only paths and metadata are pickled to the worker, never the videos themselves
+        self.process_pool.submit(render, *args, output_path=output_path).result()
+
+    def shutdown(self) -> None:
+        """Beendet den Worker-Pool, laufende Jobs werden noch abgeschlossen."""
+        logger.info(f"shutdown(): (local)")
+        self.dispatcher.shutdown(wait=True)
+        self.process_pool.shutdown(wait=True)
+
+class MemoryRenderSessionManager(BaseRenderSessionManager):
+    def __init__(self, render_cache: Optional[RenderCache] = None):
+        """Initialisiert eine Render-Warteschlange, die Jobs direkt beim Einreihen ausführt. Ohne Render-Cache, außer er wird übergeben."""
+        super().__init__()
+        logger.info(f"__init__(): (memory)")
+        self.render_cache = render_cache
+
+    def get_session(self) -> Generator["BaseRenderSessionManager", None, None]:
+        logger.info(f"get_session(): (memory)")
+        try:
+            yield self
+        finally:
+            logger.info(f"get_session(): closed session (memory)")
+
+    def _dispatch(self, edit_id: int) -> None:
+        self._drain(edit_id)
+
+    def _render(self, render: Callable[..., None], args: Tuple[Any, ...], output_path: str) -> None:
+        render(*args, output_path=output_path)
+
+
+_render_session_manager = None
+
+def init_render_session_manager() -> None:
+    global _render_session_manager
+    logger.info(f"init_render_session_manager()")
+
+    if _render_session_manager is None:
+        _render_session_manager = LocalRenderSessionManager()
+    else:
+        logger.warning(f"init_render_session_manager(): already initialized")
+
+def shutdown_render_session_manager() -> None:
+    global _render_session_manager
+    logger.info(f"shutdown_render_session_manager()")
+
+    if isinstance(_render_session_manager, LocalRenderSessionManager):
+        _render_session_manager.shutdown()
+    _render_session_manager = None
+
+def get_render_session() -> Generator[Optional[BaseRenderSessionManager], None, None]:
+    global _render_session_manager
+    logger.info(f"get_render_session()")
+
+    if _render_session_manager is None:
+        logger.error(f"get_render_session(): failed! manager not initialized")
+        return
+
+    try:
+        gen = _render_session_manager.get_session()
+        session = next(gen)
+        yield session
+    except Exception as e:
+        logger.error(f"get_render_session(): Error: {e}")
+        raise e
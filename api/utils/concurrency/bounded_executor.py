@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from api.exceptions.sessions.executor import ExecutorSaturatedError
+
+logger = logging.getLogger("utils.concurrency")
+
+T = TypeVar("T")
+
+class BoundedExecutor:
+    """
+    Thread-Pool für blockierende Aufrufe aus async-Routen, mit höchstens max_workers Threads und max_queue wartenden Aufrufen.
+    Ist die Warteschlange voll, wird sofort mit ExecutorSaturatedError abgelehnt, statt Anfragen unbegrenzt zu stauen.
+    Mit processes=True laufen die Aufrufe in ebenso vielen Prozessen, ausserhalb des GIL. func und Argumente müssen
+    dann picklebar sein (Funktionen auf Modulebene, Pfade statt Dateien oder Bytes).
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, processes: bool = False) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # The threads only wait on the processes, so queue accounting and cancellation stay as they are
+        self.process_pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers=max_workers) if processes else None
+        self.lock = threading.Lock()
+
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Führt func in einem Thread (bzw. Prozess) des Pools aus und wartet darauf, ohne die Event-Loop zu blockieren."""
+        with self.lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                logger.warning(f"run(): '{self.name}' saturated, {self.queued} calls queued")
+                raise ExecutorSaturatedError(f"Executor '{self.name}' is saturated")
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        submitted_at = time.monotonic()
+        # Context variables (e.g. of the request) stay visible in the worker thread
+        context = contextvars.copy_context()
+
+        def call() -> T:
+            wait_seconds = time.monotonic() - submitted_at
+            with self.lock:
+                self.queued -= 1
+                self.active += 1
+                self.wait_seconds_total += wait_seconds
+                self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            try:
+                if self.process_pool is not None:
+                    return self.process_pool.submit(func, *args, **kwargs).result()
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        future = self.executor.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Still waiting in the queue, call() will never run
+            if future.cancel():
+                with self.lock:
+                    self.queued -= 1
+            raise
+
+    def stats(self) -> dict:
+        """Auslastung des Pools, saturation ist der Anteil belegter Threads."""
+        with self.lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "saturation": self.active / self.max_workers,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_avg": self.wait_seconds_total / self.completed if self.completed else 0.0,
+                "wait_seconds_max": self.wait_seconds_max
+            }
+
+    def shutdown(self) -> None:
+        """Wartet auf laufende Aufrufe und beendet die Threads und Prozesse."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger("utils.concurrency")
+
+class EventLoopMonitor:
+    """
+    Misst, wie lange die Event-Loop blockiert ist: Ein Task schläft interval Sekunden und vergleicht,
+    wann er tatsächlich wieder an die Reihe kommt. Die Verspätung (Lag) ist die Zeit, in der nichts anderes laufen konnte.
+    """
+
+    def __init__(self, interval: float, warn_seconds: float) -> None:
+        self.interval = interval
+        self.warn_seconds = warn_seconds
+        self.task: Optional[asyncio.Task] = None
+
+        self.lag_seconds_last = 0.0
+        self.lag_seconds_max = 0.0
+        self.blocked = 0
+
+    def start(self) -> None:
+        """Startet die Messung in der laufenden Event-Loop."""
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def reset(self) -> None:
+        """Setzt das Maximum zurück, z.B. zwischen zwei Messungen in Tests."""
+        self.lag_seconds_max = 0.0
+        self.blocked = 0
+
+    def stats(self) -> dict:
+        return {
+            "lag_seconds_last": self.lag_seconds_last,
+            "lag_seconds_max": self.lag_seconds_max,
+            "blocked": self.blocked,
+            "warn_seconds": self.warn_seconds
+        }
+
+    async def _run(self) -> None:
+        while True:
+            started_at = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag_seconds = max(0.0, time.monotonic() - started_at - self.interval)
+
+            self.lag_seconds_last = lag_seconds
+            self.lag_seconds_max = max(self.lag_seconds_max, lag_seconds)
+            if lag_seconds > self.warn_seconds:
+                self.blocked += 1
+                logger.warning(f"_run(): event loop blocked for {lag_seconds * 1000:.0f} ms")
@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from typing import Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+logger = logging.getLogger("utils.database")
+
+class PoolMonitor:
+    """
+    Zählt, wie ein Connection-Pool genutzt wird: Wartezeit beim Auschecken, belegte Verbindungen (auch das Maximum),
+    Timeouts und verworfene (z.B. von MySQL geschlossene) Verbindungen.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.engine: Optional[Engine] = None
+
+        self.connects = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.in_use = 0
+        self.in_use_max = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def pool_class(self, base: Type[Pool] = QueuePool) -> Type[Pool]:
+        """
+        Pool-Klasse für create_engine(poolclass=...), die die Wartezeit jedes Auscheckens misst.
+        Die Pool-Events melden erst die fertige Ausgabe, nicht wie lange auf eine freie Verbindung gewartet wurde.
+        """
+        monitor = self
+
+        class MonitoredPool(base):
+            def connect(self):
+                started_at = time.monotonic()
+                try:
+                    return super().connect()
+                except PoolTimeoutError:
+                    with monitor.lock:
+                        monitor.timeouts += 1
+                    logger.warning(f"connect(): pool exhausted, no connection after {time.monotonic() - started_at:.1f}s")
+                    raise
+                finally:
+                    monitor._record_wait(time.monotonic() - started_at)
+
+        return MonitoredPool
+
+    def listen(self, engine: Engine) -> None:
+        """Registriert die Pool-Events der Engine, sie gelten auch für einen neu erzeugten Pool (engine.dispose())."""
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def stats(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        with self.lock:
+            return {
+                "size": pool.size() if isinstance(pool, QueuePool) else None,
+                "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "wait_seconds_avg": self.wait_seconds_total / self.waits if self.waits else 0.0,
+                "wait_seconds_max": self.wait_seconds_max
+            }
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        with self.lock:
+            self.waits += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.in_use_max = max(self.in_use_max, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.in_use -= 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self.lock:
+            self.invalidations += 1
+        logger.warning(f"_on_invalidate(): connection discarded: {exception}")
@@ -0,0 +1,35 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class RecentWriters:
+    """
+    Merkt sich, wer (z.B. welcher User) in den letzten seconds Sekunden geschrieben hat.
+    Deren Lesezugriffe gehen an den Primary, bis die Replikate die Änderungen sicher haben (Read-your-writes).
+    """
+
+    def __init__(self, seconds: float, max_entries: int = 10000) -> None:
+        self.seconds = seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.written_at: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def add(self, key: Hashable) -> None:
+        with self.lock:
+            self.written_at[key] = time.monotonic()
+            self.written_at.move_to_end(key)
+            # The oldest entries expire first anyway
+            while len(self.written_at) > self.max_entries:
+                self.written_at.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            written_at = self.written_at.get(key)
+            if written_at is None:
+                return False
+            if time.monotonic() - written_at > self.seconds:
+                del self.written_at[key]
+                return False
+            return True
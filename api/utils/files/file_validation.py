@@ -1,4 +1,5 @@
 
+import os
 import re
 
 from fastapi import UploadFile
@@ -23,8 +24,9 @@ def file_validation(file: UploadFile, file_type: str) -> UploadFile:
     if file.content_type not in allowed_formats:
         raise InvalidFileFormatException(f"Dateityp {file.content_type} nicht erlaubt für {file_type}.")
 
-    # Überprüfe die Dateigröße
-    file_size = len(file.file.read())
+    # Überprüfe die Dateigröße, ohne die Datei zu lesen
+    file.file.seek(0, os.SEEK_END)
+    file_size = file.file.tell()
     if file_size > max_size:
         raise FileTooLargeException(max_size / (1024 * 1024))
 
@@ -0,0 +1,72 @@
+import logging
+import os
+import threading
+from typing import Optional, Set
+
+from api.utils.files.fsync_path import fsync_path
+
+logger = logging.getLogger("utils.files")
+
+class FsyncBatcher:
+    """
+    Sammelt geänderte Dateien und schreibt sie samt ihrer Verzeichnisse gebündelt in einem Hintergrund-Thread auf die Festplatte,
+    spätestens interval Sekunden nach der Änderung. Wer schreibt, wartet so nie auf fsync.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending: Set[str] = set()
+        self.wakeup = threading.Event()
+        self.closed = False
+        # Started with the first change, many storages are never written to
+        self.thread: Optional[threading.Thread] = None
+
+        self.batches = 0
+        self.files = 0
+
+    def add(self, file_path: str) -> None:
+        """Merkt eine geänderte Datei für den nächsten Durchlauf vor."""
+        with self.lock:
+            self.pending.add(file_path)
+            if self.thread is None and not self.closed:
+                self.thread = threading.Thread(target=self._run, name="fsync", daemon=True)
+                self.thread.start()
+
+    def flush(self) -> None:
+        """Schreibt alle vorgemerkten Dateien sofort auf die Festplatte."""
+        with self.lock:
+            file_paths, self.pending = self.pending, set()
+        if not file_paths:
+            return
+
+        # Files first, then the directories holding their new names
+        for path in [*file_paths, *{os.path.dirname(file_path) for file_path in file_paths}]:
+            try:
+                fsync_path(path)
+            except FileNotFoundError:
+                # Removed or replaced again meanwhile, the replacement is synced on its own
+                pass
+
+        with self.lock:
+            self.batches += 1
+            self.files += len(file_paths)
+        logger.info(f"FsyncBatcher.flush(): synced {len(file_paths)} files")
+
+    def close(self) -> None:
+        """Beendet den Hintergrund-Thread und schreibt, was noch aussteht."""
+        with self.lock:
+            self.closed = True
+            thread = self.thread
+        self.wakeup.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self.closed:
+            self.wakeup.wait(self.interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"FsyncBatcher._run(): fsync failed: {e}")
@@ -0,0 +1,10 @@
+import os
+
+
+def fsync_path(path: str) -> None:
+    """Schreibt eine Datei oder ein Verzeichnis (z.B. nach einem rename darin) dauerhaft auf die Festplatte."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
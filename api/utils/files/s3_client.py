@@ -0,0 +1,197 @@
+import base64
+import datetime
+import hashlib
+import logging
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from api.exceptions.sessions.files import (FileNotFoundInSessionError,
+                                           FileSessionError)
+from api.utils.files.sign_s3_request import sign_s3_request
+
+logger = logging.getLogger("utils.files")
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+# DeleteObjects akzeptiert höchstens 1000 Schlüssel pro Anfrage
+DELETE_BATCH_SIZE = 1000
+
+@dataclass
+class S3Object:
+    key: str
+    size: int
+
+class S3Client:
+    """
+    Schlanker Client für die S3-API (AWS S3, MinIO, ...) mit Signature V4 und Path-Style-Adressen (endpoint/bucket/key).
+    Alle Anfragen laufen über eine requests.Session, deren Verbindungen wiederverwendet werden, auch aus mehreren Threads.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        pool_size: int = 16,
+        timeout: float = 60.0
+    ) -> None:
+        """
+        Args:
+            endpoint (str): Basis-URL des Object Stores, z.B. "https://s3.eu-central-1.amazonaws.com" oder "http://localhost:9000".
+            bucket (str): Name des Buckets.
+            access_key (str): Access Key ID.
+            secret_key (str): Secret Access Key.
+            region (str): Region für die Signatur.
+            pool_size (int): Maximale Anzahl offener Verbindungen, sollte mindestens der Anzahl paralleler Threads entsprechen.
+            timeout (float): Timeout für Verbindungsaufbau und einzelne Lesevorgänge in Sekunden.
+        """
+        self.endpoint = endpoint.rstrip("/")
+        self.host = urlsplit(self.endpoint).netloc
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        # Only failed connection attempts are retried, a request that reached the server may have a consumed body
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, other=0, allowed_methods=None, backoff_factor=0.1)
+        )
+        self.http = requests.Session()
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+
+    def put_object(self, key: str, data: Union[bytes, BinaryIO]) -> None:
+        """Lädt ein Objekt in einer Anfrage hoch, Dateiobjekte werden gestreamt."""
+        self._request("PUT", key, data=data)
+
+    def get_object(self, key: str, byte_range: Optional[Tuple[int, int]] = None, stream: bool = False) -> requests.Response:
+        """
+        Lädt ein Objekt oder mit byte_range (erstes und letztes Byte, inklusive) einen Ausschnitt davon.
+        Mit stream=True muss die Antwort vom Aufrufer geschlossen werden.
+        """
+        headers = {"range": f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range is not None else {}
+        return self._request("GET", key, headers=headers, stream=stream)
+
+    def copy_object(self, source_key: str, target_key: str) -> None:
+        """Kopiert ein Objekt innerhalb des Buckets auf dem Server."""
+        response = self._request("PUT", target_key, headers={"x-amz-copy-source": quote(f"/{self.bucket}/{source_key}", safe="/")})
+        self._raise_for_error_body(response, target_key)
+
+    def delete_object(self, key: str) -> None:
+        self._request("DELETE", key)
+
+    def delete_objects(self, keys: List[str]) -> None:
+        """Löscht mehrere Objekte mit möglichst wenigen Anfragen."""
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            root = ElementTree.Element("Delete")
+            ElementTree.SubElement(root, "Quiet").text = "true"
+            for key in keys[start:start + DELETE_BATCH_SIZE]:
+                ElementTree.SubElement(ElementTree.SubElement(root, "Object"), "Key").text = key
+            body = ElementTree.tostring(root)
+
+            content_md5 = base64.b64encode(hashlib.md5(body).digest()).decode("ascii")
+            response = self._request("POST", query={"delete": ""}, headers={"content-md5": content_md5}, data=body)
+            errors = [element.findtext("{*}Key") for element in ElementTree.fromstring(response.content).iter() if element.tag.endswith("Error")]
+            if errors:
+                raise FileSessionError(f"Could not delete objects {errors}")
+
+    def list_objects(self, prefix: str, delimiter: Optional[str] = None) -> Iterator[S3Object]:
+        """Listet alle Objekte mit dem Präfix seitenweise auf, mit delimiter nur die direkt darunter liegenden."""
+        query = {"list-type": "2", "prefix": prefix}
+        if delimiter is not None:
+            query["delimiter"] = delimiter
+
+        while True:
+            root = ElementTree.fromstring(self._request("GET", query=query).content)
+            for contents in root.iterfind("{*}Contents"):
+                yield S3Object(key=contents.findtext("{*}Key"), size=int(contents.findtext("{*}Size")))
+
+            if root.findtext("{*}IsTruncated") != "true":
+                return
+            query["continuation-token"] = root.findtext("{*}NextContinuationToken")
+
+    def create_multipart_upload(self, key: str) -> str:
+        """Beginnt einen mehrteiligen Upload und gibt dessen ID zurück."""
+        response = self._request("POST", key, query={"uploads": ""})
+        return ElementTree.fromstring(response.content).findtext("{*}UploadId")
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Lädt einen Teil (außer dem letzten mindestens 5 MiB) hoch und gibt dessen ETag zurück."""
+        response = self._request("PUT", key, query={"partNumber": str(part_number), "uploadId": upload_id}, data=data)
+        return response.headers["ETag"]
+
+    def complete_multipart_upload(self, key: str, upload_id: str, etags: List[str]) -> None:
+        """Setzt die Teile in der Reihenfolge von etags zum Objekt zusammen."""
+        root = ElementTree.Element("CompleteMultipartUpload")
+        for part_number, etag in enumerate(etags, start=1):
+            part = ElementTree.SubElement(root, "Part")
+            ElementTree.SubElement(part, "PartNumber").text = str(part_number)
+            ElementTree.SubElement(part, "ETag").text = etag
+
+        response = self._request("POST", key, query={"uploadId": upload_id}, data=ElementTree.tostring(root))
+        self._raise_for_error_body(response, key)
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self._request("DELETE", key, query={"uploadId": upload_id})
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen des Pools."""
+        self.http.close()
+
+    def _request(
+        self,
+        method: str,
+        key: str = "",
+        query: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        data: Union[bytes, BinaryIO] = b"",
+        stream: bool = False
+    ) -> requests.Response:
+        query = query or {}
+        headers = dict(headers or {})
+
+        # Bytes are signed, streamed files are sent unsigned instead of being read twice (TLS protects them)
+        payload_hash = hashlib.sha256(data).hexdigest() if isinstance(data, bytes) else UNSIGNED_PAYLOAD
+        now = datetime.datetime.now(datetime.timezone.utc)
+        headers.update({"host": self.host, "x-amz-date": now.strftime("%Y%m%dT%H%M%SZ"), "x-amz-content-sha256": payload_hash})
+
+        canonical_uri = quote(f"/{self.bucket}/{key}" if key else f"/{self.bucket}", safe="/")
+        headers["authorization"] = sign_s3_request(method, canonical_uri, query, headers, payload_hash, self.access_key, self.secret_key, self.region, now)
+
+        url = self.endpoint + canonical_uri
+        if query:
+            url += "?" + "&".join(f"{quote(name, safe='')}={quote(value, safe='')}" for name, value in sorted(query.items()))
+
+        try:
+            response = self.http.request(method, url, headers=headers, data=data, stream=stream, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"_request(): {method} '{key}' failed: {e}")
+            raise FileSessionError(f"Object store request {method} '{key}' failed: {e}")
+
+        if response.status_code == 404:
+            response.close()
+            raise FileNotFoundInSessionError(f"Object '{key}' not found")
+        if response.status_code >= 300:
+            message = response.text[:500]
+            response.close()
+            logger.error(f"_request(): {method} '{key}' failed with {response.status_code}: {message}")
+            raise FileSessionError(f"Object store request {method} '{key}' failed with {response.status_code}")
+        return response
+
+    def _raise_for_error_body(self, response: requests.Response, key: str) -> None:
+        # CopyObject and CompleteMultipartUpload can fail after answering 200
+        if ElementTree.fromstring(response.content).tag.endswith("Error"):
+            logger.error(f"_raise_for_error_body(): '{key}' failed: {response.text[:500]}")
+            raise FileSessionError(f"Object store request for '{key}' failed: {response.text[:200]}")
@@ -0,0 +1,13 @@
+import shutil
+
+from fastapi import UploadFile
+
+# Puffer beim Kopieren, nur so viel vom Upload liegt gleichzeitig im Speicher
+COPY_BUFFER_SIZE = 1024 * 1024
+
+def save_upload_file(file: UploadFile, path: str) -> int:
+    """Schreibt einen Upload stückweise in eine Datei, ohne ihn komplett zu lesen, und gibt die Größe in Bytes zurück."""
+    file.file.seek(0)
+    with open(path, "wb") as target:
+        shutil.copyfileobj(file.file, target, COPY_BUFFER_SIZE)
+        return target.tell()
@@ -0,0 +1,57 @@
+import datetime
+import hashlib
+import hmac
+from typing import Dict
+from urllib.parse import quote
+
+
+def sign_s3_request(
+    method: str,
+    canonical_uri: str,
+    query: Dict[str, str],
+    headers: Dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime.datetime
+) -> str:
+    """
+    Berechnet den Authorization-Header einer S3-Anfrage nach AWS Signature Version 4.
+
+    Args:
+        method (str): HTTP-Methode, z.B. "GET".
+        canonical_uri (str): Bereits URI-kodierter Pfad, z.B. "/bucket/edits/1.mp4".
+        query (Dict[str, str]): Nicht kodierte Query-Parameter, Parameter ohne Wert mit "".
+        headers (Dict[str, str]): Alle zu signierenden Header (mindestens host, x-amz-date und x-amz-content-sha256).
+        payload_hash (str): SHA-256 des Bodys als Hex oder "UNSIGNED-PAYLOAD".
+        access_key (str): Access Key ID.
+        secret_key (str): Secret Access Key.
+        region (str): Region, z.B. "us-east-1".
+        now (datetime.datetime): Zeitpunkt der Anfrage in UTC, muss zu x-amz-date passen.
+
+    Returns:
+        str: Wert für den Authorization-Header.
+    """
+    date = now.strftime("%Y%m%d")
+    scope = f"{date}/{region}/s3/aws4_request"
+
+    canonical_query = "&".join(f"{quote(name, safe='')}={quote(value, safe='')}" for name, value in sorted(query.items()))
+    signed_headers = sorted(name.lower() for name in headers)
+    header_values = {name.lower(): " ".join(str(value).split()) for name, value in headers.items()}
+    canonical_headers = "".join(f"{name}:{header_values[name]}\n" for name in signed_headers)
+    canonical_request = "\n".join([method, canonical_uri, canonical_query, canonical_headers, ";".join(signed_headers), payload_hash])
+
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        now.strftime("%Y%m%dT%H%M%SZ"),
+        scope,
+        hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+    ])
+
+    signing_key = f"AWS4{secret_key}".encode("utf-8")
+    for part in (date, region, "s3", "aws4_request"):
+        signing_key = hmac.new(signing_key, part.encode("utf-8"), hashlib.sha256).digest()
+    signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    return f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, SignedHeaders={';'.join(signed_headers)}, Signature={signature}"
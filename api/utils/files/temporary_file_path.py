@@ -0,0 +1,19 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def temporary_file_path(file_extension: str) -> Iterator[str]:
+    """
+    Reserviert einen Pfad für eine temporäre Datei mit der Endung (ffmpeg erkennt daran das Format) und löscht die Datei danach.
+    Wurde die Datei inzwischen verschoben (z.B. mit create_from_path in den Dateispeicher), gibt es nichts zu löschen.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+        temp_file_path = temp_file.name
+    try:
+        yield temp_file_path
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
@@ -0,0 +1,45 @@
+import logging
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+from api.utils.media_manipulation.write_videofile_for_instagram_reel import \
+    instagram_reel_audio_params
+
+logger = logging.getLogger("utils.media_manipulation")
+
+def create_audio_bed(
+    audio_path: str,
+    start_point: float,
+    end_point: float,
+    output_path: str
+) -> None:
+    """
+    Schneidet einen Song auf [start_point, end_point] (erster bis letzter Breakpoint) zu und encodiert ihn einmalig
+    mit den Audio-Parametern der Edits als AAC (m4a). Edits übernehmen dieses Audio-Bett per Stream-Copy,
+    statt den Song bei jedem Rendering zu dekodieren und neu zu encodieren.
+
+    Args:
+        audio_path (str): Pfad zum hochgeladenen Song (mp3, wav, ...).
+        start_point (float): Erster Breakpoint in Sekunden.
+        end_point (float): Letzter Breakpoint in Sekunden.
+        output_path (str): Pfad des Audio-Betts (m4a).
+    """
+    logger.info(f"create_audio_bed(): Encoding [{start_point}, {end_point}] of {audio_path}.")
+
+    try:
+        run_ffmpeg([
+            "-ss", f"{start_point:.3f}", "-t", f"{end_point - start_point:.3f}",
+            "-i", audio_path,
+            "-map", "0:a:0",
+            *instagram_reel_audio_params(),
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            "-y", output_path
+        ])
+
+    except Exception as e:
+        logger.error(f"create_audio_bed(): Error occurred: {e}")
+        raise MediaManipulationError(f"An error occurred while creating the audio bed: {e}")
+
+    logger.info("create_audio_bed(): Audio bed created successfully.")
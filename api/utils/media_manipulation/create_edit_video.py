@@ -1,68 +1,73 @@
 import logging
-import os
-import tempfile
 
 from moviepy.editor import AudioFileClip, VideoFileClip, concatenate_videoclips
 
+from api.config.media import media_config
 from api.exceptions.media_manipulation.media_manipulation import \
     MediaManipulationError
-from api.utils.media_manipulation.resize_for_instagram_reel import \
-    resize_for_instagram_reel
-from api.utils.media_manipulation.write_videofile_for_instagram_reel import \
-    write_videofile_for_instagram_reel
+from api.utils.media_manipulation.resize_for_instagram_reel import (
+    instagram_reel_filter, resize_for_instagram_reel)
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+from api.utils.media_manipulation.write_videofile_for_instagram_reel import (
+    instagram_reel_ffmpeg_params, write_videofile_for_instagram_reel)
 
 logger = logging.getLogger("utils.media_manipulation")
 
 def create_edit_video(
-    video_bytes: bytes,
-    video_format: str,
-
-    audio_bytes: bytes,
-    audio_format: str,
-
+    video_path: str,
+    audio_path: str,
     breakpoints: list[float],
-
-    output_video_format: str
-) -> bytes:
+    audio_bed: bool = False,
+    *,
+    output_path: str
+) -> None:
     """
     Creates a new video by combining segments of an existing video based on breakpoints
     and setting a provided audio track.
 
     Args:
-        video_bytes: Bytes of the input video.
-        video_format: Format of the input video (e.g., mp4).
-        audio_bytes: Bytes of the audio track.
-        audio_format: Format of the audio track (e.g., mp3).
+        video_path: Path of the input video.
+        audio_path: Path of the audio track.
         breakpoints: List of timestamps (in seconds) defining the cuts in the video.
-        output_video_format: Format of the output video (e.g., mp4).
-
-    Returns:
-        The resulting video as bytes.
+        audio_bed: Whether audio_path is the song's audio bed (see create_audio_bed), already cut to
+            breakpoints[0]..breakpoints[-1] and encoded as AAC. The ffmpeg engine then copies it without re-encoding.
+        output_path: Path of the resulting video, its extension decides the container (e.g., mp4).
     """
-
-    video_temp_file_path = None
-    audio_temp_file_path = None
-    output_file_path = None
-
     logger.info("create_edit_video(): Start video editing")
     try:
-        # Temporarily store video and audio data
-        logger.info(f"create_edit_video(): Storing video and audio temporarily as {video_format} and {audio_format}.")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{video_format}") as video_temp_file:
-            video_temp_file.write(video_bytes)
-            video_temp_file_path = video_temp_file.name
+        # Force keyframes at every slot breakpoint, so later slot swaps can stream-copy the untouched parts
+        keyframe_times = [breakpoint - breakpoints[0] for breakpoint in breakpoints]
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{audio_format}") as audio_temp_file:
-            audio_temp_file.write(audio_bytes)
-            audio_temp_file_path = audio_temp_file.name
+        engine = media_config["engine"]
+        logger.info(f"create_edit_video(): Rendering with {engine} engine.")
+        if engine == "ffmpeg":
+            _create_edit_video_ffmpeg(video_path, audio_path, breakpoints, keyframe_times, output_path, audio_bed)
+        else:
+            _create_edit_video_moviepy(video_path, audio_path, breakpoints, keyframe_times, output_path, audio_bed)
+
+    except Exception as e:
+        logger.error(f"create_edit_video(): Error occurred: {e}")
+        raise MediaManipulationError(f"An error occurred during video editing: {e}")
+
+    logger.info("create_edit_video(): Video editing completed successfully.")
 
+def _create_edit_video_moviepy(
+    video_path: str,
+    audio_path: str,
+    breakpoints: list[float],
+    keyframe_times: list[float],
+    output_path: str,
+    audio_bed: bool = False
+) -> None:
+    """Rendert das Edit mit MoviePy, jeder Frame läuft durch Python."""
+    try:
         # Load video and audio clips
-        logger.info("create_edit_video(): Loading video and audio clips.")
-        video_clip = VideoFileClip(video_temp_file_path)
-        audio_clip = AudioFileClip(audio_temp_file_path)
+        logger.info("_create_edit_video_moviepy(): Loading video and audio clips.")
+        video_clip = VideoFileClip(video_path)
+        audio_clip = AudioFileClip(audio_path)
 
         # Create video segments based on breakpoints
-        logger.info("create_edit_video(): Creating video segments based on breakpoints.")
+        logger.info("_create_edit_video_moviepy(): Creating video segments based on breakpoints.")
         video_segments = []
         for i in range(1, len(breakpoints)):
             segment_duration = breakpoints[i] - breakpoints[i - 1]
@@ -70,31 +75,20 @@ def create_edit_video(
             video_segments.append(segment)
 
         # Concatenate video segments
-        logger.info("create_edit_video(): Concatenating video segments.")
+        logger.info("_create_edit_video_moviepy(): Concatenating video segments.")
         final_video = concatenate_videoclips(video_segments)
 
-        # Set audio from start of first breakpoint to end of last breakpoint
-        audio_start_time = breakpoints[0]
-        audio_end_time = breakpoints[-1]
+        # Set audio from start of first breakpoint to end of last breakpoint, the audio bed already starts there
+        audio_start_time = 0 if audio_bed else breakpoints[0]
+        audio_end_time = audio_start_time + breakpoints[-1] - breakpoints[0]
         final_video = final_video.set_audio(audio_clip.subclip(audio_start_time, audio_end_time))
 
         # Resize final video to 9:16
-        logger.info("create_edit_video(): Resizing video to 9:16 format.")
+        logger.info("_create_edit_video_moviepy(): Resizing video to 9:16 format.")
         final_video = resize_for_instagram_reel(final_video)
 
-        # Write final video to temporary file
-        logger.info(f"create_edit_video(): Writing final video to {output_video_format}.")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{output_video_format}") as output_temp_file:
-            write_videofile_for_instagram_reel(final_video, output_temp_file.name)
-            output_file_path = output_temp_file.name
-
-        # Read final video as bytes
-        with open(output_file_path, 'rb') as file:
-            result_bytes = file.read()
-
-    except Exception as e:
-        logger.error(f"create_edit_video(): Error occurred: {e}")
-        raise MediaManipulationError(f"An error occurred during video editing: {e}")
+        # Write final video
+        write_videofile_for_instagram_reel(final_video, output_path, keyframe_times=keyframe_times)
 
     finally:
         if 'video_clip' in locals():
@@ -104,14 +98,54 @@ def create_edit_video(
         if 'final_video' in locals():
             final_video.close()
 
-        # Delete temporary files
-        logger.info("create_edit_video(): Cleaning up temporary files.")
-        if video_temp_file_path and os.path.exists(video_temp_file_path):
-            os.remove(video_temp_file_path)
-        if audio_temp_file_path and os.path.exists(audio_temp_file_path):
-            os.remove(audio_temp_file_path)
-        if output_file_path and os.path.exists(output_file_path):
-            os.remove(output_file_path)
-
-    logger.info("create_edit_video(): Video editing completed successfully.")
-    return result_bytes
\ No newline at end of file
+def _create_edit_video_ffmpeg(
+    video_path: str,
+    audio_path: str,
+    breakpoints: list[float],
+    keyframe_times: list[float],
+    output_path: str,
+    audio_bed: bool = False
+) -> None:
+    """
+    Rendert das Edit mit einem einzigen ffmpeg-Aufruf (filter_complex: trim, scale, crop, concat, atrim).
+    Ein Audio-Bett wird ohne Dekodieren per Stream-Copy übernommen.
+    Das Demo-Video wird pro Segment als eigener Input geöffnet, damit ffmpeg keine Frames für spätere Segmente puffern muss.
+    """
+    reel = media_config["profiles"]["reel"]
+    segment_durations = [breakpoints[i] - breakpoints[i - 1] for i in range(1, len(breakpoints))]
+
+    inputs = []
+    filters = []
+    for index, segment_duration in enumerate(segment_durations):
+        inputs += ["-t", f"{segment_duration:.3f}", "-i", video_path]
+        # Pad with the last frame if the demo is shorter than the segment, like MoviePy does
+        filters.append(
+            f"[{index}:v]{instagram_reel_filter(reel['width'], reel['height'], reel['fps'])},"
+            f"tpad=stop_mode=clone:stop_duration={segment_duration:.3f},"
+            f"trim=duration={segment_duration:.3f},setpts=PTS-STARTPTS[v{index}]"
+        )
+
+    audio_index = len(segment_durations)
+    inputs += ["-i", audio_path]
+
+    filters.append(
+        "".join(f"[v{index}]" for index in range(len(segment_durations)))
+        + f"concat=n={len(segment_durations)}:v=1:a=0[v]"
+    )
+    if audio_bed:
+        audio_map = f"{audio_index}:a:0"
+        audio_params = ["-c:a", "copy"]
+    else:
+        filters.append(f"[{audio_index}:a]atrim=start={breakpoints[0]:.3f}:end={breakpoints[-1]:.3f},asetpts=PTS-STARTPTS[a]")
+        audio_map = "[a]"
+        audio_params = []
+
+    run_ffmpeg([
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]", "-map", audio_map,
+        *instagram_reel_ffmpeg_params(keyframe_times),
+        *audio_params,
+        "-movflags", "+faststart",
+        "-y", output_path
+    ])
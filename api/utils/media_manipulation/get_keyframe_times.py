@@ -0,0 +1,36 @@
+import logging
+import re
+
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+logger = logging.getLogger("utils.media_manipulation")
+
+def get_keyframe_times(video_path: str) -> list[float]:
+    """
+    Liest die Zeitpunkte aller Keyframes im ersten Videostream.
+    Es werden nur die Keyframes dekodiert, der Aufruf ist daher deutlich günstiger als ein kompletter Decode.
+
+    Args:
+        video_path (str): Pfad zur Videodatei.
+
+    Returns:
+        list[float]: Aufsteigend sortierte Keyframe-Zeitpunkte in Sekunden.
+    """
+    stderr = run_ffmpeg([
+        "-skip_frame", "nokey",
+        "-i", video_path,
+        "-map", "0:v:0",
+        "-vf", "showinfo",
+        "-f", "null", "-"
+    ])
+
+    keyframe_times = sorted(float(match) for match in re.findall(r"pts_time:\s*(-?[0-9.]+)", stderr))
+    logger.info(f"get_keyframe_times(): Found {len(keyframe_times)} keyframes in {video_path}")
+    return keyframe_times
+
+def find_keyframe(keyframe_times: list[float], time: float, tolerance: float) -> float | None:
+    """Gibt den Keyframe zurück, der höchstens `tolerance` Sekunden von `time` entfernt liegt."""
+    candidates = [keyframe for keyframe in keyframe_times if abs(keyframe - time) <= tolerance]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda keyframe: abs(keyframe - time))
@@ -0,0 +1,36 @@
+import logging
+import re
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+logger = logging.getLogger("utils.media_manipulation")
+
+def get_media_duration(media_path: str) -> float:
+    """
+    Liest die Dauer einer Mediendatei aus dem Container-Header, ohne Frames zu dekodieren.
+
+    Args:
+        media_path (str): Pfad zur Mediendatei.
+
+    Returns:
+        float: Dauer in Sekunden.
+    """
+    stderr = run_ffmpeg(["-i", media_path, "-f", "null", "-t", "0", "-"])
+
+    duration = parse_duration(stderr)
+    if duration is None:
+        raise MediaManipulationError(f"Could not read duration of {media_path}")
+
+    logger.info(f"get_media_duration(): {media_path} is {duration}s long")
+    return duration
+
+def parse_duration(stderr: str) -> float | None:
+    """Liest die Dauer aus der stderr-Ausgabe von ffmpeg ("Duration: 00:01:02.50")."""
+    match = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+    if match is None:
+        return None
+
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
@@ -0,0 +1,51 @@
+import logging
+
+from api.config.media import media_config
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.resize_for_instagram_reel import \
+    instagram_reel_filter
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+from api.utils.media_manipulation.write_videofile_for_instagram_reel import \
+    instagram_reel_ffmpeg_params
+
+logger = logging.getLogger("utils.media_manipulation")
+
+def normalize_clip(
+    video_path: str,
+    start_point: float,
+    end_point: float,
+    output_path: str
+) -> None:
+    """
+    Bringt einen hochgeladenen Clip einmalig in das Render-Format (Profil "intermediate": 1080x1920, konstante 25 fps, yuv420p, ohne Ton)
+    und schneidet ihn auf [start_point, end_point] zu. Rotation aus den Metadaten wird dabei angewendet, variable Framerate wird konstant.
+    Spätere Renderings lesen nur noch diesen Clip, der dann bei 0 beginnt.
+
+    Args:
+        video_path (str): Pfad zum hochgeladenen Clip (mp4, mov, mkv, avi, ...).
+        start_point (float): Beginn des verwendeten Abschnitts in Sekunden.
+        end_point (float): Ende des verwendeten Abschnitts in Sekunden.
+        output_path (str): Pfad des normalisierten Clips, die Endung bestimmt den Container.
+    """
+    logger.info(f"normalize_clip(): Normalizing [{start_point}, {end_point}] of {video_path}.")
+
+    try:
+        render_profile = media_config["profiles"]["intermediate"]
+        run_ffmpeg([
+            "-ss", f"{start_point:.3f}", "-t", f"{end_point - start_point:.3f}",
+            "-i", video_path,
+            "-map", "0:v:0",
+            # One cloned frame at the end, so a slot that is a few milliseconds longer than the clip still gets enough frames
+            "-vf", instagram_reel_filter(render_profile["width"], render_profile["height"], render_profile["fps"]) + ",tpad=stop_mode=clone:stop=1",
+            *instagram_reel_ffmpeg_params(profile="intermediate"),
+            "-an",
+            "-movflags", "+faststart",
+            "-y", output_path
+        ])
+
+    except Exception as e:
+        logger.error(f"normalize_clip(): Error occurred: {e}")
+        raise MediaManipulationError(f"An error occurred during clip normalization: {e}")
+
+    logger.info("normalize_clip(): Clip normalized successfully.")
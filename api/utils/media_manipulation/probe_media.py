@@ -0,0 +1,343 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple, Union
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.get_media_duration import parse_duration
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+logger = logging.getLogger("utils.media_manipulation")
+
+@dataclass
+class MediaInfo:
+    duration: float
+    sample_rate: Optional[int] = None
+    channel_layout: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    codec: Optional[str] = None
+
+def probe_media(file_bytes: bytes, file_format: str) -> MediaInfo:
+    """
+    Liest Dauer und Stream-Eigenschaften direkt aus den Headern im Speicher, ohne temporäre Datei und ohne ffmpeg:
+    WAV (RIFF-Chunks), MP3 (Frame-Header, Xing/Info/VBRI) und MP4/MOV/M4A (moov: mvhd, tkhd, mdhd, stsd, stsz).
+    Unbekannte oder nicht lesbare Formate werden mit ffmpeg untersucht (probe_media_file).
+
+    Args:
+        file_bytes (bytes): Inhalt der Datei.
+        file_format (str): Dateiendung, entscheidet nur über die Reihenfolge der Parser.
+
+    Returns:
+        MediaInfo: Dauer in Sekunden, bei Audio Abtastrate und Kanal-Layout, bei Video Breite, Höhe, fps und Codec.
+    """
+    media_info = _probe_headers(file_bytes, file_format)
+    if media_info is not None:
+        return media_info
+
+    logger.info(f"probe_media(): Unknown {file_format} header, probing with ffmpeg")
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_format}") as temp_file:
+        temp_file.write(file_bytes)
+        temp_file_path = temp_file.name
+    try:
+        return probe_media_file(temp_file_path)
+    finally:
+        os.remove(temp_file_path)
+
+def probe_media_path(media_path: str) -> MediaInfo:
+    """
+    Wie probe_media für eine Datei auf der Festplatte. Die Datei wird per mmap gelesen, das Betriebssystem lädt
+    nur die Seiten mit den Headern (bei MP4 die moov-Box), nicht die ganze Datei.
+
+    Args:
+        media_path (str): Pfad zur Audio- oder Videodatei, die Endung entscheidet über die Reihenfolge der Parser.
+
+    Returns:
+        MediaInfo: Wie probe_media.
+    """
+    file_format = os.path.splitext(media_path)[1].lstrip(".")
+    try:
+        with open(media_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            media_info = _probe_headers(data, file_format)
+    except ValueError:
+        # Empty files can not be mapped
+        media_info = None
+    if media_info is not None:
+        return media_info
+
+    logger.info(f"probe_media_path(): Unknown {file_format} header, probing with ffmpeg")
+    return probe_media_file(media_path)
+
+def probe_media_file(media_path: str) -> MediaInfo:
+    """
+    Liest Dauer und Eigenschaften des ersten Audio- und Videostreams einer Datei mit ffmpeg aus dem Container-Header, ohne zu dekodieren.
+
+    Args:
+        media_path (str): Pfad zur Audio- oder Videodatei.
+
+    Returns:
+        MediaInfo: Wie probe_media.
+    """
+    stderr = run_ffmpeg(["-i", media_path, "-f", "null", "-t", "0", "-"])
+    # Only the input section, the output section lists the null muxer streams
+    stderr = stderr.split("Stream mapping:")[0]
+
+    duration = parse_duration(stderr)
+    if duration is None:
+        raise MediaManipulationError(f"Could not read duration of {media_path}")
+    media_info = MediaInfo(duration=duration)
+
+    # e.g. "Stream #0:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, stereo, fltp, 128 kb/s"
+    audio_match = re.search(r"Audio: (\w+)[^\n]*?(\d+) Hz, ([^,\n]+)", stderr)
+    if audio_match is not None:
+        media_info.codec = audio_match.group(1)
+        media_info.sample_rate = int(audio_match.group(2))
+        media_info.channel_layout = audio_match.group(3).strip()
+
+    # e.g. "Stream #0:0(und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(progressive), 1080x1920 [SAR 1:1 DAR 9:16], 25 fps"
+    video_match = re.search(r"Video: (\w+)[^\n]*?, (\d{2,5})x(\d{2,5})", stderr)
+    if video_match is not None:
+        media_info.codec = video_match.group(1)
+        media_info.width = int(video_match.group(2))
+        media_info.height = int(video_match.group(3))
+        fps_match = re.search(r"Video: [^\n]*?([0-9.]+) fps", stderr)
+        if fps_match is not None:
+            media_info.fps = float(fps_match.group(1))
+
+    logger.info(f"probe_media_file(): {media_path}: {media_info}")
+    return media_info
+
+def _probe_headers(data: Union[bytes, mmap.mmap], file_format: str) -> Optional[MediaInfo]:
+    """Versucht die Header-Parser, gibt None zurück, wenn keiner das Format erkennt."""
+    parsers = [_probe_wav, _probe_mp4, _probe_mp3]
+    # The extension only decides which parser goes first, the content decides which one matches
+    parsers.sort(key=lambda parser: file_format.lower() not in _PARSER_FORMATS[parser.__name__])
+
+    for parser in parsers:
+        try:
+            media_info = parser(data)
+        except (struct.error, IndexError, ValueError, ZeroDivisionError) as e:
+            logger.warning(f"_probe_headers(): {parser.__name__} could not parse {file_format}: {e}")
+            media_info = None
+        if media_info is not None:
+            logger.info(f"_probe_headers(): {file_format} via {parser.__name__}: {media_info}")
+            return media_info
+    return None
+
+def _channel_layout(channels: int) -> str:
+    """Kanal-Layout wie ffmpeg es benennt."""
+    return {1: "mono", 2: "stereo"}.get(channels, f"{channels} channels")
+
+"""WAV"""
+def _wav_codec(audio_format: int, bits_per_sample: int) -> Optional[str]:
+    """Codec-Name wie ffmpeg ihn nennt, z.B. pcm_s16le."""
+    if audio_format in (1, 0xFFFE):
+        return "pcm_u8" if bits_per_sample == 8 else f"pcm_s{bits_per_sample}le"
+    if audio_format == 3:
+        return f"pcm_f{bits_per_sample}le"
+    return None
+
+def _probe_wav(data: bytes) -> Optional[MediaInfo]:
+    if len(data) < 12 or data[0:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    audio_format = channels = sample_rate = byte_rate = bits_per_sample = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate, byte_rate, _, bits_per_sample = struct.unpack_from("<HHIIHH", data, offset + 8)
+        elif chunk_id == b"data":
+            if byte_rate is None:
+                return None
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF, the data then runs to the end of the file
+            data_size = min(chunk_size, len(data) - offset - 8) if chunk_size not in (0, 0xFFFFFFFF) else len(data) - offset - 8
+            return MediaInfo(duration=data_size / byte_rate, sample_rate=sample_rate, channel_layout=_channel_layout(channels), codec=_wav_codec(audio_format, bits_per_sample))
+        # Chunks are padded to an even size
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+"""MP3"""
+_MP3_BITRATES = {
+    # (MPEG-1, layer): kbit/s for bitrate index 1..14
+    (True, 1): [32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _mp3_frame_header(data: bytes, offset: int) -> Optional[Tuple[int, int, int, int, int]]:
+    """Gibt (Abtastrate, Kanäle, Bitrate in bit/s, Samples pro Frame, Framelänge) des Frame-Headers bei offset zurück."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x03
+    layer = 4 - ((data[offset + 1] >> 1) & 0x03)
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+    channel_mode = data[offset + 3] >> 6
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index - 1] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    channels = 1 if channel_mode == 3 else 2
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if mpeg1 or layer == 2 else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return sample_rate, channels, bitrate, samples_per_frame, frame_length
+
+def _probe_mp3(data: bytes) -> Optional[MediaInfo]:
+    start = 0
+    # ID3v2 tag in front of the first frame, size is syncsafe (7 bits per byte)
+    if data[0:3] == b"ID3" and len(data) >= 10:
+        tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + tag_size + (10 if data[5] & 0x10 else 0)
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+
+    # First frame whose successor starts where the header says, single sync bytes also appear in tag data
+    offset = start
+    header = None
+    while offset < min(end, start + 64 * 1024):
+        header = _mp3_frame_header(data, offset)
+        if header is not None and (offset + header[4] >= end or _mp3_frame_header(data, offset + header[4]) is not None):
+            break
+        header = None
+        offset += 1
+    if header is None:
+        return None
+    sample_rate, channels, bitrate, samples_per_frame, _ = header
+    mpeg1 = (data[offset + 1] >> 3) & 0x03 == 3
+
+    # VBR files carry the frame count in a Xing/Info header (after the side info) or a VBRI header (32 bytes after the frame header)
+    side_info_length = (17 if channels == 1 else 32) if mpeg1 else (9 if channels == 1 else 17)
+    xing_offset = offset + 4 + side_info_length
+    frames = None
+    if data[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", data, xing_offset + 4)[0]
+        if flags & 0x01:
+            frames = struct.unpack_from(">I", data, xing_offset + 8)[0]
+    elif data[offset + 36:offset + 40] == b"VBRI":
+        frames = struct.unpack_from(">I", data, offset + 36 + 14)[0]
+
+    if frames is not None:
+        duration = frames * samples_per_frame / sample_rate
+    else:
+        duration = (end - offset) * 8 / bitrate
+    return MediaInfo(duration=duration, sample_rate=sample_rate, channel_layout=_channel_layout(channels), codec="mp3")
+
+"""MP4 / MOV / M4A"""
+# Fourccs der stsd-Einträge, wie ffmpeg die Codecs nennt (probe_media_file), damit die gespeicherten Metadaten nicht vom Parser abhängen
+_MP4_CODECS = {
+    "avc1": "h264", "avc3": "h264",
+    "hvc1": "hevc", "hev1": "hevc",
+    "av01": "av1",
+    "vp09": "vp9",
+    "mp4v": "mpeg4",
+    "jpeg": "mjpeg",
+    "apch": "prores", "apcn": "prores", "apcs": "prores", "apco": "prores", "ap4h": "prores",
+    # mp4a is almost always AAC, the object type in esds is not read
+    "mp4a": "aac",
+    ".mp3": "mp3",
+    "ac-3": "ac3",
+    "ec-3": "eac3",
+    "Opus": "opus",
+    "fLaC": "flac",
+    "alac": "alac",
+    "sowt": "pcm_s16le",
+    "twos": "pcm_s16be",
+}
+
+def _mp4_boxes(data: bytes, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Gibt (Typ, Beginn des Inhalts, Ende) aller Boxen in [start, end) zurück."""
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield box_type, offset + header_size, min(offset + size, end)
+        offset += size
+
+def _mp4_child(data: bytes, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    """Sucht die Box unter dem Pfad (z.B. b"mdia", b"hdlr") und gibt (Beginn des Inhalts, Ende) zurück."""
+    for box_type, box_start, box_end in _mp4_boxes(data, start, end):
+        if box_type == path[0]:
+            return (box_start, box_end) if len(path) == 1 else _mp4_child(data, box_start, box_end, *path[1:])
+    return None
+
+def _mp4_media_duration(data: bytes, box: Tuple[int, int]) -> Tuple[int, int]:
+    """Gibt (Timescale, Duration) einer mvhd- oder mdhd-Box zurück."""
+    start, _ = box
+    if data[start] == 1:
+        return struct.unpack_from(">IQ", data, start + 20)
+    return struct.unpack_from(">II", data, start + 12)
+
+def _probe_mp4(data: bytes) -> Optional[MediaInfo]:
+    if data[4:8] not in (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip"):
+        return None
+    moov = _mp4_child(data, 0, len(data), b"moov")
+    mvhd = moov and _mp4_child(data, *moov, b"mvhd")
+    if mvhd is None:
+        return None
+
+    timescale, duration = _mp4_media_duration(data, mvhd)
+    if not duration:
+        # Fragmented MP4, the duration is only known from the fragments
+        return None
+    media_info = MediaInfo(duration=duration / timescale)
+
+    for box_type, trak_start, trak_end in _mp4_boxes(data, *moov):
+        if box_type != b"trak":
+            continue
+        hdlr = _mp4_child(data, trak_start, trak_end, b"mdia", b"hdlr")
+        stsd = _mp4_child(data, trak_start, trak_end, b"mdia", b"minf", b"stbl", b"stsd")
+        if hdlr is None or stsd is None:
+            continue
+        handler = data[hdlr[0] + 8:hdlr[0] + 12]
+        # First sample entry after version/flags and entry count
+        entry_start = stsd[0] + 8
+        fourcc = data[entry_start + 4:entry_start + 8].decode("latin-1").strip()
+        codec = _MP4_CODECS.get(fourcc, fourcc)
+
+        if handler == b"soun" and media_info.sample_rate is None:
+            channels = struct.unpack_from(">H", data, entry_start + 8 + 16)[0]
+            media_info.sample_rate = struct.unpack_from(">I", data, entry_start + 8 + 24)[0] >> 16
+            media_info.channel_layout = _channel_layout(channels)
+            media_info.codec = media_info.codec or codec
+        elif handler == b"vide" and media_info.width is None:
+            media_info.width, media_info.height = struct.unpack_from(">HH", data, entry_start + 8 + 24)
+            media_info.codec = codec
+            mdhd = _mp4_child(data, trak_start, trak_end, b"mdia", b"mdhd")
+            stsz = _mp4_child(data, trak_start, trak_end, b"mdia", b"minf", b"stbl", b"stsz")
+            if mdhd is not None and stsz is not None:
+                track_timescale, track_duration = _mp4_media_duration(data, mdhd)
+                sample_count = struct.unpack_from(">I", data, stsz[0] + 8)[0]
+                if track_duration:
+                    media_info.fps = round(sample_count * track_timescale / track_duration, 3)
+    return media_info
+
+_PARSER_FORMATS = {
+    "_probe_wav": {"wav", "wave"},
+    "_probe_mp3": {"mp3"},
+    "_probe_mp4": {"mp4", "m4a", "mov", "3gp"},
+}
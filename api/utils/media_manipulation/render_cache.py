@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Callable, Tuple
+
+from api.config.media import media_config
+from api.utils.database.create_uuid import create_uuid
+
+logger = logging.getLogger("utils.media_manipulation")
+
+# Erhöhen, wenn sich die Ausgabe der Render-Funktionen bei gleichen Eingaben ändert
+RENDER_CACHE_VERSION = 1
+
+# Block size when hashing input files, files are never held in memory completely
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def render_cache_key(render: Callable[..., None], args: Tuple[Any, ...]) -> str:
+    """
+    Berechnet den Schlüssel eines Renderings aus Render-Funktion, Eingaben und Ausgabeprofil.
+
+    Args:
+        render (Callable): Die Render-Funktion, z.B. swap_slot_in_edit.
+        args (Tuple): Die Argumente der Render-Funktion (ohne output_path). Eingabedateien werden als os.PathLike
+            (pathlib.Path) übergeben und über ihren Inhalt gehasht, nicht über den Pfad.
+
+    Returns:
+        str: SHA-256 Hexdigest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{RENDER_CACHE_VERSION}:{render.__module__}.{render.__qualname__}".encode())
+    digest.update(json.dumps(media_config, sort_keys=True).encode())
+
+    for arg in args:
+        if isinstance(arg, os.PathLike):
+            # Length prefix, so that neighbouring arguments can not shift into each other
+            digest.update(f"file:{os.path.getsize(arg)}:".encode())
+            with open(arg, 'rb') as file:
+                while block := file.read(HASH_BLOCK_SIZE):
+                    digest.update(block)
+            continue
+
+        data = arg if isinstance(arg, bytes) else repr(arg).encode()
+        digest.update(f"{type(arg).__name__}:{len(data)}:".encode())
+        digest.update(data)
+
+    return digest.hexdigest()
+
+class RenderCache:
+    """
+    Inhaltsadressierter Cache für Render-Ergebnisse auf der Festplatte.
+    Ist der Cache größer als max_bytes, werden die am längsten nicht benutzten Einträge gelöscht (LRU über mtime).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.size = sum(os.path.getsize(path) for path in self._entries())
+        logger.info(f"RenderCache(): {self.cache_dir} with {self.size}/{self.max_bytes} bytes")
+
+    def get(self, key: str, output_path: str) -> bool:
+        """Kopiert das gespeicherte Ergebnis nach output_path, gibt False zurück, wenn es keins gibt."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+            os.utime(path)
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            logger.info(f"RenderCache.get(): miss {key}")
+            return False
+
+        with self.lock:
+            self.hits += 1
+        logger.info(f"RenderCache.get(): hit {key}")
+        return True
+
+    def put(self, key: str, source_path: str) -> None:
+        """Speichert eine Kopie des Ergebnisses unter source_path, zu große Ergebnisse werden nicht gespeichert."""
+        data_size = os.path.getsize(source_path)
+        if data_size > self.max_bytes:
+            logger.info(f"RenderCache.put(): {key} is larger than the cache, skipping")
+            return
+
+        path = self._path(key)
+        temp_path = f"{path}.{create_uuid()}.tmp"
+        shutil.copyfile(source_path, temp_path)
+
+        with self.lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+            self.size += data_size - previous_size
+            self._evict()
+
+    def stats(self) -> dict:
+        """Zähler und Füllstand des Caches."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes
+            }
+
+    def _evict(self) -> None:
+        if self.size <= self.max_bytes:
+            return
+
+        for path in sorted(self._entries(), key=os.path.getmtime):
+            if self.size <= self.max_bytes:
+                break
+            entry_size = os.path.getsize(path)
+            os.remove(path)
+            self.size -= entry_size
+            self.evictions += 1
+            logger.info(f"RenderCache._evict(): removed {os.path.basename(path)}")
+
+    def _entries(self) -> list[str]:
+        return [
+            os.path.join(self.cache_dir, file_name)
+            for file_name in os.listdir(self.cache_dir)
+            if file_name.endswith(".bin")
+        ]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
@@ -44,4 +44,25 @@ def resize_for_instagram_reel(clip: VideoFileClip, output_width: int = 1080, out
 
     except Exception as e:
         logger.error(f"resize_for_instagram_reel(): Error occurred: {e}")
-        raise MediaManipulationError(f"An error occurred during resizing: {e}")
\ No newline at end of file
+        raise MediaManipulationError(f"An error occurred during resizing: {e}")
+
+def instagram_reel_filter(output_width: int = 1080, output_height: int = 1920, fps: int = 25) -> str:
+    """
+    Gibt die ffmpeg-Filterkette zurück, die dasselbe wie resize_for_instagram_reel macht
+    (skalieren bis das Zielformat abgedeckt ist, mittig zuschneiden) und zusätzlich Framerate und Pixelformat setzt.
+
+    Args:
+        output_width (int): Die Zielbreite, standardmäßig 1080.
+        output_height (int): Die Zielhöhe, standardmäßig 1920.
+        fps (int): Die Ziel-Framerate, standardmäßig 25.
+
+    Returns:
+        str: Filterkette zur Verwendung in einem filter_complex-Graph.
+    """
+    return (
+        f"scale={output_width}:{output_height}:force_original_aspect_ratio=increase,"
+        f"crop={output_width}:{output_height},"
+        f"setsar=1,"
+        f"fps={fps},"
+        f"format=yuv420p"
+    )
@@ -0,0 +1,103 @@
+import logging
+import subprocess
+import tempfile
+import threading
+from typing import Callable, Iterator, Optional
+
+from moviepy.config import get_setting
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+
+logger = logging.getLogger("utils.media_manipulation")
+
+def run_ffmpeg(args: list[str]) -> str:
+    """
+    Führt das von MoviePy verwendete ffmpeg-Binary mit den übergebenen Argumenten aus.
+
+    Args:
+        args (list[str]): Argumente für ffmpeg (ohne das Binary selbst).
+
+    Returns:
+        str: Die stderr-Ausgabe von ffmpeg (enthält u.a. Stream-Infos und Filter-Logs).
+    """
+    command = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", *args]
+    logger.info(f"run_ffmpeg(): Running {' '.join(command)}")
+
+    try:
+        process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as e:
+        logger.error(f"run_ffmpeg(): Could not start ffmpeg: {e}")
+        raise MediaManipulationError(f"Could not start ffmpeg: {e}")
+
+    stderr = process.stderr.decode("utf-8", errors="replace")
+    if process.returncode != 0:
+        logger.error(f"run_ffmpeg(): ffmpeg exited with code {process.returncode}: {stderr[-500:]}")
+        raise MediaManipulationError(f"ffmpeg exited with code {process.returncode}")
+
+    return stderr
+
+class FFmpegStream:
+    """
+    Führt ffmpeg mit Ausgabe auf stdout aus und liefert die Ausgabe stückweise, während ffmpeg noch encodiert.
+    close() beendet ffmpeg, z.B. wenn der Client die Verbindung abbricht, und darf aus einem anderen Thread kommen.
+    """
+
+    def __init__(self, args: list[str], cleanup: Optional[Callable[[], None]] = None, chunk_size: int = 64 * 1024) -> None:
+        """
+        Args:
+            args (list[str]): Argumente für ffmpeg (ohne das Binary selbst), die Ausgabe muss nach pipe:1 gehen.
+            cleanup (Callable): Wird einmal aufgerufen, sobald ffmpeg beendet ist (z.B. um temporäre Eingabedateien zu löschen).
+            chunk_size (int): Maximale Größe der gelieferten Stücke in Bytes.
+        """
+        command = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", *args]
+        logger.info(f"FFmpegStream(): Running {' '.join(command)}")
+
+        self.cleanup = cleanup
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stderr = tempfile.TemporaryFile()
+
+        try:
+            self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=self.stderr)
+        except OSError as e:
+            logger.error(f"FFmpegStream(): Could not start ffmpeg: {e}")
+            self.process = None
+            self.close()
+            raise MediaManipulationError(f"Could not start ffmpeg: {e}")
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            while True:
+                chunk = self.process.stdout.read1(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+            returncode = self.process.wait()
+            if returncode != 0 and not self.closed:
+                self.stderr.seek(0)
+                stderr = self.stderr.read().decode("utf-8", errors="replace")
+                logger.error(f"FFmpegStream(): ffmpeg exited with code {returncode}: {stderr[-500:]}")
+                raise MediaManipulationError(f"ffmpeg exited with code {returncode}")
+        finally:
+            self.process.stdout.close()
+            self.close()
+
+    def close(self) -> None:
+        """Beendet ffmpeg, falls es noch läuft, und räumt auf."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+
+        if self.process is not None and self.process.poll() is None:
+            logger.info("FFmpegStream.close(): Killing ffmpeg")
+            self.process.kill()
+        if self.process is not None:
+            self.process.wait()
+
+        self.stderr.close()
+        if self.cleanup is not None:
+            self.cleanup()
@@ -1,99 +1,463 @@
 import logging
 import os
 import tempfile
+from typing import Callable, Optional
 
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 
+from api.config.media import media_config
 from api.exceptions.media_manipulation.media_manipulation import \
     MediaManipulationError
-from api.utils.media_manipulation.resize_for_instagram_reel import \
-    resize_for_instagram_reel
+from api.utils.media_manipulation.get_keyframe_times import (
+    find_keyframe, get_keyframe_times)
+from api.utils.media_manipulation.get_media_duration import \
+    get_media_duration
+from api.utils.media_manipulation.resize_for_instagram_reel import (
+    instagram_reel_filter, resize_for_instagram_reel)
+from api.utils.media_manipulation.run_ffmpeg import FFmpegStream, run_ffmpeg
+from api.utils.media_manipulation.write_videofile_for_instagram_reel import (
+    instagram_reel_ffmpeg_params, write_videofile_for_instagram_reel)
 
 logger = logging.getLogger("utils.media_manipulation")
 
+# Ein Frame bei 25 fps, ffmpeg setzt erzwungene Keyframes auf den ersten Frame ab dem Zeitpunkt
+KEYFRAME_TOLERANCE = 0.04
+
+# Framerate der Edits (Profil "reel"), der neue Abschnitt muss exakt passen
+EDIT_FPS = media_config["profiles"]["reel"]["fps"]
+
+# Maximale Länge eines Fragments beim Streamen, so früh kann der Client die ersten Frames abspielen
+PREVIEW_FRAGMENT_MICROSECONDS = 500_000
+
 def swap_slot_in_edit(
-    input_video_bytes: bytes, 
-    input_video_start_point: float, 
+    input_video_path: str,
+    input_video_start_point: float,
     input_video_end_point: float,
-    input_video_format: str,
-    
-    new_video_bytes: bytes, 
-    new_video_start_point: float, 
+
+    new_video_path: str,
+    new_video_start_point: float,
     new_video_end_point: float,
-    new_video_format: str,
-    
-    output_video_format: str
-) -> bytes:
+
+    profile: str = "reel",
+    context_seconds: Optional[float] = None,
+    input_video_duration: Optional[float] = None,
+    *,
+    output_path: str
+) -> None:
+    """
+    Ersetzt den Abschnitt [input_video_start_point, input_video_end_point] im Edit durch einen Ausschnitt des neuen Videos
+    und schreibt das Ergebnis nach output_path. Die Videos werden nur von ffmpeg bzw. MoviePy gelesen, nie komplett in den Speicher.
+
+    Liegen im Edit Keyframes an beiden Schnittstellen (siehe create_edit_video), wird nur der neue
+    Abschnitt encodiert und die Teile davor und danach per Stream-Copy übernommen. Andernfalls wird
+    das komplette Edit neu encodiert.
+
+    Mit einem anderen Profil als "reel" (z.B. "preview") passt die Ausgabe nicht mehr zum Edit, es wird
+    immer komplett neu encodiert, dafür in der Auflösung und mit dem Preset des Profils.
+
+    Mit context_seconds wird nur ein Fenster gerendert: der Slot und bis zu context_seconds davor und danach,
+    mit der Tonspur des Edits für dieses Fenster. Geschrieben wird dann nur dieser kurze Clip.
+
+    Ist die Dauer des Edits bekannt (gespeicherte Metadaten), wird sie als input_video_duration übergeben und nicht erneut gelesen.
+    """
     logger.info("swap_slot_in_edit(): Start swapping video slots.")
-    video_temp_file_path = None
-    new_video_temp_file_path = None
-    output_file_path = None
 
     try:
-        # Create temporary files for the original and new video
-        logger.info("swap_slot_in_edit(): Storing input and new videos in temporary files.")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{input_video_format}") as video_temp_file:
-            video_temp_file.write(input_video_bytes)
-            video_temp_file_path = video_temp_file.name
+        if input_video_duration is None:
+            input_video_duration = get_media_duration(input_video_path)
+
+        # Only the window around the slot is rendered, by default the whole edit
+        windowed = context_seconds is not None
+        window_start = max(0.0, input_video_start_point - context_seconds) if windowed else 0.0
+        window_end = min(input_video_duration, input_video_end_point + context_seconds) if windowed else input_video_duration
+
+        swapped = False
+        if windowed:
+            logger.info(f"swap_slot_in_edit(): Rendering window [{window_start}, {window_end}] with {profile} profile.")
+            keyframe_times = None
+        elif profile != "reel":
+            logger.info(f"swap_slot_in_edit(): Rendering with {profile} profile, re-encoding the whole edit.")
+            keyframe_times = []
+        else:
+            swapped, keyframe_times = _try_swap_slot_stream_copy(
+                input_video_path,
+                input_video_duration,
+                input_video_start_point,
+                input_video_end_point,
+                new_video_path,
+                new_video_start_point,
+                output_path
+            )
+
+        if not swapped:
+            # Keep existing keyframes and align the swapped slot for the next swap
+            if keyframe_times is not None:
+                keyframe_times = keyframe_times + [input_video_start_point, input_video_end_point]
+
+            engine = media_config["engine"]
+            logger.info(f"swap_slot_in_edit(): Re-encoding the whole edit with {engine} engine.")
+            if engine == "ffmpeg":
+                _swap_slot_ffmpeg(
+                    input_video_path,
+                    input_video_duration,
+                    input_video_start_point,
+                    input_video_end_point,
+                    new_video_path,
+                    new_video_start_point,
+                    new_video_end_point,
+                    keyframe_times,
+                    output_path,
+                    profile,
+                    window_start,
+                    window_end
+                )
+            else:
+                _swap_slot_moviepy(
+                    input_video_path,
+                    input_video_start_point,
+                    input_video_end_point,
+                    new_video_path,
+                    new_video_start_point,
+                    new_video_end_point,
+                    keyframe_times,
+                    output_path,
+                    profile,
+                    window_start,
+                    window_end if windowed else None
+                )
+
+    except Exception as e:
+        logger.error(f"swap_slot_in_edit(): Error occurred: {e}")
+        raise MediaManipulationError(f"An error occurred during slot swapping: {e}")
+
+    logger.info("swap_slot_in_edit(): Video slot swapping completed successfully.")
+
+def stream_swap_slot_in_edit(
+    input_video_path: str,
+    input_video_start_point: float,
+    input_video_end_point: float,
+
+    new_video_path: str,
+    new_video_start_point: float,
+    new_video_end_point: float,
+
+    profile: str = "preview",
+    context_seconds: Optional[float] = None,
+    input_video_duration: Optional[float] = None,
+    cleanup: Optional[Callable[[], None]] = None
+) -> FFmpegStream:
+    """
+    Wie swap_slot_in_edit mit der ffmpeg-Engine, schreibt das Ergebnis aber als fragmentiertes MP4 nach stdout.
+    Die Fragmente können ausgeliefert werden, während ffmpeg noch encodiert. Gedacht für Vorschauen, es wird
+    immer neu encodiert (kein Stream-Copy). cleanup wird aufgerufen, sobald ffmpeg beendet ist, die Eingabedateien
+    müssen bis dahin bestehen bleiben.
+    """
+    logger.info(f"stream_swap_slot_in_edit(): Start streaming swapped slot with {profile} profile.")
+
+    try:
+        if input_video_duration is None:
+            input_video_duration = get_media_duration(input_video_path)
+
+        windowed = context_seconds is not None
+        window_start = max(0.0, input_video_start_point - context_seconds) if windowed else 0.0
+        window_end = min(input_video_duration, input_video_end_point + context_seconds) if windowed else input_video_duration
+
+        args = _swap_slot_ffmpeg_args(
+            input_video_path,
+            input_video_duration,
+            input_video_start_point,
+            input_video_end_point,
+            new_video_path,
+            new_video_start_point,
+            new_video_end_point,
+            None,
+            profile,
+            window_start,
+            window_end
+        )
+
+    except Exception as e:
+        logger.error(f"stream_swap_slot_in_edit(): Error occurred: {e}")
+        if cleanup is not None:
+            cleanup()
+        raise MediaManipulationError(f"An error occurred during slot swapping: {e}")
+
+    # Fragmented MP4, the moov atom comes first and a new fragment starts at every keyframe and at least every PREVIEW_FRAGMENT_MICROSECONDS
+    # FFmpegStream runs cleanup itself, also if ffmpeg can not be started
+    return FFmpegStream(
+        [*args, "-movflags", "frag_keyframe+empty_moov+default_base_moof", "-frag_duration", str(PREVIEW_FRAGMENT_MICROSECONDS), "-f", "mp4", "pipe:1"],
+        cleanup=cleanup
+    )
+
+def _try_swap_slot_stream_copy(
+    input_video_path: str,
+    input_video_duration: float,
+    input_video_start_point: float,
+    input_video_end_point: float,
+    new_video_path: str,
+    new_video_start_point: float,
+    output_path: str
+) -> tuple[bool, list[float]]:
+    """Tauscht den Slot per Stream-Copy, falls das Edit an beiden Schnittstellen Keyframes hat. Gibt zusätzlich die Keyframes des Edits zurück."""
+    # Check if the edit has keyframes at both cut points
+    keyframe_times = get_keyframe_times(input_video_path)
+    start_keyframe = 0.0 if input_video_start_point <= 0 else find_keyframe(keyframe_times, input_video_start_point, KEYFRAME_TOLERANCE)
+    end_keyframe = find_keyframe(keyframe_times, input_video_end_point, KEYFRAME_TOLERANCE)
+    if end_keyframe is None and input_video_end_point >= input_video_duration - KEYFRAME_TOLERANCE:
+        end_keyframe = input_video_duration
+
+    if start_keyframe is None or end_keyframe is None:
+        logger.info("_try_swap_slot_stream_copy(): Edit is not keyframe aligned, falling back to full re-encode.")
+        return False, keyframe_times
+
+    try:
+        _swap_slot_stream_copy(
+            input_video_path,
+            input_video_duration,
+            start_keyframe,
+            end_keyframe,
+            new_video_path,
+            new_video_start_point,
+            output_path
+        )
+    except MediaManipulationError as e:
+        logger.warning(f"_try_swap_slot_stream_copy(): Stream copy failed, falling back to full re-encode: {e}")
+        return False, keyframe_times
+
+    return True, keyframe_times
+
+def _swap_slot_stream_copy(
+    input_video_path: str,
+    input_video_duration: float,
+    start_keyframe: float,
+    end_keyframe: float,
+    new_video_path: str,
+    new_video_start_point: float,
+    output_path: str
+) -> None:
+    """Encodiert nur den neuen Abschnitt und übernimmt die Teile davor und danach per Stream-Copy."""
+    logger.info(f"_swap_slot_stream_copy(): Re-encoding only [{start_keyframe}, {end_keyframe}].")
+    work_dir = tempfile.mkdtemp()
+    try:
+        # Split the edit at the keyframes without re-encoding: [before slot, old slot, after slot]
+        split_times = [time for time in (start_keyframe, end_keyframe) if 0 < time < input_video_duration - KEYFRAME_TOLERANCE]
+        split_pattern = os.path.join(work_dir, "split%d.mp4")
+        if not split_times:
+            raise MediaManipulationError("Slot covers the whole edit, nothing to stream-copy")
+        run_ffmpeg([
+            "-i", input_video_path,
+            "-map", "0:v:0",
+            "-c", "copy",
+            "-f", "segment",
+            "-segment_times", ",".join(f"{time - 0.001:.3f}" for time in split_times),
+            "-reset_timestamps", "1",
+            "-y", split_pattern
+        ])
+        split_parts = sorted(
+            (file_name for file_name in os.listdir(work_dir) if file_name.startswith("split")),
+            key=lambda file_name: int(file_name[len("split"):-len(".mp4")])
+        )
+        if len(split_parts) != len(split_times) + 1:
+            raise MediaManipulationError(f"Expected {len(split_times) + 1} parts after splitting, got {len(split_parts)}")
+
+        # New slot segment, encoded with the same settings as the edit
+        segment_path = os.path.join(work_dir, "segment.mp4")
+        _write_slot_segment(new_video_path, new_video_start_point, end_keyframe - start_keyframe, segment_path)
+
+        # Replace the old slot part with the new segment
+        parts = [os.path.join(work_dir, file_name) for file_name in split_parts]
+        parts[1 if start_keyframe > 0 else 0] = segment_path
+
+        # Concatenate without re-encoding and take the audio track from the original edit
+        concat_list_path = os.path.join(work_dir, "parts.txt")
+        with open(concat_list_path, "w") as concat_list:
+            concat_list.writelines(f"file '{part}'\n" for part in parts)
+
+        run_ffmpeg([
+            "-f", "concat", "-safe", "0", "-i", concat_list_path,
+            "-i", input_video_path,
+            "-map", "0:v:0", "-map", "1:a:0?",
+            "-c", "copy",
+            "-movflags", "+faststart",
+            "-y", output_path
+        ])
+    finally:
+        for file_name in os.listdir(work_dir):
+            os.remove(os.path.join(work_dir, file_name))
+        os.rmdir(work_dir)
+
+def _write_slot_segment(new_video_path: str, new_video_start_point: float, duration: float, output_path: str) -> None:
+    """Encodiert einen Ausschnitt des neuen Videos ohne Ton im Format des Edits, mit exakt passender Anzahl Frames."""
+    frame_count = round(duration * EDIT_FPS)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{new_video_format}") as new_video_temp_file:
-            new_video_temp_file.write(new_video_bytes)
-            new_video_temp_file_path = new_video_temp_file.name
+    if media_config["engine"] == "ffmpeg":
+        reel = media_config["profiles"]["reel"]
+        run_ffmpeg([
+            "-ss", f"{new_video_start_point:.3f}", "-t", f"{duration:.3f}", "-i", new_video_path,
+            "-filter_complex", f"[0:v]{instagram_reel_filter(reel['width'], reel['height'], EDIT_FPS)}[v]",
+            "-map", "[v]", "-an",
+            "-frames:v", str(frame_count),
+            *instagram_reel_ffmpeg_params(),
+            "-y", output_path
+        ])
+        return
 
+    try:
+        new_video_clip = resize_for_instagram_reel(VideoFileClip(new_video_path))
+        # MoviePy samples frames with np.arange(0, duration, 1 / fps), end half a frame early to avoid float rounding adding a frame
+        new_segment = new_video_clip.subclip(new_video_start_point, new_video_start_point + (frame_count - 0.5) / EDIT_FPS)
+        new_segment = new_segment.set_fps(EDIT_FPS)
+        write_videofile_for_instagram_reel(new_segment, output_path, audio=False)
+    finally:
+        if 'new_video_clip' in locals():
+            new_video_clip.close()
+
+def _swap_slot_moviepy(
+    input_video_path: str,
+    input_video_start_point: float,
+    input_video_end_point: float,
+    new_video_path: str,
+    new_video_start_point: float,
+    new_video_end_point: float,
+    keyframe_times: list[float],
+    output_path: str,
+    profile: str = "reel",
+    window_start: float = 0.0,
+    window_end: Optional[float] = None
+) -> None:
+    """Encodiert das Edit (bzw. das Fenster [window_start, window_end]) neu, jeder Frame läuft durch Python."""
+    render_profile = media_config["profiles"][profile]
+    try:
         # Load the original video and new video
-        logger.info("swap_slot_in_edit(): Loading video clips.")
-        original_video_clip = VideoFileClip(video_temp_file_path)
-        new_video_clip = VideoFileClip(new_video_temp_file_path)
+        logger.info("_swap_slot_moviepy(): Loading video clips.")
+        original_video_clip = VideoFileClip(input_video_path)
+        new_video_clip = VideoFileClip(new_video_path)
 
-        # Resize the new clip to 9:16
-        logger.info("swap_slot_in_edit(): Resizing new video clip.")
-        new_video_clip = resize_for_instagram_reel(new_video_clip)
+        # Resize the new clip to 9:16, and the edit as well if the profile uses another resolution
+        logger.info("_swap_slot_moviepy(): Resizing new video clip.")
+        new_video_clip = resize_for_instagram_reel(new_video_clip, render_profile["width"], render_profile["height"])
+        if tuple(original_video_clip.size) != (render_profile["width"], render_profile["height"]):
+            original_video_clip = resize_for_instagram_reel(original_video_clip, render_profile["width"], render_profile["height"])
 
-        # Cut parts of the original video
-        logger.info("swap_slot_in_edit(): Cutting original video.")
-        part1 = original_video_clip.subclip(0, input_video_start_point)
-        part3 = original_video_clip.subclip(input_video_end_point)
+        # Cut parts of the original video, empty parts at the start or end of the window are left out
+        logger.info("_swap_slot_moviepy(): Cutting original video.")
+        edit_end = original_video_clip.duration if window_end is None else window_end
+        part1 = original_video_clip.subclip(window_start, input_video_start_point) if input_video_start_point > window_start else None
+        part3 = original_video_clip.subclip(input_video_end_point, window_end) if input_video_end_point < edit_end - KEYFRAME_TOLERANCE else None
 
         # Cut the new video
-        logger.info("swap_slot_in_edit(): Cutting new video segment.")
+        logger.info("_swap_slot_moviepy(): Cutting new video segment.")
         new_segment = new_video_clip.subclip(new_video_start_point, new_video_end_point)
 
         # Concatenate the video clips
-        logger.info("swap_slot_in_edit(): Concatenating video segments.")
-        final_video = concatenate_videoclips([part1, new_segment, part3], method="compose")
+        logger.info("_swap_slot_moviepy(): Concatenating video segments.")
+        final_video = concatenate_videoclips([part for part in (part1, new_segment, part3) if part is not None], method="compose")
 
         # Transfer the audio stream from the original video
-        final_video = final_video.set_audio(original_video_clip.audio)
-
-        # Write the final video to a temporary file
-        logger.info("swap_slot_in_edit(): Writing final video to output file.")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{output_video_format}") as output_temp_file:
-            final_video.write_videofile(output_temp_file.name, codec='libx264', audio_codec='aac', threads=4, fps=30)
-            output_file_path = output_temp_file.name
+        windowed = window_start > 0 or window_end is not None
+        original_audio = original_video_clip.audio
+        if original_audio is not None and windowed:
+            original_audio = original_audio.subclip(window_start, window_end)
+        final_video = final_video.set_audio(original_audio)
 
-        # Read the final video as bytes
-        with open(output_file_path, 'rb') as file:
-            result_bytes = file.read()
-
-    except Exception as e:
-        logger.error(f"swap_slot_in_edit(): Error occurred: {e}")
-        raise MediaManipulationError(f"An error occurred during slot swapping: {e}")
+        # Write the final video
+        logger.info("_swap_slot_moviepy(): Writing final video to output file.")
+        write_videofile_for_instagram_reel(final_video, output_path, keyframe_times=keyframe_times, profile=profile, shortest=not windowed)
 
     finally:
-        # Close the video clips and delete temporary files
-        logger.info("swap_slot_in_edit(): Cleaning up resources and temporary files.")
         if 'original_video_clip' in locals():
             original_video_clip.close()
         if 'new_video_clip' in locals():
             new_video_clip.close()
         if 'final_video' in locals():
             final_video.close()
-        if video_temp_file_path and os.path.exists(video_temp_file_path):
-            os.remove(video_temp_file_path)
-        if new_video_temp_file_path and os.path.exists(new_video_temp_file_path):
-            os.remove(new_video_temp_file_path)
-        if output_file_path and os.path.exists(output_file_path):
-            os.remove(output_file_path)
 
-    logger.info("swap_slot_in_edit(): Video slot swapping completed successfully.")
-    return result_bytes
\ No newline at end of file
+def _swap_slot_ffmpeg(
+    input_video_path: str,
+    input_video_duration: float,
+    input_video_start_point: float,
+    input_video_end_point: float,
+    new_video_path: str,
+    new_video_start_point: float,
+    new_video_end_point: float,
+    keyframe_times: list[float],
+    output_path: str,
+    profile: str = "reel",
+    window_start: float = 0.0,
+    window_end: Optional[float] = None
+) -> None:
+    """
+    Encodiert das Edit (bzw. das Fenster [window_start, window_end]) mit einem einzigen ffmpeg-Aufruf neu (filter_complex: trim, scale, crop, concat).
+    Teile vor und nach dem Slot werden als eigene Inputs geöffnet, damit ffmpeg keine Frames puffern muss.
+    """
+    run_ffmpeg([
+        *_swap_slot_ffmpeg_args(
+            input_video_path,
+            input_video_duration,
+            input_video_start_point,
+            input_video_end_point,
+            new_video_path,
+            new_video_start_point,
+            new_video_end_point,
+            keyframe_times,
+            profile,
+            window_start,
+            window_end
+        ),
+        "-movflags", "+faststart",
+        "-y", output_path
+    ])
+
+def _swap_slot_ffmpeg_args(
+    input_video_path: str,
+    input_video_duration: float,
+    input_video_start_point: float,
+    input_video_end_point: float,
+    new_video_path: str,
+    new_video_start_point: float,
+    new_video_end_point: float,
+    keyframe_times: Optional[list[float]],
+    profile: str = "reel",
+    window_start: float = 0.0,
+    window_end: Optional[float] = None
+) -> list[str]:
+    """ffmpeg-Argumente für _swap_slot_ffmpeg und stream_swap_slot_in_edit, ohne Ausgabe-Container und Ausgabe."""
+    if window_end is None:
+        window_end = input_video_duration
+    render_profile = media_config["profiles"][profile]
+    reel_filter = instagram_reel_filter(render_profile["width"], render_profile["height"], render_profile["fps"])
+
+    # (input options, input path) for every part in output order
+    parts = []
+    if input_video_start_point > window_start:
+        parts.append((_seek_options(window_start, input_video_start_point, input_video_duration), input_video_path))
+    parts.append((["-ss", f"{new_video_start_point:.3f}", "-t", f"{new_video_end_point - new_video_start_point:.3f}"], new_video_path))
+    if input_video_end_point < window_end:
+        parts.append((_seek_options(input_video_end_point, window_end, input_video_duration), input_video_path))
+
+    inputs = []
+    filters = []
+    for index, (input_options, input_path) in enumerate(parts):
+        inputs += [*input_options, "-i", input_path]
+        filters.append(f"[{index}:v]{reel_filter},setpts=PTS-STARTPTS[v{index}]")
+    filters.append("".join(f"[v{index}]" for index in range(len(parts))) + f"concat=n={len(parts)}:v=1:a=0[v]")
+
+    # Audio track of the original edit
+    audio_index = len(parts)
+    inputs += [*_seek_options(window_start, window_end, input_video_duration), "-i", input_video_path]
+
+    return [
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]", "-map", f"{audio_index}:a:0?",
+        *instagram_reel_ffmpeg_params(keyframe_times, profile)
+    ]
+
+def _seek_options(start: float, end: float, duration: float) -> list[str]:
+    """Input-Optionen, um nur [start, end] einer Datei der Länge duration zu lesen."""
+    options = []
+    if start > 0:
+        options += ["-ss", f"{start:.3f}"]
+    if end < duration:
+        options += ["-t", f"{end - start:.3f}"]
+    return options
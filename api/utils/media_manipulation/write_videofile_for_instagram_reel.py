@@ -2,45 +2,84 @@ import logging
 
 from moviepy.editor import VideoFileClip
 
+from api.config.media import media_config
 from api.exceptions.media_manipulation.media_manipulation import \
     MediaManipulationError
 
 logger = logging.getLogger("utils.media_manipulation")
 
-def write_videofile_for_instagram_reel(clip: VideoFileClip, output_path: str) -> None:
+def write_videofile_for_instagram_reel(clip: VideoFileClip, output_path: str, keyframe_times: list[float] = None, audio: bool = True, profile: str = "reel", shortest: bool = True) -> None:
     """
     Konvertiert und speichert ein Video im MP4-Format gemäß den Instagram-Spezifikationen.
 
     Args:
         clip (VideoFileClip): Das Original-Video.
         output_path (str): Der Pfad, an dem das konvertierte Video gespeichert wird.
+        keyframe_times (list[float]): Zeitpunkte (in Sekunden), an denen ein Keyframe erzwungen wird.
+            Schnitte an diesen Stellen können später ohne Re-Encode per Stream-Copy erfolgen.
+        audio (bool): Ob die Tonspur mitgeschrieben wird.
+        profile (str): Render-Profil aus media_config["profiles"].
+        shortest (bool): Ob ffmpeg mit dem kürzesten Stream aufhört. Ist eine mitten im Edit geschnittene Tonspur nach dem
+            AAC-Encoding minimal kürzer als das Video, beendet sich ffmpeg sonst, während MoviePy noch Frames schreibt.
     """
     logger.info(f"write_videofile_for_instagram_reel(): Start writing video to {output_path}.")
     try:
-        ffmpeg_params = [
-            "-aspect", "9:16",
-            "-framerate", "1/60",
-            "-r", "25",
-            "-c:v", "h264",
-            "-tune", "stillimage",
-            "-crf", "18",
-            "-c:a", "aac",
-            "-b:a", "128k",
-            "-ac", "2",
-            "-ar", "44100",
-            "-pix_fmt", "yuv420p",
-            "-max_muxing_queue_size", "1024",
-            "-shortest"
-        ]
+        ffmpeg_params = instagram_reel_ffmpeg_params(keyframe_times, profile)
+        if not shortest:
+            ffmpeg_params.remove("-shortest")
 
         clip.write_videofile(
             output_path,
             codec='libx264',
             audio_codec='aac',
+            audio=audio,
+            preset=media_config["profiles"][profile]["preset"],
             ffmpeg_params=ffmpeg_params
         )
         logger.info(f"write_videofile_for_instagram_reel(): Video successfully written to {output_path}.")
 
     except Exception as e:
         logger.error(f"write_videofile_for_instagram_reel(): Error occurred: {e}")
-        raise MediaManipulationError(f"An error occurred while writing the video file: {e}")
\ No newline at end of file
+        raise MediaManipulationError(f"An error occurred while writing the video file: {e}")
+
+def instagram_reel_ffmpeg_params(keyframe_times: list[float] = None, profile: str = "reel") -> list[str]:
+    """
+    Gibt die Encoder-Parameter gemäß den Instagram-Spezifikationen zurück.
+    Wird von write_videofile_for_instagram_reel und von der ffmpeg-Engine verwendet, damit beide gleich encodieren.
+
+    Args:
+        keyframe_times (list[float]): Zeitpunkte (in Sekunden), an denen ein Keyframe erzwungen wird.
+        profile (str): Render-Profil aus media_config["profiles"].
+
+    Returns:
+        list[str]: Ausgabeparameter für ffmpeg.
+    """
+    render_profile = media_config["profiles"][profile]
+
+    ffmpeg_params = [
+        "-aspect", "9:16",
+        "-framerate", "1/60",
+        "-r", str(render_profile["fps"]),
+        "-c:v", "h264",
+        "-preset", render_profile["preset"],
+        "-tune", "stillimage",
+        "-crf", str(render_profile["crf"]),
+        *instagram_reel_audio_params(),
+        "-pix_fmt", "yuv420p",
+        "-max_muxing_queue_size", "1024",
+        "-shortest"
+    ]
+
+    if keyframe_times:
+        ffmpeg_params += ["-force_key_frames", ",".join(f"{time:.3f}" for time in sorted(set(keyframe_times)))]
+
+    return ffmpeg_params
+
+def instagram_reel_audio_params() -> list[str]:
+    """Gibt die Audio-Encoder-Parameter der Edits zurück (AAC, Stereo, 44,1 kHz), z.B. auch für das Audio-Bett eines Songs."""
+    return [
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-ac", "2",
+        "-ar", "44100"
+    ]
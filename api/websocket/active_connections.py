@@ -1,8 +1,22 @@
+import asyncio
 import logging
+from typing import Optional
+
 logger = logging.getLogger("websocket.active_connections")
 
 active_connections = {}
 
+# Event-Loop, in der die Verbindungen laufen. Änderungen aus Worker-Threads (Executor-Pools, Render-Jobs) werden an sie übergeben
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def remember_event_loop() -> None:
+    """Merkt sich die laufende Event-Loop, beim Annehmen einer Verbindung aufrufen."""
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+
+def get_event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    return _event_loop
+
 async def notify_table_update(group_id: str, table_name: str):
     """
     Notify all connected WebSocket clients in a specific group about an update to a table.
@@ -101,6 +101,12 @@ def setup_logging(env: str):
                 prod={"level": "CRITICAL"}, 
                 handlers={"console", "file"}
             ),
+            "sessions.render": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "CRITICAL"}, 
+                handlers={"console", "file"}
+            ),
             "sessions.instagram": get_logger(env, 
                 test={"level": "CRITICAL"},
                 dev={"level": "DEBUG"}, 
@@ -108,6 +114,13 @@ def setup_logging(env: str):
                 handlers={"console", "file"}
             ),
 
+            "sessions.executor": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "INFO"}, 
+                prod={"level": "CRITICAL"}, 
+                handlers={"console", "file"}
+            ),
+
             # routes
             "routes.user": get_logger(env, 
                 test={"level": "CRITICAL"},
@@ -133,6 +146,18 @@ def setup_logging(env: str):
                 prod={"level": "CRITICAL"}, 
                 handlers={"console", "file"}
             ),
+            "routes.job": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "INFO"}, 
+                prod={"level": "CRITICAL"}, 
+                handlers={"console", "file"}
+            ),
+            "routes.metrics": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "INFO"}, 
+                prod={"level": "CRITICAL"}, 
+                handlers={"console", "file"}
+            ),
             "routes.websocket": get_logger(env, 
                 test={"level": "DEBUG"},
                 dev={"level": "DEBUG"}, 
@@ -149,6 +174,24 @@ def setup_logging(env: str):
             ),
 
             #utils
+            "utils.files": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "CRITICAL"}, 
+                handlers={"console", "file"}
+            ),
+            "utils.database": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "WARNING"}, 
+                handlers={"console", "file"}
+            ),
+            "utils.concurrency": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "WARNING"}, 
+                handlers={"console", "file"}
+            ),
             "utils.media_manipulation": get_logger(env, 
                 test={"level": "CRITICAL"},
                 dev={"level": "DEBUG"}, 
@@ -156,6 +199,20 @@ def setup_logging(env: str):
                 handlers={"console", "file"}
             ),
 
+            # commands
+            "commands.backfill_media_metadata": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "INFO"}, 
+                handlers={"console", "file"}
+            ),
+            "commands.shard_file_storage": get_logger(env, 
+                test={"level": "CRITICAL"},
+                dev={"level": "DEBUG"}, 
+                prod={"level": "INFO"}, 
+                handlers={"console", "file"}
+            ),
+
             # inside test
             "test.unittest": get_logger(env, 
                 test={"level": "DEBUG"},
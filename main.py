@@ -9,17 +9,24 @@ from api.config.exceptions import add_exception_handlers
 from api.middleware.access_handler import AccessHandlerMiddleware
 from api.routes.edit import router as edit_router
 from api.routes.group import router as group_router
+from api.routes.job import router as job_router
+from api.routes.metrics import router as metrics_router
 from api.routes.song import router as song_router
 from api.routes.static import router as static_router
 from api.routes.testing import router as testing_router
 from api.routes.slot import router as slot_router
 from api.routes.user import router as user_router
 from api.routes.websockets import router as websocket_router
-from api.sessions.database import (get_database_session,
-                                   init_database_session_manager)
+from api.sessions.database import (init_database_session_manager,
+                                   open_database_session)
 from api.sessions.email import init_email_session_manager
-from api.sessions.files import init_file_session_manager
+from api.sessions.executor import (init_executor_session_manager,
+                                   shutdown_executor_session_manager)
+from api.sessions.files import (init_file_session_manager,
+                                shutdown_file_session_manager)
 from api.sessions.instagram import init_instagram_session_manager
+from api.sessions.render import (init_render_session_manager,
+                                 shutdown_render_session_manager)
 from logging_config import setup_logging
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -30,11 +37,16 @@ LOGGER_ENV = os.getenv("LOGGER_ENV")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    init_executor_session_manager()
     init_database_session_manager()
     init_email_session_manager()
     init_instagram_session_manager()
     init_file_session_manager()
+    init_render_session_manager()
     yield
+    shutdown_render_session_manager()
+    shutdown_file_session_manager()
+    shutdown_executor_session_manager()
 
 # setup loggers
 setup_logging(env=LOGGER_ENV)
@@ -43,7 +55,7 @@ setup_logging(env=LOGGER_ENV)
 app = FastAPI(lifespan=lifespan)
 
 # add middleware
-app.add_middleware(AccessHandlerMiddleware, endpoint_config=endpoint_config, get_database_session=get_database_session)
+app.add_middleware(AccessHandlerMiddleware, endpoint_config=endpoint_config, get_database_session=open_database_session)
 
 # add exception handler
 add_exception_handlers(app)
@@ -67,6 +79,8 @@ app.include_router(group_router)
 app.include_router(user_router)
 app.include_router(edit_router)
 app.include_router(slot_router)
+app.include_router(job_router)
+app.include_router(metrics_router)
 
 # websockets
 app.include_router(websocket_router)
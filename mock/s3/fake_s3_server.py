@@ -0,0 +1,205 @@
+import datetime
+import hashlib
+import re
+import threading
+import uuid
+import xml.etree.ElementTree as ElementTree
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Set, Tuple
+from urllib.parse import parse_qsl, unquote
+
+from api.utils.files.s3_client import S3Client
+from api.utils.files.sign_s3_request import sign_s3_request
+
+S3_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+class FakeS3Server:
+    """
+    S3-Server im Testprozess für einen Bucket mit der Teilmenge der API, die S3Client verwendet (Path-Style).
+    Prüft die Signatur jeder Anfrage und merkt sich Anfragen und Verbindungen, damit Tests z.B. Range-Anfragen prüfen können.
+    """
+
+    def __init__(self, bucket: str = "test-bucket", access_key: str = "test-access-key", secret_key: str = "test-secret-key", region: str = "us-east-1", page_size: int = 1000) -> None:
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.page_size = page_size
+
+        self.lock = threading.Lock()
+        self.objects: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str], Dict[str, str]]] = []
+        self.connections: Set[Tuple[str, int]] = set()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeS3RequestHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self) -> "FakeS3Server":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def client(self, **kwargs) -> S3Client:
+        """Erzeugt einen Client mit den Zugangsdaten dieses Servers."""
+        return S3Client(self.endpoint, self.bucket, self.access_key, self.secret_key, self.region, **kwargs)
+
+    def handle(self, method: str, raw_path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        path, _, raw_query = raw_path.partition("?")
+        query = dict(parse_qsl(raw_query, keep_blank_values=True))
+        bucket, _, key = unquote(path).lstrip("/").partition("/")
+        with self.lock:
+            self.requests.append((method, key, query, headers))
+
+        if bucket != self.bucket:
+            return _error(404, "NoSuchBucket")
+        if not self._signature_valid(method, path, query, headers):
+            return _error(403, "SignatureDoesNotMatch")
+        if headers.get("x-amz-content-sha256") not in ("UNSIGNED-PAYLOAD", hashlib.sha256(body).hexdigest()):
+            return _error(400, "XAmzContentSHA256Mismatch")
+
+        with self.lock:
+            if not key:
+                if method == "GET" and query.get("list-type") == "2":
+                    return self._list(query)
+                if method == "POST" and "delete" in query:
+                    return self._delete_objects(body)
+                return _error(400, "InvalidRequest")
+
+            if method == "GET":
+                return self._get(key, headers.get("range"))
+            if method == "PUT" and "uploadId" in query:
+                if query["uploadId"] not in self.uploads:
+                    return _error(404, "NoSuchUpload")
+                self.uploads[query["uploadId"]][int(query["partNumber"])] = body
+                return 200, {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}, b""
+            if method == "PUT" and "x-amz-copy-source" in headers:
+                source_key = unquote(headers["x-amz-copy-source"]).lstrip("/").partition("/")[2]
+                if source_key not in self.objects:
+                    return _error(404, "NoSuchKey")
+                self.objects[key] = self.objects[source_key]
+                return 200, {}, _xml("CopyObjectResult", [("ETag", f'"{hashlib.md5(self.objects[key]).hexdigest()}"')])
+            if method == "PUT":
+                self.objects[key] = body
+                return 200, {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}, b""
+            if method == "POST" and "uploads" in query:
+                upload_id = uuid.uuid4().hex
+                self.uploads[upload_id] = {}
+                return 200, {}, _xml("InitiateMultipartUploadResult", [("Bucket", self.bucket), ("Key", key), ("UploadId", upload_id)])
+            if method == "POST" and "uploadId" in query:
+                return self._complete_upload(key, query["uploadId"], body)
+            if method == "DELETE" and "uploadId" in query:
+                self.uploads.pop(query["uploadId"], None)
+                return 204, {}, b""
+            if method == "DELETE":
+                self.objects.pop(key, None)
+                return 204, {}, b""
+            return _error(400, "InvalidRequest")
+
+    def _signature_valid(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str]) -> bool:
+        match = re.fullmatch(r"AWS4-HMAC-SHA256 Credential=([^/]+)/\d{8}/[^/]+/s3/aws4_request, SignedHeaders=([^,]+), Signature=[0-9a-f]{64}", headers.get("authorization", ""))
+        if match is None or match.group(1) != self.access_key or "x-amz-date" not in headers:
+            return False
+
+        signed_headers = {name: headers.get(name, "") for name in match.group(2).split(";")}
+        now = datetime.datetime.strptime(headers["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=datetime.timezone.utc)
+        expected = sign_s3_request(method, path, query, signed_headers, headers.get("x-amz-content-sha256", ""), self.access_key, self.secret_key, self.region, now)
+        return expected == headers["authorization"]
+
+    def _get(self, key: str, byte_range: str) -> Tuple[int, Dict[str, str], bytes]:
+        if key not in self.objects:
+            return _error(404, "NoSuchKey")
+        data = self.objects[key]
+        if byte_range is None:
+            return 200, {}, data
+
+        first_byte, last_byte = (int(value) for value in byte_range.removeprefix("bytes=").split("-"))
+        last_byte = min(last_byte, len(data) - 1)
+        return 206, {"Content-Range": f"bytes {first_byte}-{last_byte}/{len(data)}"}, data[first_byte:last_byte + 1]
+
+    def _list(self, query: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        prefix = query.get("prefix", "")
+        delimiter = query.get("delimiter")
+        start_after = query.get("continuation-token", "")
+
+        keys = sorted(key for key in self.objects if key.startswith(prefix) and key > start_after)
+        if delimiter:
+            keys = [key for key in keys if delimiter not in key[len(prefix):]]
+        page = keys[:self.page_size]
+        truncated = len(keys) > self.page_size
+
+        children = [("Name", self.bucket), ("Prefix", prefix), ("KeyCount", str(len(page))), ("IsTruncated", "true" if truncated else "false")]
+        if truncated:
+            children.append(("NextContinuationToken", page[-1]))
+        children += [("Contents", [("Key", key), ("Size", str(len(self.objects[key])))]) for key in page]
+        return 200, {}, _xml("ListBucketResult", children)
+
+    def _delete_objects(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        for key in ElementTree.fromstring(body).iterfind("Object/Key"):
+            self.objects.pop(key.text, None)
+        return 200, {}, _xml("DeleteResult", [])
+
+    def _complete_upload(self, key: str, upload_id: str, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        parts = self.uploads.get(upload_id)
+        if parts is None:
+            return _error(404, "NoSuchUpload")
+
+        data = b""
+        for part in ElementTree.fromstring(body).iterfind("Part"):
+            part_data = parts.get(int(part.findtext("PartNumber")))
+            if part_data is None or part.findtext("ETag") != f'"{hashlib.md5(part_data).hexdigest()}"':
+                # Like S3, a failed completion still answers 200
+                return 200, {}, _xml("Error", [("Code", "InvalidPart")])
+            data += part_data
+
+        self.objects[key] = data
+        del self.uploads[upload_id]
+        return 200, {}, _xml("CompleteMultipartUploadResult", [("Key", key)])
+
+class _FakeS3RequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client can reuse its pooled connections
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _handle(self) -> None:
+        fake: FakeS3Server = self.server.fake
+        with fake.lock:
+            fake.connections.add(self.client_address)
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, response_headers, response_body = fake.handle(self.command, self.path, headers, body)
+
+        self.send_response(status)
+        for name, value in response_headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+def _xml(tag: str, children: list) -> bytes:
+    root = ElementTree.Element(tag, xmlns=S3_NAMESPACE)
+    _append(root, children)
+    return ElementTree.tostring(root)
+
+def _append(element: ElementTree.Element, children: list) -> None:
+    for tag, value in children:
+        child = ElementTree.SubElement(element, tag)
+        if isinstance(value, list):
+            _append(child, value)
+        else:
+            child.text = value
+
+def _error(status: int, code: str) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {}, _xml("Error", [("Code", code)])
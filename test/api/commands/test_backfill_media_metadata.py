@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from sqlalchemy.orm import Session
+
+from api.commands.backfill_media_metadata import backfill_media_metadata
+from api.exceptions.sessions.files import (DirectoryNotFoundError,
+                                           FileNotFoundInSessionError)
+from api.models.database.model import Edit
+from api.sessions.files import BaseFileSessionManager
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+from mock.database.data import data
+
+
+def _store_test_video(edit_id: int, file_session: BaseFileSessionManager) -> bytes:
+    """Legt ein kurzes Testvideo als Edit-Datei ab (ersetzt eine vorhandene)."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "edit.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=duration=2:size=180x320:rate=25", "-y", path])
+        with open(path, "rb") as file:
+            video_bytes = file.read()
+    try:
+        file_session.update(str(edit_id), video_bytes, "edits")
+    except (FileNotFoundInSessionError, DirectoryNotFoundError):
+        file_session.create(str(edit_id), "mp4", video_bytes, "edits")
+    return video_bytes
+
+def test_backfill_media_metadata(memory_database_session: Session, memory_file_session: BaseFileSessionManager):
+    # Arrange
+    edit_id = data["edits"][0]["edit_id"]
+    video_bytes = _store_test_video(edit_id, memory_file_session)
+
+    # Act
+    updated = backfill_media_metadata(memory_database_session, memory_file_session)
+
+    # Assert
+    edit = memory_database_session.query(Edit).filter(Edit.edit_id == edit_id).one()
+    assert updated >= 1
+    assert abs(edit.duration - 2.0) < 0.05
+    assert (edit.width, edit.height, edit.fps) == (180, 320, 25.0)
+    assert edit.byte_size == len(video_bytes)
+
+def test_backfill_media_metadata_only_missing(memory_database_session: Session, memory_file_session: BaseFileSessionManager):
+    """Bereits nachgetragene Einträge werden beim zweiten Lauf übersprungen."""
+    _store_test_video(data["edits"][0]["edit_id"], memory_file_session)
+    backfill_media_metadata(memory_database_session, memory_file_session)
+
+    assert backfill_media_metadata(memory_database_session, memory_file_session) == 0
@@ -0,0 +1,37 @@
+import os
+
+from api.commands.shard_file_storage import shard_file_storage
+from api.sessions.files import LocalFileSessionManager, shard_of
+
+
+def test_shard_file_storage(tmp_path, no_local_fill):
+    # Arrange: flat layout as written before the hash-prefix subdirectories
+    files_path = tmp_path / "files"
+    (files_path / "edits").mkdir(parents=True)
+    (files_path / "edits" / "12.mp4").write_bytes(b"Edit content")
+    (files_path / "songs").mkdir()
+    (files_path / "songs" / "3.mp3").write_bytes(b"Song content")
+    file_session = LocalFileSessionManager(str(files_path), str(tmp_path / "index.jsonl"))
+
+    # Act
+    moved = shard_file_storage(file_session)
+
+    # Assert
+    assert moved == 2
+    assert (files_path / "edits" / shard_of("12") / "12.mp4").exists()
+    assert not (files_path / "edits" / "12.mp4").exists()
+    assert file_session.get("12", "edits") == b"Edit content"
+    assert file_session.get("3", "songs") == b"Song content"
+
+def test_shard_file_storage_twice(tmp_path, no_local_fill):
+    # Arrange
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("12", "mp4", b"Edit content", "edits")
+
+    # Act
+    moved = shard_file_storage(file_session)
+
+    # Assert
+    assert moved == 0
+    assert os.listdir(tmp_path / "files" / "edits") == [shard_of("12")]
+    assert file_session.get("12", "edits") == b"Edit content"
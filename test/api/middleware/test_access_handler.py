@@ -1,16 +1,27 @@
 import os
+from contextlib import asynccontextmanager
 from test.utils.role_tester_has_acccess import role_tester_has_access
 
 import pytest
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 
 from api.middleware.access_handler import AccessHandlerMiddleware
+from api.models.database.model import Base, Group, User
 from api.security.endpoints_class import EndpointConfig, EndpointInfo
 from api.security.role_class import Role, RoleInfos
 from api.security.role_enum import RoleEnum
+from api.services.database.group import create as create_group_database
+from api.sessions.database import (RoutingSession, after_request_commit,
+                                   after_request_rollback,
+                                   get_database_session, reads_from_replica)
+from api.sessions.executor import (init_executor_session_manager,
+                                   shutdown_executor_session_manager)
+from api.utils.database.recent_writers import RecentWriters
 from api.utils.jwt import jwt
+from mock.database.data import data
 
 """Setup"""
 
@@ -143,11 +154,17 @@ group_member_with_edit_id_req_creds = {
 }
 
 
+@asynccontextmanager
+async def executor_lifespan(app: FastAPI):
+    init_executor_session_manager()
+    yield
+    shutdown_executor_session_manager()
+
 @pytest.fixture(scope="function")
 def http_client_mocked_paths(memory_database_session: Session):
     
     # simulating prod api
-    app = FastAPI()
+    app = FastAPI(lifespan=executor_lifespan)
     
     # session
     def get_database_session_override(): 
@@ -232,5 +249,162 @@ def test_access_handler_with_subroles(http_client_mocked_paths: TestClient):
                 expected_status = 200 if required_role.value >= current_role.value else 403
                 
             assert response.status_code == expected_status
-            
-            
\ No newline at end of file
+
+
+"""Unit of Work"""
+@pytest.fixture(scope="function")
+def http_client_unit_of_work(memory_database_session: Session):
+    app = FastAPI(lifespan=executor_lifespan)
+    app.state.commits = 0
+    app.state.closed = 0
+    app.state.jobs = []
+    app.state.cleanups = 0
+
+    # only commits that write count, the release after the role lookup is read only
+    @event.listens_for(memory_database_session, "after_flush")
+    def remember_flush(session, flush_context):
+        session.info["flushed"] = True
+
+    @event.listens_for(memory_database_session, "after_commit")
+    def count_commit(session):
+        if session.info.pop("flushed", False):
+            app.state.commits += 1
+
+    def get_database_session_override():
+        try:
+            yield memory_database_session
+        finally:
+            app.state.closed += 1
+
+    app.add_middleware(AccessHandlerMiddleware, endpoint_config=mock_endpoint_config, get_database_session=get_database_session_override)
+
+    # the real dependency, it has to hand out the session of the middleware
+    @app.get("/external_no_subroles")
+    async def create_group(fail: bool = False, database_session: Session = Depends(get_database_session)):
+        create_group_database("First", database_session)
+        create_group_database("Second", database_session)
+        # like a render job, it remembers how many commits happened before it ran
+        after_request_commit(database_session, lambda: app.state.jobs.append(app.state.commits))
+        after_request_rollback(database_session, lambda: setattr(app.state, "cleanups", app.state.cleanups + 1))
+        if fail:
+            raise HTTPException(status_code=400, detail="failed")
+        return {"shared": database_session is memory_database_session}
+
+    @app.get("/external_subroles")
+    async def transaction_state(database_session: Session = Depends(get_database_session)):
+        return {"in_transaction": database_session.in_transaction()}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+def test_request_commits_once(http_client_unit_of_work: TestClient, memory_database_session: Session):
+    # Act
+    response = http_client_unit_of_work.get("/external_no_subroles")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["shared"] is True
+    assert http_client_unit_of_work.app.state.commits == 1
+    assert http_client_unit_of_work.app.state.closed == 1
+    assert memory_database_session.query(Group).filter(Group.name.in_(["First", "Second"])).count() == 2
+
+def test_request_runs_jobs_after_commit(http_client_unit_of_work: TestClient):
+    # Act
+    response = http_client_unit_of_work.get("/external_no_subroles")
+
+    # Assert
+    assert response.status_code == 200
+    assert http_client_unit_of_work.app.state.jobs == [1]
+    assert http_client_unit_of_work.app.state.cleanups == 0
+
+def test_request_error_does_not_commit(http_client_unit_of_work: TestClient):
+    """Edge Case: Eine Fehlerantwort committet nichts, die Session wird trotzdem zurückgegeben."""
+    # Act
+    response = http_client_unit_of_work.get("/external_no_subroles", params={"fail": True})
+
+    # Assert
+    assert response.status_code == 400
+    assert http_client_unit_of_work.app.state.commits == 0
+    assert http_client_unit_of_work.app.state.closed == 1
+
+def test_request_error_drops_jobs(http_client_unit_of_work: TestClient):
+    """Edge Case: Ohne Commit werden die Jobs des Requests verworfen und seine Dateien aufgeräumt."""
+    # Act
+    response = http_client_unit_of_work.get("/external_no_subroles", params={"fail": True})
+
+    # Assert
+    assert response.status_code == 400
+    assert http_client_unit_of_work.app.state.jobs == []
+    assert http_client_unit_of_work.app.state.cleanups == 1
+
+def test_request_commit_error_drops_jobs(http_client_unit_of_work: TestClient, memory_database_session: Session):
+    """Edge Case: Schlägt der Commit am Ende fehl, läuft kein Job auf dem verworfenen Zustand."""
+    # Arrange
+    @event.listens_for(memory_database_session, "before_commit")
+    def fail_commit(session):
+        if session.info.get("flushed"):
+            raise RuntimeError("commit failed")
+
+    # Act
+    response = http_client_unit_of_work.get("/external_no_subroles")
+
+    # Assert
+    assert response.status_code == 500
+    assert http_client_unit_of_work.app.state.jobs == []
+    assert http_client_unit_of_work.app.state.cleanups == 1
+
+def test_request_access_denied_closes_session(http_client_unit_of_work: TestClient):
+    response = http_client_unit_of_work.get("/admin_no_subroles")
+
+    assert response.status_code == 403
+    assert http_client_unit_of_work.app.state.commits == 0
+    assert http_client_unit_of_work.app.state.closed == 1
+
+def test_request_releases_connection_after_role_lookup(http_client_unit_of_work: TestClient):
+    """Die Route holt sich erst mit ihrem ersten Statement wieder eine Verbindung."""
+    response = http_client_unit_of_work.get("/external_subroles", params={"groupid": "11111111-1111-1111-1111-111111111111"}, headers={"Authorization": f"Bearer {jwt.create_jwt(1, 30)}"})
+
+    assert response.status_code == 200
+    assert response.json()["in_transaction"] is False
+
+
+"""Read Replicas"""
+@pytest.fixture(scope="function")
+def http_client_replica(tmp_path):
+    # the replica has not received the groups and users yet
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", connect_args={"check_same_thread": False})
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    with Session(primary) as session:
+        session.bulk_insert_mappings(Group, data["groups"])
+        session.bulk_insert_mappings(User, data["users"])
+        session.commit()
+    routing_sessions = sessionmaker(class_=RoutingSession, primary=primary, replicas=[replica], recent_writers=RecentWriters(5), autoflush=False, expire_on_commit=False)
+
+    app = FastAPI(lifespan=executor_lifespan)
+
+    def get_database_session_override():
+        with routing_sessions() as database_session:
+            yield database_session
+
+    app.add_middleware(AccessHandlerMiddleware, endpoint_config=mock_endpoint_config, get_database_session=get_database_session_override)
+
+    @app.get("/group_member_subroles")
+    async def group_member(database_session: Session = Depends(get_database_session)):
+        return {"reads_from_replica": reads_from_replica(database_session)}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+def test_replica_lag_does_not_deny_access(http_client_replica: TestClient):
+    """Edge Case: Die Mitgliedschaft fehlt noch auf dem Replikat, der Primary entscheidet."""
+    response = http_client_replica.get("/group_member_subroles", headers=group_member_req_creds["req"]["headers"], params=group_member_req_creds["req"]["params"])
+
+    assert response.status_code == 200
+    assert response.json()["reads_from_replica"] is False
+
+def test_replica_denies_unknown_user(http_client_replica: TestClient):
+    response = http_client_replica.get("/group_member_subroles", params=group_member_req_creds["req"]["params"])
+
+    assert response.status_code == 403
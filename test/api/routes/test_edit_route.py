@@ -5,6 +5,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from api.services.database.occupied_slot import create as create_occupied_slot_database
+from api.services.files.edit_template import create as create_edit_template_file
+from api.sessions.files import BaseFileSessionManager
 from mock.database.data import data
 
 import PIL
@@ -36,7 +38,7 @@ def test_create_edit_success(http_client: TestClient, bearer_headers: List[dict[
     )
 
     # Assert
-    assert response.status_code == 200
+    assert response.status_code == 202
     response_data = response.json()
 
     # Check if the new edit was created properly
@@ -46,6 +48,29 @@ def test_create_edit_success(http_client: TestClient, bearer_headers: List[dict[
     assert response_data["group_id"] == group_id
     assert response_data["song_id"] == song_id
     assert response_data["created_by"] == user_id
+    assert response_data["job_id"] is not None
+
+def test_create_edit_copies_template(http_client: TestClient, memory_file_session: BaseFileSessionManager, bearer_headers: List[dict[str, str]]):
+    # Arrange
+    song_id = data["songs"][0]["song_id"]  # Song 1
+    group_id = data["groups"][0]["group_id"]  # Group 1
+    create_edit_template_file(song_id, "mp4", b"Template content", memory_file_session)
+
+    # Act
+    response = http_client.post(
+        "/edit/",
+        headers=bearer_headers[0],
+        json={
+            "song_id": song_id,
+            "groupid": group_id,
+            "edit_name": "New Edit for Group 1"
+        }
+    )
+
+    # Assert: nothing to render, the edit file is a copy of the template
+    assert response.status_code == 202
+    assert response.json()["job_id"] is None
+    assert memory_file_session.get(str(response.json()["edit_id"]), "edits") == b"Template content"
 
 def test_create_edit_invalid_name(http_client: TestClient, bearer_headers: List[dict[str, str]]):
     # Arrange
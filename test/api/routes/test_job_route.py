@@ -0,0 +1,82 @@
+import time
+from typing import List
+
+from fastapi.testclient import TestClient
+
+from api.sessions.files import BaseFileSessionManager
+from mock.database.data import data
+
+
+def test_get_job_blank_access(http_client: TestClient):
+    response = http_client.get("/job/unknown?editid=1")
+    assert response.status_code == 403
+
+def test_get_job_not_found(http_client: TestClient, bearer_headers: List[dict[str, str]]):
+    response = http_client.get("/job/unknown?editid=1", headers=bearer_headers[0])
+    assert response.status_code == 404
+
+def test_get_job_after_create_edit(http_client: TestClient, bearer_headers: List[dict[str, str]]):
+    # Arrange
+    response = http_client.post(
+        "/edit/",
+        headers=bearer_headers[0],
+        json={
+            "song_id": data["songs"][0]["song_id"],
+            "groupid": data["groups"][0]["group_id"],
+            "edit_name": "New Edit for Group 1"
+        }
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    # Act
+    response = http_client.get(f"/job/{job_id}?editid=10", headers=bearer_headers[0])
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["job_id"] == job_id
+    assert response.json()["edit_id"] == 10
+    assert response.json()["status"] in ("done", "failed")
+
+def test_get_job_of_other_group(http_client: TestClient, bearer_headers: List[dict[str, str]]):
+    """Edge Case: Ein Mitglied einer anderen Gruppe kennt die Job-ID."""
+    # Arrange
+    response = http_client.post(
+        "/edit/",
+        headers=bearer_headers[0],
+        json={
+            "song_id": data["songs"][0]["song_id"],
+            "groupid": data["groups"][0]["group_id"],
+            "edit_name": "New Edit for Group 1"
+        }
+    )
+    job_id = response.json()["job_id"]
+
+    # Act & Assert: ohne Mitgliedschaft im Edit der Gruppe 1
+    response = http_client.get(f"/job/{job_id}?editid=10", headers=bearer_headers[3])
+    assert response.status_code == 403
+
+    # Act & Assert: mit einem eigenen Edit der Gruppe 2
+    response = http_client.get(f"/job/{job_id}?editid=4", headers=bearer_headers[3])
+    assert response.status_code == 404
+
+def test_poll_job_until_edit_rendered(http_client: TestClient, memory_file_session: BaseFileSessionManager, bearer_headers: List[dict[str, str]]):
+    # Arrange
+    occupied_slot_id = data["occupied_slots"][0]["occupied_slot_id"]
+    old_edit_file = memory_file_session.get("1", "edits")
+
+    # Act: das Entfernen des Clips rendert den Demo-Clip zurück in das Edit
+    response = http_client.delete(f"/edit/1/slot/{occupied_slot_id}", headers=bearer_headers[0])
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(100):
+        response = http_client.get(f"/job/{job_id}?editid=1", headers=bearer_headers[0])
+        assert response.status_code == 200
+        if response.json()["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.1)
+
+    # Assert
+    assert response.json()["status"] == "done", response.json()["error"]
+    assert memory_file_session.get("1", "edits") != old_edit_file
@@ -0,0 +1,45 @@
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from api.sessions.executor import get_executor_session
+from mock.database.data import data
+
+
+def test_get_metrics_blank_access(http_client: TestClient):
+    response = http_client.get("/metrics/")
+    assert response.status_code == 403
+
+def test_get_metrics_success(http_client: TestClient):
+    # Act
+    response = http_client.get("/metrics/", headers={"admintoken": str(os.getenv("ADMIN_TOKEN"))})
+
+    # Assert
+    assert response.status_code == 200
+    executors = response.json()["executors"]
+    assert set(executors) == {"database", "io", "media", "event_loop"}
+    assert executors["database"]["completed"] >= 1  # the role lookup of this request
+    assert response.json()["database_pool"] is None  # the memory database has no monitored pool
+    assert response.json()["render_cache"] is None
+    assert response.json()["file_caches"] == {}
+
+def test_slow_database_call_does_not_block_event_loop(http_client: TestClient, monkeypatch):
+    """Edge Case: Eine langsame Datenbankabfrage läuft im Pool, die Event-Loop bleibt frei."""
+    from api.routes import group
+
+    get_group_database = group.get_group_database
+    def slow_get_group_database(*args, **kwargs):
+        time.sleep(0.3)
+        return get_group_database(*args, **kwargs)
+    monkeypatch.setattr(group, "get_group_database", slow_get_group_database)
+
+    executor_session = next(get_executor_session())
+    executor_session.event_loop_monitor.reset()
+
+    # Act
+    response = http_client.get(f"/group/{data['groups'][0]['group_id']}/name")
+
+    # Assert
+    assert response.status_code == 200
+    assert executor_session.event_loop_monitor.stats()["lag_seconds_max"] < 0.2
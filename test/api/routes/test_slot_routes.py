@@ -20,7 +20,7 @@ def test_delete_slot_success(http_client: TestClient, memory_database_session: S
     response = http_client.delete(f"/edit/1/slot/{occupied_slot_id}", headers=bearer_headers[0])
 
     # Assert
-    assert response.status_code == 200
+    assert response.status_code == 202
     assert response.json()["message"] == "Successfull delete"
     
     # Check if slot is deleted from the database
@@ -109,6 +109,10 @@ def test_post_slot_success(http_client: TestClient, memory_database_session: Ses
     new_occupied_slot_video = memory_file_session.get(occupied_slot.occupied_slot_id, "occupied_slots")
     assert new_occupied_slot_video is not None
 
+    # normalisierter clip liegt daneben
+    normalized_occupied_slot_video = memory_file_session.get(occupied_slot.occupied_slot_id, "normalized_occupied_slots")
+    assert normalized_occupied_slot_video is not None
+
 def test_post_taken_slot(http_client: TestClient, memory_file_session: BaseFileSessionManager, bearer_headers: List[dict[str, str]]):
     # Arrange
     slot_id = data["slots"][1]["slot_id"]
@@ -202,7 +206,7 @@ def test_put_slot_success(http_client: TestClient, memory_file_session: BaseFile
     )
     
     # Assert
-    assert response.status_code == 200
+    assert response.status_code == 202
     assert response.json()["message"] == "Successfull swap"
     
     # Check if slot is updated in the database
@@ -224,7 +228,7 @@ def test_put_slot_without_videofile_success(http_client: TestClient, memory_file
     )
     
     # Assert
-    assert response.status_code == 200
+    assert response.status_code == 202
     assert response.json()["message"] == "Successfull swap"
     
     # Check if slot is updated in the database
@@ -49,6 +49,12 @@ def test_create_song_success(http_client: TestClient, memory_file_session: BaseF
     assert response_json["author"] == "Test Artist"
     assert response_json["audio_src"] is not None
     assert response_json["cover_src"] is not None
+    assert response_json["duration"] > 0
+    assert response_json["sample_rate"] > 0
+    assert response_json["channel_layout"]
+
+    # Audio-Bett für die Edits wurde beim Upload erstellt
+    assert memory_file_session.get(new_song_id, "audio_beds")
 
     # Überprüfe, ob die neue song_id im Speicher existiert
     stored_song_content = memory_file_session.get(new_song_id, 'songs')
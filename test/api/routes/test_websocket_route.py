@@ -59,7 +59,7 @@ async def test_websocket_edit_success(http_client: TestClient, bearer_headers: L
             }
         )
 
-        assert response.status_code == 200
+        assert response.status_code == 202
 
         # Warte auf die Nachricht über den WebSocket
         message = websocket.receive_text()
@@ -126,7 +126,7 @@ async def test_websocket_occupied_slot_post_put_delete(http_client: TestClient,
                 "end_time": 0.5
             }
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
         assert websocket.receive_text() == "OCCUPIEDSLOT"
 
         # # PUT
@@ -141,12 +141,12 @@ async def test_websocket_occupied_slot_post_put_delete(http_client: TestClient,
                 "end_time": 0.5
             }
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
         assert websocket.receive_text() == "OCCUPIEDSLOT"
 
         # DELETE
         response = http_client.delete(f"/edit/1/slot/{new_occupied_slot_id}", headers=bearer_headers[0])
-        assert response.status_code == 200
+        assert response.status_code == 202
         assert websocket.receive_text() == "OCCUPIEDSLOT"
 
 """Multiple Connections"""
@@ -201,7 +201,7 @@ async def test_websocket_multiple_connections_check_queue(http_client: TestClien
                     }
                 )
 
-                assert response_edit_group_2.status_code == 200
+                assert response_edit_group_2.status_code == 202
 
 
                 # Assert: Benutzer 0 und 1 sollten eine "USER"-Nachricht erhalten haben
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from api.models.database.model import Edit, Song
+from api.services.database.media_metadata import (get_edit, update_edit,
+                                                  update_occupied_slot,
+                                                  update_song)
+from api.sessions.database import open_background_session
+from api.utils.media_manipulation.probe_media import MediaInfo
+from mock.database.data import data
+
+EDIT_MEDIA_INFO = MediaInfo(duration=12.5, width=1080, height=1920, fps=25.0, codec="h264")
+SONG_MEDIA_INFO = MediaInfo(duration=180.0, sample_rate=44100, channel_layout="stereo", codec="mp3")
+
+"""CRUD Operationen"""
+
+def test_update_edit_success(memory_database_session: Session):
+    # Arrange
+    edit_id = data["edits"][0]["edit_id"]
+
+    # Act
+    edit = update_edit(edit_id, EDIT_MEDIA_INFO, 123456, memory_database_session)
+
+    # Assert
+    assert (edit.duration, edit.width, edit.height, edit.fps, edit.codec, edit.byte_size) == (12.5, 1080, 1920, 25.0, "h264", 123456)
+
+def test_update_edit_not_found(memory_database_session: Session):
+    with pytest.raises(NoResultFound):
+        update_edit(999, EDIT_MEDIA_INFO, 123456, memory_database_session)
+
+def test_update_song_success(memory_database_session: Session):
+    # Arrange
+    song_id = data["songs"][0]["song_id"]
+
+    # Act
+    song = update_song(song_id, SONG_MEDIA_INFO, 4000000, memory_database_session)
+
+    # Assert: songs only store the audio fields
+    assert (song.duration, song.sample_rate, song.channel_layout, song.codec, song.byte_size) == (180.0, 44100, "stereo", "mp3", 4000000)
+
+def test_update_occupied_slot_success(memory_database_session: Session):
+    # Arrange
+    occupied_slot_id = data["occupied_slots"][0]["occupied_slot_id"]
+
+    # Act
+    occupied_slot = update_occupied_slot(occupied_slot_id, EDIT_MEDIA_INFO, 654321, memory_database_session)
+
+    # Assert
+    assert (occupied_slot.duration, occupied_slot.width, occupied_slot.byte_size) == (12.5, 1080, 654321)
+
+"""Andere Operationen"""
+
+def test_get_edit_success(memory_database_session: Session):
+    # Arrange
+    edit_id = data["edits"][0]["edit_id"]
+    update_edit(edit_id, EDIT_MEDIA_INFO, 123456, memory_database_session)
+
+    # Act
+    media_info = get_edit(edit_id, memory_database_session)
+
+    # Assert
+    assert media_info == EDIT_MEDIA_INFO
+
+def test_get_edit_not_probed(memory_database_session: Session):
+    """Edge Case: Ohne gespeicherte Metadaten gibt es nichts zu planen."""
+    edit_id = data["edits"][0]["edit_id"]
+
+    assert get_edit(edit_id, memory_database_session) is None
+
+def test_update_edit_in_background_session(memory_database_session: Session):
+    """Render-Jobs schreiben über eine eigene Session, der Request sieht das Ergebnis."""
+    # Arrange
+    edit_id = data["edits"][0]["edit_id"]
+
+    # Act
+    with open_background_session(memory_database_session) as job_database_session:
+        update_edit(edit_id, EDIT_MEDIA_INFO, 123456, job_database_session)
+
+    # Assert
+    memory_database_session.expire_all()
+    assert memory_database_session.query(Edit).filter(Edit.edit_id == edit_id).one().byte_size == 123456
@@ -0,0 +1,31 @@
+import pytest
+
+from api.exceptions.sessions.files import FileNotFoundInSessionError
+from api.services.files.audio_bed import create, get, remove
+from api.services.files.song import update as update_song
+from api.sessions.files import BaseFileSessionManager
+
+
+def test_create_audio_bed_success(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Das Audio-Bett wird gespeichert."""
+    # Act
+    location = create(999, "m4a", b"Audio bed content", memory_file_session)
+
+    # Assert
+    assert location == "memory://audio_beds/999.m4a"
+    assert get(999, memory_file_session) == b"Audio bed content"
+
+def test_remove_audio_bed_missing(memory_file_session: BaseFileSessionManager):
+    """Edge Case: Verwerfen eines nicht vorhandenen Audio-Betts ist kein Fehler."""
+    remove(999, memory_file_session)
+
+def test_update_song_removes_audio_bed(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Ein neuer Song macht das Audio-Bett ungültig."""
+    create(1, "m4a", b"Audio bed content", memory_file_session)
+
+    # Act
+    update_song(1, b"New song content", memory_file_session)
+
+    # Assert
+    with pytest.raises(FileNotFoundInSessionError):
+        get(1, memory_file_session)
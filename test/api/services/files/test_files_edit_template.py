@@ -0,0 +1,62 @@
+import pytest
+
+from api.exceptions.sessions.files import FileNotFoundInSessionError
+from api.services.files.demo_slot import update as update_demo_slot
+from api.services.files.edit_template import clear, copy_to_edit, create, remove
+from api.services.files.song import update as update_song
+from api.sessions.files import BaseFileSessionManager
+
+
+def test_copy_to_edit_success(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Das Template wird als Edit-Datei kopiert."""
+    create(999, "mp4", b"Template content", memory_file_session)
+
+    # Act
+    location = copy_to_edit(999, 1000, memory_file_session)
+
+    # Assert
+    assert location == "memory://edits/1000.mp4"
+    assert memory_file_session.get("1000", "edits") == b"Template content"
+
+def test_copy_to_edit_no_template(memory_file_session: BaseFileSessionManager):
+    """Negativer Test: Ohne Template gibt es nichts zu kopieren."""
+    create(999, "mp4", b"Template content", memory_file_session)
+
+    with pytest.raises(FileNotFoundInSessionError):
+        copy_to_edit(998, 1000, memory_file_session)
+
+def test_remove_without_template(memory_file_session: BaseFileSessionManager):
+    """Edge Case: Verwerfen eines nicht vorhandenen Templates ist kein Fehler."""
+    remove(999, memory_file_session)
+
+def test_clear_success(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Alle Templates werden verworfen."""
+    create(998, "mp4", b"Template content", memory_file_session)
+    create(999, "mp4", b"Template content", memory_file_session)
+
+    # Act
+    clear(memory_file_session)
+
+    # Assert
+    assert memory_file_session.list("edit_templates") == []
+
+def test_song_update_invalidates_template(memory_file_session: BaseFileSessionManager):
+    """Ändert sich der Song, wird sein Template verworfen."""
+    create(1, "mp4", b"Template content", memory_file_session)
+
+    # Act
+    update_song(1, b"New song content", memory_file_session)
+
+    # Assert
+    with pytest.raises(FileNotFoundInSessionError):
+        copy_to_edit(1, 1000, memory_file_session)
+
+def test_demo_slot_update_invalidates_templates(memory_file_session: BaseFileSessionManager):
+    """Ändert sich der Demo-Clip, werden alle Templates verworfen."""
+    create(1, "mp4", b"Template content", memory_file_session)
+
+    # Act
+    update_demo_slot(b"New demo content", memory_file_session)
+
+    # Assert
+    assert memory_file_session.list("edit_templates") == []
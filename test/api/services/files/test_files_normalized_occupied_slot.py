@@ -0,0 +1,41 @@
+import pytest
+
+from api.exceptions.sessions.files import FileNotFoundInSessionError
+from api.services.files.normalized_occupied_slot import get, remove, save
+from api.sessions.files import BaseFileSessionManager
+
+
+def test_save_normalized_occupied_slot_success(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Der normalisierte Clip wird neben dem Original gespeichert."""
+    # Act
+    location = save(999, "mp4", b"Normalized content", memory_file_session)
+
+    # Assert
+    assert location == "memory://normalized_occupied_slots/999.mp4"
+    assert get(999, memory_file_session) == b"Normalized content"
+
+def test_save_normalized_occupied_slot_replaces(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Ein vorhandener normalisierter Clip wird ersetzt."""
+    save(999, "mp4", b"Old content", memory_file_session)
+
+    # Act
+    save(999, "mp4", b"New content", memory_file_session)
+
+    # Assert
+    assert get(999, memory_file_session) == b"New content"
+
+def test_remove_normalized_occupied_slot_success(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Der normalisierte Clip wird verworfen."""
+    save(998, "mp4", b"Other content", memory_file_session)
+    save(999, "mp4", b"Normalized content", memory_file_session)
+
+    # Act
+    remove(999, memory_file_session)
+
+    # Assert
+    with pytest.raises(FileNotFoundInSessionError):
+        get(999, memory_file_session)
+
+def test_remove_normalized_occupied_slot_missing(memory_file_session: BaseFileSessionManager):
+    """Edge Case: Verwerfen eines nicht vorhandenen Clips ist kein Fehler."""
+    remove(999, memory_file_session)
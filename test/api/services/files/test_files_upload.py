@@ -0,0 +1,38 @@
+from api.services.files.occupied_slot import create_from_upload, get
+from api.services.files.upload import copy_from, create, remove
+from api.sessions.files import BaseFileSessionManager
+
+
+def test_create_from_upload_moves_upload(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Ein vorab abgelegter Upload landet unter der ID des belegten Slots und ist danach weg."""
+    # Arrange
+    create("upload", "mp4", b"Clip content", memory_file_session)
+
+    # Act
+    location = create_from_upload(999, "upload", memory_file_session)
+
+    # Assert
+    assert location == "memory://occupied_slots/999.mp4"
+    assert get(999, memory_file_session) == b"Clip content"
+    assert "upload.mp4" not in memory_file_session.list("uploads")
+
+def test_copy_from_keeps_original(memory_file_session: BaseFileSessionManager):
+    """Positiver Test: Die Sicherung einer Datei lässt das Original stehen."""
+    # Arrange
+    create("upload", "mp4", b"Clip content", memory_file_session)
+    create_from_upload(999, "upload", memory_file_session)
+
+    # Act
+    copy_from("999", "occupied_slots", "backup", memory_file_session)
+
+    # Assert
+    assert memory_file_session.get("backup", "uploads") == b"Clip content"
+    assert get(999, memory_file_session) == b"Clip content"
+
+def test_remove_missing_upload(memory_file_session: BaseFileSessionManager):
+    """Edge Case: Ein schon verschobener oder nie angelegter Upload wird stillschweigend übergangen."""
+    remove("missing", memory_file_session)
+
+    create("upload", "mp4", b"Clip content", memory_file_session)
+    remove("upload", memory_file_session)
+    remove("upload", memory_file_session)
@@ -1,7 +1,7 @@
 import pytest
 
 from api.exceptions.sessions.instagram import InstagramUploadError
-from api.services.instagram.upload import upload
+from api.services.instagram.upload import upload, upload_from_path
 from api.sessions.instagram import MemoryInstagramSessionManager
 
 
@@ -28,3 +28,16 @@ def test_upload_missing_caption(memory_instagram_session: MemoryInstagramSession
     # Act & Assert
     with pytest.raises(InstagramUploadError, match="Video bytes or caption are missing."):
         upload(video_bytes, video_format, caption, memory_instagram_session)
+
+
+def test_upload_from_path_success(memory_instagram_session: MemoryInstagramSessionManager, tmp_path):
+    """Testet den erfolgreichen Upload eines Videos über die upload_from_path()-Funktion."""
+    # Arrange
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"test_video_data")
+
+    # Act & Assert
+    try:
+        upload_from_path(str(video_path), "mp4", "Test Caption", memory_instagram_session)
+    except InstagramUploadError:
+        pytest.fail("InstagramUploadError should not be raised for valid inputs")
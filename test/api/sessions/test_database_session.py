@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.models.database.model import Base, Group
+from api.services.database.group import create as create_group_database
+from api.services.database.group import get as get_group_database
+from api.sessions.database import (RoutingSession, has_pending_writes,
+                                   is_recent_writer, reads_from_replica,
+                                   release_database_session, remember_writer,
+                                   use_primary)
+from api.utils.database.recent_writers import RecentWriters
+
+GROUP_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def _routing_sessions(tmp_path, sticky_seconds: float = 5):
+    """Primary und Replikat als zwei SQLite-Dateien, die Gruppe heißt je nach Datenbank anders."""
+    engines = {}
+    for name in ("primary", "replica"):
+        engines[name] = create_engine(f"sqlite:///{tmp_path / name}.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engines[name])
+        with sessionmaker(bind=engines[name])() as session:
+            session.add(Group(group_id=GROUP_ID, name=name))
+            session.commit()
+
+    return sessionmaker(
+        class_=RoutingSession,
+        primary=engines["primary"],
+        replicas=[engines["replica"]],
+        recent_writers=RecentWriters(sticky_seconds),
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+def test_routing_session_reads_from_replica(tmp_path):
+    with _routing_sessions(tmp_path)() as database_session:
+        assert get_group_database(GROUP_ID, database_session).name == "replica"
+        assert reads_from_replica(database_session)
+
+def test_routing_session_reads_own_writes(tmp_path):
+    routing_sessions = _routing_sessions(tmp_path)
+
+    with routing_sessions() as database_session:
+        # Act
+        new_group = create_group_database("New Group", database_session)
+
+        # Assert
+        assert not reads_from_replica(database_session)
+        assert get_group_database(new_group.group_id, database_session).name == "New Group"
+        database_session.commit()
+
+    with routing_sessions() as database_session:
+        use_primary(database_session)
+        assert database_session.query(Group).filter(Group.name == "New Group").count() == 1
+
+def test_routing_session_use_primary(tmp_path):
+    with _routing_sessions(tmp_path)() as database_session:
+        use_primary(database_session)
+
+        assert get_group_database(GROUP_ID, database_session).name == "primary"
+
+def test_routing_session_recent_writer(tmp_path):
+    """Nach einem Commit mit Schreibzugriff liest derselbe User für eine Weile vom Primary."""
+    routing_sessions = _routing_sessions(tmp_path, sticky_seconds=0.2)
+
+    with routing_sessions() as database_session:
+        create_group_database("New Group", database_session)
+        database_session.commit()
+        remember_writer(database_session, 1)
+
+    with routing_sessions() as database_session:
+        assert is_recent_writer(database_session, 1)
+        assert not is_recent_writer(database_session, 2)
+        assert not is_recent_writer(database_session, None)
+
+    time.sleep(0.25)
+    with routing_sessions() as database_session:
+        assert not is_recent_writer(database_session, 1)
+
+def test_routing_session_read_only_does_not_stick(tmp_path):
+    """Edge Case: Nur gelesen, es gibt nichts, was auf dem Replikat fehlen könnte."""
+    routing_sessions = _routing_sessions(tmp_path)
+
+    with routing_sessions() as database_session:
+        get_group_database(GROUP_ID, database_session)
+        database_session.commit()
+        remember_writer(database_session, 1)
+
+    with routing_sessions() as database_session:
+        assert not is_recent_writer(database_session, 1)
+
+def test_release_database_session_read_only(memory_database_session):
+    """Eine reine Lesetransaktion wird beendet, geladene Objekte bleiben lesbar."""
+    group = get_group_database(GROUP_ID, memory_database_session)
+
+    release_database_session(memory_database_session)
+
+    assert not memory_database_session.in_transaction()
+    assert group.group_id == GROUP_ID
+
+def test_release_database_session_refuses_writes(memory_database_session):
+    """Edge Case: Nach einem Schreibzugriff würde release das Geschriebene vor dem Ende des Requests committen."""
+    create_group_database("Written", memory_database_session)
+    assert has_pending_writes(memory_database_session)
+
+    with pytest.raises(RuntimeError):
+        release_database_session(memory_database_session)
+
+    # The commit at the end of the request ends the writes
+    memory_database_session.commit()
+    assert not has_pending_writes(memory_database_session)
@@ -1,9 +1,19 @@
+import os
+
 import pytest
 
 from api.exceptions.sessions.files import (DirectoryNotFoundError, FileDeleteError,
                                   FileExistsInSessionError,
-                                  FileNotFoundInSessionError)
-from api.sessions.files import BaseFileSessionManager, MemoryFileSessionManager
+                                  FileNotFoundInSessionError,
+                                  FileSessionError)
+from api.sessions.files import (BaseFileSessionManager,
+                                CachingFileSessionManager,
+                                HotFileSessionManager,
+                                LocalFileSessionManager,
+                                MemoryFileSessionManager,
+                                RemoteFileSessionManager, is_temp_file,
+                                shard_of)
+from mock.s3.fake_s3_server import FakeS3Server
 
 
 # Create Tests
@@ -94,6 +104,166 @@ def test_get_edge_case_existing_empty_file(memory_file_session: BaseFileSessionM
     # Assert
     assert retrieved_file == empty_content
 
+# Copy Tests
+def test_copy_success(memory_file_session: BaseFileSessionManager):
+    """Testet das erfolgreiche Kopieren einer Datei in ein anderes Verzeichnis."""
+    # Arrange
+    memory_file_session.create("999", "mp4", b"Template content", "edit_templates")
+
+    # Act
+    location = memory_file_session.copy("999", "edit_templates", "1000", "edits")
+
+    # Assert
+    assert location == "memory://edits/1000.mp4"
+    assert memory_file_session.get("1000", "edits") == b"Template content"
+
+def test_copy_file_not_found(memory_file_session: BaseFileSessionManager):
+    """Testet das Kopieren einer Datei, die nicht existiert."""
+    memory_file_session.create("999", "mp4", b"Template content", "edit_templates")
+
+    with pytest.raises(FileNotFoundInSessionError):
+        memory_file_session.copy("998", "edit_templates", "1000", "edits")
+
+def test_copy_target_exists(memory_file_session: BaseFileSessionManager):
+    """Testet das Kopieren auf eine bereits existierende Datei."""
+    memory_file_session.create("999", "mp4", b"Template content", "edit_templates")
+    memory_file_session.create("1000", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileExistsInSessionError):
+        memory_file_session.copy("999", "edit_templates", "1000", "edits")
+
+# Path Tests
+def test_path_success(memory_file_session: BaseFileSessionManager):
+    """Testet das Bereitstellen einer Datei als lokaler Pfad, die temporäre Datei wird danach gelöscht."""
+    # Arrange
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    # Act
+    with memory_file_session.path("999", "edits") as file_path:
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+    # Assert: the extension is kept, so ffmpeg can tell the format
+    assert content == b"Edit content"
+    assert file_path.endswith(".mp4")
+    assert not os.path.exists(file_path)
+
+def test_path_file_not_found(memory_file_session: BaseFileSessionManager):
+    """Testet das Bereitstellen einer Datei, die nicht existiert."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileNotFoundInSessionError):
+        with memory_file_session.path("998", "edits"):
+            pass
+
+def test_create_from_path_success(memory_file_session: BaseFileSessionManager, tmp_path):
+    """Testet das Speichern einer Datei aus einem lokalen Pfad, die Quelldatei wird übernommen."""
+    # Arrange
+    source_path = tmp_path / "upload.mp4"
+    source_path.write_bytes(b"Upload content")
+
+    # Act
+    location = memory_file_session.create_from_path("999", "mp4", str(source_path), "occupied_slots")
+
+    # Assert
+    assert location == "memory://occupied_slots/999.mp4"
+    assert memory_file_session.get("999", "occupied_slots") == b"Upload content"
+    assert not source_path.exists()
+
+def test_update_from_path_success(memory_file_session: BaseFileSessionManager, tmp_path):
+    """Testet das Ersetzen einer Datei durch eine Datei aus einem lokalen Pfad."""
+    # Arrange
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+    source_path = tmp_path / "render.mp4"
+    source_path.write_bytes(b"Rendered content")
+
+    # Act
+    location = memory_file_session.update_from_path("999", str(source_path), "edits")
+
+    # Assert
+    assert location == "memory://edits/999.mp4"
+    assert memory_file_session.get("999", "edits") == b"Rendered content"
+    assert not source_path.exists()
+
+def test_update_from_path_file_not_found(memory_file_session: BaseFileSessionManager, tmp_path):
+    """Testet das Ersetzen einer Datei, die nicht existiert, die Quelldatei bleibt erhalten."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+    source_path = tmp_path / "render.mp4"
+    source_path.write_bytes(b"Rendered content")
+
+    with pytest.raises(FileNotFoundInSessionError):
+        memory_file_session.update_from_path("998", str(source_path), "edits")
+    assert source_path.exists()
+
+# Streaming Tests
+def test_open_read_success(memory_file_session: BaseFileSessionManager):
+    """Testet das stückweise Lesen einer Datei über ein Dateiobjekt."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    with memory_file_session.open_read("999", "edits") as file:
+        assert file.read(4) == b"Edit"
+        assert file.read() == b" content"
+
+def test_open_read_file_not_found(memory_file_session: BaseFileSessionManager):
+    """Testet das Öffnen einer Datei, die nicht existiert."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileNotFoundInSessionError):
+        with memory_file_session.open_read("998", "edits"):
+            pass
+
+def test_open_write_create(memory_file_session: BaseFileSessionManager):
+    """Testet das Anlegen einer Datei über ein Dateiobjekt, das in mehreren Stücken beschrieben wird."""
+    with memory_file_session.open_write("999", "edits", "mp4") as file:
+        file.write(b"Edit ")
+        file.write(b"content")
+
+    assert memory_file_session.get("999", "edits") == b"Edit content"
+    assert "999.mp4" in memory_file_session.list("edits")
+
+def test_open_write_create_file_exists(memory_file_session: BaseFileSessionManager):
+    """Testet das Anlegen einer Datei, die bereits existiert."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileExistsInSessionError):
+        with memory_file_session.open_write("999", "edits", "mp4"):
+            pass
+
+def test_open_write_update_keeps_extension(memory_file_session: BaseFileSessionManager):
+    """Testet das Ersetzen einer Datei über ein Dateiobjekt, die Endung bleibt erhalten."""
+    memory_file_session.create("999", "mov", b"Edit content", "edits")
+
+    with memory_file_session.open_write("999", "edits") as file:
+        file.write(b"Rendered content")
+
+    assert "999.mov" in memory_file_session.list("edits")
+    assert memory_file_session.get("999", "edits") == b"Rendered content"
+
+def test_open_write_error_keeps_old_content(memory_file_session: BaseFileSessionManager):
+    """Testet, dass ein abgebrochener Schreibvorgang die vorhandene Datei nicht verändert."""
+    memory_file_session.create("999", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(RuntimeError):
+        with memory_file_session.open_write("999", "edits") as file:
+            file.write(b"Partial")
+            raise RuntimeError("render failed")
+
+    assert memory_file_session.get("999", "edits") == b"Edit content"
+
+def test_iter_chunks_success(memory_file_session: BaseFileSessionManager):
+    """Testet das stückweise Lesen einer Datei über einen Iterator."""
+    memory_file_session.create("999", "mp4", b"0123456789", "edits")
+
+    chunks = list(memory_file_session.iter_chunks("999", "edits", chunk_size=4))
+
+    assert chunks == [b"0123", b"4567", b"89"]
+
+def test_iter_chunks_empty_file(memory_file_session: BaseFileSessionManager):
+    """Testet das stückweise Lesen einer leeren Datei."""
+    memory_file_session.create("999", "mp4", b"", "edits")
+
+    assert list(memory_file_session.iter_chunks("999", "edits")) == []
+
 # Update Tests
 def test_update_success(memory_file_session: BaseFileSessionManager):
     """Testet das erfolgreiche Aktualisieren einer existierenden Datei."""
@@ -197,3 +367,468 @@ def test_list_all_after_clear(memory_file_session: MemoryFileSessionManager):
     memory_file_session.clear()
     all_files = memory_file_session.list_all()
     assert all_files == []
+
+# Local Index Tests
+def test_local_create_sharded(tmp_path, no_local_fill):
+    """Testet, dass lokale Dateien im Unterverzeichnis nach Hash-Präfix abgelegt werden."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+
+    location = file_session.create("12", "mp4", b"Edit content", "edits")
+
+    assert location == "http://localhost:8000/files/edits/12.mp4"
+    assert (tmp_path / "files" / "edits" / shard_of("12") / "12.mp4").read_bytes() == b"Edit content"
+    assert file_session.list("edits") == ["12.mp4"]
+    assert file_session.list_all() == ["edits/12.mp4"]
+
+def test_local_index_persisted(tmp_path, no_local_fill):
+    """Testet, dass der Index über einen Neustart erhalten bleibt, inklusive gelöschter Dateien."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("12", "mp4", b"Edit content", "edits")
+    file_session.create("13", "mov", b"Other content", "edits")
+    file_session.remove("13", "edits")
+
+    restarted_file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+
+    assert restarted_file_session.get("12", "edits") == b"Edit content"
+    assert restarted_file_session.list("edits") == ["12.mp4"]
+    with pytest.raises(FileNotFoundInSessionError):
+        restarted_file_session.get("13", "edits")
+
+def test_local_index_rebuilt_without_journal(tmp_path, no_local_fill):
+    """Testet, dass der Index ohne Journal aus den Dateien aufgebaut wird, auch aus flachen Verzeichnissen."""
+    (tmp_path / "files" / "edits").mkdir(parents=True)
+    (tmp_path / "files" / "edits" / "12.mp4").write_bytes(b"Edit content")
+
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+
+    assert file_session.get("12", "edits") == b"Edit content"
+    assert (tmp_path / "index.jsonl").exists()
+
+def test_local_move(tmp_path, no_local_fill):
+    """Testet das Verschieben per rename, der Index kennt die Datei danach nur unter dem neuen Namen, auch nach einem Neustart."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("upload", "mp4", b"Clip content", "uploads")
+    source_path = file_session.file_path("upload", "uploads")
+
+    location = file_session.move("upload", "uploads", "12", "occupied_slots")
+
+    assert location == file_session.location("12", "mp4", "occupied_slots")
+    assert not os.path.exists(source_path)
+    assert file_session.list("uploads") == []
+    restarted_file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    assert restarted_file_session.get("12", "occupied_slots") == b"Clip content"
+
+def test_local_move_target_exists(tmp_path, no_local_fill):
+    """Testet, dass move() eine vorhandene Datei nicht überschreibt und die Quelle stehen lässt."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("upload", "mp4", b"Clip content", "uploads")
+    file_session.create("12", "mp4", b"Old content", "occupied_slots")
+
+    with pytest.raises(FileExistsInSessionError):
+        file_session.move("upload", "uploads", "12", "occupied_slots")
+
+    assert file_session.get("upload", "uploads") == b"Clip content"
+    assert file_session.get("12", "occupied_slots") == b"Old content"
+
+def test_local_create_file_exists_other_extension(tmp_path, no_local_fill):
+    """Testet, dass ein Name im Verzeichnis nur einmal vergeben wird, unabhängig von der Endung."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("12", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileExistsInSessionError):
+        file_session.create("12", "mov", b"Other content", "edits")
+
+def test_local_open_write_error_removes_new_file(tmp_path, no_local_fill):
+    """Testet, dass eine abgebrochene neue Datei weder im Index noch auf der Platte bleibt."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+
+    with pytest.raises(RuntimeError):
+        with file_session.open_write("12", "edits", "mp4") as file:
+            file.write(b"Partial")
+            raise RuntimeError("upload aborted")
+
+    assert file_session.list("edits") == []
+    assert not (tmp_path / "files" / "edits" / shard_of("12") / "12.mp4").exists()
+
+# Memory Overlay Tests
+def _memory_file_session_manager(tmp_path) -> MemoryFileSessionManager:
+    (tmp_path / "edits").mkdir()
+    (tmp_path / "edits" / "1.mp4").write_bytes(b"Base content")
+    return MemoryFileSessionManager(str(tmp_path))
+
+def test_memory_base_loaded_lazily(tmp_path):
+    """Testet, dass die Basisdaten erst beim ersten Zugriff gelesen werden."""
+    file_session_manager = _memory_file_session_manager(tmp_path)
+    (tmp_path / "edits" / "2.mp4").write_bytes(b"Written after init")
+
+    file_session = next(file_session_manager.get_session())
+
+    assert file_session.list("edits") == ["1.mp4", "2.mp4"]
+
+def test_memory_session_changes_stay_in_session(tmp_path):
+    """Testet, dass Änderungen einer Sitzung weder die Basis noch andere Sitzungen verändern."""
+    file_session_manager = _memory_file_session_manager(tmp_path)
+    file_session = next(file_session_manager.get_session())
+    other_file_session = next(file_session_manager.get_session())
+
+    file_session.update("1", b"Session content", "edits")
+    file_session.create("2", "mp4", b"New content", "edits")
+
+    assert file_session.get("1", "edits") == b"Session content"
+    assert sorted(file_session.list("edits")) == ["1.mp4", "2.mp4"]
+    assert other_file_session.get("1", "edits") == b"Base content"
+    assert other_file_session.list("edits") == ["1.mp4"]
+
+def test_memory_session_remove_and_clear_hide_base(tmp_path):
+    """Testet, dass gelöschte Basisdateien nur in der Sitzung verschwinden."""
+    file_session_manager = _memory_file_session_manager(tmp_path)
+    file_session = next(file_session_manager.get_session())
+    cleared_file_session = next(file_session_manager.get_session())
+
+    file_session.remove("1", "edits")
+    cleared_file_session.clear()
+
+    assert file_session.list("edits") == []
+    assert cleared_file_session.list_all() == []
+    with pytest.raises(DirectoryNotFoundError):
+        cleared_file_session.list("edits")
+    assert next(file_session_manager.get_session()).get("1", "edits") == b"Base content"
+
+# Remote Tests
+@pytest.fixture(scope="function")
+def fake_s3_server():
+    with FakeS3Server(page_size=2) as fake_s3_server:
+        yield fake_s3_server
+
+@pytest.fixture(scope="function")
+def remote_file_session(fake_s3_server: FakeS3Server):
+    # Tiny parts, so multipart uploads and ranged downloads are used without large test files
+    remote_file_session_manager = RemoteFileSessionManager(fake_s3_server.client(pool_size=4), prefix="media/", public_url="https://cdn.example.com", part_size=4)
+    yield from remote_file_session_manager.get_session()
+
+def test_remote_create_get_update_remove(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet den Lebenszyklus einer Datei im Fernspeicher."""
+    location = remote_file_session.create("12", "mp4", b"Edit content", "edits")
+    assert location == "https://cdn.example.com/media/edits/12.mp4"
+    assert fake_s3_server.objects["media/edits/12.mp4"] == b"Edit content"
+    assert remote_file_session.get("12", "edits") == b"Edit content"
+
+    assert remote_file_session.update("12", b"Rendered content", "edits") == location
+    assert remote_file_session.get("12", "edits") == b"Rendered content"
+
+    remote_file_session.remove("12", "edits")
+    assert fake_s3_server.objects == {}
+    with pytest.raises(FileDeleteError):
+        remote_file_session.remove("12", "edits")
+
+def test_remote_errors(remote_file_session: RemoteFileSessionManager):
+    """Testet die Fehler des Fernspeichers, sie entsprechen denen der anderen Dateispeicher."""
+    remote_file_session.create("12", "mp4", b"Edit content", "edits")
+
+    with pytest.raises(FileExistsInSessionError):
+        remote_file_session.create("12", "mov", b"Other content", "edits")
+    with pytest.raises(FileNotFoundInSessionError):
+        remote_file_session.get("1", "edits")
+    with pytest.raises(FileNotFoundInSessionError):
+        remote_file_session.update("1", b"Content", "edits")
+    with pytest.raises(DirectoryNotFoundError):
+        remote_file_session.list("songs")
+
+def test_remote_open_write_multipart(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet, dass größere Dateien während des Schreibens als mehrteiliger Upload hochgeladen werden."""
+    with remote_file_session.open_write("12", "edits", "mp4") as file:
+        file.write(b"0123456")
+        file.write(b"789")
+
+    assert fake_s3_server.objects["media/edits/12.mp4"] == b"0123456789"
+    assert sorted(query["partNumber"] for method, _, query, _ in fake_s3_server.requests if "partNumber" in query) == ["1", "2", "3"]
+    assert fake_s3_server.uploads == {}
+
+def test_remote_open_write_error_aborts_upload(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet, dass ein abgebrochener Upload kein Objekt und keine offenen Teile hinterlässt."""
+    with pytest.raises(RuntimeError):
+        with remote_file_session.open_write("12", "edits", "mp4") as file:
+            file.write(b"0123456789")
+            raise RuntimeError("render failed")
+
+    assert fake_s3_server.objects == {}
+    assert fake_s3_server.uploads == {}
+
+def test_remote_create_from_path_and_path(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server, tmp_path):
+    """Testet Upload und Download über lokale Pfade, der Download großer Dateien läuft über Range-Anfragen."""
+    source_path = tmp_path / "upload.mp4"
+    source_path.write_bytes(b"0123456789")
+
+    remote_file_session.create_from_path("12", "mp4", str(source_path), "occupied_slots")
+    with remote_file_session.path("12", "occupied_slots") as file_path:
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+    assert not source_path.exists()
+    assert content == b"0123456789"
+    assert file_path.endswith(".mp4")
+    assert not os.path.exists(file_path)
+    assert sorted(headers["range"] for method, _, _, headers in fake_s3_server.requests if "range" in headers) == ["bytes=0-3", "bytes=4-7", "bytes=8-9"]
+
+def test_remote_get_range_and_iter_chunks(remote_file_session: RemoteFileSessionManager):
+    """Testet das Lesen von Ausschnitten und das stückweise Lesen."""
+    remote_file_session.create("12", "mp4", b"0123456789", "edits")
+
+    assert remote_file_session.get_range("12", "edits", 2, 3) == b"234"
+    assert remote_file_session.get_range("12", "edits", 8, 5) == b"89"
+    assert list(remote_file_session.iter_chunks("12", "edits", chunk_size=4)) == [b"0123", b"4567", b"89"]
+
+def test_remote_copy_on_server(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet, dass Kopien auf dem Server entstehen, ohne die Datei herunterzuladen."""
+    remote_file_session.create("999", "mp4", b"Template content", "edit_templates")
+
+    location = remote_file_session.copy("999", "edit_templates", "1000", "edits")
+
+    assert location == "https://cdn.example.com/media/edits/1000.mp4"
+    assert fake_s3_server.objects["media/edits/1000.mp4"] == b"Template content"
+    assert not [key for method, key, query, _ in fake_s3_server.requests if method == "GET" and key]
+
+def test_remote_list_by_prefix(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet das seitenweise Auflisten, Dateien werden per Präfix ihres Namens statt über das Verzeichnis gesucht."""
+    for file_name in ["1", "2", "3", "10", "11"]:
+        remote_file_session.create(file_name, "mp4", b"Edit content", "edits")
+    remote_file_session.create("1", "png", b"Cover content", "covers")
+    fake_s3_server.requests.clear()
+
+    assert sorted(remote_file_session.list("edits")) == ["1.mp4", "10.mp4", "11.mp4", "2.mp4", "3.mp4"]
+    assert len(remote_file_session.list_all()) == 6
+    remote_file_session.get("1", "edits")
+    assert ("GET", "", {"delimiter": "/", "list-type": "2", "prefix": "media/edits/1."}) in [request[:3] for request in fake_s3_server.requests]
+
+    remote_file_session.clear()
+    assert fake_s3_server.objects == {}
+
+def test_remote_connections_pooled(remote_file_session: RemoteFileSessionManager, fake_s3_server: FakeS3Server):
+    """Testet, dass aufeinanderfolgende Anfragen dieselbe Verbindung verwenden, auch nach gestreamten Downloads."""
+    remote_file_session.create("12", "mp4", b"Edit", "edits")
+    for _ in range(10):
+        assert remote_file_session.get("12", "edits") == b"Edit"
+
+    assert len(fake_s3_server.requests) > 10
+    assert len(fake_s3_server.connections) == 1
+
+# Local Atomic Write Tests
+def test_local_update_keeps_open_readers(tmp_path, no_local_fill):
+    """Testet, dass ein Leser der alten Datei diese auch während eines Updates vollständig liest."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("12", "mp4", b"Old edit content", "edits")
+
+    with file_session.open_read("12", "edits") as reader:
+        assert reader.read(4) == b"Old "
+        with file_session.open_write("12", "edits") as writer:
+            writer.write(b"New")
+            assert file_session.get("12", "edits") == b"Old edit content"
+        assert reader.read() == b"edit content"
+
+    assert file_session.get("12", "edits") == b"New"
+    assert not [file for file in os.listdir(tmp_path / "files" / "edits" / shard_of("12")) if is_temp_file(file)]
+
+def test_local_update_error_keeps_old_file(tmp_path, no_local_fill):
+    """Testet, dass ein abgebrochenes Update die alte Datei unverändert lässt."""
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    file_session.create("12", "mp4", b"Old edit content", "edits")
+
+    with pytest.raises(RuntimeError):
+        with file_session.open_write("12", "edits") as file:
+            file.write(b"Partial")
+            raise RuntimeError("render aborted")
+
+    assert file_session.get("12", "edits") == b"Old edit content"
+    assert os.listdir(tmp_path / "files" / "edits" / shard_of("12")) == ["12.mp4"]
+
+def test_local_fsync_modes(tmp_path, no_local_fill):
+    """Testet, dass "batch" Dateien für den Hintergrund vormerkt und "always" nichts vormerkt."""
+    batch_file_session = LocalFileSessionManager(str(tmp_path / "batch"), str(tmp_path / "batch.jsonl"), fsync="batch", fsync_interval=60)
+    batch_file_session.create("12", "mp4", b"Edit content", "edits")
+    assert batch_file_session.fsync_batcher.pending == {batch_file_session.file_path("12", "edits")}
+    batch_file_session.shutdown()
+    assert batch_file_session.fsync_batcher.pending == set()
+    assert batch_file_session.fsync_batcher.files == 1
+
+    always_file_session = LocalFileSessionManager(str(tmp_path / "always"), str(tmp_path / "always.jsonl"), fsync="always")
+    always_file_session.create("12", "mp4", b"Edit content", "edits")
+    assert always_file_session.get("12", "edits") == b"Edit content"
+    assert always_file_session.fsync_batcher.pending == set()
+
+    with pytest.raises(FileSessionError):
+        LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"), fsync="sometimes")
+
+def test_local_rebuild_index_skips_temp_files(tmp_path, no_local_fill):
+    """Testet, dass liegengebliebene temporäre Dateien nicht in den Index kommen."""
+    (tmp_path / "files" / "edits" / shard_of("12")).mkdir(parents=True)
+    (tmp_path / "files" / "edits" / shard_of("12") / "12.mp4").write_bytes(b"Edit content")
+    (tmp_path / "files" / "edits" / shard_of("12") / ".0f3a.tmp").write_bytes(b"Partial")
+
+    file_session = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+
+    assert file_session.list("edits") == ["12.mp4"]
+
+# Caching Tests
+def _caching_file_session(tmp_path, max_bytes: int = 1024) -> CachingFileSessionManager:
+    backend = next(MemoryFileSessionManager(str(tmp_path / "base")).get_session())
+    backend.create("1", "mp4", b"Demo content", "demo_slot")
+    return CachingFileSessionManager(backend, str(tmp_path / "cache"), max_bytes, ["demo_slot", "edits"])
+
+def test_caching_get_hit_after_miss(tmp_path):
+    """Testet, dass eine Datei nur beim ersten Lesen aus dem Dateispeicher geladen wird."""
+    file_session = _caching_file_session(tmp_path)
+
+    assert file_session.get("1", "demo_slot") == b"Demo content"
+    file_session.backend.memory_storage["demo_slot"]["1.mp4"] = b"Changed behind the cache"
+    with file_session.path("1", "demo_slot") as file_path:
+        with open(file_path, "rb") as file:
+            assert file.read() == b"Demo content"
+
+    assert file_session.stats()["hits"] == 1
+    assert file_session.stats()["misses"] == 1
+    assert file_session.stats()["size_bytes"] == len(b"Demo content")
+
+def test_caching_write_through_and_remove(tmp_path):
+    """Testet, dass Schreiben Cache und Dateispeicher ändert und Löschen den Eintrag entfernt."""
+    file_session = _caching_file_session(tmp_path)
+    file_session.get("1", "demo_slot")
+
+    file_session.update("1", b"New demo", "demo_slot")
+    file_session.create("7", "mp4", b"Edit content", "edits")
+
+    assert file_session.backend.get("1", "demo_slot") == b"New demo"
+    assert file_session.backend.get("7", "edits") == b"Edit content"
+    assert file_session.get("1", "demo_slot") == b"New demo"
+    assert file_session.get("7", "edits") == b"Edit content"
+    assert file_session.stats()["misses"] == 1
+
+    file_session.remove("7", "edits")
+    assert file_session.stats()["entries"] == 1
+    with pytest.raises(FileNotFoundInSessionError):
+        file_session.get("7", "edits")
+
+def test_caching_evicts_least_recently_used(tmp_path):
+    """Testet die Verdrängung, in Benutzung befindliche Dateien bleiben erhalten."""
+    file_session = _caching_file_session(tmp_path, max_bytes=20)
+    file_session.create("7", "mp4", b"0123456789", "edits")
+    file_session.create("8", "mp4", b"0123456789", "edits")
+
+    with file_session.path("7", "edits") as file_path:
+        file_session.create("9", "mp4", b"0123456789", "edits")
+        assert os.path.exists(file_path)
+
+    assert file_session.stats()["evictions"] == 1
+    assert file_session.stats()["size_bytes"] <= 20
+    assert ("edits", "8") not in file_session.entries
+    assert file_session.get("8", "edits") == b"0123456789"
+
+def test_caching_uncached_dir_passes_through(tmp_path):
+    """Testet, dass Verzeichnisse außerhalb von dirs nicht zwischengespeichert werden."""
+    file_session = _caching_file_session(tmp_path)
+
+    file_session.create("3", "mp4", b"Clip content", "occupied_slots")
+
+    assert file_session.get("3", "occupied_slots") == b"Clip content"
+    assert file_session.stats()["entries"] == 0
+    assert file_session.stats()["misses"] == 0
+
+def test_caching_kept_across_restart(tmp_path):
+    """Testet, dass der Cache auf der Platte einen Neustart übersteht."""
+    file_session = _caching_file_session(tmp_path)
+    file_session.get("1", "demo_slot")
+
+    restarted_file_session = CachingFileSessionManager(file_session.backend, str(tmp_path / "cache"), 1024, ["demo_slot", "edits"])
+
+    assert restarted_file_session.get("1", "demo_slot") == b"Demo content"
+    assert restarted_file_session.stats()["hits"] == 1
+
+def test_caching_copy_of_cached_file(tmp_path):
+    """Testet, dass die Kopie einer zwischengespeicherten Datei sofort im Cache liegt."""
+    file_session = _caching_file_session(tmp_path)
+    file_session.get("1", "demo_slot")
+
+    file_session.copy("1", "demo_slot", "7", "edits")
+
+    assert file_session.get("7", "edits") == b"Demo content"
+    assert file_session.stats()["misses"] == 1
+
+# Hot Bytes Tests
+def _hot_file_session(tmp_path, **kwargs) -> HotFileSessionManager:
+    backend = next(MemoryFileSessionManager(str(tmp_path / "base")).get_session())
+    backend.create("demo", "mp4", b"Demo content", "demo_slot")
+    backend.create("1", "mp3", b"Song content", "songs")
+    return HotFileSessionManager(backend, dirs=["demo_slot", "songs"], **kwargs)
+
+def test_hot_get_served_from_memory(tmp_path):
+    """Testet, dass wiederholtes Lesen nicht mehr den Dateispeicher erreicht, auch über path()."""
+    file_session = _hot_file_session(tmp_path)
+
+    assert file_session.get("demo", "demo_slot") == b"Demo content"
+    file_session.backend.memory_storage["demo_slot"]["demo.mp4"] = b"Changed behind the cache"
+
+    assert file_session.get("demo", "demo_slot") == b"Demo content"
+    with file_session.path("demo", "demo_slot") as file_path:
+        assert file_path.endswith(".mp4")
+        with open(file_path, "rb") as file:
+            assert file.read() == b"Demo content"
+    assert file_session.get_range("demo", "demo_slot", 5, 3) == b"con"
+    assert file_session.stats()["hits"] == 2
+    assert file_session.stats()["misses"] == 1
+
+def test_hot_invalidated_by_update_and_remove(tmp_path):
+    """Testet, dass update und remove den Eintrag verwerfen."""
+    file_session = _hot_file_session(tmp_path)
+    file_session.get("demo", "demo_slot")
+    file_session.get("1", "songs")
+
+    file_session.update("demo", b"New demo", "demo_slot")
+    file_session.remove("1", "songs")
+
+    assert file_session.get("demo", "demo_slot") == b"New demo"
+    with pytest.raises(FileNotFoundInSessionError):
+        file_session.get("1", "songs")
+    assert file_session.stats()["entries"] == 1
+
+def test_hot_bounded_by_bytes_and_entries(tmp_path):
+    """Testet die Verdrängung nach Anzahl und Größe sowie, dass zu große Dateien nicht vorgehalten werden."""
+    file_session = _hot_file_session(tmp_path, max_entries=1, max_file_bytes=12)
+    file_session.backend.create("2", "mp3", b"Much longer song content", "songs")
+
+    file_session.get("demo", "demo_slot")
+    file_session.get("1", "songs")
+    assert list(file_session.entries) == [("songs", "1")]
+    assert file_session.stats()["evictions"] == 1
+
+    assert file_session.get("2", "songs") == b"Much longer song content"
+    assert ("songs", "2") in file_session.oversized
+    assert file_session.stats()["size_bytes"] == len(b"Song content")
+
+def test_hot_uncached_dir_passes_through(tmp_path):
+    """Testet, dass Verzeichnisse außerhalb von dirs nicht vorgehalten werden."""
+    file_session = _hot_file_session(tmp_path)
+
+    file_session.create("7", "mp4", b"Edit content", "edits")
+
+    assert file_session.get("7", "edits") == b"Edit content"
+    assert file_session.stats()["entries"] == 0
+    assert file_session.stats()["misses"] == 0
+
+def test_hot_warm_up(tmp_path):
+    """Testet, dass warm_up die Dateien vorab lädt und fehlende überspringt."""
+    file_session = _hot_file_session(tmp_path)
+
+    file_session.warm_up(["demo_slot/demo", "songs/404"])
+
+    assert list(file_session.entries) == [("demo_slot", "demo")]
+    file_session.get("demo", "demo_slot")
+    assert file_session.stats()["hits"] == 1
+
+def test_hot_local_backend_path_not_copied(tmp_path, no_local_fill):
+    """Testet, dass path() bei einem lokalen Dateispeicher dessen Datei selbst bereitstellt."""
+    backend = LocalFileSessionManager(str(tmp_path / "files"), str(tmp_path / "index.jsonl"))
+    backend.create("demo", "mp4", b"Demo content", "demo_slot")
+    file_session = HotFileSessionManager(backend, dirs=["demo_slot"])
+
+    with file_session.path("demo", "demo_slot") as file_path:
+        assert file_path == backend.file_path("demo", "demo_slot")
+    assert file_session.stats()["entries"] == 0
@@ -49,3 +49,21 @@ def test_upload_unsupported_video_format(memory_instagram_session: MemoryInstagr
     # Act & Assert
     with pytest.raises(InstagramUploadError, match="Unsupported video format: avi"):
         memory_instagram_session.upload(video_bytes, video_format, caption)
+
+def test_upload_path_success(memory_instagram_session: MemoryInstagramSessionManager, tmp_path):
+    """Testet den Upload eines Videos aus einer Datei."""
+    # Arrange
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"test_video_data")
+
+    # Act & Assert
+    try:
+        memory_instagram_session.upload_path(str(video_path), "mp4", "Test Caption")
+    except InstagramUploadError:
+        pytest.fail("InstagramUploadError should not be raised for valid inputs")
+
+def test_upload_path_missing_file(memory_instagram_session: MemoryInstagramSessionManager, tmp_path):
+    """Testet den Fehlerfall, wenn die Videodatei fehlt."""
+    # Act & Assert
+    with pytest.raises(InstagramUploadError, match="Video file or caption are missing."):
+        memory_instagram_session.upload_path(str(tmp_path / "missing.mp4"), "mp4", "Test Caption")
@@ -0,0 +1,132 @@
+from contextlib import nullcontext
+
+import pytest
+
+from api.exceptions.sessions.render import RenderJobNotFoundError
+from api.sessions.render import MemoryRenderSessionManager, RenderJobStatus
+from api.utils.media_manipulation.render_cache import RenderCache
+
+
+def _double(value: int, *, output_path: str) -> None:
+    with open(output_path, "w") as file:
+        file.write(str(value * 2))
+
+def _fail(value: int, *, output_path: str) -> None:
+    raise ValueError("render failed")
+
+def _read(results: list):
+    """finalize, das das Ergebnis aus der Ausgabedatei liest."""
+    def finalize(output_path: str) -> None:
+        with open(output_path) as file:
+            results.append(int(file.read()))
+    return finalize
+
+# Positiver Fall: Ein Job durchläuft prepare, render und finalize
+def test_memory_render_submit_success(memory_render_session: MemoryRenderSessionManager):
+    results = []
+
+    job_id = memory_render_session.submit(1, lambda: nullcontext((21,)), _double, _read(results))
+
+    assert results == [42]
+    job = memory_render_session.get(job_id)
+    assert job.status == RenderJobStatus.DONE
+    assert job.edit_id == 1
+    assert job.error is None
+
+# Negativer Fall: Ein Fehler beim Rendern markiert den Job als fehlgeschlagen, finalize läuft nicht
+def test_memory_render_submit_failed(memory_render_session: MemoryRenderSessionManager):
+    results = []
+
+    job_id = memory_render_session.submit(1, lambda: nullcontext((21,)), _fail, _read(results))
+
+    assert results == []
+    job = memory_render_session.get(job_id)
+    assert job.status == RenderJobStatus.FAILED
+    assert job.error == "render failed"
+
+# Die Eingaben aus prepare bleiben bis nach finalize bestehen, die Ausgabedatei wird danach gelöscht
+def test_memory_render_cleans_up_after_finalize(memory_render_session: MemoryRenderSessionManager, tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("21")
+    events = []
+    output_paths = []
+
+    class Prepare:
+        def __enter__(self):
+            events.append("prepare")
+            return (int(input_path.read_text()),)
+
+        def __exit__(self, *exc_info):
+            events.append("cleanup")
+
+    def finalize(output_path: str) -> None:
+        events.append("finalize")
+        output_paths.append(output_path)
+
+    memory_render_session.submit(1, Prepare, _double, finalize)
+
+    assert events == ["prepare", "finalize", "cleanup"]
+    assert not (tmp_path / output_paths[0]).exists()
+
+# Jobs desselben Edits laufen nacheinander, wartende Jobs mit gleichem Key werden verdrängt
+def test_memory_render_serialized_and_superseded(memory_render_session: MemoryRenderSessionManager):
+    order = []
+    queued_job_ids = []
+
+    def prepare_first():
+        # Während der erste Job läuft, werden weitere Jobs für dasselbe Edit eingereiht
+        queued_job_ids.append(memory_render_session.submit(1, lambda: nullcontext((2,)), _double, _read(order), supersede_key="slot:1"))
+        queued_job_ids.append(memory_render_session.submit(1, lambda: nullcontext((3,)), _double, _read(order), supersede_key="slot:2"))
+        queued_job_ids.append(memory_render_session.submit(1, lambda: nullcontext((4,)), _double, _read(order), supersede_key="slot:1"))
+        return nullcontext((1,))
+
+    first_job_id = memory_render_session.submit(1, prepare_first, _double, _read(order), supersede_key="slot:1")
+
+    assert order == [2, 6, 8]
+    assert memory_render_session.get(first_job_id).status == RenderJobStatus.DONE
+    assert memory_render_session.get(queued_job_ids[0]).status == RenderJobStatus.SUPERSEDED
+    assert memory_render_session.get(queued_job_ids[1]).status == RenderJobStatus.DONE
+    assert memory_render_session.get(queued_job_ids[2]).status == RenderJobStatus.DONE
+
+# Negativer Fall: Unbekannte Job-ID
+def test_memory_render_get_not_found(memory_render_session: MemoryRenderSessionManager):
+    with pytest.raises(RenderJobNotFoundError):
+        memory_render_session.get("unknown")
+
+# Gleiche Eingaben werden aus dem Render-Cache beantwortet, ohne erneut zu rendern
+def test_memory_render_cached(tmp_path):
+    memory_render_session = MemoryRenderSessionManager(render_cache=RenderCache(str(tmp_path / "cache"), 1024))
+    calls = []
+
+    def render(value: int, *, output_path: str) -> None:
+        calls.append(value)
+        _double(value, output_path=output_path)
+
+    results = []
+    memory_render_session.submit(1, lambda: nullcontext((21,)), render, _read(results))
+    memory_render_session.submit(2, lambda: nullcontext((21,)), render, _read(results))
+
+    assert results == [42, 42]
+    assert calls == [21]
+    assert memory_render_session.render_cache.stats()["hits"] == 1
+
+# Eingabedateien werden über ihren Inhalt verglichen und als einfacher Pfad an die Render-Funktion übergeben
+def test_memory_render_cached_by_file_content(tmp_path):
+    memory_render_session = MemoryRenderSessionManager(render_cache=RenderCache(str(tmp_path / "cache"), 1024))
+    input_path = tmp_path / "input.txt"
+    calls = []
+
+    def render(path: str, *, output_path: str) -> None:
+        calls.append(path)
+        with open(path) as file:
+            _double(int(file.read()), output_path=output_path)
+
+    input_path.write_text("21")
+    memory_render_session.render(render, (input_path,), str(tmp_path / "first.txt"))
+    memory_render_session.render(render, (input_path,), str(tmp_path / "second.txt"))
+    input_path.write_text("4")
+    memory_render_session.render(render, (input_path,), str(tmp_path / "third.txt"))
+
+    assert calls == [str(input_path), str(input_path)]
+    assert (tmp_path / "second.txt").read_text() == "42"
+    assert (tmp_path / "third.txt").read_text() == "8"
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from api.exceptions.sessions.executor import ExecutorSaturatedError
+from api.utils.concurrency.bounded_executor import BoundedExecutor
+
+
+def test_bounded_executor_runs_in_worker_thread():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=4)
+
+    thread_name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+
+    assert thread_name.startswith("test")
+    assert executor.stats()["completed"] == 1
+    assert executor.stats()["queued"] == 0
+    executor.shutdown()
+
+def test_bounded_executor_passes_arguments_and_errors():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=4)
+
+    assert asyncio.run(executor.run(int, "12", base=8)) == 10
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(int, "not a number"))
+
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+def test_bounded_executor_runs_in_worker_process():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=4, processes=True)
+
+    assert asyncio.run(executor.run(os.getpid)) != os.getpid()
+    assert asyncio.run(executor.run(int, "12", base=8)) == 10
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(int, "not a number"))
+
+    stats = executor.stats()
+    assert stats["completed"] == 3
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
+    executor.shutdown()
+
+def test_bounded_executor_rejects_when_saturated():
+    """Edge Case: Der einzige Thread ist belegt und die Warteschlange voll."""
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def act():
+        blocking = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(release.wait, 5)
+
+        stats = executor.stats()
+        release.set()
+        await asyncio.gather(*blocking)
+        return stats
+
+    stats = asyncio.run(act())
+
+    assert stats["active"] == 1
+    assert stats["saturation"] == 1.0
+    assert stats["queued"] == 1
+    assert stats["rejected"] == 1
+    executor.shutdown()
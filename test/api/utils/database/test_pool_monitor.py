@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from api.utils.database.pool_monitor import PoolMonitor
+
+
+def _monitored_engine(tmp_path, **pool_args):
+    pool_monitor = PoolMonitor()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", connect_args={"check_same_thread": False}, poolclass=pool_monitor.pool_class(), **pool_args)
+    pool_monitor.listen(engine)
+    return pool_monitor, engine
+
+def test_pool_monitor_counts_checkouts(tmp_path):
+    pool_monitor, engine = _monitored_engine(tmp_path, pool_size=2, max_overflow=0)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        in_use = pool_monitor.stats()["in_use"]
+
+    stats = pool_monitor.stats()
+    assert in_use == 2
+    assert stats["in_use"] == 0
+    assert stats["in_use_max"] == 2
+    assert stats["checkouts"] == 2
+    assert stats["connects"] == 2
+    assert stats["size"] == 2
+    engine.dispose()
+
+def test_pool_monitor_reuses_connections(tmp_path):
+    pool_monitor, engine = _monitored_engine(tmp_path, pool_size=1, max_overflow=0)
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    assert pool_monitor.stats()["checkouts"] == 3
+    assert pool_monitor.stats()["connects"] == 1
+    engine.dispose()
+
+def test_pool_monitor_exhausted_pool(tmp_path):
+    """Edge Case: Alle Verbindungen sind belegt, das Warten endet mit einem Timeout."""
+    pool_monitor, engine = _monitored_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.1)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_monitor.stats()
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.1
+    engine.dispose()
+
+def test_pool_monitor_invalidated_connection(tmp_path):
+    pool_monitor, engine = _monitored_engine(tmp_path, pool_size=1, max_overflow=0)
+
+    with engine.connect() as connection:
+        connection.invalidate()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    stats = pool_monitor.stats()
+    assert stats["invalidations"] == 1
+    assert stats["connects"] == 2
+    assert stats["in_use"] == 0
+    engine.dispose()
@@ -0,0 +1,25 @@
+from api.utils.files.fsync_batcher import FsyncBatcher
+
+
+def test_fsync_batcher_flushes_in_background(tmp_path):
+    file_path = tmp_path / "12.mp4"
+    file_path.write_bytes(b"content")
+    batcher = FsyncBatcher(interval=0.01)
+
+    batcher.add(str(file_path))
+    batcher.add(str(file_path))
+    batcher.close()
+
+    assert batcher.pending == set()
+    assert batcher.files == 1
+    assert not batcher.thread.is_alive()
+
+def test_fsync_batcher_removed_file(tmp_path):
+    """Edge Case: Die Datei wurde vor dem Durchlauf wieder gelöscht."""
+    batcher = FsyncBatcher(interval=60)
+
+    batcher.add(str(tmp_path / "removed.mp4"))
+    batcher.flush()
+
+    assert batcher.pending == set()
+    batcher.close()
@@ -0,0 +1,22 @@
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from fastapi import UploadFile
+
+from api.utils.files.save_upload_file import save_upload_file
+
+
+def test_save_upload_file(tmp_path):
+    """Der Upload wird komplett geschrieben, auch wenn er schon gelesen wurde (z.B. von file_validation)."""
+    # Arrange
+    mock_file = MagicMock(spec=UploadFile)
+    mock_file.file = BytesIO(b"x" * (3 * 1024 * 1024 + 7))
+    mock_file.file.read()
+    target_path = tmp_path / "upload.mp4"
+
+    # Act
+    byte_size = save_upload_file(mock_file, str(target_path))
+
+    # Assert
+    assert byte_size == 3 * 1024 * 1024 + 7
+    assert target_path.read_bytes() == b"x" * byte_size
@@ -0,0 +1,19 @@
+import os
+
+from api.utils.files.temporary_file_path import temporary_file_path
+
+
+def test_temporary_file_path_removed_afterwards():
+    with temporary_file_path("mp4") as temp_file_path:
+        assert temp_file_path.endswith(".mp4")
+        with open(temp_file_path, "wb") as temp_file:
+            temp_file.write(b"content")
+
+    assert not os.path.exists(temp_file_path)
+
+def test_temporary_file_path_moved_away(tmp_path):
+    """Edge Case: Die Datei wurde verschoben, es gibt nichts zu löschen."""
+    with temporary_file_path("mp4") as temp_file_path:
+        os.rename(temp_file_path, tmp_path / "moved.mp4")
+
+    assert (tmp_path / "moved.mp4").exists()
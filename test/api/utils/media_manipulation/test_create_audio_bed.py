@@ -0,0 +1,34 @@
+import pytest
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.create_audio_bed import create_audio_bed
+from api.utils.media_manipulation.probe_media import probe_media_file
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+
+@pytest.fixture
+def mono_song_path(tmp_path):
+    """Mono-mp3 mit 48 kHz aus ffmpeg selbst, damit keine Mock-Dateien nötig sind."""
+    song_path = str(tmp_path / "song.mp3")
+    run_ffmpeg(["-f", "lavfi", "-i", "sine=frequency=440:duration=4:sample_rate=48000", "-ac", "1", "-y", song_path])
+    return song_path
+
+def test_create_audio_bed(mono_song_path, tmp_path):
+    # Act
+    audio_bed_path = str(tmp_path / "audio_bed.m4a")
+    create_audio_bed(mono_song_path, 1.0, 3.5, audio_bed_path)
+
+    # Assert: only [1, 3.5], encoded like the audio of the edits
+    audio_info = probe_media_file(audio_bed_path)
+    assert abs(audio_info.duration - 2.5) < 0.1
+    assert audio_info.sample_rate == 44100
+    assert audio_info.channel_layout == "stereo"
+    assert "Audio: aac" in run_ffmpeg(["-i", audio_bed_path, "-f", "null", "-t", "0", "-"])
+
+def test_create_audio_bed_invalid_input(tmp_path):
+    invalid_path = tmp_path / "invalid.mp3"
+    invalid_path.write_bytes(b"no audio")
+
+    with pytest.raises(MediaManipulationError):
+        create_audio_bed(str(invalid_path), 0.0, 1.0, str(tmp_path / "audio_bed.m4a"))
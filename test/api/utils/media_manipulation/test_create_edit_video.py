@@ -1,36 +1,79 @@
+import pytest
 
+from api.config.media import media_config
 from api.models.database.model import Song
 from api.services.database.song import get_breakpoints
-from api.services.files.demo_slot import get as get_demo_slot_mediaservice
-from api.services.files.song import get as get_song_mediaservice
+from api.services.files.demo_slot import path as get_demo_slot_path
+from api.services.files.song import path as get_song_path
+from api.utils.media_manipulation.create_audio_bed import create_audio_bed
 from api.utils.media_manipulation.create_edit_video import create_edit_video
+from api.utils.media_manipulation.get_keyframe_times import (
+    find_keyframe, get_keyframe_times)
+from api.utils.media_manipulation.probe_media import probe_media_file
 
 
-def test_create_edit_video_no_errors(memory_file_session, memory_database_session):
+@pytest.mark.parametrize("engine", ["moviepy", "ffmpeg"])
+def test_create_edit_video_no_errors(engine, monkeypatch, tmp_path, memory_file_session, memory_database_session):
+    monkeypatch.setitem(media_config, "engine", engine)
     
     # Arrange
     existing_song = memory_database_session.query(Song).first()  # Nimm den ersten Song
     assert existing_song is not None, "Kein vorhandener Song gefunden"
 
     song_id = existing_song.song_id
+    breakpoints = get_breakpoints(song_id, memory_database_session)
+    output_path = str(tmp_path / "result.mp4")
+    
+    # Act 
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_song_path(song_id, memory_file_session) as song_path:
+        create_edit_video(
+            demo_video_path,
+            song_path,
+            breakpoints, 
+            output_path=output_path
+        )
     
-    demo_video_bytes = get_demo_slot_mediaservice(memory_file_session)
-    song_bytes       = get_song_mediaservice(song_id, memory_file_session)
+    assert (tmp_path / "result.mp4").stat().st_size > 0
     
-    breakpoints = get_breakpoints(song_id, memory_database_session)
+@pytest.mark.parametrize("engine", ["moviepy", "ffmpeg"])
+def test_create_edit_video_audio_bed(engine, monkeypatch, tmp_path, memory_file_session, memory_database_session):
+    monkeypatch.setitem(media_config, "engine", engine)
+
+    # Arrange
+    existing_song = memory_database_session.query(Song).first()
+    breakpoints = get_breakpoints(existing_song.song_id, memory_database_session)
+    audio_bed_path = str(tmp_path / "audio_bed.m4a")
+    output_path = str(tmp_path / "result.mp4")
+    with get_song_path(existing_song.song_id, memory_file_session) as song_path:
+        create_audio_bed(song_path, breakpoints[0], breakpoints[-1], audio_bed_path)
+
+    # Act
+    with get_demo_slot_path(memory_file_session) as demo_video_path:
+        create_edit_video(demo_video_path, audio_bed_path, breakpoints, audio_bed=True, output_path=output_path)
+
+    # Assert: the edit has the song's audio for the whole slot range
+    audio_info = probe_media_file(output_path)
+    assert abs(audio_info.duration - (breakpoints[-1] - breakpoints[0])) < 0.1
+
+def test_create_edit_video_keyframes_at_breakpoints(tmp_path, memory_file_session, memory_database_session):
     
-    assert demo_video_bytes is not None
-    assert song_bytes is not None
+    # Arrange
+    existing_song = memory_database_session.query(Song).first()
+    song_id = existing_song.song_id
+    breakpoints = get_breakpoints(song_id, memory_database_session)
+    output_path = str(tmp_path / "result.mp4")
     
     # Act 
-    result = create_edit_video(
-        demo_video_bytes,
-        "mp4",
-        song_bytes,
-        "mp3",
-        breakpoints, 
-        "mp4"
-    )
-    
-    assert result is not None
-    
\ No newline at end of file
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_song_path(song_id, memory_file_session) as song_path:
+        create_edit_video(
+            demo_video_path,
+            song_path,
+            breakpoints, 
+            output_path=output_path
+        )
+    
+    keyframe_times = get_keyframe_times(output_path)
+    
+    # Assert: jeder Slot-Übergang innerhalb des Edits ist ein Keyframe
+    for breakpoint in breakpoints[1:-1]:
+        assert find_keyframe(keyframe_times, breakpoint - breakpoints[0], 0.04) is not None
@@ -0,0 +1,18 @@
+from api.utils.media_manipulation.get_keyframe_times import find_keyframe
+
+
+def test_find_keyframe_exact():
+    assert find_keyframe([0.0, 0.5, 1.0], 0.5, 0.04) == 0.5
+
+def test_find_keyframe_within_tolerance():
+    # ffmpeg setzt den erzwungenen Keyframe auf den ersten Frame ab dem Zeitpunkt
+    assert find_keyframe([0.0, 0.52, 1.0], 0.5, 0.04) == 0.52
+
+def test_find_keyframe_closest():
+    assert find_keyframe([0.0, 0.48, 0.52, 1.0], 0.51, 0.04) == 0.52
+
+def test_find_keyframe_not_aligned():
+    assert find_keyframe([0.0, 10.0], 0.5, 0.04) is None
+
+def test_find_keyframe_empty():
+    assert find_keyframe([], 0.5, 0.04) is None
@@ -0,0 +1,37 @@
+import pytest
+
+from api.config.media import media_config
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.get_media_duration import \
+    get_media_duration
+from api.utils.media_manipulation.normalize_clip import normalize_clip
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+
+@pytest.fixture
+def landscape_clip_path(tmp_path):
+    """Querformat-Clip mit 30 fps aus ffmpeg selbst, damit keine Mock-Dateien nötig sind."""
+    clip_path = str(tmp_path / "clip.mkv")
+    run_ffmpeg(["-f", "lavfi", "-i", "testsrc=duration=3:size=640x360:rate=30", "-pix_fmt", "yuv444p", "-y", clip_path])
+    return clip_path
+
+def test_normalize_clip_render_format(landscape_clip_path, tmp_path):
+    # Act
+    output_path = str(tmp_path / "normalized.mp4")
+    normalize_clip(landscape_clip_path, 1.0, 2.0, output_path)
+
+    # Assert: 1080x1920, 25 fps, yuv420p, only [1, 2]
+    stream_info = run_ffmpeg(["-i", output_path, "-f", "null", "-t", "0", "-"])
+    profile = media_config["profiles"]["intermediate"]
+    assert f"{profile['width']}x{profile['height']}" in stream_info
+    assert f"{profile['fps']} fps" in stream_info
+    assert "yuv420p" in stream_info
+    assert abs(get_media_duration(output_path) - 1.0) < 0.1
+
+def test_normalize_clip_invalid_input(tmp_path):
+    invalid_path = tmp_path / "invalid.mp4"
+    invalid_path.write_bytes(b"no video")
+
+    with pytest.raises(MediaManipulationError):
+        normalize_clip(str(invalid_path), 0.0, 1.0, str(tmp_path / "normalized.mp4"))
@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+import pytest
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.probe_media import (probe_media,
+                                                      probe_media_file,
+                                                      probe_media_path)
+from api.utils.media_manipulation.run_ffmpeg import run_ffmpeg
+
+# Testdateien aus ffmpeg selbst, damit keine Mock-Dateien nötig sind
+SINE = ["-f", "lavfi", "-i", "sine=frequency=440:duration=3.5"]
+TESTSRC = ["-f", "lavfi", "-i", "testsrc=duration=2:size=320x240:rate=30"]
+
+MEDIA_FILES = {
+    "wav": [*SINE, "-ac", "2", "-ar", "22050"],
+    "mp3": [*SINE, "-b:a", "128k"],
+    "vbr.mp3": [*SINE, "-q:a", "4"],
+    "noxing.mp3": [*SINE, "-b:a", "128k", "-write_xing", "0"],
+    "id3.mp3": [*SINE, "-b:a", "64k", "-metadata", "title=Test Song", "-id3v2_version", "3"],
+    "mpeg2.mp3": [*SINE, "-ar", "22050", "-b:a", "32k"],
+    "m4a": [*SINE, "-c:a", "aac", "-ac", "2"],
+    "mov": [*TESTSRC],
+    "mp4": [*TESTSRC, *SINE, "-shortest"],
+}
+
+
+def _create_media(name: str, args: list[str]) -> bytes:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, f"test.{name.split('.')[-1]}")
+        run_ffmpeg([*args, "-y", path])
+        with open(path, "rb") as file:
+            return file.read()
+
+@pytest.mark.parametrize("name", MEDIA_FILES.keys())
+def test_probe_media_matches_ffmpeg(name):
+    """Die Header-Parser liefern dasselbe wie ffmpeg."""
+    # Arrange
+    file_bytes = _create_media(name, MEDIA_FILES[name])
+    file_format = name.split(".")[-1]
+    with tempfile.NamedTemporaryFile(suffix=f".{file_format}") as media_file:
+        media_file.write(file_bytes)
+        media_file.flush()
+        expected = probe_media_file(media_file.name)
+
+    # Act
+    media_info = probe_media(file_bytes, file_format)
+
+    # Assert
+    assert abs(media_info.duration - expected.duration) < 0.05
+    assert media_info.sample_rate == expected.sample_rate
+    assert media_info.channel_layout == expected.channel_layout
+    assert media_info.width == expected.width
+    assert media_info.height == expected.height
+    assert media_info.fps == expected.fps
+    assert media_info.codec == expected.codec
+
+@pytest.mark.parametrize("name", ["wav", "mp3", "mp4"])
+def test_probe_media_path_matches_probe_media(name, tmp_path):
+    """Aus der Datei (per mmap) kommt dasselbe wie aus den Bytes."""
+    # Arrange
+    file_bytes = _create_media(name, MEDIA_FILES[name])
+    media_path = tmp_path / f"test.{name}"
+    media_path.write_bytes(file_bytes)
+
+    # Act
+    media_info = probe_media_path(str(media_path))
+
+    # Assert
+    assert media_info == probe_media(file_bytes, name)
+
+def test_probe_media_path_fallback(tmp_path):
+    """Unbekannte Container und leere Dateien gehen an ffmpeg."""
+    media_path = tmp_path / "test.mkv"
+    media_path.write_bytes(_create_media("mkv", TESTSRC))
+    empty_path = tmp_path / "empty.mp4"
+    empty_path.write_bytes(b"")
+
+    assert abs(probe_media_path(str(media_path)).duration - 2.0) < 0.05
+    with pytest.raises(MediaManipulationError):
+        probe_media_path(str(empty_path))
+
+def test_probe_media_wrong_extension():
+    """Edge Case: Der Inhalt entscheidet, nicht die Dateiendung (Upload als .wav, tatsächlich mp3)."""
+    file_bytes = _create_media("mp3", MEDIA_FILES["mp3"])
+
+    media_info = probe_media(file_bytes, "wav")
+
+    assert media_info.codec == "mp3"
+    assert abs(media_info.duration - 3.5) < 0.05
+
+def test_probe_media_fallback_unknown_format():
+    """Unbekannte Container (hier mkv) werden mit ffmpeg untersucht."""
+    file_bytes = _create_media("mkv", TESTSRC)
+
+    media_info = probe_media(file_bytes, "mkv")
+
+    assert abs(media_info.duration - 2.0) < 0.05
+    assert (media_info.width, media_info.height) == (320, 240)
+
+def test_probe_media_fallback_fragmented_mp4():
+    """Fragmentiertes MP4 hat keine Dauer im moov, ffmpeg liest die Fragmente."""
+    file_bytes = _create_media("mp4", [*TESTSRC, "-movflags", "frag_keyframe+empty_moov", "-f", "mp4"])
+
+    media_info = probe_media(file_bytes, "mp4")
+
+    assert abs(media_info.duration - 2.0) < 0.05
+
+def test_probe_media_invalid():
+    with pytest.raises(MediaManipulationError):
+        probe_media(b"not a media file", "mp3")
@@ -0,0 +1,88 @@
+import os
+from pathlib import Path
+
+from api.utils.media_manipulation.render_cache import RenderCache, render_cache_key
+from api.utils.media_manipulation.swap_slot_in_edit_video import swap_slot_in_edit
+
+
+def test_render_cache_key_same_inputs():
+    args = (b"edit", 1.0, 2.0, "mp4", b"clip", 0.0, 1.0, "mp4", "mp4")
+    assert render_cache_key(swap_slot_in_edit, args) == render_cache_key(swap_slot_in_edit, args)
+
+def test_render_cache_key_different_inputs():
+    args = (b"edit", 1.0, 2.0, "mp4", b"clip", 0.0, 1.0, "mp4", "mp4")
+    other_clip = (b"edit", 1.0, 2.0, "mp4", b"clip2", 0.0, 1.0, "mp4", "mp4")
+    other_points = (b"edit", 1.0, 2.0, "mp4", b"clip", 0.5, 1.5, "mp4", "mp4")
+    shifted = (b"editclip", 1.0, 2.0, "mp4", b"", 0.0, 1.0, "mp4", "mp4")
+
+    keys = {render_cache_key(swap_slot_in_edit, arguments) for arguments in (args, other_clip, other_points, shifted)}
+    assert len(keys) == 4
+
+def test_render_cache_key_hashes_file_content(tmp_path):
+    # Arrange: same content under different paths, different content under the same path
+    first_path = tmp_path / "first.mp4"
+    second_path = tmp_path / "second.mp4"
+    first_path.write_bytes(b"edit")
+    second_path.write_bytes(b"edit")
+
+    # Act
+    first_key = render_cache_key(swap_slot_in_edit, (first_path, 1.0, 2.0))
+    second_key = render_cache_key(swap_slot_in_edit, (second_path, 1.0, 2.0))
+    first_path.write_bytes(b"changed edit")
+    changed_key = render_cache_key(swap_slot_in_edit, (first_path, 1.0, 2.0))
+
+    # Assert
+    assert first_key == second_key
+    assert changed_key != first_key
+    assert render_cache_key(swap_slot_in_edit, (str(second_path), 1.0, 2.0)) != second_key
+
+def _write(path: Path, data: bytes) -> str:
+    path.write_bytes(data)
+    return str(path)
+
+def test_render_cache_hit_and_miss(tmp_path):
+    render_cache = RenderCache(str(tmp_path / "cache"), 1024)
+    output_path = str(tmp_path / "output.mp4")
+
+    assert render_cache.get("key", output_path) is False
+    render_cache.put("key", _write(tmp_path / "result.mp4", b"result"))
+    assert render_cache.get("key", output_path) is True
+    assert Path(output_path).read_bytes() == b"result"
+
+    stats = render_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size_bytes"] == len(b"result")
+
+def test_render_cache_evicts_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    output_path = str(tmp_path / "output.mp4")
+    render_cache = RenderCache(str(cache_dir), 25)
+    render_cache.put("first", _write(tmp_path / "first.mp4", b"A" * 10))
+    render_cache.put("second", _write(tmp_path / "second.mp4", b"B" * 10))
+    os.utime(cache_dir / "first.bin", (0, 0))
+    os.utime(cache_dir / "second.bin", (1, 1))
+
+    # Act: "first" is used again, so "second" is the least recently used entry
+    render_cache.get("first", output_path)
+    render_cache.put("third", _write(tmp_path / "third.mp4", b"C" * 10))
+
+    # Assert
+    assert render_cache.get("second", output_path) is False
+    assert render_cache.get("first", output_path) is True
+    assert Path(output_path).read_bytes() == b"A" * 10
+    assert render_cache.get("third", output_path) is True
+    assert render_cache.stats()["evictions"] == 1
+    assert render_cache.stats()["size_bytes"] == 20
+
+def test_render_cache_skips_too_large_results(tmp_path):
+    render_cache = RenderCache(str(tmp_path / "cache"), 5)
+    render_cache.put("key", _write(tmp_path / "result.mp4", b"A" * 10))
+    assert render_cache.get("key", str(tmp_path / "output.mp4")) is False
+
+def test_render_cache_keeps_entries_across_instances(tmp_path):
+    RenderCache(str(tmp_path / "cache"), 1024).put("key", _write(tmp_path / "result.mp4", b"result"))
+
+    render_cache = RenderCache(str(tmp_path / "cache"), 1024)
+    assert render_cache.stats()["size_bytes"] == len(b"result")
+    assert render_cache.get("key", str(tmp_path / "output.mp4")) is True
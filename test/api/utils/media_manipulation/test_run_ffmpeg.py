@@ -0,0 +1,45 @@
+import pytest
+
+from api.exceptions.media_manipulation.media_manipulation import \
+    MediaManipulationError
+from api.utils.media_manipulation.run_ffmpeg import FFmpegStream
+
+# Testvideo aus ffmpeg selbst, damit keine Mock-Dateien nötig sind
+TEST_SOURCE = ["-f", "lavfi", "-i", "testsrc=duration=2:size=160x120:rate=25"]
+FRAGMENTED_MP4 = ["-c:v", "mpeg4", "-movflags", "frag_keyframe+empty_moov", "-f", "mp4", "pipe:1"]
+
+
+def test_ffmpeg_stream_yields_output():
+    cleaned_up = []
+    stream = FFmpegStream([*TEST_SOURCE, *FRAGMENTED_MP4], cleanup=lambda: cleaned_up.append(True), chunk_size=4096)
+
+    chunks = list(stream)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 4096 for chunk in chunks)
+    assert b"moof" in b"".join(chunks)
+    assert stream.process.returncode == 0
+    assert cleaned_up == [True]
+
+def test_ffmpeg_stream_close_kills_ffmpeg():
+    cleaned_up = []
+    # Endlose Quelle, ffmpeg würde ohne close() nie fertig
+    stream = FFmpegStream(["-re", "-f", "lavfi", "-i", "testsrc=size=160x120:rate=25", *FRAGMENTED_MP4], cleanup=lambda: cleaned_up.append(True))
+    chunks = iter(stream)
+    assert next(chunks)
+
+    stream.close()
+
+    assert stream.process.returncode is not None and stream.process.returncode != 0
+    assert cleaned_up == [True]
+    # Nach dem Abbruch endet die Iteration ohne Fehler, aufgeräumt wird nur einmal
+    list(chunks)
+    assert cleaned_up == [True]
+
+def test_ffmpeg_stream_error():
+    cleaned_up = []
+    stream = FFmpegStream(["-i", "does-not-exist.mp4", "-f", "mp4", "pipe:1"], cleanup=lambda: cleaned_up.append(True))
+
+    with pytest.raises(MediaManipulationError):
+        list(stream)
+    assert cleaned_up == [True]
@@ -1,36 +1,89 @@
+import pytest
+from moviepy.editor import VideoFileClip
+
+from api.config.media import media_config
 from api.models.database.model import Edit
-from api.services.files.demo_slot import get as get_demo_slot_mediaservice
-from api.services.files.edit import get as get_edit_mediaservice
-from api.utils.media_manipulation.swap_slot_in_edit_video import \
-    swap_slot_in_edit
+from api.services.files.demo_slot import path as get_demo_slot_path
+from api.services.files.edit import path as get_edit_path
+from api.utils.media_manipulation.swap_slot_in_edit_video import (
+    stream_swap_slot_in_edit, swap_slot_in_edit)
 
 
-def test_swap_slot_in_edit_video_no_errors(memory_file_session, memory_database_session):
+@pytest.mark.parametrize("engine", ["moviepy", "ffmpeg"])
+def test_swap_slot_in_edit_video_no_errors(engine, monkeypatch, tmp_path, memory_file_session, memory_database_session):
+    monkeypatch.setitem(media_config, "engine", engine)
     
     # Arrange
     existing_edit = memory_database_session.query(Edit).first()  # Nimm den ersten Song
     assert existing_edit is not None, "Kein vorhandenes Eidt gefunden"
     edit_id = existing_edit.edit_id
+    output_path = str(tmp_path / "result.mp4")
 
-    demo_video_bytes = get_demo_slot_mediaservice(memory_file_session)
-    assert demo_video_bytes is not None
-    
-    edit_video_bytes = get_edit_mediaservice(edit_id,memory_file_session)
-    assert edit_video_bytes is not None
-    
-    result = swap_slot_in_edit(
-        edit_video_bytes,
-        1,
-        2,
-        "mp4",
-        
-        demo_video_bytes,
-        1,
-        2,
-        "mp4",
-        
-        "mp4"
-    )
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_edit_path(edit_id, memory_file_session) as edit_video_path:
+        swap_slot_in_edit(
+            edit_video_path,
+            1,
+            2,
+            
+            demo_video_path,
+            1,
+            2,
+            
+            output_path=output_path
+        )
     
-    assert result is not None
+    assert (tmp_path / "result.mp4").stat().st_size > 0
     
+
+@pytest.mark.parametrize("engine", ["moviepy", "ffmpeg"])
+def test_swap_slot_in_edit_video_preview_profile(engine, monkeypatch, tmp_path, memory_file_session, memory_database_session):
+    monkeypatch.setitem(media_config, "engine", engine)
+
+    # Arrange
+    existing_edit = memory_database_session.query(Edit).first()
+    output_path = str(tmp_path / "result.mp4")
+
+    # Act
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_edit_path(existing_edit.edit_id, memory_file_session) as edit_video_path:
+        swap_slot_in_edit(edit_video_path, 1, 2, demo_video_path, 1, 2, "preview", output_path=output_path)
+
+    # Assert: the preview is rendered at the lower resolution
+    with VideoFileClip(output_path) as result_clip:
+        assert tuple(result_clip.size) == (media_config["profiles"]["preview"]["width"], media_config["profiles"]["preview"]["height"])
+
+@pytest.mark.parametrize("engine", ["moviepy", "ffmpeg"])
+def test_swap_slot_in_edit_video_window(engine, monkeypatch, tmp_path, memory_file_session, memory_database_session):
+    monkeypatch.setitem(media_config, "engine", engine)
+
+    # Arrange
+    existing_edit = memory_database_session.query(Edit).first()
+    output_path = str(tmp_path / "result.mp4")
+
+    # Act: slot [1, 2] with 0.5 seconds context on either side
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_edit_path(existing_edit.edit_id, memory_file_session) as edit_video_path:
+        swap_slot_in_edit(edit_video_path, 1, 2, demo_video_path, 1, 2, "preview", 0.5, output_path=output_path)
+
+    # Assert: only the window is written, with audio
+    with VideoFileClip(output_path) as result_clip:
+        assert abs(result_clip.duration - 2.0) < 0.1
+        assert result_clip.audio is not None
+
+def test_stream_swap_slot_in_edit_video(tmp_path, memory_file_session, memory_database_session):
+    # Arrange
+    existing_edit = memory_database_session.query(Edit).first()
+    cleaned_up = []
+
+    # Act
+    with get_demo_slot_path(memory_file_session) as demo_video_path, get_edit_path(existing_edit.edit_id, memory_file_session) as edit_video_path:
+        stream = stream_swap_slot_in_edit(edit_video_path, 1, 2, demo_video_path, 1, 2, "preview", 0.5, cleanup=lambda: cleaned_up.append(True))
+        chunks = list(stream)
+
+    # Assert: fragmented mp4 with the same window as swap_slot_in_edit, cleanup ran once ffmpeg was done
+    result = b"".join(chunks)
+    assert b"moof" in result
+    assert cleaned_up == [True]
+    result_path = tmp_path / "result.mp4"
+    result_path.write_bytes(result)
+    with VideoFileClip(str(result_path)) as result_clip:
+        assert abs(result_clip.duration - 2.0) < 0.1
+        assert tuple(result_clip.size) == (media_config["profiles"]["preview"]["width"], media_config["profiles"]["preview"]["height"])
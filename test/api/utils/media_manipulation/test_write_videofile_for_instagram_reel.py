@@ -0,0 +1,25 @@
+from api.config.media import media_config
+from api.utils.media_manipulation.write_videofile_for_instagram_reel import \
+    instagram_reel_ffmpeg_params
+
+
+def _param(ffmpeg_params: list[str], name: str) -> str:
+    return ffmpeg_params[ffmpeg_params.index(name) + 1]
+
+def test_instagram_reel_ffmpeg_params_reel_profile():
+    ffmpeg_params = instagram_reel_ffmpeg_params()
+
+    assert _param(ffmpeg_params, "-preset") == media_config["profiles"]["reel"]["preset"]
+    assert _param(ffmpeg_params, "-crf") == str(media_config["profiles"]["reel"]["crf"])
+    assert "-force_key_frames" not in ffmpeg_params
+
+def test_instagram_reel_ffmpeg_params_preview_profile():
+    ffmpeg_params = instagram_reel_ffmpeg_params(profile="preview")
+
+    assert _param(ffmpeg_params, "-preset") == "ultrafast"
+    assert _param(ffmpeg_params, "-crf") == str(media_config["profiles"]["preview"]["crf"])
+
+def test_instagram_reel_ffmpeg_params_keyframes():
+    ffmpeg_params = instagram_reel_ffmpeg_params(keyframe_times=[2.0, 0.0, 2.0, 1.5])
+
+    assert _param(ffmpeg_params, "-force_key_frames") == "0.000,1.500,2.000"
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 import pytest
 from dotenv import load_dotenv
@@ -11,6 +12,8 @@ from api.config.exceptions import add_exception_handlers
 from api.middleware.access_handler import AccessHandlerMiddleware
 from api.routes.edit import router as edit_router
 from api.routes.group import router as group_router
+from api.routes.job import router as job_router
+from api.routes.metrics import router as metrics_router
 from api.routes.song import router as song_router
 from api.routes.user import router as user_router
 from api.routes.slot import router as slot_router
@@ -18,9 +21,12 @@ from api.routes.websockets import router as websockets_router
 from api.sessions.database import (MemoryDatabaseSessionManager,
                                    get_database_session)
 from api.sessions.email import MemoryEmailSessionManager, get_email_session
+from api.sessions.executor import (init_executor_session_manager,
+                                   shutdown_executor_session_manager)
 from api.sessions.files import MemoryFileSessionManager, get_file_session
 from api.sessions.instagram import (MemoryInstagramSessionManager,
                                     get_instagram_session)
+from api.sessions.render import MemoryRenderSessionManager, get_render_session
 from api.utils.jwt import jwt
 from logging_config import setup_logging
 
@@ -58,6 +64,11 @@ def memory_file_session():
     memory_file_session_manager = MemoryFileSessionManager()
     yield from memory_file_session_manager.get_session()
 
+@pytest.fixture(scope="function")
+def no_local_fill(monkeypatch):
+    """Ein LocalFileSessionManager in tmp_path startet leer, auch mit FILES_LOCAL_FILL=true in der .env."""
+    monkeypatch.setattr("api.sessions.files.FILES_LOCAL_FILL", False)
+
 """Email"""
 @pytest.fixture(scope="function")
 def memory_instagram_session():
@@ -70,22 +81,38 @@ def memory_email_session():
     memory_email_session_manager = MemoryEmailSessionManager()
     yield from memory_email_session_manager.get_session()
 
+"""Render"""
+@pytest.fixture(scope="function")
+def memory_render_session():
+    memory_render_session_manager = MemoryRenderSessionManager()
+    yield from memory_render_session_manager.get_session()
+
 """HTTP Client"""
 @pytest.fixture(scope="function")
 def http_client(
         memory_database_session     : Session, 
         memory_file_session         : MemoryFileSessionManager, 
         memory_instagram_session    : MemoryInstagramSessionManager, 
-        memory_email_session         : MemoryEmailSessionManager
+        memory_email_session         : MemoryEmailSessionManager,
+        memory_render_session       : MemoryRenderSessionManager
     ):
     
+    # executors for blocking calls, as in the prod lifespan
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        init_executor_session_manager()
+        yield
+        shutdown_executor_session_manager()
+
     # adding prod routes
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.include_router(song_router)
     app.include_router(group_router)
     app.include_router(user_router)
     app.include_router(edit_router)
     app.include_router(slot_router)
+    app.include_router(job_router)
+    app.include_router(metrics_router)
     
     # websockets
     app.include_router(websockets_router)
@@ -108,6 +135,10 @@ def http_client(
 
     def get_file_session_override():
         yield memory_file_session
+
+
+    def get_render_session_override():
+        yield memory_render_session
     
     # adding middleware
     app.add_middleware(AccessHandlerMiddleware, endpoint_config=endpoint_config, get_database_session=get_database_session_override)
@@ -117,6 +148,7 @@ def http_client(
     app.dependency_overrides[get_file_session] = get_file_session_override
     app.dependency_overrides[get_instagram_session] = get_instagram_session_override
     app.dependency_overrides[get_email_session] = get_email_session_override
+    app.dependency_overrides[get_render_session] = get_render_session_override
 
     with TestClient(app) as test_client:
         yield test_client
@@ -125,4 +157,5 @@ def http_client(
     del app.dependency_overrides[get_file_session]
     del app.dependency_overrides[get_instagram_session]
     del app.dependency_overrides[get_email_session]
+    del app.dependency_overrides[get_render_session]
         
\ No newline at end of file